@@ -6,6 +6,7 @@ from psycopg2.extras import execute_values
 from pytest import fixture
 
 from dbnd_postgres import postgres_values
+from dbnd_postgres.postgres_contreoller import PostgresController
 from targets.value_meta import ValueMetaConf
 
 
@@ -99,3 +100,43 @@ class TestPostgres(object):
             },
         }
         assert value_meta.data_schema == expected_schema
+
+    def test_exact_stats(self, table):
+        meta_conf = ValueMetaConf(log_histograms=True)
+        with PostgresController(
+            self.connection_string, table, exact_stats=True
+        ) as postgres:
+            stats, histograms = postgres.get_histograms_and_stats(meta_conf)
+
+        assert stats == {
+            "string_value": {
+                "null-count": 100,
+                "count": 1000,
+                "distinct": 3,
+                "type": "character varying",
+            },
+            "numerical_value": {
+                "null-count": 100,
+                "count": 1000,
+                "distinct": 900,
+                "type": "integer",
+                "min": 0,
+                "max": 899,
+            },
+            "boolean_value": {
+                "null-count": 100,
+                "count": 1000,
+                "distinct": 2,
+                "type": "boolean",
+            },
+        }
+        assert histograms["string_value"] == (
+            [500, 300, 100],
+            ["Shalom Olam!", "Ola Mundo!", "Hello World!"],
+        )
+        assert histograms["boolean_value"] == ([700, 200], [False, True])
+
+        counts, values = histograms["numerical_value"]
+        assert sum(counts) == 900
+        assert len(counts) == 20
+        assert values[0] == 0 and values[-1] == 899
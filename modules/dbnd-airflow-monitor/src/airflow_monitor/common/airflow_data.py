@@ -1,11 +1,21 @@
+import typing
+
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import attr
 
 from dbnd._core.utils.basics.nothing import NOTHING
 
 
+if typing.TYPE_CHECKING:
+    from dbnd_airflow_export.models import (
+        DagRunsStatesData,
+        FullRunsData,
+        NewRunsData,
+    )
+
+
 @attr.s
 class LastSeenValues:
     last_seen_dag_run_id = attr.ib()  # type: Optional[int]
@@ -77,7 +87,8 @@ class MonitorState:
 class AirflowDagRun:
     id = attr.ib()  # type: int
     dag_id = attr.ib()  # type: str
-    execution_date = attr.ib()  # type: str
+    # iso string from the web fetcher, datetime from the db fetcher
+    execution_date = attr.ib()  # type: Union[str, datetime]
     state = attr.ib()  # type: str
     is_paused = attr.ib()  # type: bool
     has_updated_task_instances = attr.ib()  # type: bool
@@ -110,6 +121,26 @@ class AirflowDagRunsResponse:
             last_seen_log_id=data.get("last_seen_log_id"),
         )
 
+    @classmethod
+    def from_export_data(cls, data):
+        # type: (NewRunsData) -> AirflowDagRunsResponse
+        return cls(
+            dag_runs=[
+                AirflowDagRun(
+                    id=dr.id,
+                    dag_id=dr.dag_id,
+                    execution_date=dr.execution_date,
+                    state=dr.state,
+                    is_paused=dr.is_paused,
+                    has_updated_task_instances=dr.has_updated_task_instances,
+                    max_log_id=dr.max_log_id,
+                )
+                for dr in data.new_dag_runs or []
+            ],
+            last_seen_dag_run_id=data.last_seen_dag_run_id,
+            last_seen_log_id=data.last_seen_log_id,
+        )
+
 
 @attr.s
 class DagRunsFullData:
@@ -132,6 +163,19 @@ class DagRunsFullData:
             ],
         )
 
+    @classmethod
+    def from_export_data(cls, data):
+        # type: (FullRunsData) -> DagRunsFullData
+        # values are not json serialized yet (datetimes etc.),
+        # it's done once, when the data is sent to dbnd
+        return cls(
+            dags=[dag.as_dict() for dag in data.dags],
+            dag_runs=[dag_run.as_dict() for dag_run in data.dag_runs],
+            task_instances=[
+                task_instance.as_dict() for task_instance in data.task_instances
+            ],
+        )
+
 
 @attr.s
 class DagRunsStateData:
@@ -149,3 +193,13 @@ class DagRunsStateData:
             ],
             dag_runs=[dag_run for dag_run in data.get("dag_runs")],
         )
+
+    @classmethod
+    def from_export_data(cls, data):
+        # type: (DagRunsStatesData) -> DagRunsStateData
+        return cls(
+            task_instances=[
+                task_instance.as_dict() for task_instance in data.task_instances
+            ],
+            dag_runs=[dag_run.as_dict() for dag_run in data.dag_runs],
+        )
@@ -1,5 +1,4 @@
 import contextlib
-import json
 import logging
 
 from distutils.version import LooseVersion
@@ -14,19 +13,19 @@ from airflow_monitor.common.airflow_data import (
 )
 from airflow_monitor.common.config_data import AirflowServerConfig
 from airflow_monitor.data_fetcher.base_data_fetcher import AirflowDataFetcher
+from airflow_monitor.errors import AirflowFetchingException
 from dbnd._core.utils.uid_utils import get_airflow_instance_uid
 
 
 logger = logging.getLogger(__name__)
 
 
-def json_conv(data):
-    from dbnd_airflow_export.utils import JsonEncoder
-
-    if not isinstance(data, dict):
-        data = data.as_dict()
-
-    return json.loads(json.dumps(data, cls=JsonEncoder))
+def _raise_on_export_error(data):
+    # export functions don't raise, the error is returned as part of the result
+    if data.error_message:
+        logger.error("Error in Airflow Export Plugin: \n%s", data.error_message)
+        raise AirflowFetchingException(data.error_message)
+    return data
 
 
 class DbFetcher(AirflowDataFetcher):
@@ -96,7 +95,11 @@ class DbFetcher(AirflowDataFetcher):
 
         with self._get_session() as session:
             data = get_last_seen_values(session=session)
-        return LastSeenValues.from_dict(json_conv(data))
+        _raise_on_export_error(data)
+        return LastSeenValues(
+            last_seen_dag_run_id=data.last_seen_dag_run_id,
+            last_seen_log_id=data.last_seen_log_id,
+        )
 
     def get_airflow_dagruns_to_sync(
         self,
@@ -118,7 +121,7 @@ class DbFetcher(AirflowDataFetcher):
                 include_subdags=False,
                 session=session,
             )
-        return AirflowDagRunsResponse.from_dict(json_conv(data))
+        return AirflowDagRunsResponse.from_export_data(_raise_on_export_error(data))
 
     def get_full_dag_runs(
         self, dag_run_ids: List[int], include_sources: bool
@@ -133,7 +136,7 @@ class DbFetcher(AirflowDataFetcher):
                 session=session,
             )
 
-        return DagRunsFullData.from_dict(json_conv(data))
+        return DagRunsFullData.from_export_data(_raise_on_export_error(data))
 
     def get_dag_runs_state_data(self, dag_run_ids: List[int]) -> DagRunsStateData:
         from dbnd_airflow_export.api_functions import get_dag_runs_states_data
@@ -141,7 +144,7 @@ class DbFetcher(AirflowDataFetcher):
         with self._get_session() as session:
             data = get_dag_runs_states_data(dag_run_ids=dag_run_ids, session=session)
 
-        return DagRunsStateData.from_dict(json_conv(data))
+        return DagRunsStateData.from_export_data(_raise_on_export_error(data))
 
     def is_alive(self):
         return True
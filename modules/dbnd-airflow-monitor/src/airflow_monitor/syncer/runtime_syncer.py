@@ -1,6 +1,6 @@
 import logging
 
-from typing import List
+from typing import Iterable, List
 
 from airflow_monitor.common import capture_monitor_exception
 from airflow_monitor.common.airflow_data import (
@@ -41,8 +41,9 @@ def is_view_only_events(dr: AirflowDagRun):
 
 
 def categorize_dag_runs(
-    airflow_dag_runs: List[AirflowDagRun], dbnd_dag_run_ids: List[int]
+    airflow_dag_runs: List[AirflowDagRun], dbnd_dag_run_ids: Iterable[int]
 ):
+    dbnd_dag_run_ids = set(dbnd_dag_run_ids)
     dagruns_to_init = []
     dagruns_to_update = []
     dagruns_to_skip = []
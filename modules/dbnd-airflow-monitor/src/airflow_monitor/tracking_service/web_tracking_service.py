@@ -2,7 +2,7 @@ import json
 import logging
 import typing
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List
 
 from airflow_monitor.common.airflow_data import (
@@ -52,6 +52,15 @@ def _get_api_client(tracking_service_config: TrackingServiceConfig) -> "ApiClien
     )
 
 
+def _json_default(obj):
+    # same format as the airflow export plugin uses
+    if isinstance(obj, datetime):
+        return obj.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    if isinstance(obj, date):
+        return obj.strftime("%Y-%m-%d")
+    raise TypeError(repr(obj) + " is not JSON serializable")
+
+
 def _min_start_time(start_time_window: int) -> datetime:
     if not start_time_window:
         return None
@@ -70,10 +79,20 @@ class WebDbndAirflowTrackingService(DbndAirflowTrackingService):
         return "tracking/{}/{}".format(self.tracking_source_uid, name)
 
     def _make_request(self, name, method, data, query=None, request_timeout=None):
+        raw_data = None
+        headers = None
+        if data is not None:
+            # data fetched directly from the airflow db is not serialized yet,
+            # it's serialized only here
+            raw_data = json.dumps(data, default=_json_default).encode("utf-8")
+            headers = {"Content-Type": "application/json"}
+
         return self._api_client.api_request(
             endpoint=self._url_for(name),
             method=method,
-            data=data,
+            data=None,
+            raw_data=raw_data,
+            headers=headers,
             query=query,
             request_timeout=request_timeout,
         )
@@ -1,8 +1,16 @@
+import json
+
+from datetime import datetime, timezone
+
 import pytest
 
-from mock import MagicMock
+from mock import MagicMock, patch
 
+from airflow_monitor.common.airflow_data import DagRunsFullData
 from airflow_monitor.data_fetcher import DbFetcher, decorate_fetcher
+from airflow_monitor.data_fetcher.db_data_fetcher import _raise_on_export_error
+from airflow_monitor.errors import AirflowFetchingException
+from airflow_monitor.tracking_service import web_tracking_service
 
 
 def test_db_fetcher_retries():
@@ -19,3 +27,63 @@ def test_db_fetcher_retries():
         decorated_fetcher.get_airflow_dagruns_to_sync()
     # it should be called more than once
     assert func_mock.call_count == 3
+
+
+def _full_runs_export_data():
+    from dbnd_airflow_export.models import (
+        AirflowExportMeta,
+        AirflowTaskInstance,
+        EDagRun,
+        FullRunsData,
+    )
+
+    execution_date = datetime(2021, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)
+    return FullRunsData(
+        airflow_export_meta=AirflowExportMeta(),
+        dags=[],
+        dag_runs=[
+            EDagRun(
+                "dag",
+                1,
+                execution_date,
+                "success",
+                None,
+                execution_date,
+                {"date": execution_date},
+                "run_id",
+            )
+        ],
+        task_instances=[
+            AirflowTaskInstance(
+                "dag", "task", execution_date, "success", 1, execution_date, None
+            )
+        ],
+    )
+
+
+def test_full_runs_serialized_once():
+    from dbnd_airflow_export.utils import JsonEncoder
+
+    export_data = _full_runs_export_data()
+    full_data = DagRunsFullData.from_export_data(export_data)
+
+    api_client = MagicMock()
+    with patch.object(web_tracking_service, "_get_api_client", return_value=api_client):
+        tracking_service = web_tracking_service.WebDbndAirflowTrackingService(
+            "uid", MagicMock()
+        )
+    tracking_service.init_dagruns(full_data, 1, "runtime_syncer")
+
+    sent = json.loads(api_client.api_request.call_args[1]["raw_data"].decode("utf-8"))
+    # the same data we've got with the json round trip from the export plugin
+    expected = json.loads(json.dumps(export_data.as_dict(), cls=JsonEncoder))
+    for key in ["dags", "dag_runs", "task_instances"]:
+        assert sent[key] == expected[key]
+    assert sent["dag_runs"][0]["execution_date"] == "2021-01-02T03:04:05.000678Z"
+
+
+def test_export_error_is_raised():
+    from dbnd_airflow_export.models import FullRunsData
+
+    with pytest.raises(AirflowFetchingException, match="some error"):
+        _raise_on_export_error(FullRunsData(error_message="some error"))
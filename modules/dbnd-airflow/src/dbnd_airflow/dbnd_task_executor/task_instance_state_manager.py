@@ -1,6 +1,8 @@
 from collections import Counter, defaultdict
 from typing import List
 
+import six
+
 from airflow.models import TaskInstance
 
 
@@ -11,6 +13,8 @@ class AirflowTaskInstanceStateManager(object):
 
     def __init__(self):
         self.status = defaultdict(dict)
+        # task_id -> state of task instances that changed their state since the last pop
+        self.changes = defaultdict(dict)
 
     def _get_dag_run(self, dag_id, execution_date):
         return self.status[(dag_id, execution_date)]
@@ -23,7 +27,22 @@ class AirflowTaskInstanceStateManager(object):
             .all()
         )
 
-        self.status[(dag_id, execution_date)] = dict(updated_status)
+        updated_status = dict(updated_status)
+        dag_run_key = (dag_id, execution_date)
+        previous_status = self.status[dag_run_key]
+        changes = self.changes[dag_run_key]
+        for task_id, state in six.iteritems(updated_status):
+            if task_id not in previous_status or previous_status[task_id] != state:
+                changes[task_id] = state
+
+        self.status[dag_run_key] = updated_status
+
+    def pop_state_changes(self, dag_id, execution_date):
+        """
+        Returns task_id -> state for all task instances that changed their state
+        (or were seen for the first time) since the previous call
+        """
+        return self.changes.pop((dag_id, execution_date), {})
 
     def get_state(self, dag_id, execution_date, task_id):
         return self._get_dag_run(dag_id, execution_date).get(task_id)
@@ -2,6 +2,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import datetime
 import logging
+import typing
 
 from airflow import executors, models
 from airflow.jobs import BackfillJob, BaseJob
@@ -29,8 +30,12 @@ from dbnd_airflow.executors.kubernetes_executor.kubernetes_runtime_zombies_clean
     ClearKubernetesRuntimeZombiesForDagRun,
 )
 from dbnd_airflow.scheduler.dagrun_zombies import fix_zombie_dagrun_task_instances
+from dbnd_airflow.scheduler.task_instances_ready_queue import TaskInstancesReadyQueue
 
 
+if typing.TYPE_CHECKING:
+    from typing import List, Optional
+
 logger = logging.getLogger(__name__)
 
 SCHEDULED_OR_RUNNABLE = RUNNABLE_STATES.union({State.SCHEDULED})
@@ -89,6 +94,7 @@ class SingleDagRunJob(BaseJob, SingletonContext):
         self._logged_status = ""  # last printed status
 
         self.ti_state_manager = AirflowTaskInstanceStateManager()
+        self._ready_queue = None  # type: Optional[TaskInstancesReadyQueue]
         self.airflow_config = airflow_config  # type: AirflowConfig
         if (
             self.airflow_config.clean_zombie_task_instances
@@ -153,6 +159,7 @@ class SingleDagRunJob(BaseJob, SingletonContext):
                 self.log.warning("Task instance %s is up for retry", ti)
                 ti_status.running.pop(key)
                 ti_status.to_run[key] = ti
+                self._ready_queue.check_again(ti.task_id)
             # special case: The state of the task can be set to NONE by the task itself
             # when it reaches concurrency limits. It could also happen when the state
             # is changed externally, e.g. by clearing tasks from the ui. We need to cover
@@ -167,6 +174,7 @@ class SingleDagRunJob(BaseJob, SingletonContext):
                 ti.set_state(State.SCHEDULED)
                 ti_status.running.pop(key)
                 ti_status.to_run[key] = ti
+                self._ready_queue.check_again(ti.task_id)
 
     def _manage_executor_state(self, running, waiting_for_executor_result):
         """
@@ -377,7 +385,9 @@ class SingleDagRunJob(BaseJob, SingletonContext):
 
         # values() returns a view so we copy to maintain a full list of the TIs to run
         all_ti = list(ti_status.to_run.values())
+        to_run_keys = {ti.task_id: key for key, ti in ti_status.to_run.items()}
         waiting_for_executor_result = {}
+        self._ready_queue = TaskInstancesReadyQueue.from_dag(self.dag)
 
         while (len(ti_status.to_run) > 0 or len(ti_status.running) > 0) and len(
             ti_status.deadlocked
@@ -386,175 +396,177 @@ class SingleDagRunJob(BaseJob, SingletonContext):
                 raise friendly_error.task_execution.databand_context_killed(
                     "SingleDagRunJob scheduling main loop"
                 )
-            self.log.debug("*** Clearing out not_ready list ***")
-            ti_status.not_ready.clear()
-
             self.ti_state_manager.refresh_task_instances_state(
                 all_ti, self.dag.dag_id, self.execution_date, session=session
             )
+            self._ready_queue.update_states(
+                self.ti_state_manager.pop_state_changes(
+                    self.dag.dag_id, self.execution_date
+                )
+            )
 
-            # we need to execute the tasks bottom to top
-            # or leaf to root, as otherwise tasks might be
-            # determined deadlocked while they are actually
-            # waiting for their upstream to finish
-            for task in self.dag.topological_sort():
-
-                # TODO: too complicated mechanism,
-                # it's not possible that we have multiple tasks with the same id in to run
-                for key, ti in list(ti_status.to_run.items()):
-                    if task.task_id != ti.task_id:
-                        continue
-
-                    if not self._optimize:
-                        ti.refresh_from_db()
-
-                    task = self.dag.get_task(ti.task_id)
-                    ti.task = task
-
-                    # TODO : do we need that?
-                    # ignore_depends_on_past = (
-                    #     self.ignore_first_depends_on_past and
-                    #     ti.execution_date == (start_date or ti.start_date))
-                    ignore_depends_on_past = False
-                    self.log.debug("Task instance to run %s state %s", ti, ti.state)
-
-                    # guard against externally modified tasks instances or
-                    # in case max concurrency has been reached at task runtime
-                    if ti.state == State.NONE:
-                        self.log.warning(
-                            "FIXME: task instance {} state was set to None "
-                            "externally. This should not happen"
-                        )
-                        ti.set_state(State.SCHEDULED, session=session)
-
-                    # The task was already marked successful or skipped by a
-                    # different Job. Don't rerun it.
-                    if ti.state == State.SUCCESS:
-                        ti_status.succeeded.add(key)
-                        self.log.debug("Task instance %s succeeded. Don't rerun.", ti)
-                        ti_status.to_run.pop(key)
-                        if key in ti_status.running:
-                            ti_status.running.pop(key)
-                        continue
-                    elif ti.state == State.SKIPPED:
-                        ti_status.skipped.add(key)
-                        self.log.debug("Task instance %s skipped. Don't rerun.", ti)
-                        ti_status.to_run.pop(key)
-                        if key in ti_status.running:
-                            ti_status.running.pop(key)
-                        continue
-                    elif ti.state == State.FAILED:
-                        self.log.error("Task instance %s failed", ti)
-                        ti_status.failed.add(key)
-                        ti_status.to_run.pop(key)
-                        if key in ti_status.running:
-                            ti_status.running.pop(key)
-                        continue
-                    elif ti.state == State.UPSTREAM_FAILED:
-                        self.log.error("Task instance %s upstream failed", ti)
-                        ti_status.failed.add(key)
-                        ti_status.to_run.pop(key)
-                        if key in ti_status.running:
-                            ti_status.running.pop(key)
-                        continue
-
-                    runtime_deps = []
-                    if self.airflow_config.disable_dag_concurrency_rules:
-                        # RUN Deps validate dag and task concurrency
-                        # It's less relevant when we run in stand along mode with SingleDagRunJob
-                        # from airflow.ti_deps.deps.runnable_exec_date_dep import RunnableExecDateDep
-                        from airflow.ti_deps.deps.valid_state_dep import ValidStateDep
-
-                        # from airflow.ti_deps.deps.dag_ti_slots_available_dep import DagTISlotsAvailableDep
-                        # from airflow.ti_deps.deps.task_concurrency_dep import TaskConcurrencyDep
-                        # from airflow.ti_deps.deps.pool_slots_available_dep import PoolSlotsAvailableDep
-                        runtime_deps = {
-                            # RunnableExecDateDep(),
-                            ValidStateDep(SCHEDULED_OR_RUNNABLE),
-                            # DagTISlotsAvailableDep(),
-                            # TaskConcurrencyDep(),
-                            # PoolSlotsAvailableDep(),
-                        }
-                    else:
-                        runtime_deps = RUNNING_DEPS
-
-                    dagrun_dep_context = DepContext(
-                        deps=runtime_deps,
-                        ignore_depends_on_past=ignore_depends_on_past,
-                        ignore_task_deps=self.ignore_task_deps,
-                        flag_upstream_failed=True,
+            # we check only tasks affected by the latest state changes,
+            # in topological order (see TaskInstancesReadyQueue)
+            for task_id in self._ready_queue.pop_tasks_to_check():
+                key = to_run_keys.get(task_id)
+                if key is None or key not in ti_status.to_run:
+                    continue
+                ti = ti_status.to_run[key]
+                # it's going to be added back if it's still not ready
+                ti_status.not_ready.discard(key)
+
+                if not self._optimize:
+                    ti.refresh_from_db()
+
+                task = self.dag.get_task(ti.task_id)
+                ti.task = task
+
+                # TODO : do we need that?
+                # ignore_depends_on_past = (
+                #     self.ignore_first_depends_on_past and
+                #     ti.execution_date == (start_date or ti.start_date))
+                ignore_depends_on_past = False
+                self.log.debug("Task instance to run %s state %s", ti, ti.state)
+
+                # guard against externally modified tasks instances or
+                # in case max concurrency has been reached at task runtime
+                if ti.state == State.NONE:
+                    self.log.warning(
+                        "FIXME: task instance {} state was set to None "
+                        "externally. This should not happen"
                     )
+                    ti.set_state(State.SCHEDULED, session=session)
+
+                # The task was already marked successful or skipped by a
+                # different Job. Don't rerun it.
+                if ti.state == State.SUCCESS:
+                    ti_status.succeeded.add(key)
+                    self.log.debug("Task instance %s succeeded. Don't rerun.", ti)
+                    ti_status.to_run.pop(key)
+                    if key in ti_status.running:
+                        ti_status.running.pop(key)
+                    continue
+                elif ti.state == State.SKIPPED:
+                    ti_status.skipped.add(key)
+                    self.log.debug("Task instance %s skipped. Don't rerun.", ti)
+                    ti_status.to_run.pop(key)
+                    if key in ti_status.running:
+                        ti_status.running.pop(key)
+                    continue
+                elif ti.state == State.FAILED:
+                    self.log.error("Task instance %s failed", ti)
+                    ti_status.failed.add(key)
+                    ti_status.to_run.pop(key)
+                    if key in ti_status.running:
+                        ti_status.running.pop(key)
+                    continue
+                elif ti.state == State.UPSTREAM_FAILED:
+                    self.log.error("Task instance %s upstream failed", ti)
+                    ti_status.failed.add(key)
+                    ti_status.to_run.pop(key)
+                    if key in ti_status.running:
+                        ti_status.running.pop(key)
+                    continue
+
+                runtime_deps = []
+                if self.airflow_config.disable_dag_concurrency_rules:
+                    # RUN Deps validate dag and task concurrency
+                    # It's less relevant when we run in stand along mode with SingleDagRunJob
+                    # from airflow.ti_deps.deps.runnable_exec_date_dep import RunnableExecDateDep
+                    from airflow.ti_deps.deps.valid_state_dep import ValidStateDep
+
+                    # from airflow.ti_deps.deps.dag_ti_slots_available_dep import DagTISlotsAvailableDep
+                    # from airflow.ti_deps.deps.task_concurrency_dep import TaskConcurrencyDep
+                    # from airflow.ti_deps.deps.pool_slots_available_dep import PoolSlotsAvailableDep
+                    runtime_deps = {
+                        # RunnableExecDateDep(),
+                        ValidStateDep(SCHEDULED_OR_RUNNABLE),
+                        # DagTISlotsAvailableDep(),
+                        # TaskConcurrencyDep(),
+                        # PoolSlotsAvailableDep(),
+                    }
+                else:
+                    runtime_deps = RUNNING_DEPS
 
-                    # Is the task runnable? -- then run it
-                    # the dependency checker can change states of tis
-                    if ti.are_dependencies_met(
-                        dep_context=dagrun_dep_context,
-                        session=session,
-                        verbose=self.verbose,
-                    ):
-                        ti.refresh_from_db(lock_for_update=True, session=session)
-                        if (
-                            ti.state == State.SCHEDULED
-                            or ti.state == State.UP_FOR_RETRY
-                        ):
-                            if executor.has_task(ti):
-                                self.log.debug(
-                                    "Task Instance %s already in executor "
-                                    "waiting for queue to clear",
-                                    ti,
-                                )
-                            else:
-                                self.log.debug("Sending %s to executor", ti)
-                                # if ti.state == State.UP_FOR_RETRY:
-                                #     ti._try_number += 1
-                                # Skip scheduled state, we are executing immediately
-                                ti.state = State.QUEUED
-                                session.merge(ti)
-
-                                cfg_path = None
-                                if executor.__class__ in (
-                                    executors.LocalExecutor,
-                                    executors.SequentialExecutor,
-                                ):
-                                    cfg_path = tmp_configuration_copy()
-
-                                executor.queue_task_instance(
-                                    ti,
-                                    mark_success=self.mark_success,
-                                    pickle_id=pickle_id,
-                                    ignore_task_deps=self.ignore_task_deps,
-                                    ignore_depends_on_past=ignore_depends_on_past,
-                                    pool=self.pool,
-                                    cfg_path=cfg_path,
-                                )
-
-                                ti_status.to_run.pop(key)
-                                ti_status.running[key] = ti
-                                waiting_for_executor_result[key] = ti
-                        session.commit()
-                        continue
-
-                    if ti.state == State.UPSTREAM_FAILED:
-                        self.log.error("Task instance %s upstream failed", ti)
-                        ti_status.failed.add(key)
-                        ti_status.to_run.pop(key)
-                        if key in ti_status.running:
-                            ti_status.running.pop(key)
-                        continue
-
-                    # special case
-                    if ti.state == State.UP_FOR_RETRY:
-                        self.log.debug(
-                            "Task instance %s retry period not " "expired yet", ti
-                        )
-                        if key in ti_status.running:
-                            ti_status.running.pop(key)
-                        ti_status.to_run[key] = ti
-                        continue
-
-                    # all remaining tasks
-                    self.log.debug("Adding %s to not_ready", ti)
-                    ti_status.not_ready.add(key)
+                dagrun_dep_context = DepContext(
+                    deps=runtime_deps,
+                    ignore_depends_on_past=ignore_depends_on_past,
+                    ignore_task_deps=self.ignore_task_deps,
+                    flag_upstream_failed=True,
+                )
+
+                # Is the task runnable? -- then run it
+                # the dependency checker can change states of tis
+                if ti.are_dependencies_met(
+                    dep_context=dagrun_dep_context,
+                    session=session,
+                    verbose=self.verbose,
+                ):
+                    ti.refresh_from_db(lock_for_update=True, session=session)
+                    if ti.state == State.SCHEDULED or ti.state == State.UP_FOR_RETRY:
+                        if executor.has_task(ti):
+                            self.log.debug(
+                                "Task Instance %s already in executor "
+                                "waiting for queue to clear",
+                                ti,
+                            )
+                        else:
+                            self.log.debug("Sending %s to executor", ti)
+                            # if ti.state == State.UP_FOR_RETRY:
+                            #     ti._try_number += 1
+                            # Skip scheduled state, we are executing immediately
+                            ti.state = State.QUEUED
+                            session.merge(ti)
+
+                            cfg_path = None
+                            if executor.__class__ in (
+                                executors.LocalExecutor,
+                                executors.SequentialExecutor,
+                            ):
+                                cfg_path = tmp_configuration_copy()
+
+                            executor.queue_task_instance(
+                                ti,
+                                mark_success=self.mark_success,
+                                pickle_id=pickle_id,
+                                ignore_task_deps=self.ignore_task_deps,
+                                ignore_depends_on_past=ignore_depends_on_past,
+                                pool=self.pool,
+                                cfg_path=cfg_path,
+                            )
+
+                            ti_status.to_run.pop(key)
+                            ti_status.running[key] = ti
+                            waiting_for_executor_result[key] = ti
+                    session.commit()
+                    if key in ti_status.to_run:
+                        # still waiting for the executor
+                        self._ready_queue.check_again(task_id)
+                    continue
+
+                if ti.state == State.UPSTREAM_FAILED:
+                    self.log.error("Task instance %s upstream failed", ti)
+                    ti_status.failed.add(key)
+                    ti_status.to_run.pop(key)
+                    if key in ti_status.running:
+                        ti_status.running.pop(key)
+                    continue
+
+                # special case
+                if ti.state == State.UP_FOR_RETRY:
+                    self.log.debug(
+                        "Task instance %s retry period not " "expired yet", ti
+                    )
+                    if key in ti_status.running:
+                        ti_status.running.pop(key)
+                    ti_status.to_run[key] = ti
+                    self._ready_queue.check_again(task_id)
+                    continue
+
+                # all remaining tasks
+                self.log.debug("Adding %s to not_ready", ti)
+                ti_status.not_ready.add(key)
+                self._ready_queue.set_not_ready(task_id)
 
             # sync the attempt with the retries
             self.sync_task_run_attempts_retries(ti_status)
@@ -0,0 +1,114 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+from airflow.utils.state import State
+
+
+# states that will not be changed by the scheduler anymore
+FINISHED_STATES = frozenset(
+    {State.SUCCESS, State.FAILED, State.SKIPPED, State.UPSTREAM_FAILED}
+)
+
+
+class TaskInstancesReadyQueue(object):
+    """
+    Selects the task instances the scheduler has to check at the current loop iteration.
+
+    Instead of checking every task instance on every iteration we keep the amount of
+    unfinished upstream tasks (indegree) for every task and check a task only when
+    its own state or the state of one of its upstream tasks has changed.
+    Tasks that can not run for any other reason (all upstream tasks are finished,
+    but the task is blocked by retry period, executor queue etc.) are checked again
+    on every iteration, as nothing else is going to wake them up.
+    """
+
+    def __init__(self, upstream_task_ids):
+        # type: (Dict[str, Iterable[str]]) -> None
+        self._downstream = {task_id: [] for task_id in upstream_task_ids}
+        self._unfinished_upstream = {}
+        for task_id, upstream in upstream_task_ids.items():
+            upstream = set(upstream)
+            self._unfinished_upstream[task_id] = len(upstream)
+            for upstream_task_id in upstream:
+                self._downstream[upstream_task_id].append(task_id)
+
+        self._order = self._topological_order(upstream_task_ids)
+        self._states = {}  # type: Dict[str, str]
+
+        # on the first iteration we need to check everything
+        self._to_check = set(upstream_task_ids)  # type: Set[str]
+        self._check_again = set()  # type: Set[str]
+
+    @classmethod
+    def from_dag(cls, dag):
+        return cls({task.task_id: task.upstream_task_ids for task in dag.tasks})
+
+    def _topological_order(self, upstream_task_ids):
+        indegree = dict(self._unfinished_upstream)
+        ready = deque(t for t, count in indegree.items() if count == 0)
+        order = {}
+        while ready:
+            task_id = ready.popleft()
+            order[task_id] = len(order)
+            for downstream_task_id in self._downstream[task_id]:
+                indegree[downstream_task_id] -= 1
+                if indegree[downstream_task_id] == 0:
+                    ready.append(downstream_task_id)
+
+        # airflow doesn't allow cycles, but let's not lose tasks if we have one
+        for task_id in upstream_task_ids:
+            order.setdefault(task_id, len(order))
+        return order
+
+    def update_states(self, states):
+        # type: (Dict[str, str]) -> None
+        """
+        Apply state changes of task instances,
+        the task and its downstream tasks are going to be checked at the next iteration
+        """
+        for task_id, state in states.items():
+            if task_id not in self._downstream:
+                continue
+
+            was_finished = self._states.get(task_id) in FINISHED_STATES
+            self._states[task_id] = state
+            self._to_check.add(task_id)
+            self._to_check.update(self._downstream[task_id])
+
+            is_finished = state in FINISHED_STATES
+            if was_finished != is_finished:
+                # task can be "unfinished" again if it's cleared or retried
+                delta = -1 if is_finished else 1
+                for downstream_task_id in self._downstream[task_id]:
+                    self._unfinished_upstream[downstream_task_id] += delta
+
+    def check_again(self, task_id):
+        """
+        Task is waiting for something that is not its upstream tasks state
+        """
+        self._check_again.add(task_id)
+
+    def set_not_ready(self, task_id):
+        """
+        Task dependencies are not met, if all upstream tasks are finished
+        the task is blocked by something else, so we need to check it again.
+        Otherwise, we'll get back to it when one of the upstream tasks changes its state
+        """
+        if self._unfinished_upstream[task_id] == 0:
+            self._check_again.add(task_id)
+
+    def unfinished_upstream_count(self, task_id):
+        return self._unfinished_upstream[task_id]
+
+    def pop_tasks_to_check(self):
+        # type: () -> List[str]
+        """
+        Returns task ids that should be checked at the current iteration,
+        upstream tasks are returned before downstream tasks,
+        otherwise tasks might be determined deadlocked while they are actually
+        waiting for their upstream to finish
+        """
+        to_check = self._to_check | self._check_again
+        self._to_check = set()
+        self._check_again = set()
+        return sorted(to_check, key=self._order.__getitem__)
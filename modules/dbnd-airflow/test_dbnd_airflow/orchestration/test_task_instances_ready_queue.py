@@ -0,0 +1,64 @@
+from airflow.utils.state import State
+
+from dbnd_airflow.scheduler.task_instances_ready_queue import TaskInstancesReadyQueue
+
+
+def _diamond_queue():
+    #   a -> b -> d
+    #   a -> c -> d
+    return TaskInstancesReadyQueue({"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]})
+
+
+class TestTaskInstancesReadyQueue(object):
+    def test_first_iteration_checks_all_in_topological_order(self):
+        queue = _diamond_queue()
+        to_check = queue.pop_tasks_to_check()
+
+        assert sorted(to_check) == ["a", "b", "c", "d"]
+        assert to_check[0] == "a"
+        assert to_check[-1] == "d"
+        # nothing changed since
+        assert queue.pop_tasks_to_check() == []
+
+    def test_state_change_wakes_up_downstream(self):
+        queue = _diamond_queue()
+        queue.pop_tasks_to_check()
+
+        queue.update_states({"a": State.SUCCESS})
+        assert queue.pop_tasks_to_check() == ["a", "b", "c"]
+        assert queue.unfinished_upstream_count("b") == 0
+        assert queue.unfinished_upstream_count("d") == 2
+
+        queue.update_states({"b": State.SUCCESS, "c": State.FAILED})
+        assert queue.pop_tasks_to_check()[-1] == "d"
+        assert queue.unfinished_upstream_count("d") == 0
+
+    def test_retried_task_is_unfinished_again(self):
+        queue = _diamond_queue()
+        queue.update_states({"a": State.FAILED})
+        assert queue.unfinished_upstream_count("b") == 0
+
+        queue.update_states({"a": State.UP_FOR_RETRY})
+        assert queue.unfinished_upstream_count("b") == 1
+
+    def test_not_ready_task(self):
+        queue = _diamond_queue()
+        queue.pop_tasks_to_check()
+
+        # waiting for upstream, no need to check it till upstream changes
+        queue.set_not_ready("b")
+        assert queue.pop_tasks_to_check() == []
+
+        # upstream is finished, the task is blocked by something else
+        queue.update_states({"a": State.SUCCESS})
+        queue.pop_tasks_to_check()
+        queue.set_not_ready("b")
+        assert queue.pop_tasks_to_check() == ["b"]
+
+    def test_check_again(self):
+        queue = _diamond_queue()
+        queue.pop_tasks_to_check()
+
+        queue.check_again("d")
+        assert queue.pop_tasks_to_check() == ["d"]
+        assert queue.pop_tasks_to_check() == []
@@ -0,0 +1,84 @@
+from __future__ import print_function
+
+import logging
+import random
+import time
+
+import pytest
+
+from airflow.utils.state import State
+
+from dbnd_airflow.scheduler.task_instances_ready_queue import TaskInstancesReadyQueue
+
+
+logger = logging.getLogger(__name__)
+
+
+def build_synthetic_dag(size, max_upstream=3, seed=42):
+    """
+    task_id -> upstream task ids, every task depends on few random previous tasks
+    """
+    rnd = random.Random(seed)
+    upstream = {}
+    for i in range(size):
+        candidates = range(max(0, i - 50), i)
+        count = min(len(candidates), rnd.randint(0, max_upstream))
+        upstream["task_%s" % i] = [
+            "task_%s" % u for u in rnd.sample(list(candidates), count)
+        ]
+    return upstream
+
+
+def full_rescan_tick(sorted_task_ids, to_run):
+    # previous SingleDagRunJob implementation: every task against every task instance,
+    # (it also used to call dag.topological_sort() on every tick, that is not measured here)
+    checked = 0
+    for task_id in sorted_task_ids:
+        for key in list(to_run):
+            if key != task_id:
+                continue
+            checked += 1
+    return checked
+
+
+def ready_queue_tick(queue, changes):
+    queue.update_states(changes)
+    return len(queue.pop_tasks_to_check())
+
+
+@pytest.mark.skip("performance tests")
+class TestSchedulerTickPerformance(object):
+    @pytest.mark.parametrize("size", [1000, 5000, 10000])
+    def test_tick_latency(self, size):
+        upstream = build_synthetic_dag(size)
+        queue = TaskInstancesReadyQueue(upstream)
+        # the first tick returns all tasks in topological order
+        sorted_task_ids = queue.pop_tasks_to_check()
+
+        to_run = set(upstream)
+        finished_per_tick = 10
+        ticks = 20
+
+        full_rescan_time = 0.0
+        ready_queue_time = 0.0
+        for tick in range(ticks):
+            finished = sorted_task_ids[
+                tick * finished_per_tick : (tick + 1) * finished_per_tick
+            ]
+            to_run.difference_update(finished)
+
+            start = time.time()
+            full_rescan_tick(sorted_task_ids, to_run)
+            full_rescan_time += time.time() - start
+
+            start = time.time()
+            ready_queue_tick(queue, {task_id: State.SUCCESS for task_id in finished})
+            ready_queue_time += time.time() - start
+
+        logger.info(
+            "%s tasks: full rescan %.2fms/tick, ready queue %.3fms/tick",
+            size,
+            full_rescan_time * 1000 / ticks,
+            ready_queue_time * 1000 / ticks,
+        )
+        assert ready_queue_time < full_rescan_time
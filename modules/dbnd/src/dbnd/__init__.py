@@ -1,91 +1,138 @@
 # -*- coding: utf-8 -*-
 
 
-from dbnd._core.access import (
-    get_remote_engine_name,
-    get_task_params_defs,
-    get_task_params_values,
-)
-from dbnd._core.cli.main import (
-    dbnd_cmd,
-    dbnd_run_cmd,
-    dbnd_run_cmd_main,
-    main as dbnd_main,
-)
-from dbnd._core.configuration.config_path import ConfigPath
-from dbnd._core.configuration.config_store import replace_section_with
-from dbnd._core.configuration.config_value import default, extend, override
-from dbnd._core.configuration.dbnd_config import config, config_deco
-from dbnd._core.context.bootstrap import dbnd_bootstrap
-from dbnd._core.context.databand_context import new_dbnd_context
-from dbnd._core.current import (
-    cancel_current_run,
-    current_task,
-    current_task_run,
-    dbnd_context,
-    get_databand_context,
-    get_databand_run,
-)
-from dbnd._core.failures import dbnd_handle_errors
-from dbnd._core.parameter.constants import ParameterScope
-from dbnd._core.parameter.parameter_builder import data, output, parameter
-from dbnd._core.parameter.parameter_definition import ParameterDefinition
-from dbnd._core.plugin.dbnd_plugins import hookimpl
-from dbnd._core.task.config import Config
-from dbnd._core.task.data_source_task import DataSourceTask
-from dbnd._core.task.pipeline_task import PipelineTask
-from dbnd._core.task.python_task import PythonTask
-from dbnd._core.task.task import Task
-from dbnd._core.task_build import task_namespace
-from dbnd._core.task_build.dbnd_decorator import (
-    band,
-    data_source_pipeline,
-    pipeline,
-    task,
-)
-from dbnd._core.task_build.task_context import current
-from dbnd._core.task_build.task_namespace import auto_namespace, namespace
-from dbnd._core.task_build.task_registry import register_config_cls, register_task
-from dbnd._core.task_ctrl.task_relations import as_task
-from dbnd._core.tracking.log_data_request import LogDataRequest
-from dbnd._core.tracking.metrics import (
-    dataset_op_logger,
-    log_artifact,
-    log_dataframe,
-    log_dataset_op,
-    log_duration,
-    log_metric,
-    log_metrics,
-)
-from dbnd._core.tracking.no_tracking import dont_track
-from dbnd._core.tracking.python_tracking import (
-    track_functions,
-    track_module_functions,
-    track_modules,
-)
-from dbnd._core.tracking.script_tracking_manager import (
-    dbnd_tracking,
-    dbnd_tracking_start,
-    dbnd_tracking_stop,
-)
-from dbnd._core.utils.project.project_fs import (
-    databand_lib_path,
-    databand_system_path,
-    project_path,
-    relative_path,
-)
-from dbnd.tasks import basics
-from targets import _set_patches
-
-
-from dbnd._core.configuration.environ_config import (  # isort:skip
-    get_dbnd_project_config,
-)
-
-get_dbnd_project_config().validate_init()  # isort:skip
-
-
-dbnd_config = config
+import sys
+
+from dbnd._core.configuration.environ_config import get_dbnd_project_config
+
+
+# The public API is loaded on first access (PEP 562):
+# tracking only processes (airflow tasks, spark executors) that use `@task` or
+# `log_metric` don't pay for the cli, the orchestration and all the task classes.
+# module -> [public name or (public name, attribute name, None for the module itself)]
+_LAZY_IMPORTS = {
+    "dbnd._core.access": [
+        "get_remote_engine_name",
+        "get_task_params_defs",
+        "get_task_params_values",
+    ],
+    "dbnd._core.cli.main": [
+        "dbnd_cmd",
+        "dbnd_run_cmd",
+        "dbnd_run_cmd_main",
+        ("dbnd_main", "main"),
+    ],
+    "dbnd._core.configuration.config_path": ["ConfigPath"],
+    "dbnd._core.configuration.config_store": ["replace_section_with"],
+    "dbnd._core.configuration.config_value": ["default", "extend", "override"],
+    "dbnd._core.configuration.dbnd_config": [
+        "config",
+        "config_deco",
+        ("dbnd_config", "config"),
+    ],
+    "dbnd._core.context.bootstrap": ["dbnd_bootstrap"],
+    "dbnd._core.context.databand_context": ["new_dbnd_context"],
+    "dbnd._core.current": [
+        "cancel_current_run",
+        "current_task",
+        "current_task_run",
+        "dbnd_context",
+        "get_databand_context",
+        "get_databand_run",
+    ],
+    "dbnd._core.failures": ["dbnd_handle_errors"],
+    "dbnd._core.parameter.constants": ["ParameterScope"],
+    "dbnd._core.parameter.parameter_builder": ["data", "output", "parameter"],
+    "dbnd._core.parameter.parameter_definition": ["ParameterDefinition"],
+    "dbnd._core.plugin.dbnd_plugins": ["hookimpl"],
+    "dbnd._core.task.config": ["Config"],
+    "dbnd._core.task.data_source_task": ["DataSourceTask"],
+    "dbnd._core.task.pipeline_task": ["PipelineTask"],
+    "dbnd._core.task.python_task": ["PythonTask"],
+    "dbnd._core.task.task": ["Task"],
+    "dbnd._core.task_build.dbnd_decorator": [
+        "band",
+        "data_source_pipeline",
+        "pipeline",
+        "task",
+    ],
+    "dbnd._core.task_build.task_context": ["current"],
+    "dbnd._core.task_build.task_namespace": [
+        "auto_namespace",
+        "namespace",
+        ("task_namespace", None),
+    ],
+    "dbnd._core.task_build.task_registry": ["register_config_cls", "register_task"],
+    "dbnd._core.task_ctrl.task_relations": ["as_task"],
+    "dbnd._core.tracking.log_data_request": ["LogDataRequest"],
+    "dbnd._core.tracking.metrics": [
+        "dataset_op_logger",
+        "log_artifact",
+        "log_dataframe",
+        "log_dataset_op",
+        "log_duration",
+        "log_metric",
+        "log_metrics",
+    ],
+    "dbnd._core.tracking.no_tracking": ["dont_track"],
+    "dbnd._core.tracking.python_tracking": [
+        "track_functions",
+        "track_module_functions",
+        "track_modules",
+    ],
+    "dbnd._core.tracking.script_tracking_manager": [
+        "dbnd_tracking",
+        "dbnd_tracking_start",
+        "dbnd_tracking_stop",
+    ],
+    "dbnd._core.utils.project.project_fs": [
+        "databand_lib_path",
+        "databand_system_path",
+        "project_path",
+        "relative_path",
+    ],
+    "dbnd.tasks": [("tasks", None)],
+    "dbnd.tasks.basics": [("basics", None)],
+    "targets._set_patches": [("_set_patches", None)],
+}
+
+# public name -> (module, attribute name)
+_LAZY_ATTRIBUTES = {}
+for _module_name, _names in _LAZY_IMPORTS.items():
+    for _name in _names:
+        if isinstance(_name, tuple):
+            _name, _attr = _name
+        else:
+            _attr = _name
+        _LAZY_ATTRIBUTES[_name] = (_module_name, _attr)
+del _module_name, _names, _name, _attr
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    # not importlib.import_module, so lazy imports show up in `-X importtime`
+    __import__(module_name)
+    module = sys.modules[module_name]
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):
+    # module __getattr__ is not supported
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
+
+get_dbnd_project_config().validate_init()
+
 __all__ = [
     "cancel_current_run",
     "hookimpl",
@@ -165,8 +212,6 @@ __all__ = [
 # imported_vars = set(k for k in locals().keys() if not k.startswith("__"))
 # print(list(imported_vars.difference(set(__all__))))
 
-# shortcuts for useful objects
-str(_set_patches)  # NOQA
 __version__ = "0.49.2"
 
 __title__ = "databand"
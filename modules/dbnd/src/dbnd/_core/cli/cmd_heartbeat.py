@@ -1,3 +1,5 @@
+import contextlib
+
 from dbnd._core.current import get_databand_context
 from dbnd._core.utils.basics import nested_context
 from dbnd._vendor import click
@@ -14,9 +16,38 @@ from dbnd._vendor.click import command
 def send_heartbeat(
     run_uid, databand_url, heartbeat_interval, driver_pid, tracker, tracker_api
 ):
-    from dbnd import config
     from dbnd._core.task_executor.heartbeat_sender import send_heartbeat_continuously
 
+    with _heartbeat_tracking_store(
+        tracker, tracker_api, databand_url
+    ) as tracking_store:
+        send_heartbeat_continuously(
+            run_uid, tracking_store, heartbeat_interval, driver_pid
+        )
+
+
+@command(name="heartbeat-daemon")
+@click.option("--address", required=True)
+@click.option("--databand-url", required=False)
+@click.option("--idle-timeout", required=True, type=int)
+@click.option("--tracker", required=True)
+@click.option("--tracker-api", required=True)
+def heartbeat_daemon(address, databand_url, idle_timeout, tracker, tracker_api):
+    """Send heartbeats of all the runs of this host that are registered at ADDRESS"""
+    from dbnd._core.task_executor.heartbeat_daemon import HeartbeatDaemon
+
+    with _heartbeat_tracking_store(
+        tracker, tracker_api, databand_url
+    ) as tracking_store:
+        HeartbeatDaemon(
+            address=address, tracking_store=tracking_store, idle_timeout_s=idle_timeout
+        ).serve()
+
+
+@contextlib.contextmanager
+def _heartbeat_tracking_store(tracker, tracker_api, databand_url):
+    from dbnd import config
+
     with config(
         {
             "core": {
@@ -33,8 +64,4 @@ def send_heartbeat(
             requred_context.append(new_dbnd_context(name="send_heartbeat"))
 
         with nested_context.nested(*requred_context):
-            tracking_store = get_databand_context().tracking_store
-
-            send_heartbeat_continuously(
-                run_uid, tracking_store, heartbeat_interval, driver_pid
-            )
+            yield get_databand_context().tracking_store
@@ -12,7 +12,7 @@ from functools import partial
 import six
 
 from dbnd._core.cli.cmd_execute import execute
-from dbnd._core.cli.cmd_heartbeat import send_heartbeat
+from dbnd._core.cli.cmd_heartbeat import heartbeat_daemon, send_heartbeat
 from dbnd._core.cli.cmd_project import project_init
 from dbnd._core.cli.cmd_run import cmd_run
 from dbnd._core.cli.cmd_show import show_configs, show_tasks
@@ -69,6 +69,7 @@ cli.add_command(tracker)
 
 # heartbeat sender
 cli.add_command(send_heartbeat)
+cli.add_command(heartbeat_daemon)
 
 # clients for the web-api
 cli.add_command(alerts)
@@ -31,6 +31,7 @@ class CloudType(object):
 
 class TaskExecutorType(object):
     local = "local"
+    local_parallel = "local_parallel"
 
 
 class OutputMode(object):
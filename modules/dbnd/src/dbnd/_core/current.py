@@ -131,6 +131,14 @@ def is_verbose():
     return get_dbnd_project_config().is_verbose()
 
 
+def get_partitions_load_workers():
+    # type: () -> int
+    context = try_get_databand_context()
+    if context and getattr(context, "settings", None):
+        return context.settings.output.partitions_load_workers or 1
+    return 1
+
+
 def get_target_logging_level():
     default_level = 10  # DEBUG
 
@@ -1,3 +1,4 @@
+import linecache
 import logging
 import os
 import re
@@ -122,6 +123,20 @@ def user_side_code(context=5):
         return "UNKNOWN"
 
 
+def _get_frame_line_info(frame):
+    """
+    inspect.getframeinfo(frame, context=1), read from linecache only
+    """
+    from inspect import Traceback
+
+    code = frame.f_code
+    lineno = frame.f_lineno
+    line = linecache.getline(code.co_filename, lineno, frame.f_globals)
+    if line:
+        return Traceback(code.co_filename, lineno, code.co_name, [line], 0)
+    return Traceback(code.co_filename, lineno, code.co_name, None, None)
+
+
 class UserCodeDetector(object):
     def __init__(self, code_dir=None, system_code_dirs=None):
         # The directory we're interested in.
@@ -170,7 +185,12 @@ class UserCodeDetector(object):
 
         frame = sys._getframe(depth)
         while frame:
-            frame_info = getframeinfo(frame, context)
+            if context == 1:
+                # called for every tracked function call, getframeinfo resolves
+                # (and stats) the source file of every frame we check
+                frame_info = _get_frame_line_info(frame)
+            else:
+                frame_info = getframeinfo(frame, context)
             if self._is_user_frame(frame_info, user_side_only):
                 return frame_info
 
@@ -145,6 +145,7 @@ class DatabandRun(SingletonContext):
         )
         self.run_root = self.env.dbnd_root.folder(self.run_folder_prefix)
         self.run_local_root = self.env.dbnd_local_root.folder(self.run_folder_prefix)
+        self.run_local_tasks_root = self.run_local_root.folder("tasks")
 
         self.local_engine = build_engine_config(self.env.local_engine).clone(
             require_submit=False
@@ -246,6 +247,10 @@ class DatabandRun(SingletonContext):
         self._run_state = state
         self.tracker.set_run_state(state)
 
+    def _on_exit(self):
+        # tracking stores can send data in background, we don't want to lose it
+        self.tracker.flush()
+
     @property
     def duration(self):
         if self.finished_time and self.start_time:
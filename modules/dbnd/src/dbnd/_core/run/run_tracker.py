@@ -3,7 +3,10 @@ import typing
 
 from typing import List
 
+from dbnd._core.constants import RunState
 from dbnd._core.run.run_ctrl import RunCtrl
+from dbnd._core.tracking.background_value_meta import BackgroundValueMetaCalculator
+from dbnd._core.tracking.value_meta_cache import ValueMetaCache
 
 
 if typing.TYPE_CHECKING:
@@ -28,6 +31,23 @@ class RunTracker(RunCtrl):
         else:
             self.run_url = None
 
+        tracking_conf = self.settings.tracking
+        if tracking_conf.value_meta_async:
+            self.value_meta_calculator = BackgroundValueMetaCalculator(
+                workers=tracking_conf.value_meta_async_workers,
+                max_pending=tracking_conf.value_meta_async_max_pending,
+                timeout=tracking_conf.value_meta_async_timeout,
+            )
+        else:
+            self.value_meta_calculator = None
+
+        if tracking_conf.value_meta_cache:
+            self.value_meta_cache = ValueMetaCache(
+                max_size=tracking_conf.value_meta_cache_max_size
+            )
+        else:
+            self.value_meta_cache = None
+
     # Following handlers only works for Databand RUN, not for the specific task!
     def init_run(self):
         """
@@ -44,6 +64,9 @@ class RunTracker(RunCtrl):
             return
         if self.run.existing_run and not self.run.is_orchestration:
             return
+        if state != RunState.RUNNING:
+            # run state should be reported after all the values of the run
+            self.wait_for_value_meta()
         self.tracking_store.set_run_state(run=self.run, state=state)
 
     def add_task_runs(self, task_runs):
@@ -56,3 +79,21 @@ class RunTracker(RunCtrl):
         if not self.run.is_tracked:
             return
         self.tracking_store.set_task_run_states(task_runs=task_runs)
+
+    def flush(self):
+        """
+        sends all tracking information that is still waiting in the tracking store
+        """
+        if not self.run.is_tracked:
+            return
+        self.wait_for_value_meta()
+        self.tracking_store.flush()
+        if self.value_meta_cache:
+            logger.debug("Value meta cache: %s", self.value_meta_cache.get_stats())
+
+    def wait_for_value_meta(self):
+        """
+        waits for the value meta of logged values that is calculated in background
+        """
+        if self.value_meta_calculator:
+            self.value_meta_calculator.wait()
@@ -68,6 +68,40 @@ class CoreConfig(Config):
 
     tracker_version = parameter[str]
 
+    tracker_async_queue_size = parameter(
+        default=10000,
+        description="Maximum amount of tracking calls waiting to be sent by 'async-web' tracker_api, "
+        "tracked code blocks when the queue is full",
+    )[int]
+    tracker_async_batch_size = parameter(
+        default=500,
+        description="Amount of queued metrics/targets/datasets/states calls that triggers sending them "
+        "as a bulk request by 'async-web' tracker_api",
+    )[int]
+    tracker_async_flush_interval = parameter(
+        default=1.0,
+        description="Maximum seconds a queued tracking call waits before it's sent by 'async-web' tracker_api",
+    )[float]
+    tracker_async_flush_timeout = parameter(
+        default=30.0,
+        description="Seconds to wait for queued tracking calls to be sent at the end of the run",
+    )[float]
+
+    tracker_file_metrics_flush_size = parameter(
+        default=1000,
+        description="Amount of buffered metric values that triggers writing them by 'file' tracker",
+    )[int]
+    tracker_file_metrics_flush_interval = parameter(
+        default=5.0,
+        description="Maximum seconds a metric value is buffered by 'file' tracker, "
+        "all metrics are written at the end of the task run",
+    )[float]
+    tracker_file_metrics_single_file = parameter(
+        default=False,
+        description="'file' tracker writes all the metrics of a task run into a single metrics.tsv file "
+        "instead of a file per metric",
+    )[bool]
+
     debug_webserver = parameter(
         description="Allow collecting the webservers logs for each api-call on the local machine. "
         "Requires that the web-server supports and allow this.",
@@ -91,15 +125,35 @@ class CoreConfig(Config):
     )[int]
 
     client_session_timeout = parameter(
-        description="Minutes to recreate the api client's session", default=5
+        description="Minutes to recreate the api client's session (username/password login only)",
+        default=5,
     )[int]
     client_max_retry = parameter(
         description="Maximum amount of retries on failed connection for the api client",
         default=2,
     )[int]
     client_retry_sleep = parameter(
-        description="Sleep between retries of the api client", default=0.1
+        description="Base sleep between retries of the api client, "
+        "doubled with a random jitter on every retry",
+        default=0.1,
     )[float]
+    client_retry_max_sleep = parameter(
+        description="Maximal sleep between retries of the api client", default=30
+    )[float]
+    client_pool_maxsize = parameter(
+        description="Maximal amount of keep-alive connections of the api client to the webserver",
+        default=10,
+    )[int]
+    client_compression_threshold = parameter(
+        default=None,
+        description="Gzip api client requests bodies of this size (bytes) or bigger, "
+        "requires webserver support of gzip encoded requests",
+    )[int]
+    client_binary_proto = parameter(
+        default=False,
+        description="Post protobuf tracking requests as raw bytes instead of base64 encoded json, "
+        "requires webserver support",
+    )[bool]
 
     # USER CODE TO RUN ON START
     user_configs = parameter(
@@ -213,4 +267,7 @@ class CoreConfig(Config):
             session_timeout=self.client_session_timeout,
             default_max_retry=self.client_max_retry,
             default_retry_sleep=self.client_retry_sleep,
+            default_retry_max_sleep=self.client_retry_max_sleep,
+            pool_maxsize=self.client_pool_maxsize,
+            compression_threshold=self.client_compression_threshold,
         )
@@ -24,6 +24,50 @@ class OutputConfig(Config):
         .value("fixed")
     )
 
+    partitions_load_workers = parameter(
+        default=1,
+        description="Amount of threads used to load partitions of a directory target, "
+        "1 to load partitions one by one",
+    )[int]
+
+    local_sync_workers = parameter(
+        default=8,
+        description="Amount of threads used to download inputs and upload outputs "
+        "of a task that require local access",
+    )[int]
+
+    local_sync_content_cache = parameter(
+        default=True,
+        description="Keep downloaded inputs in a local cache addressed by their remote "
+        "checksum (ETag/MD5/generation) when the file system provides it, "
+        "so identical files are downloaded once and shared by tasks and runs. "
+        "Files without checksum are refreshed by TTL",
+    )[bool]
+
+    remote_read_block_size = parameter(
+        default=4 * 1024 * 1024,
+        description="Size in bytes of a single range request of binary reads "
+        "from remote file systems (s3, gcs)",
+    )[int]
+
+    remote_read_ahead_blocks = parameter(
+        default=4,
+        description="Maximal amount of blocks fetched ahead on sequential binary reads "
+        "from remote file systems, 0 to disable read-ahead",
+    )[int]
+
+    remote_read_cached_blocks = parameter(
+        default=16,
+        description="Amount of recently read blocks kept in memory "
+        "for every file opened for binary read on remote file system",
+    )[int]
+
+    remote_read_max_gap_blocks = parameter(
+        default=1,
+        description="Missing blocks of a single read are fetched in one request "
+        "if there are at most this amount of cached blocks between them",
+    )[int]
+
     deploy_id = parameter(
         default=VersionAlias.context_uid,
         description="deploy prefix to use for remote deployments",
@@ -28,9 +28,14 @@ class RunConfig(config.Config):
     task_executor_type = parameter(
         default=None,
         description="Alternate executor type: "
-        " local/airflow_inprocess/airflow_multiprocess_local/airflow_kubernetes,"
+        " local/local_parallel/airflow_inprocess/airflow_multiprocess_local/airflow_kubernetes,"
         "  see docs for more options",
     )[str]
+    local_parallelism = parameter(
+        default=None,
+        description="Maximum amount of task runs executed concurrently by 'local_parallel' executor, "
+        "number of CPUs is used by default",
+    )[int]
 
     enable_airflow_kubernetes = parameter(
         default=True,
@@ -175,6 +180,20 @@ class RunConfig(config.Config):
     hearbeat_disable_plugins = parameter(
         default=False, description="disable dbnd plugins at heartbeat sub-process"
     )[bool]
+    heartbeat_sender_mode = (
+        parameter.choices(["process", "thread", "daemon"])
+        .help(
+            "How heartbeats are sent: "
+            "process - a dedicated heartbeat sender process for every run, "
+            "thread - a thread of the run process, "
+            "daemon - a shared per host heartbeat daemon that sends heartbeats of all its registered runs"
+        )
+        .value("process")
+    )
+    heartbeat_daemon_idle_timeout_s = parameter(
+        default=60,
+        description="The heartbeat daemon exits after this many seconds without registered runs",
+    )[int]
     ######
     # Task/Pipeline in task Execution
     task_run_at_execution_time_enabled = parameter(
@@ -1,5 +1,6 @@
 import enum
 import logging
+import typing
 
 from typing import Any, Dict, List, Optional
 
@@ -17,6 +18,10 @@ from targets.values import (
 )
 
 
+if typing.TYPE_CHECKING:
+    from dbnd._core.tracking.value_meta_cache import ValueMetaCache
+
+
 logger = logging.getLogger()
 
 
@@ -30,6 +35,16 @@ class ValueTrackingLevel(enum.Enum):
     ALL = 3
 
 
+class ValueMetaMutationPolicy(enum.Enum):
+    """
+    What value meta is calculated in background from,
+    in case the value is changed by the user code after it was logged
+    """
+
+    REFERENCE = 1
+    SNAPSHOT = 2
+
+
 class TrackingConfig(Config):
     _conf__task_family = "tracking"
 
@@ -76,6 +91,12 @@ class TrackingConfig(Config):
         description="Enable calculation and tracking of histograms. Can be expensive",
     )[bool]
 
+    log_value_stats_sample_size = parameter(
+        default=None,
+        description="Calculate stats and histograms of large values from a random sample of this size. "
+        "Quantiles and distinct count become estimations",
+    )[int]
+
     value_reporting_strategy = parameter(
         default=ValueTrackingLevel.SMART,
         description="Multiple strategies with different limitations on potentially expensive calculation for value_meta."
@@ -84,6 +105,52 @@ class TrackingConfig(Config):
         "NONE (default) => limit everything.",
     ).enum(ValueTrackingLevel)
 
+    value_meta_async = parameter(
+        default=False,
+        description="Calculate value meta (preview, schema, hash, stats and histograms) "
+        "of logged values in background workers, tracked code doesn't wait for it",
+    )[bool]
+
+    value_meta_async_workers = parameter(
+        default=2, description="Amount of background value meta workers"
+    )[int]
+
+    value_meta_async_max_pending = parameter(
+        default=100,
+        description="Max amount of values waiting for background value meta calculation, "
+        "tracked code is blocked when there are more",
+    )[int]
+
+    value_meta_async_timeout = parameter(
+        default=60.0,
+        description="Max time (in seconds) to wait for background value meta calculation "
+        "on task run/run end, values that are not calculated by then are not reported",
+    )[float]
+
+    value_meta_mutation_policy = parameter(
+        default=ValueMetaMutationPolicy.REFERENCE,
+        description="What background value meta is calculated from."
+        "REFERENCE (default) => the logged object itself, changes done to it after logging can affect the result."
+        "SNAPSHOT => a copy taken at logging time (copies the data of DataFrames/arrays).",
+    ).enum(ValueMetaMutationPolicy)
+
+    value_meta_cache = parameter(
+        default=False,
+        description="Reuse value meta calculated in the current run when the same unchanged "
+        "object is logged again (in place changes of single DataFrame/array elements are not detected)",
+    )[bool]
+
+    value_meta_cache_max_size = parameter(
+        default=64 * 1024 * 1024,
+        description="Max estimated size (in bytes) of the value meta kept by value_meta_cache",
+    )[int]
+
+    dynamic_task_runs_delta = parameter(
+        default=True,
+        description="Submit only the new parts (task runs, relations, task definitions "
+        "and targets) of dynamically added task runs, instead of the whole run info",
+    )[bool]
+
     track_source_code = parameter(
         default=True,
         description="Enable tracking of function, module and file source code",
@@ -134,6 +201,7 @@ class TrackingConfig(Config):
             log_preview=self.log_value_preview,
             log_stats=self.log_value_stats,
             log_histograms=self.log_histograms,
+            log_stats_sample_size=self.log_value_stats_sample_size,
         )
 
 
@@ -141,8 +209,15 @@ def _is_default_value_type(value_type):
     return value_type is None or isinstance(value_type, ObjectValueType)
 
 
-def get_value_meta(value, meta_conf, tracking_config, value_type=None, target=None):
-    # type: ( Any, ValueMetaConf, TrackingConfig, Optional[ValueType], Optional[Target]) -> Optional[ValueMeta]
+def get_value_meta(
+    value,
+    meta_conf,
+    tracking_config,
+    value_type=None,
+    target=None,
+    value_meta_cache=None,
+):
+    # type: ( Any, ValueMetaConf, TrackingConfig, Optional[ValueType], Optional[Target], Optional[ValueMetaCache]) -> Optional[ValueMeta]
     """
     Build the value meta for tracking logging.
     Using the given meta config, the value, and tracking_config to calculate the required value meta.
@@ -152,6 +227,7 @@ def get_value_meta(value, meta_conf, tracking_config, value_type=None, target=No
     @param tracking_config: TrackingConfig to calc the wanted meta conf
     @param value_type: optional value_type, if its known.
     @param target: knowledge about the target which contains the value - this can effect the cost of the calculation
+    @param value_meta_cache: optional cache of value meta calculated for the same objects
     @return: Calculated value meta
     """
 
@@ -166,6 +242,8 @@ def get_value_meta(value, meta_conf, tracking_config, value_type=None, target=No
         value_type = get_value_type_of_obj(value, default_value_type=ObjectValueType())
 
     meta_conf = tracking_config.get_value_meta_conf(meta_conf, value_type, target)
+    if value_meta_cache is not None:
+        return value_meta_cache.get_value_meta(value, value_type, meta_conf)
     return value_type.get_value_meta(value, meta_conf=meta_conf)
 
 
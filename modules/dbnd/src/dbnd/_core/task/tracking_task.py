@@ -41,6 +41,8 @@ from targets import InMemoryTarget, target
 from targets.base_target import TargetSource
 from targets.target_config import folder
 from targets.utils.path import no_trailing_slash
+from targets.values import get_value_type_of_obj
+from targets.values.builtins_values import DefaultObjectValueType
 
 
 if typing.TYPE_CHECKING:
@@ -82,18 +84,7 @@ class TrackingTask(_BaseTask, _TaskCtrlMixin, _TaskParamContainer):
             task_definition, task_args, task_kwargs
         )
         # we need to add RESULT param
-        if RESULT_PARAM in task_definition.task_param_defs:
-            param = task_definition.task_param_defs[RESULT_PARAM]
-            if isinstance(param, FuncResultParameter):
-                for param_name in param.names:
-                    # we want to get the parameter evolved with the task_definition as owner
-                    inner_param = task_definition.task_param_defs[param_name]
-                    result_param_value = build_result_param(
-                        task_definition.task_passport, param_def=inner_param,
-                    )
-
-                    param_values.append(result_param_value)
-
+        for param in get_func_result_param_defs(task_definition):
             result_param_value = build_result_param(
                 task_definition.task_passport, param_def=param
             )
@@ -303,6 +294,60 @@ def build_result_param(task_passport, param_def=None, name=RESULT_PARAM):
     )
 
 
+def get_func_result_param_defs(task_definition):
+    # type: (TaskDefinition) -> List[ParameterDefinition]
+    """
+    Definitions of the result params of the function, calculated once per definition
+    """
+    result_param_defs = task_definition.tracking_result_param_defs
+    if result_param_defs is not None:
+        return result_param_defs
+
+    result_param_defs = []
+    if RESULT_PARAM in task_definition.task_param_defs:
+        param = task_definition.task_param_defs[RESULT_PARAM]
+        if isinstance(param, FuncResultParameter):
+            for param_name in param.names:
+                # we want to get the parameter evolved with the task_definition as owner
+                result_param_defs.append(task_definition.task_param_defs[param_name])
+        result_param_defs.append(param)
+
+    task_definition.tracking_result_param_defs = result_param_defs
+    return result_param_defs
+
+
+def build_func_parameter_value(task_definition, name, value):
+    # type: (TaskDefinition, str, Any) -> ParameterValue
+    """
+    The same as build_user_parameter_value, but the definition depends only on the name
+    and the type of the value, so we build it once per function
+    """
+    source = task_definition.full_task_family_short
+    if value is NOTHING:
+        return build_user_parameter_value(name, value, source=source)
+
+    value_type = get_value_type_of_obj(value, default_value_type=DefaultObjectValueType)
+    key = (name, value_type)
+    cached_param = task_definition.tracking_param_defs.get(key)
+    if cached_param is None:
+        param_value = build_user_parameter_value(name, value, source=source)
+        task_definition.tracking_param_defs[key] = (
+            param_value.parameter,
+            param_value.warnings,
+        )
+        return param_value
+
+    parameter, warnings = cached_param
+    return ParameterValue(
+        parameter=parameter,
+        source=source,
+        source_value=value,
+        value=value,
+        parsed=False,
+        warnings=list(warnings),
+    )
+
+
 def build_func_parameter_values(task_definition, task_args, task_kwargs):
     # type: (TaskDefinition, List[Any], Dict[str, Any]) -> List[ParameterValue]
     """
@@ -320,10 +365,8 @@ def build_func_parameter_values(task_definition, task_args, task_kwargs):
     # the parameter of the * argument
     if callable_spec.varargs:
         # build the parameter value for the varargs
-        vargs_param = build_user_parameter_value(
-            callable_spec.varargs,
-            tuple(args),
-            source=task_definition.full_task_family_short,
+        vargs_param = build_func_parameter_value(
+            task_definition, callable_spec.varargs, tuple(args)
         )
         values.append(vargs_param)
 
@@ -335,18 +378,14 @@ def build_func_parameter_values(task_definition, task_args, task_kwargs):
     # the parameter of the ** argument
     if callable_spec.varkw:
         # build the parameter value for the varkw
-        varkw_param = build_user_parameter_value(
-            callable_spec.varkw,
-            dict(unknown_kwargs),
-            source=task_definition.full_task_family_short,
+        varkw_param = build_func_parameter_value(
+            task_definition, callable_spec.varkw, dict(unknown_kwargs)
         )
         values.append(varkw_param)
 
     for name, value in known_kwargs:
         # build the parameters for the expected parameters
-        param_value = build_user_parameter_value(
-            name, value, source=task_definition.full_task_family_short
-        )
+        param_value = build_func_parameter_value(task_definition, name, value)
         values.append(param_value)
 
     return values
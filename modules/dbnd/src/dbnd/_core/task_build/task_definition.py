@@ -150,6 +150,11 @@ class TaskDefinition(object):
         else:
             self.task_definition_uid = get_uuid()
 
+        # tracking builds parameters of every call from the runtime values,
+        # definitions by (name, value type) and the results are built once
+        self.tracking_param_defs = {}
+        self.tracking_result_param_defs = None
+
     def _calculate_task_class_values(self, classdict, external_parameters):
         # type: (Optional[Dict],  Optional[Parameters]) -> Dict[str, ParameterDefinition]
         # reflect inherited attributes
@@ -2,6 +2,8 @@ import logging
 import re
 import typing
 
+from collections import deque
+
 from dbnd._core.errors import DatabandError, friendly_error
 from dbnd._core.task.task import Task
 from dbnd._core.task.task_mixin import _TaskCtrlMixin
@@ -11,7 +13,7 @@ from dbnd._core.utils.traversing import flatten
 
 
 if typing.TYPE_CHECKING:
-    from typing import Collection, Set
+    from typing import Collection, FrozenSet, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +48,18 @@ class _TaskDagNode(TaskSubCtrl):
 
         self._upstream_tasks = set()
         self._downstream_tasks = set()
+        # tasks of the subdag and its index, dropped when an upstream edge is added
+        # to this node or to any of its upstream nodes
+        self._subdag_cache = None  # type: Optional[FrozenSet[Task]]
+        self._subdag_index_cache = None  # type: Optional[TaskDagIndex]
+
+    def __getstate__(self):
+        # caches are rebuilt on demand, sets of tasks can't be unpickled
+        # before the state of the tasks is restored
+        state = self.__dict__.copy()
+        state["_subdag_cache"] = None
+        state["_subdag_index_cache"] = None
+        return state
 
     def initialize_dag_node(self):
         # connect to all required tasks
@@ -126,23 +140,53 @@ class _TaskDagNode(TaskSubCtrl):
         return self._upstream_tasks if upstream else self._downstream_tasks
 
     def subdag_tasks(self, should_run_only=False):
-        return self._get_all_tasks(upstream=True, should_run_only=should_run_only)
+        if should_run_only:
+            return self._get_all_tasks(upstream=True, should_run_only=True)
+
+        # the subdag depends on edges only, we can reuse it till the graph is changed
+        if self._subdag_cache is None:
+            self._subdag_cache = frozenset(self._get_all_tasks(upstream=True))
+        return set(self._subdag_cache)
+
+    def _subdag_index(self):  # type: ()->TaskDagIndex
+        if self._subdag_index_cache is None:
+            self._subdag_index_cache = TaskDagIndex(self.subdag_tasks())
+        return self._subdag_index_cache
+
+    def _invalidate_subdag(self):
+        """
+        drops cached subdags of this node and of all the nodes downstream of it,
+        they are the only subdags that can be affected by a new upstream edge
+        """
+        to_process = deque([self])
+        seen = {self.task.task_id}
+        while to_process:
+            t_dag = to_process.popleft()
+            t_dag._subdag_cache = None
+            t_dag._subdag_index_cache = None
+            for t_connected_task_id in t_dag._downstream_tasks:
+                if t_connected_task_id in seen:
+                    continue
+                seen.add(t_connected_task_id)
+                connected_task = self.get_task_by_task_id(t_connected_task_id)
+                if connected_task:
+                    to_process.append(connected_task.ctrl.task_dag)
 
     def _get_all_tasks(self, upstream=False, should_run_only=False):
-        seen = set()
-        result = []
-        to_process = [self.task]
+        seen = {self.task.task_id}
+        result = set()
+        to_process = deque([self.task])
         # should be iterative, we don't like recursive as we can have huge nesting
         while to_process:
-            current = to_process.pop(0)
-            seen.add(current.task_id)
+            current = to_process.popleft()
             if should_run_only and not current.ctrl.should_run():
                 continue
             t_dag = current.ctrl.task_dag
-            result.append(current)
+            result.add(current)
             for t_connected_task_id in t_dag._direction(upstream):
                 if t_connected_task_id in seen:
                     continue
+                seen.add(t_connected_task_id)
                 connected_task = self.get_task_by_task_id(t_connected_task_id)
                 if not connected_task:
                     raise DatabandError(
@@ -150,7 +194,7 @@ class _TaskDagNode(TaskSubCtrl):
                     )
                 to_process.append(connected_task)
 
-        return set(result)
+        return result
 
     def set_relatives(self, task_or_task_list, upstream=False):
         task_list = _task_list(task_or_task_list)
@@ -169,8 +213,14 @@ class _TaskDagNode(TaskSubCtrl):
                 )
             else:
                 logger.debug("Re adding new implementation %s to %s", task, self.task)
+                if upstream:
+                    self._invalidate_subdag()
         else:
             connected.add(task.task_id)
+            # a new upstream edge changes the subdag of this task and of its downstream,
+            # the other side of the edge gets a downstream edge only
+            if upstream:
+                self._invalidate_subdag()
 
     def topological_sort(self):
         """
@@ -183,8 +233,8 @@ class _TaskDagNode(TaskSubCtrl):
         :return: list of tasks in topological order
         """
 
-        tasks = self.subdag_tasks()
-        return topological_sort(tasks)
+        # the index is reused till the graph is changed
+        return _sorted_tasks(self._subdag_index())
 
     def select_by_task_names(self, tasks_regexes, tasks=None):
         tasks = tasks or self.subdag_tasks()
@@ -200,49 +250,77 @@ class _TaskDagNode(TaskSubCtrl):
         return selected
 
 
+class TaskDagIndex(object):
+    """
+    Compact index of the graph of the given tasks:
+    every task gets an integer node id, edges are kept as adjacency lists of node ids.
+    Edges to tasks outside of the given tasks are ignored.
+    """
+
+    def __init__(self, tasks):
+        self.tasks = []  # type: List[Task]
+        self.node_ids = {}
+        for task in tasks:
+            if task.task_id not in self.node_ids:
+                self.node_ids[task.task_id] = len(self.tasks)
+                self.tasks.append(task)
+
+        node_ids = self.node_ids
+        self.upstream = [
+            [
+                node_ids[task_id]
+                for task_id in task.ctrl.task_dag.upstream_task_ids
+                if task_id in node_ids
+            ]
+            for task in self.tasks
+        ]  # type: List[List[int]]
+        self.downstream = [[] for _ in self.tasks]  # type: List[List[int]]
+        for node, upstream in enumerate(self.upstream):
+            for upstream_node in upstream:
+                self.downstream[upstream_node].append(node)
+
+    def topological_order(self):
+        # type: () -> Tuple[List[int], List[int]]
+        """
+        Kahn's algorithm, returns the sorted node ids and the node ids
+        that can't be sorted as they are part of a cycle (or downstream of one)
+        """
+        indegree = [len(upstream) for upstream in self.upstream]
+        ready = deque(node for node, count in enumerate(indegree) if count == 0)
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for downstream_node in self.downstream[node]:
+                indegree[downstream_node] -= 1
+                if indegree[downstream_node] == 0:
+                    ready.append(downstream_node)
+
+        unsorted = [node for node, count in enumerate(indegree) if count > 0]
+        return order, unsorted
+
+
 def topological_sort(tasks, root_task=None):
     # special case
     if len(tasks) == 0:
         return tuple()
 
-    graph_unsorted = set(tasks)
-
-    graph_sorted = []
-
-    # Run until the unsorted graph is empty.
-    while graph_unsorted:
-        # Go through each of the node/edges pairs in the unsorted
-        # graph. If a set of edges doesn't contain any nodes that
-        # haven't been resolved, that is, that are still in the
-        # unsorted graph, remove the pair from the unsorted graph,
-        # and append it to the sorted graph. Note here that by using
-        # using the items() method for iterating, a copy of the
-        # unsorted graph is used, allowing us to modify the unsorted
-        # graph as we move through it. We also keep a flag for
-        # checking that that graph is acyclic, which is true if any
-        # nodes are resolved during each pass through the graph. If
-        # not, we need to bail out as the graph therefore can't be
-        # sorted.
-        acyclic = False
-        for node in list(graph_unsorted):
-            for edge in node.ctrl.task_dag.upstream:
-                if edge in graph_unsorted:
-                    break
-            # no edges in upstream tasks
-            else:
-                # we found at least one node in graph
-                acyclic = True
-                graph_unsorted.remove(node)
-                graph_sorted.append(node)
+    return _sorted_tasks(TaskDagIndex(tasks), root_task=root_task)
+
 
-        if not acyclic:
-            raise friendly_error.graph.cyclic_graph_detected(root_task, graph_unsorted)
+def _sorted_tasks(index, root_task=None):
+    # type: (TaskDagIndex, Task) -> Tuple[Task, ...]
+    order, unsorted = index.topological_order()
+    if unsorted:
+        raise friendly_error.graph.cyclic_graph_detected(
+            root_task, {index.tasks[node] for node in unsorted}
+        )
 
-    return tuple(graph_sorted)
+    return tuple(index.tasks[node] for node in order)
 
 
 def all_subdags(tasks):
     result = set()
     for sub_root in tasks:
-        result = result.union(set(sub_root.task_dag.subdag_tasks()))
+        result.update(sub_root.task_dag.subdag_tasks())
     return result
@@ -0,0 +1,364 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import typing
+
+from time import sleep, time
+
+import six
+
+from dbnd._core.configuration.environ_config import ENV_DBND__NO_PLUGINS
+from dbnd._core.utils.basics.format_exception import format_exception_as_str
+from dbnd._vendor.psutil.vendorized_psutil import pid_exists
+
+
+try:
+    import fcntl
+except ImportError:
+    # windows
+    fcntl = None
+
+if typing.TYPE_CHECKING:
+    from typing import Dict, List, Optional
+    from dbnd._core.settings import DatabandSettings
+    from dbnd._core.tracking.backends import TrackingStore
+
+logger = logging.getLogger(__name__)
+
+# how long we wait for the daemon to start/reply
+DAEMON_CONNECT_TIMEOUT = 10
+DAEMON_REPLY_TIMEOUT = 5
+
+
+def is_heartbeat_daemon_supported():
+    return hasattr(socket, "AF_UNIX") and fcntl is not None
+
+
+def get_heartbeat_daemon_address(tracker, tracker_api, databand_url):
+    # type: (List[str], str, Optional[str]) -> str
+    """
+    Every user has its own daemon per tracking configuration,
+    so all the runs registered at the daemon report to the same place
+    """
+    tracking_key = "|".join([",".join(tracker), tracker_api, databand_url or ""])
+    tracking_hash = hashlib.md5(tracking_key.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(
+        tempfile.gettempdir(),
+        "dbnd-heartbeat-%s-%s.sock" % (os.getuid(), tracking_hash),
+    )
+
+
+def _connect(address):
+    from multiprocessing.connection import Client
+
+    return Client(address, family="AF_UNIX")
+
+
+def _send_message(conn, message):
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def _recv_message(conn):
+    return json.loads(conn.recv_bytes().decode("utf-8"))
+
+
+class HeartbeatDaemonClient(object):
+    """
+    Registers/unregisters runs at the heartbeat daemon of this host,
+    starts the daemon if it's not running yet.
+    """
+
+    def __init__(
+        self,
+        address,
+        tracker,
+        tracker_api,
+        databand_url=None,
+        idle_timeout_s=60,
+        disable_plugins=False,
+    ):
+        self.address = address
+        self.tracker = tracker
+        self.tracker_api = tracker_api
+        self.databand_url = databand_url
+        self.idle_timeout_s = idle_timeout_s
+        self.disable_plugins = disable_plugins
+
+    @classmethod
+    def from_settings(cls, settings):
+        # type: (DatabandSettings) -> HeartbeatDaemonClient
+        core = settings.core
+        return cls(
+            address=get_heartbeat_daemon_address(
+                core.tracker, core.tracker_api, core.databand_url
+            ),
+            tracker=core.tracker,
+            tracker_api=core.tracker_api,
+            databand_url=core.databand_url,
+            idle_timeout_s=settings.run.heartbeat_daemon_idle_timeout_s,
+            disable_plugins=settings.run.hearbeat_disable_plugins,
+        )
+
+    def register_run(self, run_uid, driver_pid, heartbeat_interval_s):
+        message = {
+            "action": "register",
+            "run_uid": run_uid,
+            "driver_pid": driver_pid,
+            "heartbeat_interval_s": heartbeat_interval_s,
+        }
+        deadline = time() + DAEMON_CONNECT_TIMEOUT
+        daemon_process = None
+        while True:
+            try:
+                if self._request(message).get("ok"):
+                    return
+                # the daemon is shutting down, the next one will take its place
+            except (IOError, OSError, EOFError):
+                # a new daemon exits right away if the previous one still holds the lock
+                if daemon_process is None or daemon_process.poll() is not None:
+                    daemon_process = self.start_daemon()
+
+            if time() > deadline:
+                raise Exception(
+                    "heartbeat daemon at %s is not available" % self.address
+                )
+            sleep(0.1)
+
+    def unregister_run(self, run_uid):
+        self._request({"action": "unregister", "run_uid": run_uid})
+
+    def _request(self, message):
+        conn = _connect(self.address)
+        try:
+            _send_message(conn, message)
+            if not conn.poll(DAEMON_REPLY_TIMEOUT):
+                raise IOError("heartbeat daemon hasn't replied")
+            return _recv_message(conn)
+        finally:
+            conn.close()
+
+    def start_daemon(self):
+        cmd = [
+            sys.executable,
+            "-m",
+            "dbnd",
+            "heartbeat-daemon",
+            "--address",
+            self.address,
+            "--idle-timeout",
+            str(self.idle_timeout_s),
+            "--tracker",
+            ",".join(self.tracker),
+            "--tracker-api",
+            self.tracker_api,
+        ]
+        if self.databand_url:
+            cmd += ["--databand-url", self.databand_url]
+
+        env = os.environ.copy()
+        if self.disable_plugins:
+            env[ENV_DBND__NO_PLUGINS] = "True"
+
+        log_file = self.address + ".log"
+        logger.info(
+            "Starting heartbeat daemon with log at %s using cmd: %s",
+            log_file,
+            subprocess.list2cmdline(cmd),
+        )
+        with open(log_file, "a") as log_fp:
+            # the daemon outlives the run that has started it
+            kwargs = (
+                {"preexec_fn": os.setsid} if six.PY2 else {"start_new_session": True}
+            )
+            return subprocess.Popen(
+                cmd,
+                stdout=log_fp,
+                stderr=subprocess.STDOUT,
+                env=env,
+                close_fds=True,
+                **kwargs
+            )
+
+
+class _RegisteredRun(object):
+    def __init__(self, run_uid, driver_pid, heartbeat_interval_s):
+        self.run_uid = run_uid
+        self.driver_pid = driver_pid
+        self.heartbeat_interval_s = heartbeat_interval_s
+        self.next_heartbeat = time()
+
+
+class HeartbeatDaemon(object):
+    """
+    Sends heartbeats of all the runs that are registered at it over a local socket,
+    using a single process and a single tracking store (http session) for all of them.
+    A run is dropped when it unregisters or its driver process doesn't exist anymore.
+    The daemon exits after `idle_timeout_s` seconds without registered runs.
+    """
+
+    def __init__(self, address, tracking_store, idle_timeout_s=60):
+        # type: (str, TrackingStore, int) -> None
+        self.address = address
+        self.tracking_store = tracking_store
+        self.idle_timeout_s = idle_timeout_s
+
+        self._runs = {}  # type: Dict[str, _RegisteredRun]
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closing = False
+        self._idle_since = time()
+
+    def serve(self):
+        from multiprocessing.connection import Listener
+
+        # only one daemon can serve the address, we keep the lock while we are alive
+        lock_fp = open(self.address + ".lock", "w")
+        try:
+            fcntl.flock(lock_fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError):
+            logger.info(
+                "[heartbeat daemon] another daemon is serving %s, exiting", self.address
+            )
+            lock_fp.close()
+            return
+
+        listener = None
+        try:
+            if os.path.exists(self.address):
+                # left by a daemon that was killed
+                os.unlink(self.address)
+            listener = Listener(self.address, family="AF_UNIX")
+            os.chmod(self.address, 0o600)
+
+            accept_thread = threading.Thread(
+                target=self._accept_loop,
+                args=(listener,),
+                name="dbnd-heartbeat-daemon-accept",
+            )
+            accept_thread.daemon = True
+            accept_thread.start()
+            logger.info(
+                "[heartbeat daemon] serving %s (pid %s)", self.address, os.getpid()
+            )
+
+            self._heartbeat_loop()
+        finally:
+            if listener:
+                # removes the socket file
+                listener.close()
+            lock_fp.close()
+            logger.info("[heartbeat daemon] stopped")
+
+    def _accept_loop(self, listener):
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception:
+                if self._closing:
+                    return
+                logger.warning(
+                    "[heartbeat daemon] failed to accept connection: %s",
+                    format_exception_as_str(),
+                )
+                continue
+
+            try:
+                if conn.poll(DAEMON_REPLY_TIMEOUT):
+                    _send_message(conn, self.handle_message(_recv_message(conn)))
+            except Exception:
+                logger.warning(
+                    "[heartbeat daemon] failed to handle request: %s",
+                    format_exception_as_str(),
+                )
+            finally:
+                conn.close()
+
+    def handle_message(self, message):
+        action = message.get("action")
+        with self._lock:
+            if action == "register":
+                if self._closing:
+                    return {"ok": False}
+                run = _RegisteredRun(
+                    run_uid=message["run_uid"],
+                    driver_pid=message["driver_pid"],
+                    heartbeat_interval_s=message["heartbeat_interval_s"],
+                )
+                self._runs[run.run_uid] = run
+                logger.info(
+                    "[heartbeat daemon] registered run %s (driver pid %s)",
+                    run.run_uid,
+                    run.driver_pid,
+                )
+            elif action == "unregister":
+                if self._runs.pop(message["run_uid"], None):
+                    logger.info(
+                        "[heartbeat daemon] unregistered run %s", message["run_uid"]
+                    )
+            else:
+                return {"ok": False, "error": "unknown action %s" % action}
+
+        self._wakeup.set()
+        return {"ok": True}
+
+    def _heartbeat_loop(self):
+        while True:
+            next_heartbeat = self.send_heartbeats()
+            with self._lock:
+                if self._runs:
+                    self._idle_since = None
+                elif self._idle_since is None:
+                    self._idle_since = time()
+                elif time() - self._idle_since > self.idle_timeout_s:
+                    # registration requests are rejected from now on
+                    self._closing = True
+                    return
+
+            timeout = next_heartbeat - time() if next_heartbeat else 1
+            self._wakeup.wait(max(0, min(timeout, 1)))
+            self._wakeup.clear()
+
+    def send_heartbeats(self):
+        """
+        Sends heartbeats of all the runs that are due,
+        returns the time of the next heartbeat
+        """
+        from dbnd._core.task_executor.heartbeat_sender import send_run_heartbeat
+
+        with self._lock:
+            runs = list(self._runs.values())
+
+        now = time()
+        for run in runs:
+            if run.next_heartbeat > now:
+                continue
+
+            # failsafe, in case the driver process died violently
+            if not pid_exists(run.driver_pid):
+                logger.info(
+                    "[heartbeat daemon] driver process %s of run %s stopped",
+                    run.driver_pid,
+                    run.run_uid,
+                )
+                with self._lock:
+                    self._runs.pop(run.run_uid, None)
+                continue
+
+            try:
+                send_run_heartbeat(self.tracking_store, run.run_uid, run.driver_pid)
+            except Exception:
+                logger.warning(
+                    "[heartbeat daemon] failed to send heartbeat of %s: %s",
+                    run.run_uid,
+                    format_exception_as_str(),
+                )
+            run.next_heartbeat = now + run.heartbeat_interval_s
+
+        with self._lock:
+            return min([r.next_heartbeat for r in self._runs.values()] or [None])
@@ -4,12 +4,17 @@ import os
 import signal
 import subprocess
 import sys
+import threading
 import typing
 
 from time import sleep, time
 
 from dbnd._core.configuration.environ_config import ENV_DBND__NO_PLUGINS
 from dbnd._core.constants import RunState
+from dbnd._core.task_executor.heartbeat_daemon import (
+    HeartbeatDaemonClient,
+    is_heartbeat_daemon_supported,
+)
 from dbnd._core.tracking.backends import TrackingStore
 from dbnd._core.utils.basics.format_exception import format_exception_as_str
 from dbnd._vendor.psutil.vendorized_psutil import pid_exists
@@ -47,6 +52,33 @@ def start_heartbeat_sender(run_executor):
         yield
         return
 
+    mode = run_config.heartbeat_sender_mode
+    if mode == "daemon" and not is_heartbeat_daemon_supported():
+        logger.info(
+            "heartbeat daemon is not supported on this platform, using heartbeat thread"
+        )
+        mode = "thread"
+
+    if mode == "thread":
+        sender = _heartbeat_sender_thread(run, heartbeat_interval_s)
+    elif mode == "daemon":
+        sender = _heartbeat_daemon_registration(run, heartbeat_interval_s)
+    else:
+        sender = _heartbeat_sender_process(run, heartbeat_interval_s)
+
+    with sender:
+        yield
+
+
+@contextlib.contextmanager
+def _heartbeat_sender_process(run, heartbeat_interval_s):
+    """
+    Runs `dbnd send-heartbeat` process for the run
+    """
+    settings = run.context.settings
+    core = settings.core
+    run_config = settings.run
+
     sp = None
     heartbeat_log_fp = None
     try:
@@ -116,6 +148,105 @@ def start_heartbeat_sender(run_executor):
             heartbeat_log_fp.close()
 
 
+class HeartbeatSenderThread(threading.Thread):
+    """
+    Sends heartbeats of the current process run, lives as long as the run process
+    """
+
+    def __init__(self, run_uid, tracking_store, heartbeat_interval_s):
+        # type: (str, TrackingStore, int) -> None
+        super(HeartbeatSenderThread, self).__init__(name="dbnd-heartbeat-sender")
+        self.daemon = True
+        self.run_uid = run_uid
+        self.tracking_store = tracking_store
+        self.heartbeat_interval_s = heartbeat_interval_s
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            loop_start = time()
+            try:
+                send_run_heartbeat(self.tracking_store, self.run_uid, os.getpid())
+            except Exception:
+                logger.warning(
+                    "[heartbeat sender] failed to send heartbeat: %s",
+                    format_exception_as_str(),
+                )
+            self._stop_event.wait(
+                max(0, loop_start + self.heartbeat_interval_s - time())
+            )
+
+    def stop(self, timeout=TERMINATE_WAIT_TIMEOUT):
+        self._stop_event.set()
+        self.join(timeout)
+
+
+@contextlib.contextmanager
+def _heartbeat_sender_thread(run, heartbeat_interval_s):
+    logger.info("Starting heartbeat sender thread")
+    sender = HeartbeatSenderThread(
+        run_uid=str(run.run_uid),
+        tracking_store=run.context.tracking_store,
+        heartbeat_interval_s=heartbeat_interval_s,
+    )
+    sender.start()
+    try:
+        yield
+    finally:
+        sender.stop()
+
+
+@contextlib.contextmanager
+def _heartbeat_daemon_registration(run, heartbeat_interval_s):
+    """
+    Registers the run at the shared heartbeat daemon of this host (starts it if required),
+    falls back to the heartbeat thread if the daemon is not available
+    """
+    settings = run.context.settings
+    daemon = HeartbeatDaemonClient.from_settings(settings)
+    run_uid = str(run.run_uid)
+    try:
+        daemon.register_run(
+            run_uid=run_uid,
+            driver_pid=os.getpid(),
+            heartbeat_interval_s=heartbeat_interval_s,
+        )
+    except Exception as ex:
+        logger.warning(
+            "Failed to register the run at heartbeat daemon %s, using heartbeat thread: %s",
+            daemon.address,
+            ex,
+        )
+        with _heartbeat_sender_thread(run, heartbeat_interval_s):
+            yield
+        return
+
+    logger.info("Run is registered at heartbeat daemon %s", daemon.address)
+    try:
+        yield
+    finally:
+        try:
+            daemon.unregister_run(run_uid)
+        except Exception as ex:
+            # the daemon will find out that we are gone by itself
+            logger.warning("Failed to unregister the run at heartbeat daemon: %s", ex)
+
+
+def send_run_heartbeat(tracking_store, run_uid, driver_pid):
+    # type: (TrackingStore, str, int) -> None
+    """
+    Sends a heartbeat of the run, kills the driver if the run was requested to shut down
+    """
+    run_state = tracking_store.heartbeat(run_uid=run_uid)
+    logger.debug("[heartbeat sender] sent heartbeat of %s", run_uid)
+    if run_state == RunState.SHUTDOWN.value:
+        logger.info(
+            "[heartbeat sender] received run state SHUTDOWN: killing driver process %s",
+            driver_pid,
+        )
+        os.kill(driver_pid, signal.SIGTERM)
+
+
 def send_heartbeat_continuously(
     run_uid, tracking_store, heartbeat_interval_s, driver_pid
 ):  # type: (str, TrackingStore, int, int) -> None
@@ -137,13 +268,7 @@ def send_heartbeat_continuously(
                     )
                     return
 
-                run_state = tracking_store.heartbeat(run_uid=run_uid)
-                logger.debug("[heartbeat sender] sent heartbeat")
-                if run_state == RunState.SHUTDOWN.value:
-                    logger.info(
-                        "[heartbeat sender] received run state SHUTDOWN: killing driver process"
-                    )
-                    os.kill(driver_pid, signal.SIGTERM)
+                send_run_heartbeat(tracking_store, run_uid, driver_pid)
             except KeyboardInterrupt:
                 logger.info(
                     "[heartbeat sender] stopping heartbeat sender process due to interrupt"
@@ -155,7 +280,7 @@ def send_heartbeat_continuously(
                     format_exception_as_str(),
                 )
 
-            time_to_sleep_s = max(0, time() + heartbeat_interval_s - loop_start)
+            time_to_sleep_s = max(0, loop_start + heartbeat_interval_s - time())
             if time_to_sleep_s > 0:
                 sleep(time_to_sleep_s)
     except KeyboardInterrupt:
@@ -0,0 +1,183 @@
+import logging
+import multiprocessing
+import os
+
+from collections import deque
+from multiprocessing.connection import wait
+
+from dbnd._core.constants import TaskRunState
+from dbnd._core.errors.base import DatabandRunError
+from dbnd._core.task_ctrl.task_dag import topological_sort
+from dbnd._core.task_executor.local_task_executor import _collect_errors
+from dbnd._core.task_executor.task_executor import TaskExecutor
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_local_parallel_supported():
+    # every task run is executed in a forked process, that gets current run from the parent
+    return hasattr(os, "fork")
+
+
+def _execute_task_run_in_child(task_run, conn):
+    try:
+        task_run.runner.execute()
+    except Exception:
+        logger.exception("Failed to execute task '%s':" % task_run.task.task_id)
+    finally:
+        try:
+            # tracking stores can send data in background, this process exits right away
+            task_run.run.tracker.flush()
+        finally:
+            conn.send(task_run.task_run_state)
+            conn.close()
+
+
+class _RunningTaskRun(object):
+    def __init__(self, task_run, process, conn):
+        self.task_run = task_run
+        self.process = process
+        self.conn = conn
+
+    def read_state(self):
+        try:
+            if self.conn.poll():
+                return self.conn.recv()
+        except (EOFError, OSError):
+            pass
+        return None
+
+
+class LocalParallelTaskExecutor(TaskExecutor):
+    """
+    Runs independent task runs concurrently, every task run is executed in its own
+    forked process, at most run.local_parallelism processes at a time.
+    """
+
+    def do_run(self):
+        if not is_local_parallel_supported():
+            raise DatabandRunError(
+                "local_parallel task executor is not supported on this platform"
+            )
+
+        run_config = self.settings.run
+        fail_fast = run_config.fail_fast
+        parallelism = run_config.local_parallelism or multiprocessing.cpu_count()
+        mp_context = multiprocessing.get_context("fork")
+
+        topological_tasks = topological_sort([tr.task for tr in self.task_runs])
+        task_runs = [
+            self.run.get_task_run_by_id(task.task_id) for task in topological_tasks
+        ]
+        pending = {tr.task.task_id: tr for tr in task_runs if not tr.is_reused}
+
+        # amount of upstream task runs that haven't finished yet
+        waiting_for = {}
+        downstream = {task_id: [] for task_id in pending}
+        for task_id, tr in pending.items():
+            upstream_ids = tr.task.ctrl.task_dag.upstream_task_ids
+            waiting_for[task_id] = 0
+            for upstream_id in upstream_ids:
+                if upstream_id in pending:
+                    waiting_for[task_id] += 1
+                    downstream[upstream_id].append(task_id)
+
+        ready = deque(tr for tr in task_runs if waiting_for.get(tr.task.task_id) == 0)
+        running = {}  # sentinel -> _RunningTaskRun
+        task_runs_to_update_state = []
+        task_failed = False
+
+        def _set_state(tr, state):
+            logger.info("Setting %s to %s", tr.task.task_id, state)
+            tr.set_task_run_state(state, track=False)
+            task_runs_to_update_state.append(tr)
+            _set_upstream_failed(tr.task.task_id)
+
+        def _set_upstream_failed(failed_task_id):
+            # mark all downstream task runs, other task runs are not blocked
+            to_mark = list(downstream[failed_task_id])
+            while to_mark:
+                tr = pending[to_mark.pop()]
+                if tr.task_run_state == TaskRunState.UPSTREAM_FAILED:
+                    continue
+                logger.info(
+                    "Setting %s to %s", tr.task.task_id, TaskRunState.UPSTREAM_FAILED
+                )
+                tr.set_task_run_state(TaskRunState.UPSTREAM_FAILED, track=False)
+                task_runs_to_update_state.append(tr)
+                to_mark.extend(downstream[tr.task.task_id])
+
+        try:
+            while ready or running:
+                while ready and len(running) < parallelism:
+                    tr = ready.popleft()
+                    if tr.task_run_state == TaskRunState.UPSTREAM_FAILED:
+                        continue
+
+                    if fail_fast and task_failed:
+                        _set_state(tr, TaskRunState.UPSTREAM_FAILED)
+                        continue
+
+                    if self.run.is_killed():
+                        logger.info("Databand Context is killed!")
+                        _set_state(tr, TaskRunState.FAILED)
+                        continue
+
+                    logger.debug("Executing task: %s", tr.task.task_id)
+                    parent_conn, child_conn = mp_context.Pipe(duplex=False)
+                    process = mp_context.Process(
+                        target=_execute_task_run_in_child,
+                        args=(tr, child_conn),
+                        name="dbnd-task-%s" % tr.task.task_id,
+                    )
+                    process.start()
+                    child_conn.close()
+                    running[process.sentinel] = _RunningTaskRun(
+                        tr, process, parent_conn
+                    )
+
+                if not running:
+                    continue
+
+                for sentinel in wait(list(running)):
+                    finished = running.pop(sentinel)
+                    finished.process.join()
+                    tr = finished.task_run
+                    state = finished.read_state()
+                    finished.conn.close()
+
+                    if state is None:
+                        logger.error(
+                            "Task '%s' process has exited with code %s without reporting its state",
+                            tr.task.task_id,
+                            finished.process.exitcode,
+                        )
+                        state = TaskRunState.FAILED
+                        tr.set_task_run_state(state)
+                    else:
+                        # the state is already tracked by the child process
+                        tr.set_task_run_state(state, track=False)
+
+                    if state in TaskRunState.fail_states():
+                        task_failed = True
+                        _set_upstream_failed(tr.task.task_id)
+                        continue
+
+                    for task_id in downstream[tr.task.task_id]:
+                        waiting_for[task_id] -= 1
+                        if waiting_for[task_id] == 0:
+                            ready.append(pending[task_id])
+        finally:
+            for r in running.values():
+                logger.warning("Terminating task %s", r.task_run.task.task_id)
+                r.process.terminate()
+
+        if task_runs_to_update_state:
+            self.run.tracker.set_task_run_states(task_runs_to_update_state)
+
+        if task_failed:
+            err = _collect_errors(self.run.task_runs)
+
+            if err:
+                raise DatabandRunError(err)
@@ -363,7 +363,11 @@ class RunExecutor(object):
         if remote_engine.require_submit:
             return True
 
-        if self.task_executor_type == TaskExecutorType.local:
+        if self.task_executor_type in (
+            TaskExecutorType.local,
+            TaskExecutorType.local_parallel,
+        ):
+            # local_parallel forks the current process, the run is already there
             return False
 
         if is_airflow_enabled():
@@ -32,19 +32,25 @@ logger = logging.getLogger(__name__)
 
 def check_if_completed_dfs(task, existing_completed_status=None):
     completed_status = existing_completed_status or dict()
-    task_id = task.task_id
-    completed_status[task_id] = completed = task._complete()
-    if not completed:
-        for c in task.ctrl.task_dag.upstream:
-            if c.task_id in completed_status:
-                continue
-            completed_status.update(check_if_completed_dfs(c, completed_status))
+    # should be iterative, we can have very long chains of tasks
+    to_check = [task]
+    while to_check:
+        current = to_check.pop()
+        if current is not task and current.task_id in completed_status:
+            continue
+        completed_status[current.task_id] = completed = current._complete()
+        if completed:
+            continue
+        for c in current.ctrl.task_dag.upstream:
+            if c.task_id not in completed_status:
+                to_check.append(c)
     return completed_status
 
 
 def check_if_completed_bfs(root_task, number_of_threads):
     completed_status = {}
     tasks_to_check_list = [root_task]
+    discovered = {root_task.task_id}
 
     with ThreadPoolExecutor(max_workers=number_of_threads) as executor:
         while tasks_to_check_list:
@@ -72,7 +78,9 @@ def check_if_completed_bfs(root_task, number_of_threads):
                     continue
 
                 for upstream_task in task.ctrl.task_dag.upstream:
-                    if upstream_task.task_id not in completed_status:
+                    # the same task can be upstream of many tasks, check it once
+                    if upstream_task.task_id not in discovered:
+                        discovered.add(upstream_task.task_id)
                         new_task_to_check_list.append(upstream_task)
 
             tasks_to_check_list = new_task_to_check_list
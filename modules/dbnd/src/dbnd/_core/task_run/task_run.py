@@ -57,21 +57,15 @@ class TaskRun(object):
         self.job_name = clean_job_name(self.task_af_id).lower()
         self.job_id = self.job_name + "_" + str(self.task_run_uid)[:8]
 
-        # custom per task engine , or just use one from global env
-        dbnd_local_root = (
-            self.task_engine.dbnd_local_root or self.run.env.dbnd_local_root
-        )
-        self.local_task_run_root = (
-            dbnd_local_root.folder(run.run_folder_prefix)
-            .folder("tasks")
-            .folder(self.task.task_id)
-        )
+        # folders, log files and the controllers that use them are built on first use:
+        # tracking creates a task run for every call of a tracked function,
+        # and most of them never touch these
+        self._local_task_run_root = None
+        self._deploy = None
+        self._sync_local = None
 
         self.attempt_number = try_number
         self.task_run_attempt_uid = None
-        self.attempt_folder = None
-        self.meta_files = None
-        self.log = None
         self.init_new_task_run_attempt()
 
         # TODO: inherit from parent task if disabled
@@ -91,8 +85,6 @@ class TaskRun(object):
         self.tracking_store = tracking_store
         self.tracker = TaskRunTracker(task_run=self, tracking_store=tracking_store)
         self.runner = TaskRunRunner(task_run=self)
-        self.deploy = TaskSyncCtrl(task_run=self)
-        self.sync_local = TaskRunLocalSyncer(task_run=self)
         self.task_tracker_url = self.tracker.task_run_url()
         self.external_resource_urls = dict()
         self.errors = []
@@ -118,6 +110,64 @@ class TaskRun(object):
             del d["airflow_context"]
         return d
 
+    @property
+    def local_task_run_root(self):
+        if self._local_task_run_root is None:
+            # custom per task engine , or just use one from global env
+            dbnd_local_root = self.task_engine.dbnd_local_root
+            if dbnd_local_root:
+                tasks_root = dbnd_local_root.folder(self.run.run_folder_prefix).folder(
+                    "tasks"
+                )
+            else:
+                tasks_root = self.run.run_local_tasks_root
+            self._local_task_run_root = tasks_root.folder(self.task.task_id)
+        return self._local_task_run_root
+
+    @property
+    def attempt_folder(self):
+        if self._attempt_folder is None:
+            self._attempt_folder = self.task._meta_output.folder(
+                self._attempt_folder_name, extension=None
+            )
+        return self._attempt_folder
+
+    @property
+    def attempt_folder_local(self):
+        if self._attempt_folder_local is None:
+            self._attempt_folder_local = self.local_task_run_root.folder(
+                self._attempt_folder_name, extension=None
+            )
+        return self._attempt_folder_local
+
+    @property
+    def attemp_folder_local_cache(self):
+        return self.attempt_folder_local.folder("cache")
+
+    @property
+    def meta_files(self):
+        if self._meta_files is None:
+            self._meta_files = TaskRunMetaFiles(self.attempt_folder)
+        return self._meta_files
+
+    @property
+    def log(self):
+        if self._log is None:
+            self._log = TaskRunLogManager(task_run=self)
+        return self._log
+
+    @property
+    def deploy(self):
+        if self._deploy is None:
+            self._deploy = TaskSyncCtrl(task_run=self)
+        return self._deploy
+
+    @property
+    def sync_local(self):
+        if self._sync_local is None:
+            self._sync_local = TaskRunLocalSyncer(task_run=self)
+        return self._sync_local
+
     @property
     def task_run_env(self):
         return self.run.context.task_run_env
@@ -162,9 +212,19 @@ class TaskRun(object):
 
         self._task_run_state = state
         if track:
-            self.tracking_store.set_task_run_state(
-                task_run=self, state=state, error=error
-            )
+            if state in TaskRunState.finished_states():
+                # the state is reported after the values of the task run,
+                # their value meta can still be calculated in background
+                self.tracker.after_value_meta(
+                    self.tracking_store.set_task_run_state,
+                    task_run=self,
+                    state=state,
+                    error=error,
+                )
+            else:
+                self.tracking_store.set_task_run_state(
+                    task_run=self, state=state, error=error
+                )
         return True
 
     def set_task_reused(self):
@@ -201,17 +261,15 @@ class TaskRun(object):
         # if so - the attempt_uid is uniquely for this task_run_attempt, and that why we pop.
         self.task_run_attempt_uid = get_task_run_attempt_uid_by_task_run(self)
 
-        self.attempt_folder = self.task._meta_output.folder(
-            "attempt_%s_%s" % (self.attempt_number, self.task_run_attempt_uid),
-            extension=None,
-        )
-        self.attempt_folder_local = self.local_task_run_root.folder(
-            "attempt_%s_%s" % (self.attempt_number, self.task_run_attempt_uid),
-            extension=None,
+        # the folders and the log of the attempt are built on first use
+        self._attempt_folder_name = "attempt_%s_%s" % (
+            self.attempt_number,
+            self.task_run_attempt_uid,
         )
-        self.attemp_folder_local_cache = self.attempt_folder_local.folder("cache")
-        self.meta_files = TaskRunMetaFiles(self.attempt_folder)
-        self.log = TaskRunLogManager(task_run=self)
+        self._attempt_folder = None
+        self._attempt_folder_local = None
+        self._meta_files = None
+        self._log = None
 
     def __repr__(self):
         return "TaskRun(id=%s, af_id=%s)" % (self.task.task_id, self.task_af_id)
@@ -9,6 +9,7 @@ class TaskRunMetaFiles(object):
     _ARTIFACTS = "artifacts"
     _METRICS = "metrics"
     _META_DATA_FILE_NAME = "meta.yaml"
+    _METRICS_FILE_NAME = "metrics.tsv"
     _DEFAULT_METRIC_SOURCE = "user"
 
     def _output(self, *path):
@@ -23,6 +24,11 @@ class TaskRunMetaFiles(object):
         source = source or TaskRunMetaFiles._DEFAULT_METRIC_SOURCE
         return self._output(TaskRunMetaFiles._METRICS, source, metric_key)
 
+    def get_metrics_file(self):
+        return self._output(
+            TaskRunMetaFiles._METRICS, TaskRunMetaFiles._METRICS_FILE_NAME
+        )
+
     def get_artifact_target(self, name):
         return self._output(TaskRunMetaFiles._ARTIFACTS, name)
 
@@ -1,10 +1,14 @@
+import functools
+import hashlib
 import logging
 import os
 import shutil
+import threading
+import uuid
 
 from contextlib import contextmanager
 from tempfile import mkdtemp, mkstemp
-from typing import Type
+from typing import Optional, Type
 
 from dbnd._core.parameter.parameter_definition import (
     ParameterDefinition,
@@ -25,9 +29,77 @@ from targets.caching import get_or_create_folder_in_dir
 from targets.multi_target import MultiTarget
 
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # we are python2
+    from dbnd._vendor.futures import ThreadPoolExecutor
+
 logger = logging.getLogger(__name__)
 
 LOCAL_SYNC_CACHE_NAME = "local_sync_cache"
+LOCAL_SYNC_CONTENT_CACHE_NAME = "local_sync_content"
+
+# DbndLocalFileMetadataRegistry files are not safe for concurrent access
+_metadata_registry_lock = threading.Lock()
+
+
+def _link_or_copy(source_path, dest_path):
+    if os.path.exists(dest_path) and os.path.samefile(source_path, dest_path):
+        return
+
+    tmp_path = "%s.tmp-%s" % (dest_path, uuid.uuid4().hex)
+    try:
+        os.link(source_path, tmp_path)
+    except (OSError, AttributeError):
+        # different device, or file system without hard links
+        shutil.copyfile(source_path, tmp_path)
+
+    if os.path.exists(dest_path):
+        os.remove(dest_path)
+    os.rename(tmp_path, dest_path)
+
+
+class LocalSyncContentCache(object):
+    """
+    Downloaded files addressed by the content fingerprint of their remote file
+    (see `FileSystem.content_fingerprint`). A file is downloaded once and hard linked
+    (or copied) to the local path of every target with the same content,
+    in all the tasks and runs that share the same dbnd local root.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def get_content_path(self, fingerprint):
+        digest = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _get_lock(self, content_path):
+        with self._locks_lock:
+            return self._locks.setdefault(content_path, threading.Lock())
+
+    def sync(self, remote_target, local_target, fingerprint):
+        # type: (FileTarget, FileTarget, str) -> None
+        content_path = self.get_content_path(fingerprint)
+        # the same content can be required by a few targets that are synced concurrently
+        with self._get_lock(content_path):
+            if os.path.exists(content_path):
+                logger.info("Using cached content of %s", remote_target)
+            else:
+                content_dir = os.path.dirname(content_path)
+                if not os.path.isdir(content_dir):
+                    os.makedirs(content_dir)
+                tmp_path = "%s.tmp-%s" % (content_path, uuid.uuid4().hex)
+                remote_target.download(tmp_path)
+                # the content is shared, it should not be changed through one of the links
+                os.chmod(tmp_path, 0o444)
+                os.rename(tmp_path, content_path)
+
+        local_target.mkdir_parent()
+        _link_or_copy(content_path, local_target.path)
 
 
 class TaskRunLocalSyncer(TaskRunCtrl):
@@ -85,43 +157,91 @@ class TaskRunLocalSyncer(TaskRunCtrl):
         else:
             self.inputs_to_sync.append((param_definition, old_target))
 
+    @staticmethod
+    def _requires_sync(target_):
+        return target_.config.require_local_access and not target_.fs.local
+
+    def _run_transfers(self, transfer, jobs, error_message):
+        """
+        Runs transfer(remote_target, local_target) for every (p_def, remote, local) job,
+        using up to `output.local_sync_workers` threads
+        """
+        workers = min(self.settings.output.local_sync_workers, len(jobs))
+        if workers <= 1:
+            errors = []
+            for job in jobs:
+                try:
+                    self._run_transfer(transfer, job, error_message)
+                except Exception as ex:
+                    errors.append(ex)
+            if errors:
+                # the same as with workers, the first failure after all the transfers
+                raise errors[0]
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._run_transfer, transfer, job, error_message)
+                for job in jobs
+            ]
+        for future in futures:
+            # raises the first failure, all of them are logged already
+            future.result()
+
+    @staticmethod
+    def _run_transfer(transfer, job, error_message):
+        p_def, remote_target, local_target = job
+        try:
+            transfer(remote_target, local_target)
+        except Exception:
+            logger.exception(error_message, p_def, remote_target, local_target)
+            raise
+
     def sync_pre_execute(self):
+        # not kept at the ctrl, it has to be pickled with the task run
+        content_cache = None
+        if self.settings.output.local_sync_content_cache:
+            content_cache = LocalSyncContentCache(
+                get_or_create_folder_in_dir(
+                    LOCAL_SYNC_CONTENT_CACHE_NAME,
+                    self.task.task_env.dbnd_local_root.path,
+                )
+            )
+
+        downloads = []
+        local_inputs = []
+        synced_paths = set()
         for p_def, remote_target in self.inputs_to_sync:
             # Input should be synced to local path and substituted
-            try:
-                if isinstance(remote_target, MultiTarget):
-                    local_target = self._local_cache_multitarget(remote_target)
-
-                    logger.info(
-                        "Downloading  %s %s to %s", p_def, remote_target, local_target,
-                    )
-
+            if isinstance(remote_target, MultiTarget):
+                local_target = self._local_cache_multitarget(remote_target)
+                pairs = [
+                    (remote_subtarget, local_subtarget)
                     for remote_subtarget, local_subtarget in zip(
                         remote_target.targets, local_target.targets
-                    ):
-                        if (
-                            remote_subtarget.config.require_local_access
-                            and not remote_subtarget.fs.local
-                        ):
-                            self._sync_remote_to_local(
-                                remote_subtarget, local_subtarget
-                            )
-                else:
-                    # Target requires local access, it points to a remote path that must be synced-to from a local path
-                    local_target = self._local_cache_target(remote_target)
-
-                    logger.info(
-                        "Downloading  %s %s to %s", p_def, remote_target, local_target,
                     )
+                    if self._requires_sync(remote_subtarget)
+                ]
+            else:
+                # Target requires local access, it points to a remote path that must be synced-to from a local path
+                local_target = self._local_cache_target(remote_target)
+                pairs = [(remote_target, local_target)]
 
-                    self._sync_remote_to_local(remote_target, local_target)
-
-            except Exception as e:
-                logger.exception(
-                    "Failed to create local cache for %s %s", p_def, remote_target,
-                )
-                raise
-
+            logger.info(
+                "Downloading  %s %s to %s", p_def, remote_target, local_target,
+            )
+            for remote_subtarget, local_subtarget in pairs:
+                if local_subtarget.path not in synced_paths:
+                    synced_paths.add(local_subtarget.path)
+                    downloads.append((p_def, remote_subtarget, local_subtarget))
+            local_inputs.append((p_def, local_target))
+
+        self._run_transfers(
+            functools.partial(self._sync_remote_to_local, content_cache=content_cache),
+            downloads,
+            "Failed to create local cache for %s %s at %s",
+        )
+        for p_def, local_target in local_inputs:
             setattr(self.task, p_def.name, local_target)
 
         if self.inputs_to_sync:
@@ -136,10 +256,7 @@ class TaskRunLocalSyncer(TaskRunCtrl):
                 for remote_subtarget, local_subtarget in zip(
                     remote_target.targets, local_target.targets
                 ):
-                    if (
-                        remote_subtarget.config.require_local_access
-                        and not remote_subtarget.fs.local
-                    ):
+                    if self._requires_sync(remote_subtarget):
                         local_subtarget.mkdir_parent()
             else:
                 local_target = self._local_cache_target(remote_target)
@@ -151,59 +268,61 @@ class TaskRunLocalSyncer(TaskRunCtrl):
         for p_def, remote_target in self.inputs_to_sync:
             setattr(self.task, p_def.name, remote_target)
 
+        uploads = []
         for p_def, remote_target in self.outputs_to_sync:
-            try:
-                if isinstance(remote_target, MultiTarget):
-                    local_target = self._local_cache_multitarget(remote_target)
-
-                    logger.info(
-                        "Uploading  %s %s from %s", p_def, remote_target, local_target
-                    )
-
+            if isinstance(remote_target, MultiTarget):
+                local_target = self._local_cache_multitarget(remote_target)
+                pairs = [
+                    (remote_subtarget, local_subtarget)
                     for remote_subtarget, local_subtarget in zip(
                         remote_target.targets, local_target.targets
-                    ):
-                        if (
-                            remote_subtarget.config.require_local_access
-                            and not remote_subtarget.fs.local
-                        ):
-                            remote_subtarget.copy_from_local(
-                                local_path=local_subtarget.path
-                            )
-                            if remote_subtarget.config.flag:
-                                remote_subtarget.mark_success()
-
-                else:
-                    local_target = self._local_cache_target(remote_target)
-
-                    logger.info(
-                        "Uploading  %s %s from %s", p_def, remote_target, local_target
                     )
+                    if self._requires_sync(remote_subtarget)
+                ]
+            else:
+                local_target = self._local_cache_target(remote_target)
+                pairs = [(remote_target, local_target)]
 
-                    remote_target.copy_from_local(local_path=local_target.path)
-                    if remote_target.config.flag:
-                        remote_target.mark_success()
-            except Exception:
-                logger.exception(
-                    "Failed to upload task output %s %s from %s",
-                    p_def,
-                    remote_target,
-                    local_target,
-                )
-                raise
+            logger.info("Uploading  %s %s from %s", p_def, remote_target, local_target)
+            uploads.extend(
+                (p_def, remote_subtarget, local_subtarget)
+                for remote_subtarget, local_subtarget in pairs
+            )
+
+        self._run_transfers(
+            self._sync_local_to_remote,
+            uploads,
+            "Failed to upload task output %s %s from %s",
+        )
+        for p_def, remote_target in self.outputs_to_sync:
             setattr(self.task, p_def.name, remote_target)
 
-    def _sync_remote_to_local(self, remote_target, local_target):
+    def _sync_local_to_remote(self, remote_target, local_target):
         # type: (FileTarget, FileTarget) -> None
+        remote_target.copy_from_local(local_path=local_target.path)
+        if remote_target.config.flag:
+            remote_target.mark_success()
+
+    def _sync_remote_to_local(self, remote_target, local_target, content_cache=None):
+        # type: (FileTarget, FileTarget, Optional[LocalSyncContentCache]) -> None
+        if content_cache:
+            fingerprint = remote_target.fs.content_fingerprint(remote_target.path)
+            if fingerprint:
+                content_cache.sync(remote_target, local_target, fingerprint)
+                return
+
         # Use DbndLocalFileMetadataRegistry to sync inputs only when necessary
-        dbnd_meta_cache = DbndLocalFileMetadataRegistry.get_or_create(local_target)
+        with _metadata_registry_lock:
+            dbnd_meta_cache = DbndLocalFileMetadataRegistry.get_or_create(local_target)
+            # Without remote checksum -> We can't compare the content, so use TTL instead
+            expired = dbnd_meta_cache.expired or not local_target.exists()
 
-        # When syncing remote to local -> We can't use MD5, so use TTL instead
-        if dbnd_meta_cache.expired or not local_target.exists():
+        if expired:
             # If TTL is invalid, or local file doesn't exist -> Sync to local
             local_target.mkdir_parent()
 
             with local_target.tmp() as tmp_local_path:
                 remote_target.download(tmp_local_path)
 
-        DbndLocalFileMetadataRegistry.refresh(local_target)
+        with _metadata_registry_lock:
+            DbndLocalFileMetadataRegistry.refresh(local_target)
@@ -15,9 +15,11 @@ from dbnd._core.log.external_exception_logging import (
     log_exception_to_server,
 )
 from dbnd._core.parameter.parameter_definition import ParameterDefinition
-from dbnd._core.settings.tracking_config import get_value_meta
+from dbnd._core.settings.tracking_config import ValueMetaMutationPolicy, get_value_meta
 from dbnd._core.task_run.task_run_ctrl import TaskRunCtrl
+from dbnd._core.tracking.background_value_meta import snapshot_value
 from dbnd._core.tracking.schemas.metrics import Metric
+from dbnd._core.utils.basics.nothing import NOTHING
 from dbnd._core.utils.timezone import utcnow
 from targets import Target
 from targets.value_meta import ValueMeta, ValueMetaConf
@@ -40,6 +42,8 @@ class TaskRunTracker(TaskRunCtrl):
     def __init__(self, task_run, tracking_store):
         super(TaskRunTracker, self).__init__(task_run=task_run)
         self.tracking_store = tracking_store  # type: TrackingStore
+        # background value meta calculations of this task run that are not done yet
+        self._value_meta_futures = set()
 
     def task_run_url(self):
         run_tracker = self.run.tracker
@@ -67,11 +71,27 @@ class TaskRunTracker(TaskRunCtrl):
         if not tracking_conf.log_value_meta or value is None:
             return
 
+        if self._log_in_background(
+            self._log_parameter_data,
+            value,
+            parameter,
+            target,
+            operation_type,
+            operation_status,
+        ):
+            return
+
+        self._log_parameter_data(
+            value, parameter, target, operation_type, operation_status
+        )
+
+    def _log_parameter_data(
+        self, value, parameter, target, operation_type, operation_status
+    ):
         try:
-            target.target_meta = get_value_meta(
+            target.target_meta = self._get_value_meta(
                 value,
                 parameter.value_meta_conf,
-                tracking_config=tracking_conf,
                 value_type=parameter.value_type,
                 target=target,
             )
@@ -95,6 +115,50 @@ class TaskRunTracker(TaskRunCtrl):
                 non_critical=True,
             )
 
+    def _get_value_meta(self, value, meta_conf, value_type=None, target=None):
+        tracking_conf = self.settings.tracking
+        return get_value_meta(
+            value,
+            meta_conf,
+            tracking_config=tracking_conf,
+            value_type=value_type,
+            target=target,
+            value_meta_cache=self.run.tracker.value_meta_cache
+            if tracking_conf.value_meta_cache
+            else None,
+        )
+
+    def _log_in_background(self, func, value, *args):
+        """
+        Submits func(value, *args) to the background value meta calculator,
+        returns False if value meta should be calculated by the caller
+        """
+        tracking_conf = self.settings.tracking
+        if not tracking_conf.value_meta_async:
+            return False
+
+        if tracking_conf.value_meta_mutation_policy == ValueMetaMutationPolicy.SNAPSHOT:
+            value = snapshot_value(value)
+            if value is NOTHING:
+                return False
+
+        future = self.run.tracker.value_meta_calculator.submit(func, value, *args)
+        self._value_meta_futures.add(future)
+        future.add_done_callback(self._value_meta_futures.discard)
+        return True
+
+    def after_value_meta(self, func, *args, **kwargs):
+        """
+        calls `func` after the value meta of the values logged by this task run
+        is reported (right away if there is nothing to wait for), without blocking
+        """
+        if self._value_meta_futures:
+            self.run.tracker.value_meta_calculator.then(
+                self._value_meta_futures.copy(), func, *args, **kwargs
+            )
+        else:
+            func(*args, **kwargs)
+
     def _log_metrics(self, metrics):
         # type: (List[Metric]) -> None
         return self.tracking_store.log_metrics(task_run=self.task_run, metrics=metrics)
@@ -154,11 +218,34 @@ class TaskRunTracker(TaskRunCtrl):
         operation_status=DbndTargetOperationStatus.OK,  # type: DbndTargetOperationStatus
         raise_on_error=False,  # type: bool
     ):  # type: (...) -> None
+        if not raise_on_error and self._log_in_background(
+            self._log_data, data, key, meta_conf, path, operation_type, operation_status
+        ):
+            return
+
+        self._log_data(
+            data,
+            key,
+            meta_conf,
+            path,
+            operation_type,
+            operation_status,
+            raise_on_error=raise_on_error,
+        )
+
+    def _log_data(
+        self,
+        data,
+        key,
+        meta_conf,
+        path,
+        operation_type,
+        operation_status,
+        raise_on_error=False,
+    ):
         try:
             # Combine meta_conf with the config settings
-            value_meta = get_value_meta(
-                data, meta_conf, tracking_config=self.settings.tracking
-            )
+            value_meta = self._get_value_meta(data, meta_conf)
             if not value_meta:
                 logger.warning(
                     "Couldn't log the wanted data {name}, reason - can't log objects of type {value_type} ".format(
@@ -211,14 +298,42 @@ class TaskRunTracker(TaskRunCtrl):
         data=None,  # type: Optional[Any]
         meta_conf=None,  # type: Optional[ValueMetaConf]
         send_metrics=True,
+    ):
+        if data is not None and meta_conf is not None:
+            if self._log_in_background(
+                self._log_dataset,
+                data,
+                operation_path,
+                operation_type,
+                operation_status,
+                meta_conf,
+                send_metrics,
+            ):
+                return
+
+        self._log_dataset(
+            data,
+            operation_path,
+            operation_type,
+            operation_status,
+            meta_conf,
+            send_metrics,
+        )
+
+    def _log_dataset(
+        self,
+        data,
+        operation_path,
+        operation_type,
+        operation_status,
+        meta_conf,
+        send_metrics,
     ):
         data_meta = None
         if data is not None and meta_conf is not None:
             # Combine meta_conf with the config settings
             try:
-                data_meta = get_value_meta(
-                    data, meta_conf, tracking_config=self.settings.tracking
-                )
+                data_meta = self._get_value_meta(data, meta_conf)
             except Exception as e:
                 log_exception_to_server(e)
                 logger.exception(
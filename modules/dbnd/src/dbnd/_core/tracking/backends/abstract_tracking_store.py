@@ -140,3 +140,6 @@ class TrackingStore(object):
     def is_ready(self):
         # type: () -> bool
         pass
+
+    def flush(self):
+        pass
@@ -70,5 +70,8 @@ class TrackingChannel(object):
     def is_ready(self):
         return self._handle(TrackingChannel.is_ready.__name__, None)
 
+    def flush(self):
+        pass
+
     def get_schema_by_handler_name(self, handler_name):
         raise NotImplementedError()
@@ -0,0 +1,186 @@
+import atexit
+import logging
+import os
+import threading
+
+from time import time
+
+from six.moves import queue
+
+from dbnd._core.errors.errors_utils import log_exception
+from dbnd._core.tracking.backends.channels.abstract_channel import TrackingChannel
+
+
+logger = logging.getLogger(__name__)
+
+# handlers whose payload is a single list that can be concatenated with the payload
+# of the following call to the same handler, mapped to the name of that list field
+BULK_HANDLERS_FIELDS = {
+    TrackingChannel.log_metrics.__name__: "metrics_info",
+    TrackingChannel.log_targets.__name__: "targets_info",
+    TrackingChannel.log_datasets.__name__: "datasets_info",
+    TrackingChannel.update_task_run_attempts.__name__: "task_run_attempt_updates",
+}
+
+# handlers which results are used by the caller, they can't be sent in background
+SYNC_HANDLERS = {TrackingChannel.heartbeat.__name__}
+
+
+class _FlushRequest(object):
+    def __init__(self):
+        self.done = threading.Event()
+
+
+def coalesce_events(events):
+    """
+    Merge adjacent calls to the same bulk handler into a single call.
+    The relative order of all calls is kept.
+    """
+    batches = []
+    for name, data in events:
+        field = BULK_HANDLERS_FIELDS.get(name)
+        if field and batches and batches[-1][0] == name:
+            batches[-1][1][field].extend(data[field])
+            continue
+
+        if field:
+            # copy, so we don't change the payload that was passed to us
+            data = dict(data)
+            data[field] = list(data[field])
+        batches.append((name, data))
+    return batches
+
+
+class AsyncTrackingChannel(TrackingChannel):
+    """
+    Sends tracking calls of the wrapped channel from a background thread.
+
+    Calls are queued in memory and sent in the same order they were made,
+    adjacent log_metrics/log_targets/log_datasets/update_task_run_attempts calls
+    are coalesced into one bulk request.
+    Pending bulk calls are sent when `batch_size` of them are waiting,
+    `flush_interval` seconds after the first one was queued, or right before
+    any other (state) call.
+    The queue is bounded by `queue_size`, the caller blocks if it's full.
+    """
+
+    def __init__(
+        self,
+        channel,
+        queue_size=10000,
+        batch_size=500,
+        flush_interval=1.0,
+        flush_timeout=30.0,
+    ):
+        # type: (TrackingChannel, int, int, float, float) -> None
+        super(AsyncTrackingChannel, self).__init__()
+        self.channel = channel
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_timeout = flush_timeout
+
+        self._queue = None
+        self._worker = None
+        self._worker_pid = None
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+
+    def _handle(self, name, data):
+        if name in SYNC_HANDLERS:
+            return getattr(self.channel, name)(data)
+
+        self._ensure_worker()
+        # blocks if the queue is full - backpressure on the tracked code
+        self._queue.put((name, data))
+
+    def _ensure_worker(self):
+        if self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+
+        with self._lock:
+            if self._worker_pid == os.getpid() and self._worker.is_alive():
+                return
+
+            # we get here on first call, or in a forked process (there are no threads
+            # after fork, and the queue of the parent process is not ours)
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            self._worker = threading.Thread(
+                target=self._worker_loop, name="dbnd-async-tracking"
+            )
+            self._worker.daemon = True
+            self._worker.start()
+            self._worker_pid = os.getpid()
+
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+    def _worker_loop(self):
+        pending = []
+        deadline = None
+        while True:
+            try:
+                if deadline is None:
+                    item = self._queue.get()
+                else:
+                    item = self._queue.get(timeout=max(0.0, deadline - time()))
+            except queue.Empty:
+                item = None
+
+            if item is None:
+                # flush interval has passed
+                self._send(pending)
+                pending, deadline = [], None
+                continue
+
+            if isinstance(item, _FlushRequest):
+                self._send(pending)
+                pending, deadline = [], None
+                item.done.set()
+                continue
+
+            name, _ = item
+            pending.append(item)
+            if name not in BULK_HANDLERS_FIELDS or len(pending) >= self.batch_size:
+                self._send(pending)
+                pending, deadline = [], None
+            elif deadline is None:
+                deadline = time() + self.flush_interval
+
+    def _send(self, events):
+        for name, data in coalesce_events(events):
+            try:
+                getattr(self.channel, name)(data)
+            except Exception as ex:
+                log_exception(
+                    "Failed to send tracking information from %s at %s"
+                    % (name, str(self)),
+                    ex,
+                    non_critical=True,
+                )
+
+    def flush(self):
+        """
+        Blocks until all calls queued before this one are sent (or `flush_timeout` passes)
+        """
+        if self._worker_pid != os.getpid() or not self._worker.is_alive():
+            return
+
+        flush_request = _FlushRequest()
+        self._queue.put(flush_request)
+        if not flush_request.done.wait(self.flush_timeout):
+            logger.warning(
+                "Timed out after %s seconds while waiting for %s tracking calls to be sent",
+                self.flush_timeout,
+                self._queue.qsize(),
+            )
+
+    def is_ready(self):
+        return self.channel.is_ready()
+
+    def get_schema_by_handler_name(self, handler_name):
+        return self.channel.get_schema_by_handler_name(handler_name)
+
+    def __str__(self):
+        return "Async%s" % str(self.channel)
@@ -13,6 +13,9 @@ from dbnd.api.proto.generated.tracking_pb2 import (
 )
 
 
+PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+
+
 def str_type(obj):
     return "%s.%s" % (obj.__class__.__module__, obj.__class__.__name__)
 
@@ -25,6 +28,11 @@ class TrackingProtoWebChannel(ProtobufMixin, TrackingChannel):
     def client(self):
         return get_databand_context().databand_api_client
 
+    @property
+    @cached()
+    def binary_proto(self):
+        return get_databand_context().settings.core.client_binary_proto
+
     @property
     @cached()
     def source_version(self):
@@ -47,12 +55,24 @@ class TrackingProtoWebChannel(ProtobufMixin, TrackingChannel):
         post_event_request.timestamp.GetCurrentTime()
 
         raw_bytes = post_event_request.SerializeToString()
-        encoded_str = base64.b64encode(raw_bytes).decode("utf-8")
-        data = {"data": encoded_str}
-
-        response = self.client.api_request("tracking/proto", data)
-        encoded_str = response.get("result")
-        raw_bytes = base64.b64decode(encoded_str.encode("utf-8"))
+        if self.binary_proto:
+            raw_bytes = self.client.api_request(
+                "tracking/proto",
+                None,
+                raw_data=raw_bytes,
+                headers={
+                    "Content-Type": PROTOBUF_CONTENT_TYPE,
+                    "Accept": PROTOBUF_CONTENT_TYPE,
+                },
+                raw_response=True,
+            )
+        else:
+            encoded_str = base64.b64encode(raw_bytes).decode("utf-8")
+            data = {"data": encoded_str}
+
+            response = self.client.api_request("tracking/proto", data)
+            encoded_str = response.get("result")
+            raw_bytes = base64.b64decode(encoded_str.encode("utf-8"))
 
         post_event_response = PostEventsResponse()
         post_event_response.ParseFromString(raw_bytes)
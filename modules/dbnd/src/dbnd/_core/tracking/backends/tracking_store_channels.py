@@ -1,6 +1,7 @@
 import datetime
 import logging
 import typing
+import weakref
 
 import dbnd
 
@@ -11,8 +12,12 @@ from dbnd._core.constants import (
 )
 from dbnd._core.tracking.backends.abstract_tracking_store import TrackingStore
 from dbnd._core.tracking.backends.channels.abstract_channel import TrackingChannel
+from dbnd._core.tracking.schemas.compiled_dump import compile_dump
 from dbnd._core.tracking.schemas.metrics import Metric
-from dbnd._core.tracking.tracking_info_convertor import TrackingInfoBuilder
+from dbnd._core.tracking.tracking_info_convertor import (
+    SubmittedTrackingInfo,
+    TrackingInfoBuilder,
+)
 from dbnd._core.utils import json_utils
 from dbnd._core.utils.timezone import utcnow
 from dbnd.api.tracking_api import (
@@ -41,6 +46,8 @@ class TrackingStoreThroughChannel(TrackingStore):
     def __init__(self, channel):
         # type: (TrackingChannel) -> None
         self.channel = channel
+        # run -> what this channel has already submitted for it
+        self._submitted = weakref.WeakKeyDictionary()
 
     def init_scheduled_job(self, scheduled_job, update_existing):
         return self._m(
@@ -50,7 +57,10 @@ class TrackingStoreThroughChannel(TrackingStore):
         )
 
     def init_run(self, run):
-        init_args = TrackingInfoBuilder(run).build_init_args()
+        submitted = None
+        if run.context.settings.tracking.dynamic_task_runs_delta:
+            submitted = self._submitted[run] = SubmittedTrackingInfo()
+        init_args = TrackingInfoBuilder(run, submitted=submitted).build_init_args()
         return self.init_run_from_args(init_args=init_args)
 
     def init_run_from_args(self, init_args):
@@ -59,9 +69,9 @@ class TrackingStoreThroughChannel(TrackingStore):
         )
 
     def add_task_runs(self, run, task_runs):
-        task_runs_info = TrackingInfoBuilder(run).build_task_runs_info(
-            task_runs=task_runs, dynamic_task_run_update=True
-        )
+        task_runs_info = TrackingInfoBuilder(
+            run, submitted=self._submitted.get(run)
+        ).build_task_runs_info(task_runs=task_runs, dynamic_task_run_update=True)
         return self._m(
             self.channel.add_task_runs,
             task_runs_info=task_runs_info,
@@ -256,8 +266,7 @@ class TrackingStoreThroughChannel(TrackingStore):
         :return:
         """
         req_schema = self.channel.get_schema_by_handler_name(channel_call.__name__)
-        marsh = req_schema.dump(req_kwargs)
-        resp = channel_call(marsh.data)
+        resp = channel_call(compile_dump(req_schema)(req_kwargs))
         # if resp_schema and resp:
         #     resp = resp_schema.load(resp)
         return resp
@@ -265,6 +274,9 @@ class TrackingStoreThroughChannel(TrackingStore):
     def is_ready(self):
         return self.channel.is_ready()
 
+    def flush(self):
+        return self.channel.flush()
+
     def __str__(self):
         return "TrackingStoreThroughChannel with channel=%s" % (str(self.channel),)
 
@@ -299,3 +311,24 @@ class TrackingStoreThroughChannel(TrackingStore):
         )
 
         return TrackingStoreThroughChannel(channel=TrackingProtoWebChannel())
+
+    @staticmethod
+    def build_with_async_web_channel():
+        from dbnd._core.settings import CoreConfig
+        from dbnd._core.tracking.backends.channels.tracking_async_channel import (
+            AsyncTrackingChannel,
+        )
+        from dbnd._core.tracking.backends.channels.tracking_web_channel import (
+            TrackingWebChannel,
+        )
+
+        core = CoreConfig.current()
+        return TrackingStoreThroughChannel(
+            channel=AsyncTrackingChannel(
+                channel=TrackingWebChannel(),
+                queue_size=core.tracker_async_queue_size,
+                batch_size=core.tracker_async_batch_size,
+                flush_interval=core.tracker_async_flush_interval,
+                flush_timeout=core.tracker_async_flush_timeout,
+            )
+        )
@@ -202,5 +202,8 @@ class CompositeTrackingStore(TrackingStore):
             CompositeTrackingStore.update_task_run_attempts.__name__, kwargs
         )
 
+    def flush(self, **kwargs):
+        return self._invoke(CompositeTrackingStore.flush.__name__, kwargs)
+
     def is_ready(self, **kwargs):
         return all(store.is_ready() for store in self._stores.values())
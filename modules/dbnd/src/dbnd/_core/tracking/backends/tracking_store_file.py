@@ -5,9 +5,11 @@ import json
 import logging
 import os
 import re
+import threading
 import time
 import typing
 
+from collections import OrderedDict
 from datetime import datetime
 
 import six
@@ -17,6 +19,7 @@ from six import BytesIO
 
 from dbnd._core.constants import MetricSource, TaskRunState
 from dbnd._core.errors import DatabandError, DatabandRuntimeError
+from dbnd._core.task_build.task_signature import TASK_ID_INVALID_CHAR_REGEX
 from dbnd._core.task_run.task_run_meta_files import TaskRunMetaFiles
 from dbnd._core.tracking.backends import TrackingStore
 from dbnd._core.tracking.schemas.metrics import Artifact, Metric
@@ -27,6 +30,7 @@ from dbnd._core.tracking.tracking_info_convertor import (
 from dbnd.api.serialization.run import RunInfoSchema
 from dbnd.api.serialization.task import TaskDefinitionInfoSchema, TaskRunInfoSchema
 from targets import target
+from targets.fs import FileSystems
 
 
 if typing.TYPE_CHECKING:
@@ -55,10 +59,175 @@ def _parse_metric(value):
 _METRICS_RE = re.compile(r"(\d+)\s+(.+)")
 
 
+def _metric_line(metric):
+    # type: (Metric) -> str
+    timestamp = int(time.mktime(metric.timestamp.timetuple()))
+    return "{} {}\n".format(timestamp, metric.serialized_value)
+
+
+def _metrics_file_line(metric):
+    # type: (Metric) -> str
+    timestamp = int(time.mktime(metric.timestamp.timetuple()))
+    return "{}\t{}\t{}\t{}\n".format(
+        metric.source or TaskRunMetaFiles._DEFAULT_METRIC_SOURCE,
+        TASK_ID_INVALID_CHAR_REGEX.sub("_", metric.key),
+        timestamp,
+        metric.serialized_value,
+    )
+
+
+class _TaskRunMetricsWriter(object):
+    """
+    Appends metric values of a task run to its metric files.
+    Values are buffered until `flush_size` of them are waiting or `flush_interval`
+    seconds after the first of them was buffered. Local files are kept open till `close`,
+    files at remote file systems can't be appended, so we keep their content and
+    rewrite them on every flush.
+    """
+
+    def __init__(self, meta_files, flush_size, flush_interval, single_file):
+        # type: (TaskRunMetaFiles, int, float, bool) -> None
+        self.meta_files = meta_files
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.single_file = single_file
+
+        self._buffers = OrderedDict()  # path -> (target, lines)
+        self._buffered = 0
+        self._flush_timer = None
+        self._handles = {}
+        self._remote_content = {}
+        self._lock = threading.Lock()
+
+    def append(self, metrics):
+        # type: (List[Metric]) -> None
+        with self._lock:
+            for metric in metrics:
+                if self.single_file:
+                    metric_target = self.meta_files.get_metrics_file()
+                    line = _metrics_file_line(metric)
+                else:
+                    metric_target = self.meta_files.get_metric_target(
+                        metric.key, source=metric.source
+                    )
+                    line = _metric_line(metric)
+
+                buffer = self._buffers.get(metric_target.path)
+                if buffer is None:
+                    buffer = self._buffers[metric_target.path] = (metric_target, [])
+                buffer[1].append(line)
+                self._buffered += 1
+
+            if self._buffered >= self.flush_size or self.flush_interval <= 0:
+                self._flush()
+            elif self._flush_timer is None:
+                # the buffered values are written even if no more values are logged
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        for path, (metric_target, lines) in six.iteritems(self._buffers):
+            self._write(path, metric_target, "".join(lines))
+        self._buffers = OrderedDict()
+        self._buffered = 0
+
+    def _write(self, path, metric_target, data):
+        if metric_target.fs_name != FileSystems.local:
+            content = self._remote_content.get(path)
+            if content is None:
+                content = metric_target.read() if metric_target.exists() else ""
+            content += data
+            metric_target.write(content)
+            self._remote_content[path] = content
+            return
+
+        handle = self._handles.get(path)
+        if handle is None:
+            metric_target.mkdir_parent()
+            handle = self._handles[path] = open(path, "a")
+        handle.write(data)
+        # metrics can be read while the task is running
+        handle.flush()
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                for handle in self._handles.values():
+                    handle.close()
+                self._handles = {}
+                self._remote_content = {}
+
+
 class FileTrackingStore(TrackingStore):
+    def __init__(
+        self, metrics_flush_size=1, metrics_flush_interval=0, metrics_single_file=False
+    ):
+        # type: (int, float, bool) -> None
+        super(FileTrackingStore, self).__init__()
+        self.metrics_flush_size = metrics_flush_size
+        self.metrics_flush_interval = metrics_flush_interval
+        self.metrics_single_file = metrics_single_file
+
+        self._metrics_writers = {}
+        self._metrics_writers_lock = threading.Lock()
+
+    @staticmethod
+    def build_from_config():
+        from dbnd._core.settings import CoreConfig
+
+        core = CoreConfig.current()
+        return FileTrackingStore(
+            metrics_flush_size=core.tracker_file_metrics_flush_size,
+            metrics_flush_interval=core.tracker_file_metrics_flush_interval,
+            metrics_single_file=core.tracker_file_metrics_single_file,
+        )
+
     def set_task_run_state(self, task_run, state, error=None, timestamp=None):
         if state == TaskRunState.RUNNING:
             self.dump_task_run_info(task_run)
+        elif state in TaskRunState.finished_states():
+            self._close_metrics_writer(task_run)
+
+    def set_task_run_states(self, task_runs):
+        for task_run in task_runs:
+            if task_run.task_run_state in TaskRunState.finished_states():
+                self._close_metrics_writer(task_run)
+
+    def flush(self):
+        with self._metrics_writers_lock:
+            writers = list(self._metrics_writers.values())
+        for writer in writers:
+            writer.flush()
+
+    def _get_metrics_writer(self, task_run):
+        # type: (TaskRun) -> _TaskRunMetricsWriter
+        key = task_run.task_run_attempt_uid
+        with self._metrics_writers_lock:
+            writer = self._metrics_writers.get(key)
+            if writer is None:
+                writer = self._metrics_writers[key] = _TaskRunMetricsWriter(
+                    task_run.meta_files,
+                    flush_size=self.metrics_flush_size,
+                    flush_interval=self.metrics_flush_interval,
+                    single_file=self.metrics_single_file,
+                )
+            return writer
+
+    def _close_metrics_writer(self, task_run):
+        with self._metrics_writers_lock:
+            writer = self._metrics_writers.pop(task_run.task_run_attempt_uid, None)
+        if writer:
+            writer.close()
 
     def dump_task_run_info(self, task_run):
 
@@ -98,17 +267,10 @@ class FileTrackingStore(TrackingStore):
 
     def log_metrics(self, task_run, metrics):
         # type: (TaskRun, List[Metric]) -> None
-        for metric in metrics:
-            metric_path = task_run.meta_files.get_metric_target(
-                metric.key, source=metric.source
-            )
-            timestamp = int(time.mktime(metric.timestamp.timetuple()))
-            value = "{} {}\n".format(timestamp, metric.serialized_value)
-
-            data = value
-            if metric_path.exists():
-                data = metric_path.read() + value
-            metric_path.write(data)
+        self._get_metrics_writer(task_run).append(metrics)
+        if task_run.task_run_state in TaskRunState.finished_states():
+            # late values of a finished task run (background value meta that timed out)
+            self._close_metrics_writer(task_run)
 
     def log_artifact(self, task_run, name, artifact, artifact_target):
         artifact_target.mkdir_parent()
@@ -148,18 +310,63 @@ class TaskRunMetricsFileStoreReader(object):
 
     def _get_all_metrics_names(self, source=None):
         metrics_root = self.meta.get_metric_folder(source=source)
-        all_files = [os.path.basename(str(p)) for p in metrics_root.list_partitions()]
-        return [re.sub(r"\.json\b", "", f) for f in all_files]
+        names = []
+        if metrics_root.folder_exists():
+            all_files = [
+                os.path.basename(str(p)) for p in metrics_root.list_partitions()
+            ]
+            names = [re.sub(r"\.json\b", "", f) for f in all_files]
+
+        for key in self._read_metrics_file(source=source):
+            if key not in names:
+                names.append(key)
+        return names
+
+    def _read_metrics_file(self, source=None):
+        """
+        Reads metrics written in single file layout,
+        returns {key: [(timestamp, value)]} of the given source
+        """
+        metrics_file = self.meta.get_metrics_file()
+        if not metrics_file.exists():
+            return {}
+
+        source = source or TaskRunMetaFiles._DEFAULT_METRIC_SOURCE
+        metrics = OrderedDict()
+        for line in metrics_file.readlines():
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            metric_source, key, timestamp, val = line.split("\t", 3)
+            if metric_source == source:
+                metrics.setdefault(key, []).append((timestamp, val))
+        return metrics
 
     def get_metric_history(self, key, source=None):
         metric_target = self.meta.get_metric_target(key, source=source)
         if not metric_target.exists():
-            raise DatabandError("Metric '%s' not found" % key)
+            values = self._read_metrics_file(source=source).get(key)
+            if not values:
+                raise DatabandError("Metric '%s' not found" % key)
+            return [
+                Metric(
+                    key=key,
+                    value=float(val),
+                    timestamp=datetime.fromtimestamp(int(ts)),
+                )
+                for ts, val in values
+            ]
         metric_data = metric_target.readlines()
         rsl = []
         for pair in metric_data:
             ts, val = pair.strip().split(" ")
-            rsl.append(Metric(key, float(val), datetime.fromtimestamp(int(ts))))
+            rsl.append(
+                Metric(
+                    key=key,
+                    value=float(val),
+                    timestamp=datetime.fromtimestamp(int(ts)),
+                )
+            )
         return rsl
 
     def get_all_metrics_values(self, source=None):
@@ -185,7 +392,17 @@ class TaskRunMetricsFileStoreReader(object):
 
         metric_target = self.meta.get_metric_target(key, source=source)
         if not metric_target.exists():
-            raise DatabandRuntimeError("Metric '%s' not found" % key)
+            values = self._read_metrics_file(source=source).get(key)
+            if not values:
+                raise DatabandRuntimeError("Metric '%s' not found" % key)
+            timestamp, val = values[0]
+            return [
+                Metric(
+                    key=key,
+                    value=_parse_metric(val),
+                    timestamp=datetime.fromtimestamp(int(timestamp)),
+                )
+            ]
         metric_data = metric_target.readlines()
         if len(metric_data) == 0:
             raise DatabandRuntimeError("Metric '%s' is malformed. No data found." % key)
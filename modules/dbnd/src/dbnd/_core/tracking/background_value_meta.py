@@ -0,0 +1,166 @@
+import copy
+import logging
+import os
+import threading
+
+from dbnd._core.errors.errors_utils import log_exception
+from dbnd._core.utils.basics.nothing import NOTHING
+
+
+try:
+    from concurrent.futures import Future, ThreadPoolExecutor, wait
+except ImportError:
+    # we are python2
+    from dbnd._vendor.futures import Future, ThreadPoolExecutor, wait
+
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_value(value):
+    """
+    Copy of the value that is not affected by the changes the user code
+    does to the original value after it was logged.
+    Returns NOTHING if the value can't be copied.
+    """
+    try:
+        # pandas/numpy objects copy their data, containers are copied shallowly
+        return copy.copy(value)
+    except Exception:
+        return NOTHING
+
+
+class BackgroundValueMetaCalculator(object):
+    """
+    Calculates value meta (preview, schema, hash, stats, histograms) of logged values
+    in a bounded pool of worker threads, so the tracked code doesn't wait for it.
+
+    `submit` gets a function that calculates the value meta and reports it,
+    the caller blocks only if there are `max_pending` calculations waiting already.
+    `then` runs a function once the given calculations are done (e.g. reports
+    the state of a task run after its values), without blocking the caller.
+    `wait` should be called before the tracking information is flushed,
+    calculations that are not finished after `timeout` seconds are dropped.
+    """
+
+    def __init__(self, workers=2, max_pending=100, timeout=60.0):
+        # type: (int, int, float) -> None
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+
+        self._executor = None
+        self._executor_pid = None
+        self._pending_slots = None
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    def _ensure_executor(self):
+        if self._executor_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._executor_pid == os.getpid():
+                return
+
+            # we get here on first call, or in a forked process,
+            # there are no worker threads after fork
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="dbnd-value-meta"
+            )
+            self._pending_slots = threading.BoundedSemaphore(self.max_pending)
+            self._futures = set()
+            self._executor_pid = os.getpid()
+
+    def submit(self, func, *args, **kwargs):
+        self._ensure_executor()
+        # backpressure on the tracked code, we don't want to keep unlimited
+        # amount of values in memory
+        self._pending_slots.acquire()
+        try:
+            future = self._executor.submit(self._run, func, *args, **kwargs)
+        except Exception:
+            self._pending_slots.release()
+            raise
+
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def then(self, futures, func, *args, **kwargs):
+        """
+        runs `func` once all the `futures` are done (or dropped), in the thread
+        that finishes the last of them; `wait` waits for it as well
+        """
+        futures = [f for f in futures if not f.done()]
+        if not futures:
+            self._run(func, *args, **kwargs)
+            return None
+
+        # continuation is "running" from the start, so `wait` can't cancel it
+        continuation = Future()
+        continuation.set_running_or_notify_cancel()
+        remaining = [len(futures)]
+        with self._lock:
+            self._futures.add(continuation)
+
+        def on_done(_):
+            with self._lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            try:
+                continuation.set_result(self._run(func, *args, **kwargs))
+            finally:
+                with self._lock:
+                    self._futures.discard(continuation)
+
+        for future in futures:
+            future.add_done_callback(on_done)
+        return continuation
+
+    def _run(self, func, *args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as ex:
+            log_exception(
+                "Error occurred during background value meta calculation",
+                ex,
+                non_critical=True,
+            )
+
+    def _on_done(self, future):
+        with self._lock:
+            self._futures.discard(future)
+        self._pending_slots.release()
+
+    def wait(self, futures=None, timeout=None):
+        """
+        waits for the given (by default all) submitted calculations, up to `timeout` seconds
+        """
+        if self._executor_pid != os.getpid():
+            return True
+
+        with self._lock:
+            if futures is None:
+                futures = list(self._futures)
+            else:
+                futures = [f for f in futures if f in self._futures]
+        if not futures:
+            return True
+
+        timeout = self.timeout if timeout is None else timeout
+        _, not_done = wait(futures, timeout=timeout)
+        if not not_done:
+            return True
+
+        cancelled = sum(1 for f in not_done if f.cancel())
+        logger.warning(
+            "Value meta calculation of %s values hasn't finished in %ss, "
+            "%s of them are not going to be reported",
+            len(not_done),
+            timeout,
+            cancelled,
+        )
+        return False
@@ -21,7 +21,56 @@ def _is_task(obj):
     return hasattr(obj, "__is_dbnd_task__")
 
 
-def _track_function(function):
+class _ModuleReferencesIndex(object):
+    """
+    Reverse index of the functions in modules: id(function) -> [(module, name)].
+    Built in a single pass over sys.modules on the first lookup,
+    modules imported later are added on the next lookup.
+    """
+
+    def __init__(self):
+        self._holders = None
+        # module id -> module, we keep the module so the id is not reused
+        self._indexed_modules = {}
+        self._modules_count = 0
+
+    def _index_module(self, module):
+        self._indexed_modules[id(module)] = module
+        try:
+            module_items = list(module.__dict__.items())
+        except Exception:
+            logger.debug("Failed to index module %s", module, exc_info=True)
+            return
+
+        for name, value in module_items:
+            if _is_function(value):
+                self._holders.setdefault(id(value), []).append((module, name))
+
+    def _update(self):
+        if self._holders is None:
+            self._holders = {}
+        elif len(sys.modules) == self._modules_count:
+            return
+
+        modules = list(sys.modules.values())
+        self._modules_count = len(modules)
+        for module in modules:
+            if _is_module(module) and id(module) not in self._indexed_modules:
+                self._index_module(module)
+
+    def replace(self, obj, new_obj):
+        """
+        Replaces all the references to obj in modules with new_obj
+        """
+        self._update()
+        for module, name in self._holders.pop(id(obj), []):
+            module_dict = module.__dict__
+            # the module could rebind the name after we have indexed it
+            if module_dict.get(name) is obj:
+                module_dict[name] = new_obj
+
+
+def _track_function(function, modules_index=None):
     if not _is_function(function) or should_not_track(function) or _is_task(function):
         return
 
@@ -29,52 +78,58 @@ def _track_function(function):
 
     # We modify all modules since each module has its own pointers to local and imported functions.
     # If a module has already imported the function we need to change the pointer in that module.
-    for module in sys.modules.copy().values():
-        if not _is_module(module):
-            continue
+    if modules_index is None:
+        modules_index = _ModuleReferencesIndex()
+    modules_index.replace(function, decorated_function)
 
-        for k, v in module.__dict__.items():
-            if v is function:
-                module.__dict__[k] = decorated_function
+
+def _track_functions(functions, modules_index):
+    for function in functions:
+        try:
+            _track_function(function, modules_index)
+        except Exception:
+            logger.exception("Failed to track %s" % function)
 
 
 def track_functions(*args):
     """ Track functions by decorating them with @task """
-    for arg in args:
-        try:
-            _track_function(arg)
-        except Exception:
-            logger.exception("Failed to track %s" % arg)
+    _track_functions(args, _ModuleReferencesIndex())
 
 
 def _is_module(obj):
     return isinstance(obj, ModuleType)
 
 
-def track_module_functions(module):
-    """
-    Track functions inside module by decorating them with @task.
-    Only functions implemented in module will be tracked, imported functions won't be tracked.
-    """
+def _track_module_functions(module, modules_index):
     try:
         if not _is_module(module):
             return
 
         module_objects = module.__dict__.values()
         module_functions = [i for i in module_objects if _is_module_function(i, module)]
-        track_functions(*module_functions)
+        _track_functions(module_functions, modules_index)
     except Exception:
         logger.exception("Failed to track %s" % module)
 
 
+def track_module_functions(module):
+    """
+    Track functions inside module by decorating them with @task.
+    Only functions implemented in module will be tracked, imported functions won't be tracked.
+    """
+    _track_module_functions(module, _ModuleReferencesIndex())
+
+
 def track_modules(*args):
     """
     Track functions inside modules by decorating them with @task.
     Only functions implemented in module will be tracked, imported functions won't be tracked.
     """
+    # one index of the functions in all the modules for all the tracked functions
+    modules_index = _ModuleReferencesIndex()
     for arg in args:
         try:
-            track_module_functions(arg)
+            _track_module_functions(arg, modules_index)
         except Exception:
             logger.exception("Failed to track %s" % arg)
 
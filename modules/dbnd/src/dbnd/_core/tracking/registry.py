@@ -23,12 +23,13 @@ from dbnd._core.tracking.backends.tracking_store_composite import build_store_na
 logger = logging.getLogger(__name__)
 
 _BACKENDS_REGISTRY = {
-    "file": FileTrackingStore,
+    "file": FileTrackingStore.build_from_config,
     "console": ConsoleStore,
     "debug": TrackingStoreThroughChannel.build_with_console_debug_channel,
     ("api", "web"): TrackingStoreThroughChannel.build_with_web_channel,
     ("api", "proto"): TrackingStoreThroughChannel.build_with_proto_web_channel,
     ("api", "disabled"): TrackingStoreThroughChannel.build_with_disabled_channel,
+    ("api", "async-web"): TrackingStoreThroughChannel.build_with_async_web_channel,
 }
 
 
@@ -0,0 +1,325 @@
+"""
+Schema.dump of marshmallow compiled into plain functions.
+
+Marshmallow resolves the way every field is read and serialized on every call:
+a Marshaller with error store per call, `field.serialize` -> `get_value` -> `_serialize`
+per field and a nested `Schema.dump` per nested object. Tracking payloads are large
+graphs of the same few schemas, so we resolve it once per schema instead:
+
+ * every field becomes (output key, accessor, serializer), where common field types
+   get a specialized serializer and other fields use their own `_serialize`
+ * schemas we can't reproduce exactly (dump processors, `extra`, inferred fields,
+   custom `get_attribute`) and fields with custom `serialize` use marshmallow itself
+ * if a compiled dump fails, we dump again with marshmallow,
+   so errors are reported exactly the way marshmallow reports them
+
+The output is equal to `schema.dump(obj).data`.
+"""
+import logging
+import threading
+import typing
+import uuid
+
+from collections import OrderedDict
+
+from dbnd._vendor.marshmallow import Schema, fields, utils
+from dbnd._vendor.marshmallow_enum import EnumField, LoadDumpOptions
+
+
+if typing.TYPE_CHECKING:
+    from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_missing = utils.missing
+
+_PRE_DUMP = "pre_dump"
+_POST_DUMP = "post_dump"
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def compile_dump(schema):
+    # type: (Schema) -> Callable[[Any], Any]
+    """
+    Returns dump(obj) function of the schema, equal to `schema.dump(obj).data`
+    """
+    dump = _compiled.get(schema)
+    if dump is None:
+        with _compiled_lock:
+            dump = _compiled.get(schema)
+            if dump is None:
+                dump = _compiled[schema] = _SchemaDumpCompiler().compile_schema(schema)
+    return dump
+
+
+def _marshmallow_dump(schema, many=None):
+    def dump(obj):
+        return schema.dump(obj, many=many).data
+
+    return dump
+
+
+def _has_dump_processors(schema):
+    return any(
+        tag[0] in (_PRE_DUMP, _POST_DUMP) and processors
+        for tag, processors in schema.__processors__.items()
+    )
+
+
+def _can_compile_schema(schema):
+    return (
+        not _has_dump_processors(schema)
+        and not schema.extra
+        and not schema.opts.fields
+        and not schema.opts.additional
+        and type(schema).get_attribute is Schema.get_attribute
+    )
+
+
+_subscriptable_types = {}
+
+
+def _is_subscriptable(obj):
+    obj_type = type(obj)
+    subscriptable = _subscriptable_types.get(obj_type)
+    if subscriptable is None:
+        subscriptable = _subscriptable_types[obj_type] = hasattr(
+            obj_type, "__getitem__"
+        )
+    return subscriptable
+
+
+def _get_attribute(obj, key):
+    value = getattr(obj, key, _missing)
+    if value is not _missing and callable(value):
+        return value()
+    return value
+
+
+def _field_default(field):
+    default = field.default
+    if callable(default):
+        return default
+    return lambda: default
+
+
+def _serialize_string(value, obj):
+    if value is None or type(value) is str:
+        return value
+    return utils.ensure_text_type(value)
+
+
+def _serialize_uuid(value, obj):
+    if value is None:
+        return None
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return str(uuid.UUID(value))
+
+
+def _serialize_boolean(value, obj):
+    if value is None:
+        return None
+    if value in fields.Boolean.truthy:
+        return True
+    if value in fields.Boolean.falsy:
+        return False
+    return bool(value)
+
+
+def _serialize_iso_datetime(value, obj):
+    if value is None:
+        return None
+    return utils.isoformat(value, localtime=False)
+
+
+def _serialize_raw(value, obj):
+    return value
+
+
+class _SchemaDumpCompiler(object):
+    def __init__(self):
+        # schema -> dump of single object, nested schemas can refer to each other
+        self._schema_dumps = {}
+
+    def compile_schema(self, schema):
+        if not _can_compile_schema(schema):
+            return _marshmallow_dump(schema)
+
+        dump_one = self._compile_single(schema)
+        if schema.many:
+            dump_many = self._compile_many(dump_one)
+        else:
+            dump_many = None
+
+        def dump(obj):
+            try:
+                if dump_many is not None:
+                    return dump_many(obj)
+                return dump_one(obj)
+            except Exception:
+                # marshmallow reports the error (or dumps what we couldn't)
+                logger.debug(
+                    "Compiled dump of %s failed, using marshmallow",
+                    schema,
+                    exc_info=True,
+                )
+                return schema.dump(obj).data
+
+        return dump
+
+    def _compile_many(self, dump_one):
+        def dump_many(obj):
+            if obj is None:
+                return dump_one(obj)
+            return [dump_one(each) for each in obj]
+
+        return dump_many
+
+    def _compile_single(self, schema):
+        dump = self._schema_dumps.get(schema)
+        if dump is not None:
+            return dump
+
+        # (output key, attribute key, default, serialize(value, obj)) of simple fields,
+        # (output key, None, None, serialize(obj)) of fields with their own lookup
+        plan = []
+        dict_class = OrderedDict if schema.ordered else dict
+
+        def dump(obj):
+            # the same lookup as marshmallow.utils.get_value:
+            # obj[key], if that fails getattr(obj, key) (called if callable)
+            subscriptable = _is_subscriptable(obj)
+            items = []
+            for key, attr_key, get_default, serialize in plan:
+                if attr_key is None:
+                    value = serialize(obj)
+                else:
+                    if subscriptable:
+                        try:
+                            value = obj[attr_key]
+                        except (KeyError, AttributeError, IndexError, TypeError):
+                            value = _get_attribute(obj, attr_key)
+                    else:
+                        value = getattr(obj, attr_key, _missing)
+                        if value is not _missing and callable(value):
+                            value = value()
+                    if value is _missing:
+                        value = get_default()
+                    else:
+                        value = serialize(value, obj)
+                if value is not _missing:
+                    items.append((key, value))
+            return dict_class(items)
+
+        # register before compiling the fields, for recursive schemas
+        self._schema_dumps[schema] = dump
+
+        accessor = schema.get_attribute
+        for attr_name, field in schema.fields.items():
+            if getattr(field, "load_only", False):
+                continue
+            key = "".join([schema.prefix or "", field.dump_to or attr_name])
+            plan.append((key,) + self._compile_field(attr_name, field, accessor))
+        return dump
+
+    def _compile_field(self, attr_name, field, accessor):
+        field_type = type(field)
+        if field_type.serialize is not fields.Field.serialize or (
+            field_type.get_value is not fields.Field.get_value
+            and not (
+                isinstance(field, fields.List) and field.container.attribute is None
+            )
+        ):
+            return (
+                None,
+                None,
+                lambda obj: field.serialize(attr_name, obj, accessor=accessor),
+            )
+
+        if not field._CHECK_ATTRIBUTE:
+            return None, None, lambda obj: field._serialize(None, attr_name, obj)
+
+        attr_key = attr_name if field.attribute is None else field.attribute
+        get_default = _field_default(field)
+        serialize_value = self._compile_value_serializer(attr_name, field)
+        if isinstance(attr_key, str) and "." not in attr_key:
+            return attr_key, get_default, serialize_value
+
+        def serialize_nested_key(obj):
+            value = utils.get_value(attr_key, obj, _missing)
+            if value is _missing:
+                return get_default()
+            return serialize_value(value, obj)
+
+        return None, None, serialize_nested_key
+
+    def _compile_value_serializer(self, attr_name, field):
+        """
+        Returns serialize(value, obj), equal to field._serialize(value, attr_name, obj)
+        """
+        field_type = type(field)
+        if field_type in (fields.String, fields.Str):
+            return _serialize_string
+        if field_type is fields.UUID:
+            return _serialize_uuid
+        if field_type in (fields.Integer, fields.Float, fields.Number) and not (
+            field.as_string
+        ):
+            num_type = field.num_type
+            return lambda value, obj: None if value is None else num_type(value)
+        if field_type is fields.Boolean:
+            return _serialize_boolean
+        if (
+            field_type is fields.DateTime
+            and (field.dateformat or field.DEFAULT_FORMAT) in ("iso", "iso8601")
+            and not field.localtime
+        ):
+            return _serialize_iso_datetime
+        if field_type in (fields.Raw, fields.Dict):
+            return _serialize_raw
+        if field_type is EnumField:
+            if field.dump_by == LoadDumpOptions.value:
+                return lambda value, obj: None if value is None else value.value
+            return lambda value, obj: None if value is None else value.name
+
+        if field_type is fields.Nested and not isinstance(field.only, str):
+            return self._compile_nested(field)
+
+        if field_type is fields.List:
+            container = field.container
+            serialize_item = self._compile_value_serializer(attr_name, container)
+
+            def serialize_list(value, obj):
+                if value is None:
+                    return None
+                if utils.is_collection(value):
+                    return [serialize_item(each, obj) for each in value]
+                return [serialize_item(value, obj)]
+
+            return serialize_list
+
+        return lambda value, obj: field._serialize(value, attr_name, obj)
+
+    def _compile_nested(self, field):
+        schema = field.schema
+        if not _can_compile_schema(schema):
+            return lambda value, obj: field._serialize(value, field.name, obj)
+
+        # compiled on first use: "self" nesting creates a new schema for every level
+        compiled = []
+
+        def serialize_nested(value, obj):
+            if value is None:
+                return None
+            if not compiled:
+                dump_one = self._compile_single(schema)
+                if field.many:
+                    compiled.append(self._compile_many(dump_one))
+                else:
+                    compiled.append(dump_one)
+            return compiled[0](value)
+
+        return serialize_nested
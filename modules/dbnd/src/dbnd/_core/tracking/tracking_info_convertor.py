@@ -1,11 +1,13 @@
 import logging
 import typing
 
+from collections import defaultdict
 from functools import partial
 
 from dbnd._core.configuration import get_dbnd_project_config
 from dbnd._core.constants import RunState, TaskRunState, UpdateSource
 from dbnd._core.plugin.dbnd_plugins import should_use_airflow_monitor
+from dbnd._core.task_build.task_context import current_task_stack, has_current_task
 from dbnd._core.task_build.task_results import FuncResultParameter
 from dbnd._core.tracking.schemas.tracking_info_objects import (
     TargetInfo,
@@ -23,7 +25,7 @@ from dbnd.api.tracking_api import InitRunArgs, TaskRunsInfo
 
 if typing.TYPE_CHECKING:
     from dbnd._core.context.databand_context import DatabandContext
-    from typing import Dict, List
+    from typing import Dict, List, Optional
     from targets import Target
     from dbnd._core.task import Task
     from dbnd._core.run.databand_run import DatabandRun
@@ -32,9 +34,32 @@ if typing.TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class SubmittedTrackingInfo(object):
+    """
+    What was already sent to the tracking server for a run,
+    so updates of dynamically added task runs carry only the new parts of it
+    """
+
+    def __init__(self):
+        # (task_definition_uid, source_hash)
+        self.task_definitions = set()
+        self.target_paths = set()
+        # child task_id -> parent task_ids, for children without task run yet
+        self.pending_parents = defaultdict(set)
+
+
+def _task_definition_key(task_definition):
+    source_code = task_definition.source_code
+    return (
+        task_definition.task_definition_uid,
+        source_md5(source_code.task_source_code) if source_code else None,
+    )
+
+
 class TrackingInfoBuilder(object):
-    def __init__(self, run):
+    def __init__(self, run, submitted=None):
         self.run = run  # type: DatabandRun
+        self.submitted = submitted  # type: Optional[SubmittedTrackingInfo]
 
     def _run_to_run_info(self):
         # type: () -> RunInfo
@@ -110,6 +135,18 @@ class TrackingInfoBuilder(object):
         return init_args
 
     def build_task_runs_info(self, task_runs, dynamic_task_run_update=False):
+        # type: (List[TaskRun], bool) -> TaskRunsInfo
+        if dynamic_task_run_update and self.submitted is not None:
+            return self.build_task_runs_delta_info(task_runs)
+
+        task_runs_info = self._build_task_runs_full_info(
+            task_runs, dynamic_task_run_update
+        )
+        if self.submitted is not None:
+            self._mark_submitted(task_runs_info)
+        return task_runs_info
+
+    def _build_task_runs_full_info(self, task_runs, dynamic_task_run_update):
         # type: (List[TaskRun], bool) -> TaskRunsInfo
         run = self.run
         task_defs = {}
@@ -145,19 +182,107 @@ class TrackingInfoBuilder(object):
             for upstream in task_dag.upstream:
                 _add_rel(upstreams_map, task.task_id, upstream.task_id)
 
-        return TaskRunsInfo(
-            run_uid=self.run.run_uid,
-            root_run_uid=self.run.root_run_info.root_run_uid,
-            task_run_env_uid=run.context.task_run_env.uid,
+        return self._task_runs_info(
             task_definitions=[val for key, val in sorted(task_defs.items())],
             task_runs=[val for key, val in sorted(all_task_models.items())],
             targets=[val for key, val in sorted(all_targets.items())],
             parent_child_map=parent_child_map,
             upstreams_map=upstreams_map,
             dynamic_task_run_update=dynamic_task_run_update,
+        )
+
+    def build_task_runs_delta_info(self, task_runs):
+        # type: (List[TaskRun]) -> TaskRunsInfo
+        """
+        Update with new task runs only: their relations, and task definitions and targets
+        that were not submitted yet. The cost depends on the new task runs, not on the run size
+        """
+        run = self.run
+        submitted = self.submitted
+
+        task_defs = {}
+        all_task_models = {}
+        all_targets = {}
+        upstreams_map = set()
+        parent_child_map = set()
+
+        def _add_rel(rel_map, t_id_1, t_id_2):
+            tr_1 = run.get_task_run_by_id(t_id_1)
+            tr_2 = run.get_task_run_by_id(t_id_2)
+            if tr_1 and tr_2:
+                rel_map.add((tr_1.task_run_uid, tr_2.task_run_uid))
+
+        # children are added to the running task, the new task runs are created in it
+        task_stack = current_task_stack() if has_current_task() else []
+
+        for task_run in task_runs:
+            task = task_run.task
+            task_id = task.task_id
+
+            td_key = _task_definition_key(task.task_definition)
+            if td_key not in submitted.task_definitions:
+                submitted.task_definitions.add(td_key)
+                task_defs[task.task_definition.full_task_family] = task_to_task_def(
+                    run.context, task
+                )
+
+            self.task_to_targets(task, all_targets)
+            all_task_models[task_id] = build_task_run_info(task_run)
+
+            for child_id in task.descendants.children:
+                if run.get_task_run_by_id(child_id):
+                    _add_rel(parent_child_map, task_id, child_id)
+                else:
+                    submitted.pending_parents[child_id].add(task_id)
+            for parent_id in submitted.pending_parents.pop(task_id, ()):
+                _add_rel(parent_child_map, parent_id, task_id)
+            for parent in task_stack:
+                if task_id in parent.descendants.children:
+                    _add_rel(parent_child_map, parent.task_id, task_id)
+
+            task_dag = task.ctrl.task_dag
+            for upstream_id in task_dag.upstream_task_ids:
+                _add_rel(upstreams_map, task_id, upstream_id)
+            for downstream_id in task_dag.downstream_task_ids:
+                _add_rel(upstreams_map, downstream_id, task_id)
+
+        targets = [
+            val
+            for key, val in sorted(all_targets.items())
+            if key not in submitted.target_paths
+        ]
+        submitted.target_paths.update(target.path for target in targets)
+        return self._task_runs_info(
+            task_definitions=[val for key, val in sorted(task_defs.items())],
+            task_runs=[val for key, val in sorted(all_task_models.items())],
+            targets=targets,
+            parent_child_map=parent_child_map,
+            upstreams_map=upstreams_map,
+            dynamic_task_run_update=True,
+        )
+
+    def _mark_submitted(self, task_runs_info):
+        # type: (TaskRunsInfo) -> None
+        run = self.run
+        submitted = self.submitted
+        for task_run in run.task_runs:
+            task = task_run.task
+            submitted.task_definitions.add(_task_definition_key(task.task_definition))
+            for child_id in task.descendants.children:
+                if not run.get_task_run_by_id(child_id):
+                    submitted.pending_parents[child_id].add(task.task_id)
+        submitted.target_paths.update(t.path for t in task_runs_info.targets)
+
+    def _task_runs_info(self, **kwargs):
+        run = self.run
+        return TaskRunsInfo(
+            run_uid=run.run_uid,
+            root_run_uid=run.root_run_info.root_run_uid,
+            task_run_env_uid=run.context.task_run_env.uid,
             af_context=run.af_context,
             parent_task_run_uid=run.root_run_info.root_task_run_uid,
             parent_task_run_attempt_uid=run.root_run_info.root_task_run_attempt_uid,
+            **kwargs
         )
 
     def task_to_targets(self, task, targets):
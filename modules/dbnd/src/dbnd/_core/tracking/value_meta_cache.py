@@ -0,0 +1,109 @@
+import logging
+import threading
+import typing
+import weakref
+
+from collections import OrderedDict
+
+
+if typing.TYPE_CHECKING:
+    from typing import Any
+    from targets.value_meta import ValueMeta, ValueMetaConf
+    from targets.values import ValueType
+
+logger = logging.getLogger(__name__)
+
+
+def _estimate_value_meta_size(value_meta):
+    # type: (ValueMeta) -> int
+    return (
+        len(value_meta.value_preview or "")
+        + len(repr(value_meta.data_schema))
+        + len(repr(value_meta.descriptive_stats))
+        + len(repr(value_meta.histograms))
+    )
+
+
+class _CacheEntry(object):
+    __slots__ = ("value_ref", "value_meta", "size")
+
+    def __init__(self, value_ref, value_meta, size):
+        self.value_ref = value_ref
+        self.value_meta = value_meta
+        self.size = size
+
+
+class ValueMetaCache(object):
+    """
+    Run scoped cache of calculated value meta, so logging the same unchanged object
+    again (i.e. a DataFrame that is passed through a chain of tracked functions)
+    doesn't recalculate its preview, hash, stats and histograms.
+
+    Entries are keyed by the object identity, the fingerprint provided by its value type
+    and the value meta conf. We keep a weak reference to the object, so the identity
+    of an object that doesn't exist anymore can't be matched.
+    Least recently used entries are evicted when the estimated size of the cached
+    value metas is over `max_size` bytes.
+    """
+
+    def __init__(self, max_size):
+        # type: (int) -> None
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_value_meta(self, value, value_type, meta_conf):
+        # type: (Any, ValueType, ValueMetaConf) -> ValueMeta
+        fingerprint = value_type.get_value_meta_fingerprint(value)
+        if fingerprint is None:
+            return value_type.get_value_meta(value, meta_conf=meta_conf)
+
+        key = (id(value), type(value_type), fingerprint, repr(meta_conf))
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry.value_ref() is value:
+                # re-insert to mark as most recently used
+                self._entries[key] = entry
+                self.hits += 1
+                return entry.value_meta
+
+            if entry is not None:
+                self._size -= entry.size
+            self.misses += 1
+
+        value_meta = value_type.get_value_meta(value, meta_conf=meta_conf)
+        try:
+            value_ref = weakref.ref(value)
+        except TypeError:
+            return value_meta
+
+        size = _estimate_value_meta_size(value_meta)
+        if size > self.max_size:
+            return value_meta
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = _CacheEntry(value_ref, value_meta, size)
+            self._size += size
+            while self._size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+        return value_meta
+
+    def get_stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size": self._size,
+        }
@@ -10,3 +10,4 @@ AUTHS_SUPPORTED = [NO_AUTH, AUTH_KERBEROS, AUTH_BASIC]
 CONFIGURABLE_RETRY = "configurable"
 LINEAR_RETRY = "linear"
 LINEAR_RETRY_ANY_ERROR = "linear_retry_any_error"
+EXPONENTIAL_BACKOFF_RETRY = "exponential_backoff"
@@ -1,10 +1,12 @@
 # originally from sparkmagic package
 # Copyright (c) 2015  aggftw@gmail.com
 # Distributed under the terms of the Modified BSD License.s
+import random
 
 from dbnd._core.errors import DatabandConfigError
 from dbnd._core.utils.http.constants import (
     CONFIGURABLE_RETRY,
+    EXPONENTIAL_BACKOFF_RETRY,
     LINEAR_RETRY,
     LINEAR_RETRY_ANY_ERROR,
 )
@@ -33,6 +35,10 @@ def get_retry_policy(name, policy=None, seconds_to_sleep=5, max_retries=5):
         return LinearRetryOnAnyError(
             seconds_to_sleep=seconds_to_sleep, max_retries=max_retries
         )
+    elif policy == EXPONENTIAL_BACKOFF_RETRY:
+        return ExponentialBackoffRetryPolicy(
+            base_seconds_to_sleep=seconds_to_sleep, max_retries=max_retries
+        )
     else:
         raise DatabandConfigError(u"Retry policy '{}' not supported".format(policy))
 
@@ -97,3 +103,22 @@ class LinearRetryOnAnyError(LinearRetryPolicy):
         if self.max_retries != -1 and retry_count >= self.max_retries:
             return False
         return True
+
+
+class ExponentialBackoffRetryPolicy(LinearRetryPolicy):
+    """Retry policy that doubles the sleep between calls up to max_seconds_to_sleep,
+    the actual sleep is randomly picked between 0 and that value ("full jitter"),
+    so many clients that failed together don't hit the server together again.
+    Takes all status codes 500 or above to be retriable, and retries a given maximum number of times."""
+
+    def __init__(self, base_seconds_to_sleep, max_retries, max_seconds_to_sleep=30):
+        super(ExponentialBackoffRetryPolicy, self).__init__(
+            base_seconds_to_sleep, max_retries
+        )
+        self.max_seconds_to_sleep = max_seconds_to_sleep
+
+    def seconds_to_sleep(self, retry_count):
+        exponent = max(retry_count - 1, 0)
+        # don't let the exponent overflow for the "infinite" retries
+        backoff = self._seconds_to_sleep * (2 ** min(exponent, 32))
+        return random.uniform(0, min(backoff, self.max_seconds_to_sleep))
@@ -71,6 +71,7 @@ class DagSchema(ApiObjectSchema):
     task_args = fields.Dict()
     is_active = fields.Boolean(allow_none=True)
     is_paused = fields.Boolean(allow_none=True)
+    dag_hash = fields.String(allow_none=True)
 
 
 class DagRunSchema(ApiObjectSchema):
@@ -1,4 +1,7 @@
 import logging
+import threading
+import time
+import zlib
 
 from datetime import datetime, timedelta
 from time import sleep
@@ -6,6 +9,8 @@ from typing import Dict, Optional, Union
 
 import requests
 
+from requests.adapters import HTTPAdapter
+from requests.compat import json as complexjson
 from six.moves.urllib_parse import urljoin
 
 from dbnd._core.current import try_get_databand_run
@@ -19,13 +24,16 @@ from dbnd._core.errors.friendly_error.api import (
     unauthorized_api_call,
 )
 from dbnd._core.log.logging_utils import create_file_handler
-from dbnd._core.utils.http.retry_policy import LinearRetryPolicy
+from dbnd._core.utils.http.retry_policy import ExponentialBackoffRetryPolicy
 from dbnd._vendor import curlify
 from dbnd.utils.trace import get_tracing_id
 
 
 # we'd like to have all requests with default timeout, just in case it's stuck
 DEFAULT_REQUEST_TIMEOUT = 300
+# same as the requests defaults
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +43,45 @@ logger = logging.getLogger(__name__)
 # http.client.HTTPConnection.debuglevel = 1
 
 
+def gzip_compress(data):
+    # type: (bytes) -> bytes
+    # gzip.compress is not available at python 2
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class EndpointLatency(object):
+    """Latency counters of the requests sent to a single endpoint"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.request_bytes = 0
+
+    def add(self, seconds, request_bytes, failed):
+        self.count += 1
+        self.errors += int(failed)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.request_bytes += request_bytes
+
+    @property
+    def avg_seconds(self):
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def as_dict(self):
+        return dict(
+            count=self.count,
+            errors=self.errors,
+            total_seconds=self.total_seconds,
+            avg_seconds=self.avg_seconds,
+            max_seconds=self.max_seconds,
+            request_bytes=self.request_bytes,
+        )
+
+
 class ApiClient(object):
     """Json API client implementation."""
 
@@ -50,18 +97,29 @@ class ApiClient(object):
         default_max_retry=1,  # type: int
         default_retry_sleep=0,  # type: Union[int, float]
         default_request_timeout=DEFAULT_REQUEST_TIMEOUT,  # Union[float, Tuple[float, float]],
+        default_retry_max_sleep=30,  # type: Union[int, float]
+        pool_connections=DEFAULT_POOL_CONNECTIONS,  # type: int
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,  # type: int
+        compression_threshold=None,  # type: Optional[int]
     ):
         """
         @param api_base_url: databand webserver url to build the request with
         @param credentials: dict of credential to authenticate with the webserver
          can include "token" key or "username"  and "password" keys
         @param debug_server: flag to debug the webserver - collect logs from webserver and the client's requests
-        @param session_timeout: minutes to recreate the requests session
+        @param session_timeout: minutes to recreate the requests session of a login (username/password)
+         authentication, sessions authenticated by token (or not authenticated) are kept alive
         @param default_max_retry: default value for retries for failed connection
-        @param default_retry_sleep: default value for sleep between retries
+        @param default_retry_sleep: default value for the base sleep between retries,
+         the sleep is doubled (with a random jitter) on every retry
         @param default_request_timeout: (optional) How long to wait for the server to send
             data before giving up, as a float, or a :ref:`(connect timeout,
             read timeout) <timeouts>` tuple
+        @param default_retry_max_sleep: the maximal sleep between retries
+        @param pool_connections: number of connection pools (hosts) to cache
+        @param pool_maxsize: maximal number of connections to keep open to a single host
+        @param compression_threshold: (optional) gzip request bodies of this size (in bytes) or bigger,
+         the webserver should support `Content-Encoding: gzip` requests
         """
 
         self._api_base_url = api_base_url
@@ -78,6 +136,14 @@ class ApiClient(object):
         self.default_max_retry = default_max_retry
         self.default_retry_sleep = default_retry_sleep
         self.default_request_timeout = default_request_timeout
+        self.default_retry_max_sleep = default_retry_max_sleep
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.compression_threshold = compression_threshold
+
+        self._latency_lock = threading.Lock()
+        self._endpoints_latency = {}  # type: Dict[str, EndpointLatency]
 
         self.debug_mode = debug_server
         if debug_server:
@@ -89,14 +155,59 @@ class ApiClient(object):
             self.webserver_logger = build_file_logger("webserver")
 
     def remove_session(self):
+        if self.session:
+            # release the pooled connections
+            self.session.close()
         self.session = None
         self.session_creation_time = None
 
     def is_session_timedout(self):
+        if not self._is_login_session():
+            # nothing to refresh, keep the connections alive
+            return False
         return datetime.now() - self.session_creation_time >= timedelta(
             minutes=self.session_timeout
         )
 
+    def _is_login_session(self):
+        return self.is_auth_required and not self.credentials.get("token")
+
+    def get_endpoints_latency(self):
+        # type: () -> Dict[str, Dict[str, float]]
+        with self._latency_lock:
+            return {
+                endpoint: latency.as_dict()
+                for endpoint, latency in self._endpoints_latency.items()
+            }
+
+    def _add_endpoint_latency(self, endpoint, seconds, request_bytes, failed):
+        with self._latency_lock:
+            latency = self._endpoints_latency.get(endpoint)
+            if latency is None:
+                latency = self._endpoints_latency[endpoint] = EndpointLatency()
+            latency.add(seconds, request_bytes, failed)
+
+    def _build_body(self, data, raw_data, headers):
+        """
+        Returns the json or raw body as (possibly compressed) bytes,
+        or None if the body is left for requests to serialize
+        """
+        if raw_data is not None:
+            body = raw_data
+            headers.setdefault("Content-Type", "application/octet-stream")
+        elif data is not None and self.compression_threshold is not None:
+            body = complexjson.dumps(data).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        else:
+            return None
+
+        if self.compression_threshold is not None and (
+            len(body) >= self.compression_threshold
+        ):
+            body = gzip_compress(body)
+            headers["Content-Encoding"] = "gzip"
+        return body
+
     def _request(
         self,
         endpoint,
@@ -105,6 +216,8 @@ class ApiClient(object):
         headers=None,
         query=None,
         request_timeout=None,
+        raw_data=None,
+        raw_response=False,
     ):
         if not self.session or self.is_session_timedout():
             logger.info(
@@ -114,27 +227,44 @@ class ApiClient(object):
 
         headers = dict(self.default_headers, **(headers or {}))
         url = urljoin(self._api_base_url, endpoint)
+        body = self._build_body(data, raw_data, headers)
+        start_time = time.time()
+        failed = True
         try:
             headers["X-Databand-Trace-ID"] = get_tracing_id().hex
             request_params = dict(
                 method=method,
                 url=url,
-                json=data,
                 headers=headers,
                 params=query,
                 timeout=request_timeout or self.default_request_timeout,
             )
+            if body is None:
+                request_params["json"] = data
+            else:
+                request_params["data"] = body
             logger.debug("Sending the following request: %s", request_params)
             resp = self._send_request(**request_params)
+            failed = not resp.ok
 
         except requests.exceptions.ConnectionError as ce:
             logger.info("Got connection error while sending request: {}".format(ce))
             self.remove_session()
             raise
+        finally:
+            self._add_endpoint_latency(
+                endpoint,
+                time.time() - start_time,
+                len(body) if body is not None else 0,
+                failed,
+            )
 
         if self.debug_mode:
             # save the curl of the current request
-            curl_request = curlify.to_curl(resp.request)
+            try:
+                curl_request = curlify.to_curl(resp.request)
+            except UnicodeDecodeError:
+                curl_request = "{} {} <binary body>".format(method, url)
             self.requests_logger.info(curl_request)
 
         if not resp.ok:
@@ -146,6 +276,9 @@ class ApiClient(object):
                 method, url, resp.status_code, resp.content.decode("utf-8")
             )
 
+        if raw_response:
+            return resp.content
+
         if resp.content:
             try:
                 data = resp.json()
@@ -168,7 +301,13 @@ class ApiClient(object):
     def _init_session(self, credentials):
         logger.info("Initialising session for webserver")
         try:
+            self.remove_session()
             self.session = requests.session()
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+            )
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
             self.session_creation_time = datetime.now()
 
             if not self.is_auth_required:
@@ -207,10 +346,18 @@ class ApiClient(object):
         retry_policy=None,
         failure_handler=None,
         request_timeout=None,
+        raw_data=None,
+        raw_response=False,
     ):
-        retry_policy = retry_policy or LinearRetryPolicy(
-            seconds_to_sleep=self.default_retry_sleep,
+        """
+        @param data: json body of the request
+        @param raw_data: (optional) bytes body of the request, used instead of data
+        @param raw_response: return the response bytes instead of the parsed json
+        """
+        retry_policy = retry_policy or ExponentialBackoffRetryPolicy(
+            base_seconds_to_sleep=self.default_retry_sleep,
             max_retries=self.default_max_retry,
+            max_seconds_to_sleep=self.default_retry_max_sleep,
         )
         url = endpoint if no_prefix else urljoin(self.api_prefix, endpoint)
 
@@ -225,6 +372,8 @@ class ApiClient(object):
                     headers=headers,
                     query=query,
                     request_timeout=request_timeout,
+                    raw_data=raw_data,
+                    raw_response=raw_response,
                 )
             except (requests.ConnectionError, requests.Timeout) as ex:
                 if failure_handler:
@@ -1,5 +1,6 @@
 import os
 
+from targets import _set_patches
 from targets.base_target import Target
 from targets.caching import DbndLocalFileMetadataRegistry
 from targets.data_target import DataTarget
@@ -16,3 +17,7 @@ from targets.fs.local import LocalFileSystem
 from targets.inmemory_target import InMemoryTarget
 from targets.target_factory import target
 from targets.utils.atomic import AtomicLocalFile
+
+
+# DataFrame.to_target, `import dbnd` doesn't load targets any more
+str(_set_patches)  # NOQA
@@ -147,6 +147,14 @@ class DataTarget(Target):
 
         return value
 
+    def load_partitioned(self, value_type, **kwargs):
+        """
+        Yields the value of every partition, the whole data is never loaded at once
+        """
+        m = get_marshaller_ctrl(self, value_type)
+        for value in m.load_partitioned(**kwargs):
+            yield value
+
     def touch(self):
         return self.as_object.touch()
 
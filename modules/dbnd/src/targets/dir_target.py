@@ -48,12 +48,20 @@ class DirTarget(FileTarget):
             flag = DEFAULT_FLAG_FILE_NAME  # default value, otherwise override it
 
         self.flag_target = target(path, flag, fs=fs) if flag else None
+        # write target is built on first use,
+        # most of the folders (task and attempt folders) never write to it
+        self._write_target_ = None
 
         self._auto_partition_count = 0
-        self._write_target = self.partition("part-0000")
 
         self.meta_files = config.meta_files
 
+    @property
+    def _write_target(self):
+        if self._write_target_ is None:
+            self._write_target_ = self.partition("part-0000")
+        return self._write_target_
+
     def exists(self):
         path = self.path
         if self.flag_target:
@@ -28,6 +28,8 @@ class FileSystem(object):
 
     name = None
     support_direct_access = False
+    # open_read(path, "rb") returns a seekable file that fetches only the parts it reads
+    support_range_read = False
     _exist_after_write_consistent = True
     local = False
 
@@ -192,6 +194,14 @@ class FileSystem(object):
         else:
             self.download_file(path, location, **kwargs)
 
+    def content_fingerprint(self, path):
+        """
+        Identifier of the current content of the file at ``path`` (checksum, etag, generation),
+        identical files should have identical fingerprints.
+        Returns ``None`` if the file system can't provide it or ``path`` is not a file.
+        """
+        return None
+
     def download_file(self, path, location, **kwargs):
         raise NotImplementedError(
             "download_file() not implemented on {0}".format(self.__class__.__name__)
@@ -0,0 +1,225 @@
+"""
+Seekable read-only file objects over remote objects, backed by range requests.
+
+Columnar formats (parquet, feather/arrow) read the footer first and then only the
+column chunks they need, so with a seekable file object we don't have to download
+the whole object. The object is read in blocks of `block_size` bytes:
+
+ * recently used blocks are kept in a LRU cache of `max_cached_blocks` blocks
+ * missing blocks of a single read are fetched with a single request, cached blocks in
+   between are fetched again if there are at most `max_gap_blocks` of them
+ * sequential reads double the amount of blocks fetched ahead of a missing block,
+   up to `max_read_ahead_blocks`, a seek to another place resets the read-ahead
+"""
+from __future__ import absolute_import
+
+import io
+import threading
+
+from collections import OrderedDict
+
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_MAX_READ_AHEAD_BLOCKS = 4
+DEFAULT_MAX_CACHED_BLOCKS = 16
+DEFAULT_MAX_GAP_BLOCKS = 1
+
+
+class RangeRequestFile(io.RawIOBase):
+    """
+    :param name: path of the object, for logging and error messages
+    :param size: size of the object in bytes
+    :param fetch_range: fetch_range(start, end) returns the bytes [start, end) of the object
+    """
+
+    def __init__(
+        self,
+        name,
+        size,
+        fetch_range,
+        block_size=DEFAULT_BLOCK_SIZE,
+        max_read_ahead_blocks=DEFAULT_MAX_READ_AHEAD_BLOCKS,
+        max_cached_blocks=DEFAULT_MAX_CACHED_BLOCKS,
+        max_gap_blocks=DEFAULT_MAX_GAP_BLOCKS,
+    ):
+        super(RangeRequestFile, self).__init__()
+        if block_size <= 0:
+            raise ValueError("block_size should be positive, got %s" % block_size)
+        self.name = name
+        self.size = size
+        self.block_size = block_size
+        self.max_read_ahead_blocks = max(0, max_read_ahead_blocks)
+        self.max_cached_blocks = max(1, max_cached_blocks)
+        self.max_gap_blocks = max(0, max_gap_blocks)
+
+        self._fetch_range = fetch_range
+        self._blocks = OrderedDict()
+        self._pos = 0
+        self._read_ahead = 0
+        self._last_block = None
+        self._lock = threading.Lock()
+
+        # statistics, useful to tune the options
+        self.requests = 0
+        self.bytes_fetched = 0
+
+    @property
+    def _blocks_count(self):
+        return (self.size + self.block_size - 1) // self.block_size
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def writable(self):
+        return False
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError("invalid whence (%s)" % whence)
+        if pos < 0:
+            raise ValueError("negative seek position %s" % pos)
+        self._pos = pos
+        return pos
+
+    def readinto(self, b):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        view = memoryview(b)
+        start = self._pos
+        end = min(start + len(view), self.size)
+        if end <= start:
+            return 0
+
+        with self._lock:
+            first = start // self.block_size
+            last = (end - 1) // self.block_size
+            blocks = self._get_blocks(first, last)
+
+        written = 0
+        for index in range(first, last + 1):
+            block = blocks[index]
+            block_start = index * self.block_size
+            offset = max(start, block_start) - block_start
+            length = min(end - block_start, len(block)) - offset
+            view[written : written + length] = block[offset : offset + length]
+            written += length
+
+        self._pos = start + written
+        return written
+
+    def readall(self):
+        return self.read(max(0, self.size - self._pos))
+
+    def _get_blocks(self, first, last):
+        """
+        Returns {index: block} of blocks [first, last],
+        fetches the missing blocks (and read-ahead blocks) with as few requests as possible
+        """
+        if self._last_block is not None and first in (
+            self._last_block,
+            self._last_block + 1,
+        ):
+            self._read_ahead = min(
+                self.max_read_ahead_blocks, max(1, self._read_ahead * 2)
+            )
+        else:
+            self._read_ahead = 0
+        self._last_block = last
+
+        missing = [i for i in range(first, last + 1) if i not in self._blocks]
+        if missing:
+            # read-ahead only together with a request we have to send anyway
+            fetch_last = min(last + self._read_ahead, self._blocks_count - 1)
+            missing += [
+                i for i in range(last + 1, fetch_last + 1) if i not in self._blocks
+            ]
+
+        result = {}
+        for run_first, run_last in self._coalesce(missing):
+            result.update(self._fetch_blocks(run_first, run_last))
+
+        for index in range(first, last + 1):
+            if index not in result:
+                result[index] = self._blocks[index]
+            # mark as the most recently used
+            self._blocks[index] = self._blocks.pop(index, result[index])
+
+        while len(self._blocks) > self.max_cached_blocks:
+            self._blocks.popitem(last=False)
+        return result
+
+    def _coalesce(self, missing):
+        runs = []
+        for index in missing:
+            if runs and index - runs[-1][1] - 1 <= self.max_gap_blocks:
+                runs[-1][1] = index
+            else:
+                runs.append([index, index])
+        return runs
+
+    def _fetch_blocks(self, first, last):
+        start = first * self.block_size
+        end = min((last + 1) * self.block_size, self.size)
+        data = self._fetch_range(start, end)
+        if len(data) != end - start:
+            raise IOError(
+                "Failed to read %s: expected %s bytes at %s, got %s"
+                % (self.name, end - start, start, len(data))
+            )
+        self.requests += 1
+        self.bytes_fetched += len(data)
+
+        blocks = {}
+        for index in range(first, last + 1):
+            offset = index * self.block_size - start
+            block = data[offset : offset + self.block_size]
+            blocks[index] = block
+            self._blocks[index] = block
+        return blocks
+
+    def close(self):
+        self._blocks.clear()
+        super(RangeRequestFile, self).close()
+
+
+def get_range_read_options():
+    """
+    Block cache and read-ahead options of remote reads, from `[output]` configuration
+    """
+    from dbnd._core.current import try_get_databand_context
+
+    context = try_get_databand_context()
+    if not context or not getattr(context, "settings", None):
+        return {}
+    output = context.settings.output
+    return dict(
+        block_size=output.remote_read_block_size,
+        max_read_ahead_blocks=output.remote_read_ahead_blocks,
+        max_cached_blocks=output.remote_read_cached_blocks,
+        max_gap_blocks=output.remote_read_max_gap_blocks,
+    )
+
+
+def open_range_file(name, size, fetch_range, **options):
+    """
+    Buffered seekable binary file over the object, see `RangeRequestFile` for the options.
+    Options that are not provided are taken from `[output]` configuration
+    """
+    for key, value in get_range_read_options().items():
+        options.setdefault(key, value)
+    raw = RangeRequestFile(name, size, fetch_range, **options)
+    return io.BufferedReader(raw)
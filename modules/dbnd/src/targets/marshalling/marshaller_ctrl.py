@@ -1,13 +1,24 @@
 import types
 
+from collections import deque
+from itertools import islice
+
 import attr
 
+from dbnd._core.current import get_partitions_load_workers
 from dbnd._core.errors import friendly_error
 from targets.marshalling import StrLinesMarshaller, StrMarshaller
 from targets.marshalling.marshaller import Marshaller
 from targets.values import ValueType
 
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # we are python2
+    from dbnd._vendor.futures import ThreadPoolExecutor
+
+
 @attr.s
 class MarshallerCtrl(object):
     target = attr.ib()
@@ -23,15 +34,22 @@ class MarshallerCtrl(object):
             value = self.value_type.parse_from_str_lines(value)
         return value
 
-    def _load(self, **kwargs):
+    def _get_partitioned_target(self):
         from targets.dir_target import DirTarget
         from targets.file_target import FileTarget
-        from targets.multi_target import MultiTarget
 
-        m = self.marshaller
         target = self.target
         if isinstance(target, FileTarget) and target.fs.isdir(target.path):
             target = DirTarget(target.path + "/", target.fs, config=target.config)
+        return target
+
+    def _load(self, **kwargs):
+        from targets.dir_target import DirTarget
+        from targets.file_target import FileTarget
+        from targets.multi_target import MultiTarget
+
+        m = self.marshaller
+        target = self._get_partitioned_target()
 
         if isinstance(target, MultiTarget):
             if m.support_multi_target_direct_read:
@@ -51,9 +69,24 @@ class MarshallerCtrl(object):
         # Concatenate all data into one DataFrame
         # We don't want list to be stored in memory
         # however, concat does list() on the iterator as one of the first things
-        partitions_values = [m.target_to_value(t, **kwargs) for t in partitions]
+        # use load_partitioned() to process partitions one by one
+        partitions_values = self._load_partitions(partitions, **kwargs)
         return self.value_type.merge_values(*partitions_values)
 
+    def _load_partitions(self, partitions, **kwargs):
+        workers = min(get_partitions_load_workers(), len(partitions))
+        if workers <= 1:
+            return [self.marshaller.target_to_value(t, **kwargs) for t in partitions]
+
+        # every partition is mostly IO (remote fs) and parsing that releases the GIL
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() keeps the order of the partitions, raises the first error
+            return list(
+                executor.map(
+                    lambda t: self.marshaller.target_to_value(t, **kwargs), partitions
+                )
+            )
+
     def dump(self, value, **kwargs):
         target = self.target
         from targets.multi_target import MultiTarget
@@ -94,5 +127,35 @@ class MarshallerCtrl(object):
         target.mark_success()
 
     def load_partitioned(self, **kwargs):
-        for t in self.target.list_partitions():
-            yield self.marshaller.target_to_value(t, **kwargs)
+        """
+        Yields the value of every partition, in order.
+        Only a few partitions are in memory at a time: the current one and
+        the ones that are loaded ahead by the partitions load workers.
+        """
+        partitions = self._get_partitioned_target().list_partitions()
+        workers = min(get_partitions_load_workers(), len(partitions))
+        if workers <= 1:
+            for t in partitions:
+                yield self.marshaller.target_to_value(t, **kwargs)
+            return
+
+        partitions = iter(partitions)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            loading = deque(
+                executor.submit(self.marshaller.target_to_value, t, **kwargs)
+                for t in islice(partitions, workers)
+            )
+            try:
+                while loading:
+                    value = loading.popleft().result()
+                    for t in islice(partitions, 1):
+                        loading.append(
+                            executor.submit(
+                                self.marshaller.target_to_value, t, **kwargs
+                            )
+                        )
+                    yield value
+            finally:
+                # the consumer has stopped before the end (or we have failed)
+                for future in loading:
+                    future.cancel()
@@ -267,6 +267,15 @@ class DataFrameToParquet(_PandasMarshaller):
     def _pd_to(self, value, *args, **kwargs):
         value.to_parquet(*args, **kwargs)
 
+    def support_direct_read(self, target):
+        from targets.dir_target import DirTarget
+
+        # parquet reader seeks to the footer and to the requested columns,
+        # with range reads we fetch only these parts of the remote file
+        if target.fs.support_range_read and not isinstance(target, DirTarget):
+            return False
+        return super(DataFrameToParquet, self).support_direct_read(target)
+
     def support_direct_write(self, target):
         # TODO: decide based on pandas version and s3fs availability
         return (
@@ -3,8 +3,9 @@ import os
 import six
 
 from targets.pipes.base import IOPipeline, NopPipeline
-from targets.pipes.bzip2 import Bzip2Pipeline
-from targets.pipes.gzip import GzipPipeline
+from targets.pipes.bzip2 import Bzip2Pipeline, Bzip2ProcessPipeline
+from targets.pipes.compression import Lz4Pipeline, XzPipeline, ZstdPipeline
+from targets.pipes.gzip import GzipPipeline, GzipProcessPipeline
 from targets.pipes.text import MixedUnicodeBytesFormat, NewlinePipeline, TextPipeline
 
 
@@ -13,7 +14,11 @@ Text = TextPipeline()
 UTF8 = TextPipeline(encoding="utf8")
 SysNewLine = NewlinePipeline()
 Gzip = GzipPipeline()
-Bzip2 = Bzip2Pipeline()
+# python2 BZ2File can't read from a file object
+Bzip2 = Bzip2ProcessPipeline() if six.PY2 else Bzip2Pipeline()
+Xz = XzPipeline()
+Zstd = ZstdPipeline()
+Lz4 = Lz4Pipeline()
 MixedUnicodeBytes = MixedUnicodeBytesFormat()
 
 SeamlessFilters = [Nop, Text]
@@ -3,9 +3,17 @@ from targets.pipes.base import (
     IOPipeline,
     OutputPipeProcessWrapper,
 )
+from targets.pipes.compression import Bzip2Codec, CompressionPipeline
 
 
-class Bzip2Pipeline(IOPipeline):
+class Bzip2Pipeline(CompressionPipeline):
+    codec = Bzip2Codec()
+
+
+class Bzip2ProcessPipeline(IOPipeline):
+    """
+    Compression by `bzip2` subprocess
+    """
 
     input = "bytes"
     output = "bytes"
@@ -0,0 +1,394 @@
+"""
+In-process streaming compression pipelines.
+
+Output is compressed by the codec's compressor object, no external process or temporary
+file is involved. Large outputs can be compressed by a pool of threads: the data is
+split into blocks that are compressed as independent streams (gzip members, bzip2
+streams, xz streams, zstd/lz4 frames) and written in order. Concatenated streams are
+valid for all the supported formats, so any reader (including the command line tools)
+can read the result.
+"""
+from __future__ import absolute_import
+
+import bz2
+import gzip
+import io
+import multiprocessing
+import zlib
+
+from collections import deque
+
+from targets.pipes.base import IOPipeline
+
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # we are python2
+    from dbnd._vendor.futures import ThreadPoolExecutor
+
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 4
+
+
+def default_compression_workers():
+    try:
+        cpus = multiprocessing.cpu_count()
+    except NotImplementedError:
+        cpus = 1
+    return max(1, min(DEFAULT_MAX_WORKERS, cpus))
+
+
+class CompressionCodec(object):
+    """
+    Streaming compressor/decompressor of a single compression format.
+    """
+
+    name = None
+    default_level = None
+
+    def compressor(self, level=None):
+        """
+        Object with `compress(data)` and `flush()`, producing a single complete stream
+        """
+        raise NotImplementedError()
+
+    def open_reader(self, input_pipe):
+        """
+        Binary file object that decompresses `input_pipe`,
+        it should support concatenated streams
+        """
+        raise NotImplementedError()
+
+    def compress_block(self, data, level=None):
+        compressor = self.compressor(level)
+        return compressor.compress(data) + compressor.flush()
+
+    def _level(self, level):
+        return self.default_level if level is None else int(level)
+
+
+class GzipCodec(CompressionCodec):
+    name = "gzip"
+    # the default of gzip command line
+    default_level = 6
+
+    def compressor(self, level=None):
+        # wbits of 16 + MAX_WBITS produce gzip header and trailer
+        return zlib.compressobj(self._level(level), zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def open_reader(self, input_pipe):
+        return gzip.GzipFile(fileobj=input_pipe, mode="rb")
+
+
+class Bzip2Codec(CompressionCodec):
+    name = "bzip2"
+    default_level = 9
+
+    def compressor(self, level=None):
+        return bz2.BZ2Compressor(self._level(level))
+
+    def open_reader(self, input_pipe):
+        return bz2.BZ2File(input_pipe, mode="rb")
+
+
+class XzCodec(CompressionCodec):
+    name = "xz"
+    default_level = 6
+
+    def compressor(self, level=None):
+        lzma = _import_codec_module("lzma", "lzma")
+        return lzma.LZMACompressor(preset=self._level(level))
+
+    def open_reader(self, input_pipe):
+        lzma = _import_codec_module("lzma", "lzma")
+        return lzma.LZMAFile(input_pipe, mode="rb")
+
+
+class ZstdCodec(CompressionCodec):
+    name = "zstd"
+    default_level = 3
+
+    def compressor(self, level=None):
+        zstd = _import_codec_module("zstandard", "zstandard")
+        return zstd.ZstdCompressor(level=self._level(level)).compressobj()
+
+    def open_reader(self, input_pipe):
+        zstd = _import_codec_module("zstandard", "zstandard")
+        decompressor = zstd.ZstdDecompressor()
+        try:
+            reader = decompressor.stream_reader(input_pipe, read_across_frames=True)
+        except TypeError:
+            # old zstandard, we don't write multiple frames without workers
+            reader = decompressor.stream_reader(input_pipe)
+        return io.BufferedReader(reader)
+
+
+class _Lz4Compressor(object):
+    def __init__(self, level):
+        import lz4.frame
+
+        self._compressor = lz4.frame.LZ4FrameCompressor(compression_level=level)
+        self._header = self._compressor.begin()
+
+    def compress(self, data):
+        compressed = self._compressor.compress(data)
+        if self._header:
+            compressed = self._header + compressed
+            self._header = None
+        return compressed
+
+    def flush(self):
+        return (self._header or b"") + self._compressor.flush()
+
+
+class Lz4Codec(CompressionCodec):
+    name = "lz4"
+    default_level = 0
+
+    def compressor(self, level=None):
+        _import_codec_module("lz4.frame", "lz4")
+        return _Lz4Compressor(self._level(level))
+
+    def open_reader(self, input_pipe):
+        lz4_frame = _import_codec_module("lz4.frame", "lz4")
+        return lz4_frame.LZ4FrameFile(input_pipe, mode="rb")
+
+
+def _import_codec_module(module_name, package):
+    import importlib
+
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        raise ImportError(
+            "Compression is not available, failed to import '%s', "
+            "please install '%s' package" % (module_name, package)
+        )
+
+
+class CompressedInputStream(io.BufferedIOBase):
+    """
+    Decompressed view of `input_pipe`, closes `input_pipe` on close.
+    """
+
+    def __init__(self, input_pipe, codec):
+        super(CompressedInputStream, self).__init__()
+        self._input_pipe = input_pipe
+        self._stream = codec.open_reader(input_pipe)
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+    def read1(self, size=-1):
+        read1 = getattr(self._stream, "read1", None)
+        if read1 is None:
+            return self._stream.read(size)
+        return read1(size)
+
+    def readinto(self, b):
+        return self._stream.readinto(b)
+
+    def readline(self, size=-1):
+        return self._stream.readline(size)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return False
+
+    def seekable(self):
+        return False
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._stream.close()
+        finally:
+            self._input_pipe.close()
+            super(CompressedInputStream, self).close()
+
+
+class CompressedOutputStream(io.BufferedIOBase):
+    """
+    Compresses everything written into it to `output_pipe`.
+
+    With a single worker the data is compressed as a single stream.
+    With more workers the data is split into `block_size` blocks which are compressed
+    in parallel as independent streams, at most `2 * workers` blocks are kept in memory.
+    An output smaller than a block is always compressed in the calling thread.
+
+    `output_pipe` is closed on close only, an aborted output (exception inside
+    of `with` block or garbage collection without close) is not committed.
+    """
+
+    def __init__(
+        self,
+        output_pipe,
+        codec,
+        compression_level=None,
+        workers=1,
+        block_size=DEFAULT_BLOCK_SIZE,
+    ):
+        super(CompressedOutputStream, self).__init__()
+        self._output_pipe = output_pipe
+        self._codec = codec
+        self._compression_level = compression_level
+        self._workers = workers
+        self._block_size = block_size
+
+        self._compressor = None
+        self._buffer = bytearray()
+        self._executor = None
+        self._pending = deque()
+        self._aborted = False
+
+        if workers <= 1:
+            self._compressor = codec.compressor(compression_level)
+
+    def write(self, b):
+        if self.closed:
+            raise ValueError("write to closed file")
+
+        if self._compressor is not None:
+            compressed = self._compressor.compress(b)
+            if compressed:
+                self._output_pipe.write(compressed)
+            return len(b)
+
+        self._buffer.extend(b)
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[: self._block_size])
+            del self._buffer[: self._block_size]
+            self._submit_block(block)
+        return len(b)
+
+    def _submit_block(self, block):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        self._pending.append(
+            self._executor.submit(
+                self._codec.compress_block, block, self._compression_level
+            )
+        )
+        # keep the order of the blocks and a limited amount of them in memory
+        while len(self._pending) > 2 * self._workers:
+            self._output_pipe.write(self._pending.popleft().result())
+
+    def _finish(self):
+        if self._compressor is not None:
+            self._output_pipe.write(self._compressor.flush())
+            return
+
+        if self._executor is None:
+            # small output, a single block (possibly empty) is a valid stream
+            self._output_pipe.write(
+                self._codec.compress_block(bytes(self._buffer), self._compression_level)
+            )
+            return
+
+        if self._buffer:
+            self._submit_block(bytes(self._buffer))
+        while self._pending:
+            self._output_pipe.write(self._pending.popleft().result())
+
+    def _shutdown(self):
+        self._buffer = bytearray()
+        if self._executor is not None:
+            for future in self._pending:
+                future.cancel()
+            self._pending.clear()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if not self._aborted:
+                self._finish()
+                self._output_pipe.close()
+        finally:
+            self._shutdown()
+            super(CompressedOutputStream, self).close()
+
+    def abort(self):
+        self._aborted = True
+        self.close()
+
+    def flush(self):
+        # compressed data is written when the block is ready
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __del__(self):
+        if not self.closed:
+            self.abort()
+
+    def readable(self):
+        return False
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+
+class CompressionPipeline(IOPipeline):
+
+    input = "bytes"
+    output = "bytes"
+
+    codec = None  # type: CompressionCodec
+
+    def __init__(self, compression_level=None, workers=None, block_size=None):
+        """
+        :param compression_level: codec specific level, codec default if not set
+        :param workers: threads compressing a large output, by default up to 4 cpus
+        :param block_size: size of independently compressed blocks (with workers > 1)
+        """
+        self.compression_level = compression_level
+        self.workers = workers
+        self.block_size = block_size or DEFAULT_BLOCK_SIZE
+
+    def pipe_reader(self, input_pipe):
+        return CompressedInputStream(input_pipe, self.codec)
+
+    def pipe_writer(self, output_pipe):
+        workers = self.workers
+        if workers is None:
+            workers = default_compression_workers()
+        return CompressedOutputStream(
+            output_pipe,
+            self.codec,
+            compression_level=self.compression_level,
+            workers=workers,
+            block_size=self.block_size,
+        )
+
+
+class XzPipeline(CompressionPipeline):
+    codec = XzCodec()
+
+
+class ZstdPipeline(CompressionPipeline):
+    codec = ZstdCodec()
+
+
+class Lz4Pipeline(CompressionPipeline):
+    codec = Lz4Codec()
@@ -3,9 +3,17 @@ from targets.pipes.base import (
     IOPipeline,
     OutputPipeProcessWrapper,
 )
+from targets.pipes.compression import CompressionPipeline, GzipCodec
 
 
-class GzipPipeline(IOPipeline):
+class GzipPipeline(CompressionPipeline):
+    codec = GzipCodec()
+
+
+class GzipProcessPipeline(IOPipeline):
+    """
+    Compression by `gzip` subprocess
+    """
 
     input = "bytes"
     output = "bytes"
@@ -121,6 +121,7 @@ class ValueMetaConf(object):
     log_stats = attr.ib(
         default=None, converter=LogDataRequest.from_user_param
     )  # type: Optional[Union[LogDataRequest, bool]]
+    log_stats_sample_size = attr.ib(default=None)  # type: Optional[int]
 
     def get_preview_size(self):
         return self.log_preview_size or _DEFAULT_VALUE_PREVIEW_MAX_LEN
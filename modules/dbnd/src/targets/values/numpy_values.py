@@ -6,6 +6,31 @@ from dbnd._vendor import fast_hasher
 from targets.values.builtins_values import DataValueType
 
 
+# amount of elements that are sampled for the value meta fingerprint
+_FINGERPRINT_SAMPLE_SIZE = 1024
+
+
+def array_fingerprint(values):
+    """
+    Fingerprint of the array that doesn't depend on its size:
+    the buffer address and a hash of evenly spaced elements sample
+    """
+    if values.size > _FINGERPRINT_SAMPLE_SIZE:
+        # positions in the flattened array, any shape and memory layout
+        positions = numpy.linspace(0, values.size - 1, _FINGERPRINT_SAMPLE_SIZE).astype(
+            numpy.intp
+        )
+        sample = values[numpy.unravel_index(positions, values.shape)]
+    else:
+        sample = values
+    return (
+        values.shape,
+        values.dtype,
+        values.__array_interface__["data"][0],
+        hash(numpy.ascontiguousarray(sample).tobytes()),
+    )
+
+
 class NumpyArrayValueType(DataValueType):
     type = numpy.ndarray
     config_name = "numpy_ndarray"
@@ -15,5 +40,9 @@ class NumpyArrayValueType(DataValueType):
         shape = "[%s]" % (",".join(map(str, x.shape)))
         return "%s:%s" % (shape, fast_hasher.hash(x))
 
+    def get_value_meta_fingerprint(self, value):
+        # in place changes of not sampled elements are not detected
+        return array_fingerprint(value)
+
     def merge_values(self, *values, **kwargs):
         return numpy.concatenate(values)
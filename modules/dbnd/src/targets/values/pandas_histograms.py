@@ -1,11 +1,19 @@
 import json
 import logging
+import math
 import typing
 
 import numpy as np
 import pandas as pd
 
-from pandas.core.dtypes.common import is_bool_dtype, is_numeric_dtype, is_string_dtype
+from pandas.core.dtypes.common import (
+    is_bool_dtype,
+    is_categorical_dtype,
+    is_complex_dtype,
+    is_numeric_dtype,
+    is_string_dtype,
+)
+from pandas.util import hash_array
 
 
 if typing.TYPE_CHECKING:
@@ -15,16 +23,34 @@ if typing.TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+NUMERIC_HISTOGRAM_BINS = 20
+MAX_HISTOGRAM_CATEGORIES = 50
+_DESCRIBE_PERCENTILES = ((0.25, "25%"), (0.5, "50%"), (0.75, "75%"))
+
+_COLUMN_TYPE_HEAD_SIZE = 1000
+
+# fixed seed, the same data should produce the same sampled stats
+_SAMPLE_SEED = 42
+# 2^14 registers, ~1% standard error
+_HLL_PRECISION = 14
+
 
 class PandasHistograms(object):
     """
     calculates histograms and stats on pandas dataframe.
+
+    Every column is scanned once into a column summary (null count, distinct values
+    with their counts) that is shared between stats and histograms calculation.
+    If `meta_conf.log_stats_sample_size` is set, numeric columns with more non-null
+    values than that are not sorted: quantiles are calculated from a random sample
+    and distinct count is estimated by HyperLogLog, other stats are still exact.
     """
 
     def __init__(self, df, meta_conf):
         # type: (pd.DataFrame, ValueMetaConf) -> None
         self.df = df
         self.meta_conf = meta_conf
+        self._summaries = {}  # type: Dict[str, Optional[_ColumnSummary]]
 
     def get_histograms_and_stats(self):
         # type: () -> Tuple[Dict[str, Dict], Dict[str, List[List]]]
@@ -36,18 +62,10 @@ class PandasHistograms(object):
             hist_column_names = self._get_column_names_from_request(
                 self.df, self.meta_conf.log_histograms
             )
-            df_histograms = self.df.filter(hist_column_names)
-            if pd.__version__ > "1":
-                # return_type="expand" and orient="list" are used to stabilize produced
-                # histograms data structure across pandas v0 & v1
-                histograms = df_histograms.apply(
-                    self._calculate_histograms, result_type="expand", args=(stats,)
-                ).to_dict(orient="list")
-            else:
-                histograms = df_histograms.apply(
-                    self._calculate_histograms, args=(stats,)
-                ).to_dict()
-                histograms = {k: list(v) for k, v in histograms.items()}
+            for column_name in hist_column_names:
+                histogram = self._calculate_histograms(self.df[column_name], stats)
+                if histogram is not None:
+                    histograms[column_name] = list(histogram)
 
         return stats, histograms
 
@@ -62,19 +80,47 @@ class PandasHistograms(object):
             elif data_request.include_all_numeric and is_numeric_dtype(column_type):
                 column_names.append(column_name)
 
-        column_names = [
-            column
-            for column in column_names
-            if column not in data_request.exclude_columns
-        ]
-        return column_names
+        existing_columns = set(df.columns)
+        result = []
+        for column in column_names:
+            if (
+                column in existing_columns
+                and column not in data_request.exclude_columns
+                and column not in result
+            ):
+                result.append(column)
+        return result
+
+    def _get_summary(self, column):
+        # type: (pd.Series) -> Optional[_ColumnSummary]
+        if column.name not in self._summaries:
+            self._summaries[column.name] = build_column_summary(
+                column, sample_size=self.meta_conf.log_stats_sample_size
+            )
+        return self._summaries[column.name]
 
     def _calculate_stats(self, df):
         # type: (pd.DataFrame) -> Dict[str, Dict]
         stats_column_names = self._get_column_names_from_request(
             df, self.meta_conf.log_stats
         )
-        df = df.filter(stats_column_names)
+
+        stats = {}
+        describe_column_names = []
+        for column_name in stats_column_names:
+            summary = self._get_summary(df[column_name])
+            if summary is None:
+                describe_column_names.append(column_name)
+            else:
+                stats[column_name] = summary.get_stats()
+
+        if describe_column_names:
+            # dtypes we don't summarize ourselves (datetime, timedelta, category...)
+            stats.update(self._calculate_stats_by_describe(df[describe_column_names]))
+        return stats
+
+    def _calculate_stats_by_describe(self, df):
+        # type: (pd.DataFrame) -> Dict[str, Dict]
         stats = df.describe(include="all").to_json()
         stats = json.loads(stats)
         stats = self._remove_none_values(stats)
@@ -97,11 +143,7 @@ class PandasHistograms(object):
 
     def _get_column_type(self, column):
         # type: (pd.Series) -> str
-        first_index = column.first_valid_index()
-        if first_index is None:
-            return column.dtype.name
-        first_value = column.at[first_index]
-        return type(first_value).__name__
+        return get_column_type(column)
 
     def _calculate_histograms(self, df_column, stats):
         # type: (pd.Series, Dict) -> Optional[Tuple[List, List]]
@@ -113,27 +155,28 @@ class PandasHistograms(object):
             if "1" < pd.__version__ < "1.2":
                 # handle  'Float32', 'Float64', 'Int8', 'Int16', 'Int32', 'Int64', 'UInt8', 'UInt16', 'UInt32', 'UInt64'
                 column_type = column_type.lower()
+
+            summary = self._get_summary(df_column)
             if is_string_dtype(column_type) or is_bool_dtype(column_type):
-                counts = df_column.value_counts()  # type: pd.Series
+                if isinstance(summary, CategoricalColumnSummary):
+                    counts = summary.value_counts
+                else:
+                    counts = df_column.value_counts()  # type: pd.Series
+                null_count = None
                 if (
                     stats
                     and df_column.name in stats
                     and "null-count" in stats[df_column.name]
                 ):
                     null_count = stats[df_column.name]["null-count"]
-                    null_column = pd.Series([null_count], index=[None])
-                    counts = counts.append(null_column)
-                    counts = counts.sort_values(ascending=False)
-                if len(counts) > 50:
-                    counts, tail = counts[:49], counts[49:]
-                    tail_sum = pd.Series([tail.sum()], index=["_others"])
-                    counts = counts.append(tail_sum)
-                values = counts.index
+                counts, values = _categorical_histogram(counts, null_count)
             elif is_numeric_dtype(column_type):
-                df_column = df_column.dropna()
-                counts, values = np.histogram(
-                    df_column, bins=20
-                )  # type: np.array, np.array
+                if isinstance(summary, NumericColumnSummary):
+                    counts, values = summary.get_histogram()
+                else:
+                    counts, values = np.histogram(
+                        df_column.dropna(), bins=NUMERIC_HISTOGRAM_BINS
+                    )  # type: np.array, np.array
             else:
                 return
 
@@ -142,3 +185,264 @@ class PandasHistograms(object):
             logger.exception(
                 "log_histogram: Something went wrong for column '%s'", df_column.name
             )
+
+
+def get_column_type(column):
+    # type: (pd.Series) -> str
+    # the first valid value is usually at the head, don't scan the whole column for it
+    first_index = column.iloc[:_COLUMN_TYPE_HEAD_SIZE].first_valid_index()
+    if first_index is None and len(column) > _COLUMN_TYPE_HEAD_SIZE:
+        first_index = column.first_valid_index()
+    if first_index is None:
+        return column.dtype.name
+    first_value = column.at[first_index]
+    return type(first_value).__name__
+
+
+def build_column_summary(column, sample_size=None):
+    # type: (pd.Series, Optional[int]) -> Optional[_ColumnSummary]
+    """
+    Returns the summary matching `df.describe()` treatment of the column dtype,
+    None for the dtypes we don't summarize.
+    """
+    dtype = column.dtype
+    if is_categorical_dtype(dtype):
+        return None
+    if is_bool_dtype(dtype) or is_string_dtype(dtype):
+        # value_counts() is a single hash pass anyway, sampling doesn't make it faster
+        return CategoricalColumnSummary(column)
+    if is_numeric_dtype(dtype) and not is_complex_dtype(dtype):
+        return NumericColumnSummary(column, sample_size=sample_size)
+    return None
+
+
+class _ColumnSummary(object):
+    def __init__(self, column):
+        # type: (pd.Series) -> None
+        self.column = column
+        self.count = len(column)
+        self.null_count = 0
+        self.distinct = 0  # not including null
+
+    def _get_describe_stats(self):
+        # type: () -> Dict
+        raise NotImplementedError()
+
+    def get_stats(self):
+        # type: () -> Dict
+        stats = self._get_describe_stats()
+        stats["null-count"] = self.null_count
+        stats["count"] = self.count
+        stats["non-null"] = self.count - self.null_count
+        # null is counted as a distinct value, same as in Series.unique()
+        stats["distinct"] = self.distinct + (1 if self.null_count else 0)
+        stats["type"] = get_column_type(self.column)
+        return stats
+
+
+class NumericColumnSummary(_ColumnSummary):
+    """
+    Non-null values of the column are reduced to sorted distinct values and their
+    cumulative counts: by np.bincount() for integers of a small range,
+    by a single sort otherwise (of a sample, if there are more than `sample_size` values).
+    min/max, quantiles, distinct count and histogram bins are read from it.
+    """
+
+    def __init__(self, column, sample_size=None):
+        # type: (pd.Series, Optional[int]) -> None
+        super(NumericColumnSummary, self).__init__(column)
+        self.is_sampled = False
+
+        values = column.values
+        if len(values) and _is_countable_integer(values):
+            # numpy integers don't have nulls
+            self.values = values
+            self.min, self.max = values.min(), values.max()
+            if int(self.max) - int(self.min) < len(values):
+                self._count_distinct(values)
+                return
+        else:
+            values = column.astype(np.float64, copy=False).values
+            nulls = np.isnan(values)
+            self.null_count = int(np.count_nonzero(nulls))
+            if self.null_count:
+                values = values[~nulls]
+            self.values = values
+            self.min = self.max = None
+
+        if sample_size and len(values) > sample_size:
+            self.is_sampled = True
+            random_state = np.random.RandomState(_SAMPLE_SEED)
+            sample = values[random_state.randint(0, len(values), sample_size)]
+            self._sort_distinct(np.sort(sample))
+            self.min, self.max = values.min(), values.max()
+            self.distinct = min(_approximate_distinct_count(values), len(values))
+            return
+
+        self._sort_distinct(np.sort(values))
+        if len(values):
+            self.min, self.max = self.distinct_values[0], self.distinct_values[-1]
+
+    def _count_distinct(self, values):
+        counts = np.bincount(values.astype(np.intp, copy=False) - self.min)
+        present = np.flatnonzero(counts)
+        self.distinct_values = present + self.min
+        self.cumulative_counts = np.concatenate(([0], np.cumsum(counts[present])))
+        self.distinct = len(present)
+
+    def _sort_distinct(self, sorted_values):
+        if len(sorted_values):
+            run_starts = np.flatnonzero(sorted_values[1:] != sorted_values[:-1]) + 1
+            run_starts = np.concatenate(([0], run_starts))
+        else:
+            run_starts = np.array([], dtype=np.intp)
+        self.distinct_values = sorted_values[run_starts]
+        self.cumulative_counts = np.concatenate((run_starts, [len(sorted_values)]))
+        self.distinct = len(run_starts)
+
+    def _value_at(self, rank):
+        # value at the given position of the sorted values
+        index = np.searchsorted(self.cumulative_counts, rank, side="right") - 1
+        return self.distinct_values[index]
+
+    def _quantile(self, q):
+        # linear interpolation of float64 values, same as Series.quantile()
+        position = q * (self.cumulative_counts[-1] - 1)
+        lower = int(math.floor(position))
+        lower_value = float(self._value_at(lower))
+        upper_value = float(
+            self._value_at(min(lower + 1, self.cumulative_counts[-1] - 1))
+        )
+        weight = position - lower
+        return lower_value * (1 - weight) + upper_value * weight
+
+    def _get_describe_stats(self):
+        # type: () -> Dict
+        non_null_count = len(self.values)
+        stats = {"count": non_null_count}
+        if not non_null_count:
+            return stats
+
+        describe = [("mean", self.values.mean())]
+        describe.append(
+            ("std", self.values.std(ddof=1) if non_null_count > 1 else np.nan)
+        )
+        describe.append(("min", self.min))
+        for q, name in _DESCRIBE_PERCENTILES:
+            describe.append((name, self._quantile(q)))
+        describe.append(("max", self.max))
+
+        # encoded the same way as describe().to_json(): nan and inf are null
+        names, values = zip(*describe)
+        for name, value in zip(names, _to_json_values(values, dtype=np.float64)):
+            if value is not None:
+                stats[name] = value
+        return stats
+
+    def get_histogram(self):
+        # type: () -> Tuple[np.array, np.array]
+        if not len(self.values) or not np.isfinite([self.min, self.max]).all():
+            # same results (or errors) np.histogram produces for these values
+            return np.histogram(self.values, bins=NUMERIC_HISTOGRAM_BINS)
+
+        value_range = (float(self.min), float(self.max))
+        if self.is_sampled:
+            # uniform bins with a known range is a single O(n) pass in numpy
+            return np.histogram(
+                self.values, bins=NUMERIC_HISTOGRAM_BINS, range=value_range
+            )
+
+        bin_edges = np.histogram_bin_edges(
+            self.distinct_values, bins=NUMERIC_HISTOGRAM_BINS, range=value_range
+        )
+        # all bins are half-open [a, b), except the last one [a, b], as in np.histogram
+        bin_starts = np.searchsorted(self.distinct_values, bin_edges[1:-1], side="left")
+        counts_before = self.cumulative_counts[bin_starts]
+        counts = np.diff(
+            np.concatenate(([0], counts_before, [self.cumulative_counts[-1]]))
+        )
+        return counts, bin_edges
+
+
+class CategoricalColumnSummary(_ColumnSummary):
+    """
+    Single value_counts() pass provides null count, distinct count, top value
+    and the histogram.
+    """
+
+    def __init__(self, column):
+        # type: (pd.Series) -> None
+        super(CategoricalColumnSummary, self).__init__(column)
+        self.value_counts = column.value_counts()
+        self.null_count = self.count - int(self.value_counts.sum())
+        self.distinct = len(self.value_counts)
+
+    def _get_describe_stats(self):
+        # type: () -> Dict
+        stats = {"count": self.count - self.null_count, "unique": self.distinct}
+        if len(self.value_counts):
+            stats["top"] = _to_json_value(self.value_counts.index[0])
+            stats["freq"] = int(self.value_counts.iloc[0])
+        return stats
+
+
+def _categorical_histogram(counts, null_count=None):
+    # type: (pd.Series, Optional[int]) -> Tuple[pd.Series, pd.Index]
+    if null_count is not None:
+        null_column = pd.Series([null_count], index=[None])
+        counts = counts.append(null_column)
+        counts = counts.sort_values(ascending=False)
+    if len(counts) > MAX_HISTOGRAM_CATEGORIES:
+        counts, tail = (
+            counts[: MAX_HISTOGRAM_CATEGORIES - 1],
+            counts[MAX_HISTOGRAM_CATEGORIES - 1 :],
+        )
+        tail_sum = pd.Series([tail.sum()], index=["_others"])
+        counts = counts.append(tail_sum)
+    return counts, counts.index
+
+
+def _is_countable_integer(values):
+    # bincount() works with intp, uint64 values can't be shifted into it safely
+    return isinstance(values, np.ndarray) and (
+        values.dtype.kind == "i" or (values.dtype.kind == "u" and values.itemsize < 8)
+    )
+
+
+def _approximate_distinct_count(values, precision=_HLL_PRECISION):
+    # type: (np.array, int) -> int
+    """
+    HyperLogLog estimation of the distinct count, vectorized over hashed values
+    """
+    registers_count = 1 << precision
+    word_bits = 64 - precision
+    hashes = hash_array(values)
+    registers = (hashes >> np.uint64(word_bits)).astype(np.intp)
+    words = hashes & np.uint64((1 << word_bits) - 1)
+    # position of the leftmost 1 bit of the word, words fit into float64 exactly
+    _, bit_length = np.frexp(words.astype(np.float64))
+    ranks = word_bits - bit_length + 1
+
+    # max rank of every register without a python loop: mark (register, rank) pairs
+    # and take the highest marked rank of every register
+    seen = np.zeros((registers_count, word_bits + 2), dtype=bool)
+    seen[:, 0] = True  # ranks start at 1, rank 0 is left for empty registers
+    seen[registers, ranks] = True
+    max_ranks = word_bits + 1 - np.argmax(seen[:, ::-1], axis=1)
+
+    alpha = 0.7213 / (1 + 1.079 / registers_count)
+    estimate = alpha * registers_count ** 2 / np.sum(2.0 ** -max_ranks)
+    empty_registers = int(np.count_nonzero(max_ranks == 0))
+    if estimate <= 2.5 * registers_count and empty_registers:
+        # small cardinality correction (linear counting)
+        estimate = registers_count * math.log(float(registers_count) / empty_registers)
+    return int(round(estimate))
+
+
+def _to_json_values(values, dtype=None):
+    # the same values we'd get from describe().to_json()
+    return json.loads(pd.Series(values, dtype=dtype).to_json(orient="values"))
+
+
+def _to_json_value(value):
+    return _to_json_values([value])[0]
@@ -7,6 +7,7 @@ import typing
 
 from typing import Dict
 
+import numpy
 import pandas as pd
 import six
 
@@ -17,6 +18,7 @@ from dbnd._vendor import fast_hasher
 from targets.target_config import FileFormat
 from targets.value_meta import ValueMeta
 from targets.values.builtins_values import DataValueType
+from targets.values.numpy_values import array_fingerprint
 from targets.values.pandas_histograms import PandasHistograms
 from targets.values.structure import DictValueType
 from targets.values.value_type import _isinstances
@@ -28,6 +30,13 @@ if typing.TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _block_fingerprint(values):
+    if isinstance(values, numpy.ndarray):
+        return array_fingerprint(values)
+    # extension arrays (categorical, etc.)
+    return id(values)
+
+
 class DataFrameValueType(DataValueType):
     type = pd.DataFrame
     type_str = "DataFrame"
@@ -42,6 +51,22 @@ class DataFrameValueType(DataValueType):
     def to_preview(self, df, preview_size):  # type: (pd.DataFrame, int) -> str
         return df.to_string(index=False, max_rows=20, max_cols=1000)[:preview_size]
 
+    def get_value_meta_fingerprint(self, value):
+        # in place changes of not sampled elements are not detected
+        mgr = getattr(value, "_mgr", None)
+        if mgr is None:
+            mgr = getattr(value, "_data", None)
+        if mgr is None:
+            return None
+
+        return (
+            value.shape,
+            tuple(value.dtypes) if value.ndim > 1 else value.dtype,
+            id(value.index),
+            id(value.columns) if value.ndim > 1 else value.name,
+            tuple(_block_fingerprint(block.values) for block in mgr.blocks),
+        )
+
     def get_value_meta(self, value, meta_conf):
         # type: (pd.DataFrame, ValueMetaConf) -> ValueMeta
         data_schema = {}
@@ -139,6 +164,7 @@ class DataFramesDictValueType(DictValueType):
     type_str_extras = ("DataFrameDict", "Dict[str,pd.DataFrame]")
     config_name = "pandas_dataframe"
     sub_value_type = DataFrameValueType()
+    is_type_of_by_content = True
 
     def is_handler_of_type(self, type_):
         return type_ == self.type
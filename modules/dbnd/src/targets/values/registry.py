@@ -19,6 +19,9 @@ def f_name(f):
 
 logger = logging.getLogger(__name__)
 
+# we don't want to grow forever on dynamically created classes
+_MAX_DISPATCH_CACHE_SIZE = 10000
+
 
 class ValueTypeRegistry(object):
     def __init__(self, known_value_types):
@@ -26,6 +29,9 @@ class ValueTypeRegistry(object):
         self.discoverable_value_types = []  # type: List[ValueType]
         self.default = DefaultObjectValueType()
 
+        # type(value) -> (value types to check by content, value type matched by type)
+        self._dispatch_cache = {}
+
         # now for every parameter we also have text representation of the type
         # will be used for annotations
         self.type_str_to_parameter = {}
@@ -39,6 +45,7 @@ class ValueTypeRegistry(object):
         self.value_types.append(value_type)
         if value_type.discoverable:
             self.discoverable_value_types.append(value_type)
+            self._dispatch_cache = {}
         try:
             # for t in [value_type.type]:
 
@@ -64,10 +71,35 @@ class ValueTypeRegistry(object):
         # right now we do that, but as for obj_list
         # we can keep deterministic conversion only
 
-        for item in self.discoverable_value_types:
+        value_class = type(value)
+        dispatch = self._dispatch_cache.get(value_class)
+        if dispatch is None:
+            dispatch = self._build_dispatch(value)
+            if len(self._dispatch_cache) >= _MAX_DISPATCH_CACHE_SIZE:
+                self._dispatch_cache = {}
+            self._dispatch_cache[value_class] = dispatch
+
+        by_content, by_type = dispatch
+        for item in by_content:
             if item.is_type_of(value):
                 return item
-        return default
+        return by_type or default
+
+    def _build_dispatch(self, value):
+        """
+        Resolves discoverable value types for type(value) in the registration order.
+        The result of type based checks (isinstance/type equality) is the same for all
+        values of the same class, so we evaluate them once. Value types that inspect
+        the content can match only if preceding the first type based match,
+        they are kept to be checked on every call.
+        """
+        by_content = []
+        for item in self.discoverable_value_types:
+            if item.is_type_of_by_content:
+                by_content.append(item)
+            elif item.is_type_of(value):
+                return tuple(by_content), item
+        return tuple(by_content), None
 
     def get_value_type_of_type(self, type_, inline_value_type=False):
         if isinstance(type_, ValueType):
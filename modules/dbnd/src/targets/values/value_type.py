@@ -13,7 +13,7 @@ from targets.value_meta import ValueMeta
 
 
 if typing.TYPE_CHECKING:
-    from typing import Any, Union
+    from typing import Any, Optional, Union
     from targets import DataTarget, Target
     from targets.value_meta import ValueMetaConf
 
@@ -42,6 +42,10 @@ class ValueType(object):
 
     is_lazy_evaluated = False
 
+    # is_type_of checks the content of the value and not only its type,
+    # so the result can't be cached by type(value)
+    is_type_of_by_content = False
+
     @property
     @abc.abstractmethod
     def type(self):
@@ -337,6 +341,15 @@ class ValueType(object):
             data_hash=data_hash,
         )
 
+    def get_value_meta_fingerprint(self, value):
+        # type: (Any) -> Optional[Any]
+        """
+        Cheap (not depending on the data size) hashable fingerprint of the value,
+        it should change if the value is changed in a way that affects its value meta.
+        Values without fingerprint (None) are not cached by ValueMetaCache
+        """
+        return None
+
     def support_fast_count(self, target):
         # type: (Target) -> bool
         return True
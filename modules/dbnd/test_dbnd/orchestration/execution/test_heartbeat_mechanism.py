@@ -1,13 +1,26 @@
 import logging
+import os
+import signal
+import threading
+
+from time import sleep
+
+import pytest
 
 from mock import MagicMock, PropertyMock, patch
 
 from dbnd import new_dbnd_context
 from dbnd._core.configuration.environ_config import ENV_DBND__NO_PLUGINS
+from dbnd._core.constants import RunState
 from dbnd._core.run.databand_run import DatabandRun
 from dbnd._core.settings import RunConfig
+from dbnd._core.task_executor.heartbeat_daemon import (
+    HeartbeatDaemon,
+    HeartbeatDaemonClient,
+)
 from dbnd._core.task_executor.heartbeat_sender import start_heartbeat_sender
 from dbnd._core.task_executor.run_executor import RunExecutor
+from dbnd._core.tracking.backends import TrackingStore
 
 
 logger = logging.getLogger(__name__)
@@ -38,3 +51,113 @@ class TestHeartbeat(object):
 
                 assert ENV_DBND__NO_PLUGINS in call.kwargs["env"]
                 assert "testtest" in call.args[0]
+
+    def test_heartbeat_sender_thread(self):
+        with new_dbnd_context(
+            conf={
+                RunConfig.heartbeat_interval_s: 1,
+                RunConfig.heartbeat_sender_mode: "thread",
+            }
+        ) as dc:
+            run = MagicMock(DatabandRun)
+            type(run).run_uid = PropertyMock(return_value="testtest")
+            type(run).context = PropertyMock(return_value=dc)
+
+            run_executor = MagicMock(RunExecutor)
+            type(run_executor).run = PropertyMock(return_value=run)
+            with patch("subprocess.Popen") as mock_popen, patch.object(
+                dc.tracking_store, "heartbeat", return_value=None
+            ) as mock_heartbeat:
+                with start_heartbeat_sender(run_executor):
+                    sleep(0.1)
+
+                mock_popen.assert_not_called()
+                mock_heartbeat.assert_called_with(run_uid="testtest")
+
+
+class TestHeartbeatDaemon(object):
+    @pytest.fixture
+    def daemon(self, tmpdir):
+        tracking_store = MagicMock(TrackingStore)
+        tracking_store.heartbeat.return_value = RunState.RUNNING.value
+        daemon = HeartbeatDaemon(
+            address=str(tmpdir.join("heartbeat.sock")),
+            tracking_store=tracking_store,
+            idle_timeout_s=1,
+        )
+        serve_thread = threading.Thread(target=daemon.serve)
+        serve_thread.daemon = True
+        yield daemon, serve_thread
+
+    def _client(self, daemon):
+        client = HeartbeatDaemonClient(
+            address=daemon.address, tracker=["console"], tracker_api="web"
+        )
+        client.start_daemon = MagicMock()
+        return client
+
+    def test_register_runs(self, daemon):
+        daemon, serve_thread = daemon
+        serve_thread.start()
+        while not os.path.exists(daemon.address):
+            sleep(0.01)
+        client = self._client(daemon)
+
+        client.register_run("run_1", os.getpid(), heartbeat_interval_s=1)
+        client.register_run("run_2", os.getpid(), heartbeat_interval_s=1)
+        sleep(0.2)
+        client.unregister_run("run_1")
+        client.unregister_run("run_2")
+
+        heartbeat_runs = {
+            c.kwargs["run_uid"] for c in daemon.tracking_store.heartbeat.call_args_list
+        }
+        assert heartbeat_runs == {"run_1", "run_2"}
+        client.start_daemon.assert_not_called()
+
+        # no registered runs for idle timeout
+        serve_thread.join(5)
+        assert not serve_thread.is_alive()
+        assert not os.path.exists(daemon.address)
+
+    def test_dead_driver_is_dropped(self, daemon):
+        daemon, _ = daemon
+        daemon.handle_message(
+            {
+                "action": "register",
+                "run_uid": "run_1",
+                "driver_pid": 2 ** 22 + 1,  # above linux pid_max
+                "heartbeat_interval_s": 1,
+            }
+        )
+        assert daemon.send_heartbeats() is None
+        daemon.tracking_store.heartbeat.assert_not_called()
+
+    def test_shutdown_kills_driver(self, daemon):
+        daemon, _ = daemon
+        daemon.tracking_store.heartbeat.return_value = RunState.SHUTDOWN.value
+        daemon.handle_message(
+            {
+                "action": "register",
+                "run_uid": "run_1",
+                "driver_pid": os.getpid(),
+                "heartbeat_interval_s": 1,
+            }
+        )
+        with patch("os.kill") as mock_kill:
+            daemon.send_heartbeats()
+        mock_kill.assert_called_with(os.getpid(), signal.SIGTERM)
+
+    def test_daemon_is_started_by_the_first_run(self, daemon):
+        daemon, serve_thread = daemon
+        client = self._client(daemon)
+
+        def _start_daemon():
+            serve_thread.start()
+            return MagicMock(**{"poll.return_value": None})
+
+        client.start_daemon.side_effect = _start_daemon
+
+        client.register_run("run_1", os.getpid(), heartbeat_interval_s=1)
+        client.start_daemon.assert_called_once()
+        client.unregister_run("run_1")
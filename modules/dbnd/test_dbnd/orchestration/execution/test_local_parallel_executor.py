@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from dbnd import PipelineTask, new_dbnd_context, output, pipeline, task
+from dbnd._core.constants import TaskExecutorType, TaskRunState
+from dbnd._core.errors import DatabandRunError
+from dbnd._core.task_executor.local_parallel_task_executor import (
+    is_local_parallel_supported,
+)
+
+
+pytestmark = pytest.mark.skipif(
+    not is_local_parallel_supported(), reason="requires os.fork"
+)
+
+
+@task
+def t_pid(i):
+    # type: (int) -> int
+    return os.getpid()
+
+
+@task
+def t_sum_pids(pids):
+    # type: (list) -> int
+    return len(set(pids))
+
+
+@task
+def t_fail(i):
+    # type: (int) -> int
+    raise TypeError("Some user error")
+
+
+@task
+def t_after_fail(value):
+    # type: (int) -> int
+    return value
+
+
+@pipeline
+def t_parallel_pipeline():
+    return t_sum_pids([t_pid(i) for i in range(4)])
+
+
+class TFailedBranchPipeline(PipelineTask):
+    out_ok = output
+    out_failed = output
+
+    def band(self):
+        self.out_ok = t_after_fail(t_pid(1))
+        self.out_failed = t_after_fail(t_fail(2))
+
+
+def _run_conf(**kwargs):
+    run = {"task_executor_type": TaskExecutorType.local_parallel}
+    run.update(kwargs)
+    return {"run": run}
+
+
+def _task_runs_states(run):
+    return {tr.task.task_id: tr.task_run_state for tr in run.task_runs}
+
+
+class TestLocalParallelTaskExecutor(object):
+    def test_tasks_run_in_separate_processes(self):
+        with new_dbnd_context(conf=_run_conf(local_parallelism=2)):
+            run = t_parallel_pipeline.dbnd_run()
+
+        assert run.root_task.result.load(int) == 4
+        states = set(_task_runs_states(run).values())
+        assert states == {TaskRunState.SUCCESS}
+
+    def test_failed_task_does_not_block_independent_branch(self):
+        with new_dbnd_context(conf=_run_conf(fail_fast=False)):
+            with pytest.raises(DatabandRunError) as exc_info:
+                TFailedBranchPipeline().dbnd_run()
+
+        run = exc_info.value.run
+        states = {
+            tr.task.task_name: tr.task_run_state
+            for tr in run.task_runs
+            if tr.task.task_name in ("t_pid", "t_fail")
+        }
+        assert states == {"t_pid": TaskRunState.SUCCESS, "t_fail": TaskRunState.FAILED}
+
+        after_fail_states = {
+            tr.task_run_state
+            for tr in run.task_runs
+            if tr.task.task_name == "t_after_fail"
+        }
+        assert after_fail_states == {
+            TaskRunState.SUCCESS,
+            TaskRunState.UPSTREAM_FAILED,
+        }
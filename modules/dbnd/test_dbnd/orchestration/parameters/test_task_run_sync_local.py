@@ -1,6 +1,8 @@
+import hashlib
 import logging
 import os
 import shutil
+import uuid
 
 from contextlib import contextmanager
 
@@ -40,6 +42,14 @@ class PseudoLocalFileSystem(LocalFileSystem):
         shutil.copy(local, dest)
 
 
+class FingerprintLocalFileSystem(PseudoLocalFileSystem):
+    name = "pseudo_local_fingerprint"
+
+    def content_fingerprint(self, path):
+        with open(path, "rb") as f:
+            return "md5:%s" % hashlib.md5(f.read()).hexdigest()
+
+
 class TestTaskRunSyncLocal(TargetTestBase):
     @pytest.fixture
     def my_target(self, pandas_data_frame):
@@ -136,7 +146,9 @@ class TestTaskRunSyncLocal(TargetTestBase):
                     for remote_subtarget, local_subtarget in zip(
                         my_multitarget.targets, local_multitarget.targets
                     )
-                ]
+                ],
+                # sub targets are downloaded concurrently
+                any_order=True,
             )
         # check if test_task.input_ was changed to local after sync_pre_execute
         self.compare_multitargets(test_task.input_, local_multitarget)
@@ -188,3 +200,68 @@ class TestTaskRunSyncLocal(TargetTestBase):
             multitarget.targets, other_multitarget.targets
         ):
             assert subtarget.path == other_subtarget.path
+
+    def _fingerprinted_targets(self, content):
+        targets = []
+        for name in ["a.txt", "b.txt"]:
+            _target = self.target(
+                name,
+                fs=FingerprintLocalFileSystem(),
+                config=TargetConfig().with_require_local_access(),
+            )
+            _target.write(content)
+            targets.append(_target)
+        return targets
+
+    def test_task_run_sync_local_content_cache(self):
+        @task
+        def t_concat(a=parameter[str], b=parameter[str]):
+            return a + b
+
+        content = "content %s" % uuid.uuid4()
+        a, b = self._fingerprinted_targets(content)
+
+        with patch.object(
+            FingerprintLocalFileSystem,
+            "download",
+            autospec=True,
+            side_effect=PseudoLocalFileSystem.download,
+        ) as mocked_fs_download:
+            test_task = t_concat.t(a=a, b=b)
+            task_run = test_task.dbnd_run().root_task_run
+            # identical files are downloaded once
+            assert mocked_fs_download.call_count == 1
+
+            sync_local = task_run.sync_local
+            sync_local.sync_pre_execute()
+            assert mocked_fs_download.call_count == 1
+
+            local_a, local_b = test_task.a, test_task.b
+            assert local_a.read() == content
+            assert os.path.samefile(local_a.path, local_b.path)
+            sync_local.sync_post_execute()
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_task_run_sync_local_failed_download(self, monkeypatch, workers):
+        @task
+        def t_concat(a=parameter[str], b=parameter[str]):
+            return a + b
+
+        a, b = self._fingerprinted_targets("content %s" % uuid.uuid4())
+        test_task = t_concat.t(a=a, b=b)
+        task_run = test_task.dbnd_run().root_task_run
+        sync_local = task_run.sync_local
+        monkeypatch.setattr(sync_local.settings.output, "local_sync_workers", workers)
+
+        # no checksum, we fallback to TTL
+        with patch.object(
+            FingerprintLocalFileSystem, "content_fingerprint", return_value=None
+        ), patch.object(
+            FingerprintLocalFileSystem, "download", side_effect=IOError("failed")
+        ) as mocked_fs_download, patch(
+            "dbnd._core.task_run.task_run_sync_local.DbndLocalFileMetadataRegistry"
+        ):
+            with pytest.raises(IOError):
+                sync_local.sync_pre_execute()
+            # all the downloads are attempted
+            assert mocked_fs_download.call_count == 2
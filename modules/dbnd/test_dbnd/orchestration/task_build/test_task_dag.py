@@ -0,0 +1,121 @@
+import pytest
+
+from dbnd import band, task
+from dbnd._core.errors import DatabandBuildError
+from dbnd._core.task_ctrl.task_dag import TaskDagIndex, topological_sort
+from dbnd._core.task_executor.task_runs_builder import (
+    check_if_completed_bfs,
+    check_if_completed_dfs,
+)
+
+
+@task
+def t_node(value, extra=None):
+    # type: (int, object) -> int
+    return value
+
+
+@band
+def t_wide_pipeline(width=20, depth=5):
+    level = [t_node(i) for i in range(width)]
+    for d in range(depth):
+        level = [t_node(i + d * width, extra=level[:i]) for i in range(width)]
+    return level
+
+
+def _assert_topological(sorted_tasks):
+    position = {t.task_id: i for i, t in enumerate(sorted_tasks)}
+    for t in sorted_tasks:
+        for upstream_task_id in t.ctrl.task_dag.upstream_task_ids:
+            if upstream_task_id in position:
+                assert position[upstream_task_id] < position[t.task_id]
+
+
+def _chain(length):
+    tasks = [t_node.task(0)]
+    for i in range(1, length):
+        tasks.append(t_node.task(i, extra=tasks[-1]))
+    return tasks
+
+
+class TestTaskDag(object):
+    def test_topological_sort(self):
+        root = t_wide_pipeline.task()
+        all_tasks = root.ctrl.task_dag.subdag_tasks()
+
+        sorted_tasks = topological_sort(all_tasks)
+
+        assert len(sorted_tasks) == len(all_tasks)
+        _assert_topological(sorted_tasks)
+        assert sorted_tasks[-1] == root
+
+    def test_topological_sort_of_partial_graph(self):
+        tasks = _chain(5)
+        sorted_tasks = topological_sort([tasks[3], tasks[1], tasks[2]])
+        assert [t.task_id for t in sorted_tasks] == [
+            tasks[1].task_id,
+            tasks[2].task_id,
+            tasks[3].task_id,
+        ]
+
+    def test_cyclic_graph(self):
+        a, b, c = _chain(3)
+        a.set_upstream(c)
+
+        with pytest.raises(DatabandBuildError, match="A cyclic dependency occurred"):
+            topological_sort([a, b, c])
+
+        _, unsorted = TaskDagIndex([a, b, c]).topological_order()
+        assert len(unsorted) == 3
+
+    def test_subdag_is_updated_on_new_edge(self):
+        a, b = _chain(2)
+        other = t_node.task(100)
+
+        assert b.ctrl.task_dag.subdag_tasks() == {a, b}
+        # cached version
+        assert b.ctrl.task_dag.subdag_tasks() == {a, b}
+
+        a.set_upstream(other)
+        assert b.ctrl.task_dag.subdag_tasks() == {a, b, other}
+        assert b.ctrl.task_dag.subdag_tasks(should_run_only=True) == {a, b, other}
+
+    def test_subdag_invalidated_downstream_only(self):
+        a, b, c = _chain(3)
+        other, other_downstream = t_node.task(100), t_node.task(101)
+        other_downstream.set_upstream(other)
+
+        for t in (a, b, c, other_downstream):
+            t.ctrl.task_dag.subdag_tasks()
+        sorted_tasks = c.ctrl.task_dag.topological_sort()
+        # the index is reused
+        assert c.ctrl.task_dag._subdag_index_cache
+        assert c.ctrl.task_dag.topological_sort() == sorted_tasks
+
+        b.set_upstream(other)
+        # upstream of the new edge is not affected
+        assert a.ctrl.task_dag._subdag_cache is not None
+        assert other_downstream.ctrl.task_dag._subdag_cache is not None
+        assert b.ctrl.task_dag._subdag_cache is None
+        assert c.ctrl.task_dag._subdag_cache is None
+        assert c.ctrl.task_dag._subdag_index_cache is None
+
+        assert c.ctrl.task_dag.subdag_tasks() == {a, b, c, other}
+        assert c.ctrl.task_dag.topological_sort()[-1] == c
+        assert other_downstream.ctrl.task_dag.subdag_tasks() == {
+            other,
+            other_downstream,
+        }
+
+    def test_chain(self):
+        tasks = _chain(200)
+        last = tasks[-1]
+
+        assert len(last.ctrl.task_dag.subdag_tasks()) == 200
+        _assert_topological(topological_sort(tasks[::-1]))
+
+        completed_status = check_if_completed_dfs(last)
+        assert len(completed_status) == 200
+        assert not any(completed_status.values())
+
+        assert check_if_completed_bfs(last, 2) == completed_status
@@ -1,4 +1,5 @@
 import os
+import pickle
 
 import pytest
 
@@ -29,6 +30,22 @@ class TestDirTarget(TargetTestBase):
         t_p3 = t.partition(name="my_partition-2", extension=None)
         assert os.path.basename(str(t_p3)) == "my_partition-2"
 
+    def test_write_target(self, tmpdir):
+        t = self.target("dir.csv/", config=file.csv)
+
+        assert os.path.basename(str(t._write_target)) == "part-0000.csv"
+        assert t._auto_partition_count == 0
+        assert t._write_target is t._write_target
+
+    def test_pickled(self, tmpdir):
+        dir_path = str(tmpdir.join("dir.csv")) + os.path.sep
+        t = target(dir_path, config=folder.with_flag(True))
+        t._write_target
+
+        for unpickled in [pickle.loads(pickle.dumps(t)), pickle.loads(pickle.dumps(t))]:
+            assert str(unpickled.flag_target) == dir_path + DEFAULT_FLAG_FILE_NAME
+            assert str(unpickled._write_target) == dir_path + "part-0000.csv"
+
     def test_read_lines_csv(self, s1_root_dir, s1_file_1_csv, s1_file_2_csv):
         expected = target(s1_file_1_csv).readlines() + target(s1_file_2_csv).readlines()
 
@@ -2,8 +2,11 @@ from __future__ import print_function
 
 import logging
 
+import pandas as pd
+
 from pandas.util.testing import assert_frame_equal
 
+from dbnd import new_dbnd_context
 from dbnd_test_scenarios.test_common.targets.target_test_base import TargetTestBase
 from targets import target
 from targets.target_config import file
@@ -59,3 +62,30 @@ class TestPandasFrameTargetCtrl(TargetTestBase):
         t = target(s1_dir_with_csv[0])
         actual = t.read_df()
         assert_frame_equal(actual, simple_df)
+
+    def _write_partitions(self, count):
+        t = self.target("dir/", config=file.csv)
+        partitions = [pd.DataFrame({"partition": [i] * 3}) for i in range(count)]
+        t.as_pandas.to_csv((p for p in partitions), index=False)
+        return t, partitions
+
+    def test_folder_partitions_parallel_load(self):
+        t, partitions = self._write_partitions(10)
+
+        with new_dbnd_context(conf={"output": {"partitions_load_workers": 4}}):
+            actual = t.read_df()
+        assert actual["partition"].tolist() == [i for i in range(10) for _ in range(3)]
+
+    def test_folder_partitions_streaming_load(self):
+        t, partitions = self._write_partitions(10)
+
+        with new_dbnd_context(conf={"output": {"partitions_load_workers": 4}}):
+            loaded = []
+            for df in t.read_df_partitioned():
+                loaded.append(df["partition"][0])
+                if len(loaded) == 5:
+                    break
+        assert loaded == [0, 1, 2, 3, 4]
+
+        loaded = [df["partition"][0] for df in t.read_df_partitioned()]
+        assert loaded == list(range(10))
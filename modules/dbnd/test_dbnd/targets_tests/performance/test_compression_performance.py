@@ -0,0 +1,75 @@
+from __future__ import print_function
+
+import logging
+import os
+import time
+
+import numpy as np
+import pytest
+
+from targets import target
+from targets.pipes.bzip2 import Bzip2Pipeline, Bzip2ProcessPipeline
+from targets.pipes.gzip import GzipPipeline, GzipProcessPipeline
+
+
+logger = logging.getLogger(__name__)
+
+FILE_SIZE = 1024 ** 3
+CHUNK_SIZE = 1024 * 1024
+
+
+def _chunks():
+    # csv like data, compresses about as well as the real one
+    rnd = np.random.RandomState(42)
+    pool = [
+        "\n".join(
+            ",".join(str(v) for v in row) for row in rnd.randint(0, 10000, (5000, 8))
+        ).encode("ascii")
+        for _ in range(8)
+    ]
+    written = 0
+    i = 0
+    while written < FILE_SIZE:
+        chunk = (pool[i % len(pool)] * (CHUNK_SIZE // len(pool[0]) + 1))[:CHUNK_SIZE]
+        written += len(chunk)
+        i += 1
+        yield chunk
+
+
+def _measure(path, pipeline):
+    start = time.time()
+    with target(path, io_pipe=pipeline).open("w") as f:
+        for chunk in _chunks():
+            f.write(chunk)
+    write_time = time.time() - start
+
+    start = time.time()
+    with target(path, io_pipe=pipeline).open("r") as f:
+        while f.read(CHUNK_SIZE):
+            pass
+    read_time = time.time() - start
+
+    mb = FILE_SIZE / 1024.0 / 1024
+    logger.info(
+        "%s: write %.1f MB/s, read %.1f MB/s, compressed size %.1f MB",
+        pipeline.__class__.__name__,
+        mb / write_time,
+        mb / read_time,
+        os.path.getsize(path) / 1024.0 / 1024,
+    )
+    return write_time, read_time
+
+
+@pytest.mark.skip("performance tests")
+class TestCompressionPerformance(object):
+    def test_gzip(self, tmpdir):
+        path = str(tmpdir.join("data.gz"))
+        _measure(path, GzipProcessPipeline())
+        _measure(path, GzipPipeline(workers=1))
+        _measure(path, GzipPipeline(workers=4))
+
+    def test_bzip2(self, tmpdir):
+        path = str(tmpdir.join("data.bz2"))
+        _measure(path, Bzip2ProcessPipeline())
+        _measure(path, Bzip2Pipeline(workers=1))
+        _measure(path, Bzip2Pipeline(workers=4))
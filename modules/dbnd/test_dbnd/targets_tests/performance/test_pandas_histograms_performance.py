@@ -0,0 +1,82 @@
+from __future__ import print_function
+
+import json
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from targets.value_meta import ValueMetaConf
+from targets.values.pandas_histograms import PandasHistograms
+
+
+logger = logging.getLogger(__name__)
+
+
+def generate_df(rows, seed=42):
+    rnd = np.random.RandomState(seed)
+    nulls = rnd.rand(rows) < 0.05
+    return pd.DataFrame(
+        {
+            "ints": rnd.randint(0, 1000, rows),
+            "floats": np.where(nulls, np.nan, rnd.randn(rows)),
+            "bools": rnd.rand(rows) < 0.3,
+            "strings": pd.Series(
+                np.where(nulls, None, rnd.choice(["a", "b", "c", "d", "e"], rows)),
+                dtype=object,
+            ),
+        }
+    )
+
+
+def previous_histograms_and_stats(df):
+    """
+    The implementation we had before the single pass engine: describe + json round trip,
+    separate isnull/unique passes and df.apply for the histograms
+    """
+    stats = json.loads(df.describe(include="all").to_json())
+    for col in stats:
+        stats[col]["null-count"] = np.count_nonzero(pd.isnull(df[col]))
+        stats[col]["distinct"] = len(df[col].unique())
+
+    def _histogram(column):
+        if column.dtype == object or column.dtype == bool:
+            counts = column.value_counts()
+            return counts.tolist(), counts.index.tolist()
+        counts, values = np.histogram(column.dropna(), bins=20)
+        return counts.tolist(), values.tolist()
+
+    histograms = df.apply(_histogram, result_type="expand").to_dict(orient="list")
+    return stats, histograms
+
+
+def _timeit(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+@pytest.mark.skip("performance tests")
+class TestPandasHistogramsPerformance(object):
+    @pytest.mark.parametrize("rows", [1000000, 10000000])
+    def test_histograms_and_stats_performance(self, rows):
+        df = generate_df(rows)
+
+        previous = _timeit(previous_histograms_and_stats, df)
+        current = _timeit(
+            PandasHistograms(df, ValueMetaConf.enabled()).get_histograms_and_stats
+        )
+        sampled_conf = ValueMetaConf.enabled()
+        sampled_conf.log_stats_sample_size = 100000
+        sampled = _timeit(PandasHistograms(df, sampled_conf).get_histograms_and_stats)
+
+        logger.info(
+            "%s rows: previous %.2fs, current %.2fs, sampled %.2fs",
+            rows,
+            previous,
+            current,
+            sampled,
+        )
+        assert current < previous
@@ -0,0 +1,79 @@
+from __future__ import print_function
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mock import patch
+
+from dbnd import new_dbnd_context
+from targets import target
+from targets.marshalling.pandas import DataFrameToCsv
+from targets.target_config import file
+
+
+logger = logging.getLogger(__name__)
+
+PARTITIONS = 200
+
+
+@pytest.fixture
+def partitioned_dir(tmpdir):
+    t = target(str(tmpdir.join("partitioned")) + "/", config=file.csv)
+    rnd = np.random.RandomState(42)
+    t.as_pandas.to_csv(
+        (pd.DataFrame(rnd.randn(20000, 5)) for _ in range(PARTITIONS)), index=False
+    )
+    return t
+
+
+def _timeit(func):
+    start = time.time()
+    func()
+    return time.time() - start
+
+
+def _load_with_workers(t, workers):
+    with new_dbnd_context(conf={"output": {"partitions_load_workers": workers}}):
+        return _timeit(t.read_df)
+
+
+def _stream_with_workers(t, workers):
+    with new_dbnd_context(conf={"output": {"partitions_load_workers": workers}}):
+        return _timeit(lambda: sum(len(df) for df in t.read_df_partitioned()))
+
+
+@pytest.mark.skip("performance tests")
+class TestPartitionsLoadPerformance(object):
+    def test_local_partitions_load(self, partitioned_dir):
+        for workers in [1, 4, 8]:
+            logger.info(
+                "%s partitions, %s workers: load %.2fs, stream %.2fs",
+                PARTITIONS,
+                workers,
+                _load_with_workers(partitioned_dir, workers),
+                _stream_with_workers(partitioned_dir, workers),
+            )
+
+    def test_remote_partitions_load(self, partitioned_dir):
+        # emulates a round trip to S3/GCS for every partition
+        original_pd_read = DataFrameToCsv._pd_read
+
+        def _pd_read_with_latency(self, *args, **kwargs):
+            time.sleep(0.05)
+            return original_pd_read(self, *args, **kwargs)
+
+        with patch.object(DataFrameToCsv, "_pd_read", _pd_read_with_latency):
+            sequential = _load_with_workers(partitioned_dir, 1)
+            parallel = _load_with_workers(partitioned_dir, 16)
+
+        logger.info(
+            "%s remote partitions: 1 worker %.2fs, 16 workers %.2fs",
+            PARTITIONS,
+            sequential,
+            parallel,
+        )
+        assert parallel < sequential
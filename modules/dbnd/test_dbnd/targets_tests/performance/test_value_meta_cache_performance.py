@@ -0,0 +1,43 @@
+from __future__ import print_function
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dbnd._core.tracking.value_meta_cache import ValueMetaCache
+from targets.value_meta import ValueMetaConf
+from targets.values.pandas_values import DataFrameValueType
+
+
+logger = logging.getLogger(__name__)
+
+REPEATS = 100
+
+
+def _timeit(func):
+    start = time.time()
+    for _ in range(REPEATS):
+        func()
+    return (time.time() - start) / REPEATS
+
+
+@pytest.mark.skip("performance tests")
+class TestValueMetaCachePerformance(object):
+    @pytest.mark.parametrize("rows", [10000, 1000000])
+    def test_repeated_value_meta(self, rows):
+        df = pd.DataFrame(np.random.RandomState(42).randn(rows, 10))
+        value_type = DataFrameValueType()
+        meta_conf = ValueMetaConf.enabled()
+        cache = ValueMetaCache(max_size=64 * 1024 * 1024)
+        cache.get_value_meta(df, value_type, meta_conf)
+
+        uncached = _timeit(lambda: value_type.get_value_meta(df, meta_conf))
+        cached = _timeit(lambda: cache.get_value_meta(df, value_type, meta_conf))
+
+        logger.info(
+            "%s rows: uncached %.6fs, cached %.6fs per call", rows, uncached, cached
+        )
+        assert cached < uncached
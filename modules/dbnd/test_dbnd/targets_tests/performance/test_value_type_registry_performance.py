@@ -0,0 +1,66 @@
+from __future__ import print_function
+
+import datetime
+import logging
+import time
+
+import pytest
+
+from targets.values import get_types_registry
+
+
+logger = logging.getLogger(__name__)
+
+CALLS = 100000
+
+
+class _UserObject(object):
+    pass
+
+
+# arguments of a typical high frequency tracked function: many small values
+SMALL_ARGS = [
+    1,
+    1.5,
+    True,
+    "some_str",
+    None,
+    [1, 2, 3],
+    {"a": 1},
+    (1, 2),
+    datetime.datetime(2020, 1, 1),
+    _UserObject(),
+]
+
+
+def _linear_scan(registry, value):
+    # get_value_type_of_obj implementation before the dispatch cache
+    for item in registry.discoverable_value_types:
+        if item.is_type_of(value):
+            return item
+    return None
+
+
+def _timeit(func):
+    start = time.time()
+    for _ in range(CALLS):
+        for arg in SMALL_ARGS:
+            func(arg)
+    return time.time() - start
+
+
+@pytest.mark.skip("performance tests")
+class TestValueTypeRegistryPerformance(object):
+    def test_get_value_type_of_obj_performance(self):
+        registry = get_types_registry()
+        previous = _timeit(lambda value: _linear_scan(registry, value))
+        current = _timeit(registry.get_value_type_of_obj)
+
+        logger.info(
+            "%s calls with %s small arguments: linear scan %.2fs, dispatch cache %.2fs",
+            CALLS,
+            len(SMALL_ARGS),
+            previous,
+            current,
+        )
+        assert current < previous
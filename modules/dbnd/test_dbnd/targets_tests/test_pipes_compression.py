@@ -0,0 +1,127 @@
+import bz2
+import gzip
+import io
+import os
+
+import pytest
+
+import targets.pipes
+
+from targets import target
+from targets.pipes.bzip2 import Bzip2Pipeline
+from targets.pipes.compression import (
+    CompressedInputStream,
+    GzipCodec,
+    Lz4Pipeline,
+    XzPipeline,
+    ZstdPipeline,
+)
+from targets.pipes.gzip import GzipPipeline, GzipProcessPipeline
+
+
+def _has_module(name):
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+PIPELINES = [
+    GzipPipeline,
+    Bzip2Pipeline,
+    pytest.param(
+        XzPipeline, marks=pytest.mark.skipif(not _has_module("lzma"), reason="no lzma"),
+    ),
+    pytest.param(
+        ZstdPipeline,
+        marks=pytest.mark.skipif(not _has_module("zstandard"), reason="no zstd"),
+    ),
+    pytest.param(
+        Lz4Pipeline, marks=pytest.mark.skipif(not _has_module("lz4"), reason="no lz4"),
+    ),
+]
+
+TEST_DATA = b"".join(b"line %d of the test data\n" % i for i in range(20000))
+
+
+class TestCompressionPipelines(object):
+    @pytest.fixture
+    def path(self, tmpdir):
+        return str(tmpdir.join("data.compressed"))
+
+    @pytest.mark.parametrize("pipeline_cls", PIPELINES)
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_roundtrip(self, path, pipeline_cls, workers):
+        pipeline = pipeline_cls(workers=workers, block_size=64 * 1024)
+        with target(path, io_pipe=pipeline).open("w") as f:
+            for i in range(0, len(TEST_DATA), 1000):
+                f.write(TEST_DATA[i : i + 1000])
+
+        with target(path, io_pipe=pipeline).open("r") as f:
+            assert f.read() == TEST_DATA
+
+    @pytest.mark.parametrize("pipeline_cls", PIPELINES)
+    def test_empty_output(self, path, pipeline_cls):
+        for workers in [1, 4]:
+            pipeline = pipeline_cls(workers=workers)
+            target(path, io_pipe=pipeline).open("w").close()
+            with target(path, io_pipe=pipeline).open("r") as f:
+                assert f.read() == b""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_gzip_readable_by_module(self, path, workers):
+        t = target(path, io_pipe=GzipPipeline(workers=workers, block_size=64 * 1024))
+        with t.open("w") as f:
+            f.write(TEST_DATA)
+
+        with gzip.open(path, "rb") as f:
+            assert f.read() == TEST_DATA
+
+    def test_bzip2_readable_by_module(self, path):
+        t = target(path, io_pipe=Bzip2Pipeline(workers=4, block_size=64 * 1024))
+        with t.open("w") as f:
+            f.write(TEST_DATA)
+
+        with bz2.BZ2File(path, "rb") as f:
+            assert f.read() == TEST_DATA
+
+    def test_compression_level(self, path):
+        with target(path, io_pipe=GzipPipeline(compression_level=1)).open("w") as f:
+            f.write(TEST_DATA)
+        fast_size = os.path.getsize(path)
+
+        with target(path, io_pipe=GzipPipeline(compression_level=9)).open("w") as f:
+            f.write(TEST_DATA)
+        assert os.path.getsize(path) <= fast_size
+
+    def test_reads_subprocess_output(self, path):
+        with target(path, io_pipe=GzipProcessPipeline()).open("w") as f:
+            f.write(TEST_DATA)
+
+        with target(path, io_pipe=targets.pipes.Gzip).open("r") as f:
+            assert f.read() == TEST_DATA
+
+    def test_input_without_fileno(self):
+        input_pipe = io.BytesIO(GzipCodec().compress_block(TEST_DATA))
+        with CompressedInputStream(input_pipe, GzipCodec()) as f:
+            assert list(f) == TEST_DATA.splitlines(True)
+        assert input_pipe.closed
+
+    def test_text_lines(self, path):
+        t = target(path, io_pipe=targets.pipes.UTF8 >> targets.pipes.Gzip)
+        with t.open("w") as f:
+            f.write(u"first\nsecond\n")
+
+        with t.open("r") as f:
+            assert list(f) == [u"first\n", u"second\n"]
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_abort_on_exception(self, path, workers):
+        t = target(path, io_pipe=GzipPipeline(workers=workers, block_size=1024))
+        with pytest.raises(ValueError):
+            with t.open("w") as f:
+                f.write(TEST_DATA)
+                raise ValueError()
+
+        assert not os.path.exists(path)
@@ -0,0 +1,161 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from targets import LocalFileSystem, target
+from targets.fs.range_file import RangeRequestFile, open_range_file
+
+
+DATA = bytes(bytearray(i % 251 for i in range(10 * 1000)))
+
+
+class _Fetcher(object):
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+
+    def __call__(self, start, end):
+        self.calls.append((start, end))
+        return self.data[start:end]
+
+
+def _range_file(data=DATA, **kwargs):
+    fetcher = _Fetcher(data)
+    kwargs.setdefault("block_size", 1000)
+    return RangeRequestFile("test", len(data), fetcher, **kwargs), fetcher
+
+
+class RangeReadLocalFileSystem(LocalFileSystem):
+    name = "range_read_local"
+    local = False
+    support_direct_access = False
+    support_range_read = True
+
+    files = []
+
+    def open_read(self, path, mode="r"):
+        if "b" not in mode:
+            return super(RangeReadLocalFileSystem, self).open_read(path, mode)
+
+        def fetch_range(start, end):
+            with open(path, "rb") as f:
+                f.seek(start)
+                return f.read(end - start)
+
+        fp = open_range_file(path, os.path.getsize(path), fetch_range, block_size=1024)
+        self.files.append(fp.raw)
+        return fp
+
+
+class TestRangeRequestFile(object):
+    def test_read_all(self):
+        f, fetcher = _range_file()
+        assert f.seekable()
+        assert f.read() == DATA
+        assert f.read() == b""
+        assert f.tell() == len(DATA)
+
+    def test_seek_and_read(self):
+        f, fetcher = _range_file()
+        assert f.seek(-10, io.SEEK_END) == len(DATA) - 10
+        assert f.read(100) == DATA[-10:]
+
+        f.seek(2500)
+        assert f.read(10) == DATA[2500:2510]
+        f.seek(5, io.SEEK_CUR)
+        assert f.read(5) == DATA[2515:2520]
+        # the second read of the block 2 is served by the cache
+        assert fetcher.calls == [(9000, 10000), (2000, 3000)]
+
+        with pytest.raises(ValueError):
+            f.seek(-1)
+
+    def test_read_across_blocks_single_request(self):
+        f, fetcher = _range_file()
+        f.seek(1500)
+        assert f.read(3000) == DATA[1500:4500]
+        assert fetcher.calls == [(1000, 5000)]
+        assert f.requests == 1
+        assert f.bytes_fetched == 4000
+
+    def test_coalesce_small_gap(self):
+        f, fetcher = _range_file(max_gap_blocks=1, max_read_ahead_blocks=0)
+        f.seek(3000)
+        f.read(10)
+        f.seek(0)
+        assert f.read(5000) == DATA[:5000]
+        # block 3 is cached, but fetched again to save a request
+        assert fetcher.calls == [(3000, 4000), (0, 5000)]
+
+    def test_no_coalesce_large_gap(self):
+        f, fetcher = _range_file(max_gap_blocks=0, max_read_ahead_blocks=0)
+        f.seek(3000)
+        f.read(10)
+        f.seek(0)
+        assert f.read(5000) == DATA[:5000]
+        assert fetcher.calls == [(3000, 4000), (0, 3000), (4000, 5000)]
+
+    def test_read_ahead_grows_on_sequential_reads(self):
+        f, fetcher = _range_file(max_read_ahead_blocks=4)
+        while f.read(1000):
+            pass
+        assert fetcher.calls == [(0, 1000), (1000, 3000), (3000, 8000), (8000, 10000)]
+
+    def test_read_ahead_reset_on_seek(self):
+        f, fetcher = _range_file(max_read_ahead_blocks=4)
+        f.read(1000)
+        f.read(1000)
+        f.seek(8000)
+        f.read(10)
+        assert fetcher.calls == [(0, 1000), (1000, 3000), (8000, 9000)]
+
+    def test_cache_eviction(self):
+        f, fetcher = _range_file(max_cached_blocks=2, max_read_ahead_blocks=0)
+        for offset in [0, 1000, 2000, 0]:
+            f.seek(offset)
+            f.read(10)
+        assert fetcher.calls == [(0, 1000), (1000, 2000), (2000, 3000), (0, 1000)]
+
+    def test_read_larger_than_cache(self):
+        f, fetcher = _range_file(max_cached_blocks=2)
+        assert f.read(5000) == DATA[:5000]
+
+    def test_short_response(self):
+        f = RangeRequestFile("test", 100, lambda start, end: b"x", block_size=10)
+        with pytest.raises(IOError):
+            f.read(10)
+
+    def test_empty(self):
+        f, fetcher = _range_file(data=b"")
+        assert f.read() == b""
+        assert not fetcher.calls
+
+    def test_buffered(self):
+        fp = open_range_file("test", len(DATA), _Fetcher(DATA), block_size=1000)
+        with fp:
+            fp.seek(9990)
+            assert fp.read() == DATA[9990:]
+            fp.seek(0)
+            assert fp.read(10) == DATA[:10]
+        assert fp.raw.closed
+
+
+class TestParquetRangeRead(object):
+    def test_read_columns(self, tmpdir):
+        rnd = np.random.RandomState(42)
+        df = pd.DataFrame(
+            {name: rnd.rand(20000) for name in ["a", "b", "c", "d", "e", "f"]}
+        )
+        path = str(tmpdir.join("data.parquet"))
+        df.to_parquet(path, index=False)
+
+        fs = RangeReadLocalFileSystem()
+        del fs.files[:]
+        actual = target(path, fs=fs).load(pd.DataFrame, columns=["b"])
+
+        pd.testing.assert_frame_equal(actual, df[["b"]])
+        (raw,) = fs.files
+        assert raw.bytes_fetched < os.path.getsize(path) / 2
@@ -2,9 +2,12 @@ from __future__ import print_function
 
 import logging
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from dbnd_test_scenarios.test_common.histogram_tests import BaseHistogramTests
+from targets.values.pandas_histograms import PandasHistograms
 
 
 logger = logging.getLogger(__name__)
@@ -40,3 +43,69 @@ class TestPandasHistograms(BaseHistogramTests):
         assert stats["null-count"] == 20
         assert stats["distinct"] == 1
         assert stats["type"] == "object"
+
+    def test_stats_match_describe(self, meta_conf):
+        df = pd.DataFrame(
+            {
+                "ints": [3, 1, 4, 1, 5, 9, 2, 6, 5, 3],
+                "floats": [2.7, 1.8, None, 2.8, 1.8, 2.8, 4.5, None, 9.0, 0.1],
+            }
+        )
+        value_meta = get_value_meta_from_value("df", df, meta_conf)
+
+        describe = df.describe()
+        for column in df.columns:
+            stats = value_meta.descriptive_stats[column]
+            for stat in ["mean", "std", "min", "25%", "50%", "75%", "max"]:
+                assert stats[stat] == pytest.approx(describe[column][stat])
+
+    def test_sampled_stats(self, meta_conf):
+        rnd = np.random.RandomState(0)
+        floats = rnd.randn(100000)
+        floats[::10] = np.nan
+        df = pd.DataFrame({"floats": floats})
+        meta_conf.log_stats_sample_size = 1000
+
+        value_meta = get_value_meta_from_value("sampled", df, meta_conf)
+
+        stats = value_meta.descriptive_stats["floats"]
+        assert stats["count"] == 100000
+        assert stats["null-count"] == 10000
+        assert stats["min"] == pytest.approx(np.nanmin(floats))
+        assert stats["max"] == pytest.approx(np.nanmax(floats))
+        assert stats["mean"] == pytest.approx(np.nanmean(floats))
+        assert stats["50%"] == pytest.approx(np.nanmedian(floats), abs=0.1)
+        # HyperLogLog estimation, 90000 distinct values + null
+        assert stats["distinct"] == pytest.approx(90001, rel=0.05)
+
+        histogram = value_meta.histograms["floats"]
+        assert sum(histogram[0]) == 90000
+
+    @pytest.mark.parametrize(
+        "column",
+        [
+            pd.Series([], dtype="int64"),
+            pd.Series([], dtype="float64"),
+            pd.Series([1, 2, 3], dtype="int64")[:0],
+        ],
+    )
+    def test_empty_numeric_column(self, meta_conf, column):
+        df = pd.DataFrame({"empty": column})
+        value_meta = get_value_meta_from_value("empty", df, meta_conf)
+
+        expected = PandasHistograms(df, meta_conf)._calculate_stats_by_describe(df)
+        assert value_meta.descriptive_stats["empty"] == expected["empty"]
+
+    def test_stats_json_precision(self, meta_conf):
+        df = pd.DataFrame(
+            {
+                "large": [1.2345678912345e20, 2.3456789123456e20, 3.4567891234567e20],
+                "small": [1.2345678912345e-11, 2.3456789123456e-5, 3.14159265358979],
+                "big_ints": [12345678901234567, 2, 3],
+            }
+        )
+        value_meta = get_value_meta_from_value("precision", df, meta_conf)
+
+        expected = PandasHistograms(df, meta_conf)._calculate_stats_by_describe(df)
+        for column in df.columns:
+            assert value_meta.descriptive_stats[column] == expected[column]
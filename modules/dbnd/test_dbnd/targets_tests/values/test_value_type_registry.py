@@ -0,0 +1,65 @@
+import datetime
+
+import pandas as pd
+
+from targets.values import (
+    DictValueType,
+    InlineValueType,
+    ListValueType,
+    ObjectValueType,
+    StrValueType,
+    get_types_registry,
+    get_value_type_of_obj,
+    register_value_type,
+)
+from targets.values.pandas_values import DataFramesDictValueType, DataFrameValueType
+from targets.values.registry import ValueTypeRegistry
+
+
+class MyStr(str):
+    pass
+
+
+class TestValueTypeRegistry(object):
+    def test_value_type_of_obj_is_cached_by_type(self):
+        registry = get_types_registry()
+        assert isinstance(get_value_type_of_obj("a"), StrValueType)
+        assert str in registry._dispatch_cache
+        assert isinstance(get_value_type_of_obj("b"), StrValueType)
+
+    def test_value_type_of_subclass(self):
+        assert isinstance(get_value_type_of_obj(MyStr("a")), StrValueType)
+        assert isinstance(get_value_type_of_obj([1, 2]), ListValueType)
+
+    def test_unknown_type_uses_default(self):
+        class NotRegistered(object):
+            pass
+
+        default = ObjectValueType()
+        assert get_value_type_of_obj(NotRegistered()) is None
+        assert get_value_type_of_obj(NotRegistered(), default) is default
+        assert get_value_type_of_obj(NotRegistered(), default) is default
+
+    def test_content_based_value_type_is_checked_every_time(self):
+        df_dict = {"a": pd.DataFrame(data={"c": [1]})}
+        assert isinstance(get_value_type_of_obj(df_dict), DataFramesDictValueType)
+        # same type, different content
+        assert isinstance(get_value_type_of_obj({"a": 1}), DictValueType)
+        assert not isinstance(get_value_type_of_obj({"a": 1}), DataFramesDictValueType)
+        assert isinstance(get_value_type_of_obj(df_dict), DataFramesDictValueType)
+
+    def test_register_value_type_invalidates_cache(self):
+        registry = ValueTypeRegistry([StrValueType(), DataFrameValueType()])
+        dt = datetime.datetime.now()
+        assert registry.get_value_type_of_obj(dt) is None
+
+        registered = registry.register_value_type(InlineValueType(datetime.datetime))
+        assert registry.get_value_type_of_obj(dt) is registered
+
+    def test_registered_value_type_is_discovered(self):
+        class MyTObj(object):
+            pass
+
+        assert get_value_type_of_obj(MyTObj()) is None
+        registered = register_value_type(InlineValueType(MyTObj))
+        assert get_value_type_of_obj(MyTObj()) is registered
@@ -0,0 +1,89 @@
+import subprocess
+import sys
+
+import pytest
+
+
+# `import dbnd` without the public API took ~1s before it was loaded lazily
+IMPORT_DBND_BUDGET_SECONDS = 0.3
+
+TRACKING_ONLY_CODE = (
+    "from dbnd import task, log_metric, log_dataframe, "
+    "dbnd_tracking_start, dbnd_tracking_stop"
+)
+
+# cli and orchestration only modules
+NOT_FOR_TRACKING_MODULES = [
+    "dbnd._core.cli.main",
+    "dbnd._vendor.click",
+    "dbnd.cli",
+    "dbnd.tasks.basics",
+    "dbnd._core.access",
+]
+
+
+def _import_times(code):
+    """
+    Returns {module: (self seconds, cumulative seconds)} from `python -X importtime`
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    _, stderr = process.communicate()
+    assert process.returncode == 0, stderr.decode("utf-8")
+
+    import_times = {}
+    for line in stderr.decode("utf-8").splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # the header
+            continue
+        import_times[module.strip()] = (
+            int(self_us) / 1000000.0,
+            int(cumulative_us) / 1000000.0,
+        )
+    return import_times
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires -X importtime")
+class TestImportTime(object):
+    def test_import_dbnd(self):
+        import_times = _import_times("import dbnd")
+
+        _, cumulative = import_times["dbnd"]
+        assert cumulative < IMPORT_DBND_BUDGET_SECONDS
+        assert "targets" not in import_times
+        assert "dbnd._core.task.task" not in import_times
+
+    def test_tracking_only_imports(self):
+        import_times = _import_times(TRACKING_ONLY_CODE)
+
+        assert "dbnd._core.task_build.dbnd_decorator" in import_times
+        for module in NOT_FOR_TRACKING_MODULES:
+            assert module not in import_times
+
+    @pytest.mark.parametrize(
+        "code", ["from dbnd import task, Task, output", "import dbnd; dbnd.Task"]
+    )
+    def test_pandas_patched(self, code):
+        _import_times(
+            code + "\n"
+            "import pandas\n"
+            "assert pandas.DataFrame.to_target, 'DataFrame.to_target is not patched'"
+        )
+
+    def test_public_api(self):
+        import_times = _import_times(
+            "import dbnd\n"
+            "missing = [name for name in dbnd.__all__ if getattr(dbnd, name) is None]\n"
+            "assert not missing, missing\n"
+            "assert dbnd.dbnd_config is dbnd.config\n"
+            "assert dbnd.basics.dbnd_sanity_check\n"
+            "from dbnd import *"
+        )
+        for module in NOT_FOR_TRACKING_MODULES:
+            assert module in import_times
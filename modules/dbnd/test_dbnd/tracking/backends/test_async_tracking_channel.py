@@ -0,0 +1,91 @@
+import threading
+
+from dbnd._core.tracking.backends.channels.abstract_channel import TrackingChannel
+from dbnd._core.tracking.backends.channels.tracking_async_channel import (
+    AsyncTrackingChannel,
+    coalesce_events,
+)
+
+
+class RecordingChannel(TrackingChannel):
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def _handle(self, name, data):
+        self.calls.append((name, data))
+        self.threads.add(threading.current_thread().name)
+        return "result"
+
+    def is_ready(self):
+        return True
+
+
+class TestAsyncTrackingChannel(object):
+    def test_coalesce_events(self):
+        events = [
+            ("log_metrics", {"metrics_info": [1]}),
+            ("log_metrics", {"metrics_info": [2, 3]}),
+            ("set_run_state", {"state": "RUNNING"}),
+            ("log_metrics", {"metrics_info": [4]}),
+            ("log_targets", {"targets_info": [5]}),
+            ("log_targets", {"targets_info": [6]}),
+        ]
+        assert coalesce_events(events) == [
+            ("log_metrics", {"metrics_info": [1, 2, 3]}),
+            ("set_run_state", {"state": "RUNNING"}),
+            ("log_metrics", {"metrics_info": [4]}),
+            ("log_targets", {"targets_info": [5, 6]}),
+        ]
+        # original payloads are not changed
+        assert events[0][1] == {"metrics_info": [1]}
+
+    def test_calls_are_sent_in_background_in_order(self):
+        inner = RecordingChannel()
+        channel = AsyncTrackingChannel(inner, flush_interval=60)
+
+        assert channel.log_metrics({"metrics_info": [1]}) is None
+        channel.log_metrics({"metrics_info": [2]})
+        channel.set_run_state({"state": "SUCCESS"})
+        channel.update_task_run_attempts({"task_run_attempt_updates": ["a"]})
+        channel.update_task_run_attempts({"task_run_attempt_updates": ["b"]})
+        channel.flush()
+
+        assert inner.calls == [
+            ("log_metrics", {"metrics_info": [1, 2]}),
+            ("set_run_state", {"state": "SUCCESS"}),
+            ("update_task_run_attempts", {"task_run_attempt_updates": ["a", "b"]}),
+        ]
+        assert inner.threads == {"dbnd-async-tracking"}
+
+    def test_batch_size_triggers_send(self):
+        inner = RecordingChannel()
+        channel = AsyncTrackingChannel(inner, batch_size=2, flush_interval=60)
+
+        for i in range(5):
+            channel.log_targets({"targets_info": [i]})
+        channel.flush()
+
+        assert inner.calls == [
+            ("log_targets", {"targets_info": [0, 1]}),
+            ("log_targets", {"targets_info": [2, 3]}),
+            ("log_targets", {"targets_info": [4]}),
+        ]
+
+    def test_sync_handlers(self):
+        inner = RecordingChannel()
+        channel = AsyncTrackingChannel(inner)
+
+        assert channel.heartbeat({"run_uid": 1}) == "result"
+        assert inner.threads == {threading.current_thread().name}
+
+    def test_failed_call_does_not_stop_the_worker(self):
+        inner = RecordingChannel()
+        inner.set_task_reused = lambda data: 1 / 0
+        channel = AsyncTrackingChannel(inner)
+
+        channel.set_task_reused({})
+        channel.set_run_state({"state": "SUCCESS"})
+        channel.flush()
+
+        assert inner.calls == [("set_run_state", {"state": "SUCCESS"})]
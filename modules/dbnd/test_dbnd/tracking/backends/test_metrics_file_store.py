@@ -1,15 +1,20 @@
+import time
+
 import pytest
 import six
 
 from mock import Mock
 
-from dbnd._core.constants import MetricSource
+from dbnd._core.constants import MetricSource, TaskRunState
+from dbnd._core.errors import DatabandError
 from dbnd._core.task_run.task_run_meta_files import TaskRunMetaFiles
 from dbnd._core.task_run.task_run_tracker import TaskRunTracker
 from dbnd._core.tracking.backends.tracking_store_file import (
     FileTrackingStore,
     TaskRunMetricsFileStoreReader,
 )
+from dbnd._core.tracking.schemas.metrics import Metric
+from dbnd._core.utils.timezone import utcnow
 from targets import target
 from targets.value_meta import ValueMetaConf
 
@@ -52,6 +57,8 @@ class TestFileMetricsStore(object):
         tr_tracker.settings.tracking.get_value_meta_conf = Mock(
             return_value=ValueMetaConf.enabled()
         )
+        tr_tracker.settings.tracking.value_meta_async = False
+        tr_tracker.settings.tracking.value_meta_cache = False
         tr_tracker.log_data(
             "df", pandas_data_frame, meta_conf=ValueMetaConf.enabled(),
         )
@@ -72,3 +79,84 @@ class TestFileMetricsStore(object):
         # std value varies in different py versions due to float precision fluctuation
         df_births_std = hist_metrics["df.Births.std"]
         assert df_births_std == pytest.approx(428.4246)
+
+    def test_task_metrics_appended(self, tmpdir):
+        metrics_folder = target(str(tmpdir))
+
+        task_run = Mock()
+        task_run.meta_files = TaskRunMetaFiles(metrics_folder)
+        t = FileTrackingStore()
+        for i in range(100):
+            t.log_metrics(task_run, [Metric("a", utcnow(), value=i)])
+
+        history = TaskRunMetricsFileStoreReader(metrics_folder).get_metric_history("a")
+        assert [m.value for m in history] == list(range(100))
+
+    def test_task_metrics_buffered(self, tmpdir):
+        metrics_folder = target(str(tmpdir))
+
+        task_run = Mock()
+        task_run.meta_files = TaskRunMetaFiles(metrics_folder)
+        t = FileTrackingStore(metrics_flush_size=10, metrics_flush_interval=600)
+        reader = TaskRunMetricsFileStoreReader(metrics_folder)
+
+        for i in range(15):
+            t.log_metrics(task_run, [Metric("a", utcnow(), value=i)])
+        assert len(reader.get_metric_history("a")) == 10
+
+        t.set_task_run_state(task_run, TaskRunState.SUCCESS)
+        assert len(reader.get_metric_history("a")) == 15
+
+    def test_task_metrics_flush_interval(self, tmpdir):
+        metrics_folder = target(str(tmpdir))
+
+        task_run = Mock()
+        task_run.meta_files = TaskRunMetaFiles(metrics_folder)
+        t = FileTrackingStore(metrics_flush_size=10, metrics_flush_interval=0.1)
+        reader = TaskRunMetricsFileStoreReader(metrics_folder)
+
+        for i in range(3):
+            t.log_metrics(task_run, [Metric("a", utcnow(), value=i)])
+        with pytest.raises(DatabandError):
+            reader.get_metric_history("a")
+
+        # written without waiting for more values or the end of the task run
+        time.sleep(0.5)
+        assert len(reader.get_metric_history("a")) == 3
+
+    def test_task_metrics_after_task_end(self, tmpdir):
+        metrics_folder = target(str(tmpdir))
+
+        task_run = Mock()
+        task_run.meta_files = TaskRunMetaFiles(metrics_folder)
+        t = FileTrackingStore(metrics_flush_size=10, metrics_flush_interval=600)
+        reader = TaskRunMetricsFileStoreReader(metrics_folder)
+
+        task_run.task_run_state = TaskRunState.SUCCESS
+        t.set_task_run_state(task_run, TaskRunState.SUCCESS)
+        t.log_metrics(task_run, [Metric("a", utcnow(), value=1)])
+
+        assert len(reader.get_metric_history("a")) == 1
+        assert not t._metrics_writers
+
+    def test_task_metrics_single_file(self, tmpdir):
+        metrics_folder = target(str(tmpdir))
+
+        task_run = Mock()
+        task_run.meta_files = TaskRunMetaFiles(metrics_folder)
+        t = FileTrackingStore(metrics_single_file=True)
+        t.log_metrics(
+            task_run,
+            [
+                Metric("a", utcnow(), value=1),
+                Metric("b", utcnow(), value=2),
+                Metric("a", utcnow(), value=3),
+                Metric("c", utcnow(), value=4, source=MetricSource.system),
+            ],
+        )
+        t.set_task_run_state(task_run, TaskRunState.SUCCESS)
+
+        reader = TaskRunMetricsFileStoreReader(metrics_folder)
+        assert reader.get_all_metrics_values(MetricSource.user) == {"a": 1, "b": 2}
+        assert reader.get_all_metrics_values(MetricSource.system) == {"c": 4}
+        assert [m.value for m in reader.get_metric_history("a")] == [1, 3]
@@ -24,3 +24,11 @@ def f5():
 @task
 def f6():
     pass
+
+
+def f7():
+    pass
+
+
+def f8():
+    pass
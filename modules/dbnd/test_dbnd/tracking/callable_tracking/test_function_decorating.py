@@ -1,11 +1,38 @@
+import logging
+import sys
+import time
+
+from types import ModuleType
+
+import pytest
+
+from dbnd import task
 from dbnd._core.tracking.python_tracking import (
     _is_function,
     _is_task,
+    _ModuleReferencesIndex,
     track_functions,
     track_modules,
 )
 from test_dbnd.tracking.callable_tracking import module_to_track
-from test_dbnd.tracking.callable_tracking.module_to_track import f1, f2, f3, f4, f6
+from test_dbnd.tracking.callable_tracking.module_to_track import (
+    f1,
+    f2,
+    f3,
+    f4,
+    f6,
+    f7,
+    f8,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _new_module(name, **attrs):
+    module = ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
 
 
 class TestFunctionDecorating(object):
@@ -45,3 +72,92 @@ class TestFunctionDecorating(object):
         track_modules(module_to_track)
         track_modules(module_to_track)
         assert callable(f6.callable), "function was decorated more than once"
+
+    def test_modules_index_updated_with_new_modules(self, monkeypatch):
+        index = _ModuleReferencesIndex()
+        index.replace(f2, f2)
+
+        # imported after the index is built
+        later = _new_module("_dbnd_later_module", f7=f7, alias=f7)
+        monkeypatch.setitem(sys.modules, later.__name__, later)
+        decorated = task(f7)
+        index.replace(f7, decorated)
+
+        assert later.f7 is decorated
+        assert later.alias is decorated
+        assert module_to_track.f7 is decorated
+
+    def test_modules_index_rebound_names(self, monkeypatch):
+        holder = _new_module("_dbnd_rebinding_module", f8=f8)
+        monkeypatch.setitem(sys.modules, holder.__name__, holder)
+        index = _ModuleReferencesIndex()
+        index.replace(f1, f1)
+
+        holder.f8 = f1
+        decorated = task(f8)
+        index.replace(f8, decorated)
+
+        # rebound after indexing, not a reference to f8 anymore
+        assert holder.f8 is f1
+        assert module_to_track.f8 is decorated
+
+
+def _scan_modules_replace(function, new_function):
+    # reference implementation: scan all the modules for every function
+    for module in list(sys.modules.values()):
+        if not isinstance(module, ModuleType):
+            continue
+        for k, v in list(module.__dict__.items()):
+            if v is function:
+                module.__dict__[k] = new_function
+
+
+@pytest.mark.skip("performance tests")
+class TestFunctionDecoratingPerformance(object):
+    FUNCTIONS = 500
+
+    def _build_package(self, monkeypatch, name):
+        package = _new_module(name)
+        monkeypatch.setitem(sys.modules, name, package)
+        for m in range(10):
+            module = _new_module("%s.module_%s" % (name, m))
+            exec(
+                "\n".join(
+                    "def func_%s():\n    return %s\n" % (i, i)
+                    for i in range(self.FUNCTIONS // 10)
+                ),
+                module.__dict__,
+            )
+            monkeypatch.setitem(sys.modules, module.__name__, module)
+            setattr(package, "module_%s" % m, module)
+        return [getattr(package, "module_%s" % m) for m in range(10)]
+
+    def test_track_modules(self, monkeypatch):
+        # realistic set of imported modules
+        import pandas  # noqa: F401
+        import numpy  # noqa: F401
+        import dbnd_test_scenarios  # noqa: F401
+
+        logger.info("modules imported: %s", len(sys.modules))
+
+        modules = self._build_package(monkeypatch, "_dbnd_scan_package")
+        start = time.time()
+        for module in modules:
+            for name, value in list(module.__dict__.items()):
+                if _is_function(value):
+                    _scan_modules_replace(value, task(value))
+        scan_time = time.time() - start
+
+        modules = self._build_package(monkeypatch, "_dbnd_index_package")
+        start = time.time()
+        track_modules(*modules)
+        index_time = time.time() - start
+
+        logger.info(
+            "tracking %s functions: scanning modules per function %.2fs, index %.2fs",
+            self.FUNCTIONS,
+            scan_time,
+            index_time,
+        )
+        assert all(_is_task(module.func_0) for module in modules)
+        assert index_time < scan_time
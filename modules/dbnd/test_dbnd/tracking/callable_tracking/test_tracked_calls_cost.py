@@ -0,0 +1,110 @@
+import inspect
+import logging
+import time
+
+import pytest
+
+from dbnd import dbnd_tracking_stop, get_databand_run, task
+from dbnd._core.configuration import get_dbnd_project_config
+from dbnd._core.errors.errors_utils import _get_frame_line_info
+from dbnd.testing.helpers_mocks import set_tracking_context
+
+
+logger = logging.getLogger(__name__)
+
+
+@task
+def cost_step(value, *args, **kwargs):
+    return value
+
+
+def _task_runs_of(func):
+    run = get_databand_run()
+    return [tr for tr in run.task_runs if tr.task.task_name == func.__name__]
+
+
+def _param(task_run, name):
+    return task_run.task._params.get_param_value(name)
+
+
+@pytest.mark.usefixtures(set_tracking_context.__name__)
+class TestTrackedCallsCost(object):
+    def test_param_definitions_built_once(self, mock_channel_tracker):
+        cost_step(1, "a", key="b")
+        cost_step(2, "c", key="d")
+        cost_step("str value")
+
+        first, second, third = _task_runs_of(cost_step)
+        for name in ("value", "args", "kwargs"):
+            assert _param(first, name).parameter is _param(second, name).parameter
+        assert _param(third, "value").parameter is not _param(first, "value").parameter
+
+        assert _param(first, "value").value == 1
+        assert _param(second, "value").value == 2
+        assert _param(second, "args").value == ("c",)
+        assert _param(second, "kwargs").value == {"key": "d"}
+        assert _param(third, "value").value == "str value"
+        dbnd_tracking_stop()
+
+    def test_task_run_folders(self, mock_channel_tracker):
+        cost_step(1)
+
+        task_run = _task_runs_of(cost_step)[0]
+        # not used by tracking
+        assert task_run._attempt_folder is None
+        assert task_run._deploy is None
+        assert task_run._sync_local is None
+
+        attempt_name = "attempt_1_%s" % task_run.task_run_attempt_uid
+        assert str(task_run.attempt_folder) == str(
+            task_run.task._meta_output.folder(attempt_name, extension=None)
+        )
+        assert str(task_run.local_task_run_root).endswith(
+            "/tasks/%s/" % task_run.task.task_id
+        )
+        assert str(task_run.log.local_log_file).endswith(
+            "/tasks/%s/1.log" % task_run.task.task_id
+        )
+        assert task_run.meta_files.root is task_run.attempt_folder
+        dbnd_tracking_stop()
+
+
+def _suspended():
+    yield
+
+
+def test_frame_line_info():
+    # frame that doesn't run while we compare
+    generator = _suspended()
+    next(generator)
+    frame = generator.gi_frame
+
+    expected = inspect.getframeinfo(frame, 1)
+    actual = _get_frame_line_info(frame)
+    assert actual == expected
+
+
+@pytest.mark.skip("performance tests")
+@pytest.mark.usefixtures(set_tracking_context.__name__)
+class TestTrackedCallsCostPerformance(object):
+    def test_trivial_task_calls(self, mock_channel_tracker, monkeypatch):
+        # the limit is read when the function is decorated
+        monkeypatch.setattr(get_dbnd_project_config(), "max_calls_per_run", 1000000)
+
+        @task
+        def trivial(value):
+            return value
+
+        calls = 100000
+        start = time.time()
+        for i in range(calls):
+            trivial(i)
+        took = time.time() - start
+        dbnd_tracking_stop()
+
+        logger.info(
+            "%s calls of a trivial task: %.1fs, %.3f ms per call",
+            calls,
+            took,
+            took / calls * 1000,
+        )
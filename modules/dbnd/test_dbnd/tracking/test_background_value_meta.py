@@ -0,0 +1,200 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from dbnd import get_databand_context, log_dataframe, task
+from dbnd._core.constants import TaskRunState
+from dbnd._core.settings.tracking_config import ValueMetaMutationPolicy
+from dbnd._core.task_run.task_run_tracker import TaskRunTracker
+from dbnd._core.tracking.backends.tracking_store_composite import CompositeTrackingStore
+from dbnd._core.tracking.background_value_meta import (
+    BackgroundValueMetaCalculator,
+    snapshot_value,
+)
+from dbnd._core.utils.basics.nothing import NOTHING
+from test_dbnd.tracking.tracking_helpers import get_log_metrics, get_log_targets
+
+
+class _NotCopyable(object):
+    def __copy__(self):
+        raise TypeError("can't copy")
+
+
+class TestBackgroundValueMetaCalculator(object):
+    def test_submit_and_wait(self):
+        calculator = BackgroundValueMetaCalculator(workers=2)
+        results = []
+        for i in range(10):
+            calculator.submit(results.append, i)
+
+        assert calculator.wait()
+        assert sorted(results) == list(range(10))
+
+    def test_errors_are_not_raised(self):
+        calculator = BackgroundValueMetaCalculator(workers=1)
+        calculator.submit(lambda: 1 / 0)
+        assert calculator.wait()
+
+    def test_wait_timeout(self):
+        calculator = BackgroundValueMetaCalculator(workers=1, timeout=0.1)
+        release = threading.Event()
+        results = []
+        calculator.submit(release.wait)
+        # still waiting for the worker
+        calculator.submit(results.append, 1)
+
+        assert not calculator.wait()
+        release.set()
+        time.sleep(0.1)
+        # calculation that hasn't started by the deadline is dropped
+        assert results == []
+
+    def test_max_pending(self):
+        calculator = BackgroundValueMetaCalculator(workers=1, max_pending=1)
+        release = threading.Event()
+        calculator.submit(release.wait)
+
+        submitted = threading.Event()
+
+        def _submit():
+            calculator.submit(lambda: None)
+            submitted.set()
+
+        threading.Thread(target=_submit).start()
+        assert not submitted.wait(0.2)
+
+        release.set()
+        assert submitted.wait(5)
+        assert calculator.wait()
+
+    def test_wait_for_some_futures(self):
+        calculator = BackgroundValueMetaCalculator(workers=2, timeout=5)
+        release = threading.Event()
+        calculator.submit(release.wait)
+        results = []
+        future = calculator.submit(results.append, 1)
+
+        # doesn't wait for the other calculation
+        assert calculator.wait(futures=[future])
+        assert results == [1]
+        release.set()
+        assert calculator.wait()
+
+    def test_then(self):
+        calculator = BackgroundValueMetaCalculator(workers=2, timeout=5)
+        release = threading.Event()
+        results = []
+        futures = [
+            calculator.submit(release.wait, 5),
+            calculator.submit(results.append, 1),
+        ]
+
+        # doesn't block the caller
+        calculator.then(futures, results.append, 2)
+        assert results in ([], [1])
+
+        release.set()
+        assert calculator.wait()
+        assert results == [1, 2]
+
+        # nothing to wait for, called right away
+        calculator.then(futures, results.append, 3)
+        assert results == [1, 2, 3]
+
+    def test_snapshot_value(self):
+        df = pd.DataFrame(data={"a": [1, 2, 3]})
+        snapshot = snapshot_value(df)
+        df["a"] = 0
+
+        assert snapshot["a"].tolist() == [1, 2, 3]
+        assert snapshot_value(_NotCopyable()) is NOTHING
+
+
+@task
+def task_with_log_dataframe(df):
+    log_dataframe("df", df, with_histograms=True)
+    df["a"] = 0
+    return df
+
+
+class TestBackgroundValueMetaTracking(object):
+    def _run_with_policy(self, monkeypatch, mutation_policy):
+        df = pd.DataFrame(data={"a": [1, 2, 3, 4], "b": ["x", "y", "z", "w"]})
+        # the settings of the current context, the run tracker is built from them
+        tracking = get_databand_context().settings.tracking
+        monkeypatch.setattr(tracking, "value_meta_async", True)
+        monkeypatch.setattr(
+            tracking,
+            "value_meta_mutation_policy",
+            ValueMetaMutationPolicy[mutation_policy],
+        )
+        task_with_log_dataframe.dbnd_run(df)
+
+    @pytest.mark.parametrize("mutation_policy", ["REFERENCE", "SNAPSHOT"])
+    def test_log_dataframe_in_background(
+        self, mock_channel_tracker, monkeypatch, mutation_policy
+    ):
+        self._run_with_policy(monkeypatch, mutation_policy)
+
+        metrics = {
+            m["metric"].key: m["metric"].value
+            for m in get_log_metrics(mock_channel_tracker)
+        }
+        assert metrics["df.shape0"] == 4
+
+        targets = {t.param_name for t in get_log_targets(mock_channel_tracker)}
+        assert {"df", "result"}.issubset(targets)
+
+    def test_snapshot_is_not_affected_by_mutation(
+        self, mock_channel_tracker, monkeypatch
+    ):
+        self._run_with_policy(monkeypatch, "SNAPSHOT")
+
+        metrics = {
+            m["metric"].key: m["metric"].value
+            for m in get_log_metrics(mock_channel_tracker)
+        }
+        # the task sets all the values to 0 right after logging
+        assert metrics["df.a.max"] == 4
+
+    def test_task_state_is_reported_after_its_values(
+        self, mock_channel_tracker, monkeypatch
+    ):
+        events = []
+        reporting_threads = {}
+        get_value_meta = TaskRunTracker._get_value_meta
+        log_value_metrics = TaskRunTracker.log_value_metrics
+        set_task_run_state = CompositeTrackingStore.set_task_run_state
+
+        def slow_get_value_meta(self, *args, **kwargs):
+            # longer than the rest of the task run
+            time.sleep(1)
+            return get_value_meta(self, *args, **kwargs)
+
+        def logging_log_value_metrics(self, key, *args, **kwargs):
+            events.append((self.task.task_name, key))
+            return log_value_metrics(self, key, *args, **kwargs)
+
+        def logging_set_task_run_state(self, **kwargs):
+            events.append((kwargs["task_run"].task.task_name, kwargs["state"]))
+            reporting_threads[
+                (kwargs["task_run"].task.task_name, kwargs["state"])
+            ] = threading.current_thread()
+            return set_task_run_state(self, **kwargs)
+
+        monkeypatch.setattr(TaskRunTracker, "_get_value_meta", slow_get_value_meta)
+        monkeypatch.setattr(
+            TaskRunTracker, "log_value_metrics", logging_log_value_metrics
+        )
+        monkeypatch.setattr(
+            CompositeTrackingStore, "set_task_run_state", logging_set_task_run_state
+        )
+        self._run_with_policy(monkeypatch, "REFERENCE")
+
+        task_name = "task_with_log_dataframe"
+        success = (task_name, TaskRunState.SUCCESS)
+        assert events.index((task_name, "df")) < events.index(success)
+        # the task run didn't wait for its values, the state is reported in background
+        assert reporting_threads[success] is not threading.current_thread()
@@ -0,0 +1,261 @@
+import datetime
+import json
+import logging
+import time
+import uuid
+
+from collections import OrderedDict
+
+import attr
+import pytest
+
+from dbnd import dbnd_tracking_stop, log_dataframe, log_dataset_op, log_metric, task
+from dbnd._core.constants import DbndDatasetOperationType, RunState
+from dbnd._core.tracking.backends.channels.marshmallow_mixin import MarshmallowMixin
+from dbnd._core.tracking.commands import set_external_resource_urls
+from dbnd._core.tracking.schemas.compiled_dump import compile_dump
+from dbnd._vendor.marshmallow import Schema, ValidationError, fields, pre_dump
+from dbnd._vendor.marshmallow_enum import EnumField
+from dbnd.testing.helpers_mocks import set_tracking_context
+
+
+logger = logging.getLogger(__name__)
+
+
+def _channel_calls(mock_channel_tracker):
+    for call in mock_channel_tracker.call_args_list:
+        yield call.args[0].__name__, call.kwargs
+
+
+def _assert_same_dump(schema, obj):
+    expected = schema.dump(obj).data
+    actual = compile_dump(schema)(obj)
+    assert actual == expected
+    assert json.dumps(actual, sort_keys=True, default=str) == json.dumps(
+        expected, sort_keys=True, default=str
+    )
+    return actual
+
+
+@task
+def compiled_dump_step(data, factor=2):
+    log_metric("factor", factor)
+    log_dataframe("data", data)
+    log_dataset_op("location://path/to/value.csv", DbndDatasetOperationType.read)
+    set_external_resource_urls({"docs": "http://localhost/docs"})
+    return data * factor
+
+
+@task
+def compiled_dump_failure():
+    raise ValueError("expected failure")
+
+
+@task
+def compiled_dump_pipeline(data):
+    result = compiled_dump_step(data)
+    try:
+        compiled_dump_failure()
+    except ValueError:
+        pass
+    return result
+
+
+@pytest.mark.usefixtures(set_tracking_context.__name__)
+class TestCompiledDumpTrackingCalls(object):
+    def test_same_as_schema_dump(self, mock_channel_tracker, pandas_data_frame):
+        compiled_dump_pipeline(pandas_data_frame)
+        dbnd_tracking_stop()
+
+        handlers = set()
+        for name, kwargs in _channel_calls(mock_channel_tracker):
+            schema = MarshmallowMixin.SCHEMA_BY_HANDLER_NAME[name]
+            _assert_same_dump(schema, kwargs)
+            handlers.add(name)
+
+        assert {
+            "init_run",
+            "add_task_runs",
+            "update_task_run_attempts",
+            "log_metrics",
+            "log_targets",
+            "log_datasets",
+            "save_external_links",
+            "set_run_state",
+        }.issubset(handlers)
+
+
+class Color(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class _ColorSchema(Schema):
+    name = fields.String()
+
+
+@attr.s
+class _Node(object):
+    uid = attr.ib()
+    name = attr.ib()
+    state = attr.ib(default=RunState.RUNNING)
+    created = attr.ib(default=None)
+    weight = attr.ib(default=1.5)
+    count = attr.ib(default="3")
+    enabled = attr.ib(default=1)
+    tags = attr.ib(default=attr.Factory(list))
+    meta = attr.ib(default=None)
+    children = attr.ib(default=attr.Factory(list))
+    parent = attr.ib(default=None)
+    colors = attr.ib(default=attr.Factory(list))
+    secret = attr.ib(default="secret")
+
+    def display_name(self):
+        return self.name.upper()
+
+
+class _NodeSchema(Schema):
+    uid = fields.UUID()
+    name = fields.String(dump_to="node_name")
+    display_name = fields.String()
+    title = fields.String(attribute="name")
+    state = EnumField(RunState)
+    state_value = EnumField(RunState, by_value=True, attribute="state")
+    created = fields.DateTime(allow_none=True)
+    created_date = fields.Date(attribute="created", allow_none=True)
+    weight = fields.Float()
+    count = fields.Integer()
+    enabled = fields.Boolean()
+    tags = fields.List(fields.String())
+    meta = fields.Dict(allow_none=True)
+    children = fields.Nested("self", many=True, exclude=("parent",))
+    parent = fields.Nested("self", only="name", allow_none=True)
+    colors = fields.Nested(_ColorSchema, many=True)
+    color_names = fields.List(fields.String(attribute="name"), attribute="colors")
+    name_length = fields.Function(lambda node: len(node.name))
+    missing_with_default = fields.String(default="default")
+    missing = fields.String()
+    secret = fields.String(load_only=True)
+
+
+class _OrderedNodeSchema(_NodeSchema):
+    class Meta:
+        ordered = True
+
+
+class _PreDumpSchema(Schema):
+    name = fields.String()
+
+    @pre_dump
+    def upper(self, data):
+        return {"name": data["name"].upper()}
+
+
+class _StrictSchema(Schema):
+    uid = fields.UUID()
+
+    class Meta:
+        strict = True
+
+
+def _build_node():
+    parent = _Node(uid=uuid.uuid4(), name="parent")
+    return _Node(
+        uid=str(uuid.uuid4()),
+        name="node",
+        created=datetime.datetime(2020, 1, 2, 3, 4, 5, 6),
+        tags=["a", b"b", 1],
+        meta={"key": {"nested": [1, 2]}},
+        children=[
+            _Node(uid=uuid.uuid4(), name="child_%s" % i, parent=parent)
+            for i in range(3)
+        ],
+        parent=parent,
+        colors=[Color("red"), Color("blue")],
+    )
+
+
+class TestCompiledDump(object):
+    @pytest.mark.parametrize("schema_cls", [_NodeSchema, _OrderedNodeSchema])
+    def test_fields(self, schema_cls):
+        actual = _assert_same_dump(schema_cls(), _build_node())
+        assert actual["node_name"] == "node"
+        assert actual["display_name"] == "NODE"
+        assert actual["parent"] == "parent"
+        assert actual["color_names"] == ["red", "blue"]
+        assert actual["missing_with_default"] == "default"
+        assert "missing" not in actual
+        assert "secret" not in actual
+        assert len(actual["children"]) == 3
+
+    def test_ordered(self):
+        actual = compile_dump(_OrderedNodeSchema())(_build_node())
+        assert isinstance(actual, OrderedDict)
+
+    def test_many(self):
+        nodes = [_build_node() for _ in range(3)]
+        _assert_same_dump(_NodeSchema(many=True), nodes)
+        schema = _NodeSchema(many=True)
+        assert compile_dump(schema)(iter(nodes)) == schema.dump(iter(nodes)).data
+
+    def test_dict_input(self):
+        _assert_same_dump(
+            _NodeSchema(only=("uid", "name", "tags", "meta", "enabled")),
+            {"uid": uuid.uuid4(), "name": "dict", "tags": "single", "enabled": "f"},
+        )
+
+    def test_none_values(self):
+        _assert_same_dump(
+            _NodeSchema(),
+            _Node(uid=None, name="node", state=None, weight=None, count=None),
+        )
+
+    def test_dump_processors(self):
+        _assert_same_dump(_PreDumpSchema(), {"name": "value"})
+
+    def test_errors(self):
+        schema = _StrictSchema()
+        with pytest.raises(ValidationError):
+            schema.dump({"uid": "not a uuid"})
+        with pytest.raises(ValidationError):
+            compile_dump(schema)({"uid": "not a uuid"})
+
+        # not strict schemas return what marshmallow returns
+        _assert_same_dump(_NodeSchema(only=("uid",)), {"uid": "not a uuid"})
+
+
+@pytest.mark.skip("performance tests")
+@pytest.mark.usefixtures(set_tracking_context.__name__)
+class TestCompiledDumpPerformance(object):
+    def test_init_run(self, mock_channel_tracker, pandas_data_frame):
+        compiled_dump_pipeline(pandas_data_frame)
+
+        init_args = next(
+            kwargs
+            for name, kwargs in _channel_calls(mock_channel_tracker)
+            if name == "init_run"
+        )
+        task_runs_info = init_args["init_args"].task_runs_info
+        task_run = task_runs_info.task_runs[0]
+        task_runs_info.task_runs = [
+            attr.evolve(task_run, task_run_uid=uuid.uuid4(), task_id="task_%s" % i)
+            for i in range(5000)
+        ]
+
+        schema = MarshmallowMixin.SCHEMA_BY_HANDLER_NAME["init_run"]
+        start = time.time()
+        expected = schema.dump(init_args).data
+        schema_dump_time = time.time() - start
+
+        dump = compile_dump(schema)
+        start = time.time()
+        actual = dump(init_args)
+        compiled_dump_time = time.time() - start
+
+        logger.info(
+            "init_run with 5000 task runs: schema dump %.3fs, compiled dump %.3fs",
+            schema_dump_time,
+            compiled_dump_time,
+        )
+        assert actual == expected
+        assert compiled_dump_time < schema_dump_time
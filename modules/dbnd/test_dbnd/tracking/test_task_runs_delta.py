@@ -0,0 +1,134 @@
+import logging
+import time
+
+import pytest
+
+from dbnd import config, get_databand_run, task
+from dbnd._core.configuration import get_dbnd_project_config
+from dbnd._core.tracking.tracking_info_convertor import TrackingInfoBuilder
+from dbnd.testing.helpers_mocks import set_tracking_context
+from test_dbnd.tracking.tracking_helpers import (
+    build_tasks_connection_from_runs_info,
+    get_task_runs_info,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@task
+def delta_step(value):
+    return value + 1
+
+
+@task
+def delta_join(left, right):
+    return left + right
+
+
+@task
+def delta_pipeline(count):
+    values = [delta_step(i) for i in range(count)]
+    result = 0
+    for value in values:
+        result = delta_join(result, value)
+    return result
+
+
+def _track_pipeline(mock_channel_tracker, count, delta):
+    with config({"tracking": {"dynamic_task_runs_delta": delta}}):
+        delta_pipeline(count)
+    return list(get_task_runs_info(mock_channel_tracker))
+
+
+def _relations(task_runs_infos):
+    parent_child_map = set()
+    upstreams_map = set()
+    for task_runs_info in task_runs_infos:
+        parent_child_map.update(task_runs_info.parent_child_map)
+        upstreams_map.update(task_runs_info.upstreams_map)
+    return parent_child_map, upstreams_map
+
+
+@pytest.mark.usefixtures(set_tracking_context.__name__)
+class TestTaskRunsDelta(object):
+    def test_same_relations_as_full_update(self, mock_channel_tracker):
+        delta = _track_pipeline(mock_channel_tracker, 3, delta=True)
+
+        run = get_databand_run()
+        full = TrackingInfoBuilder(run).build_task_runs_info(run.task_runs)
+        # relations with the parent of the tracked run are added by init_run only
+        init_parent_child_map = delta[0].parent_child_map
+
+        assert _relations(delta) == (
+            full.parent_child_map | init_parent_child_map,
+            full.upstreams_map,
+        )
+
+        child_connections, _ = build_tasks_connection_from_runs_info(delta)
+        assert ("delta_pipeline", "delta_step") in child_connections
+        assert ("delta_pipeline", "delta_join") in child_connections
+
+    def test_task_definitions_submitted_once(self, mock_channel_tracker):
+        task_runs_infos = _track_pipeline(mock_channel_tracker, 5, delta=True)
+
+        families = [
+            task_definition.family
+            for task_runs_info in task_runs_infos
+            for task_definition in task_runs_info.task_definitions
+        ]
+        assert sorted(families) == sorted(set(families))
+        assert {"delta_pipeline", "delta_step", "delta_join"}.issubset(families)
+
+        # every update has only the new task run
+        for task_runs_info in task_runs_infos[1:]:
+            assert len(task_runs_info.task_runs) == 1
+            assert task_runs_info.dynamic_task_run_update
+
+    def test_targets_submitted_once(self, mock_channel_tracker):
+        task_runs_infos = _track_pipeline(mock_channel_tracker, 5, delta=True)
+
+        paths = [
+            target.path
+            for task_runs_info in task_runs_infos
+            for target in task_runs_info.targets
+        ]
+        assert len(paths) == len(set(paths))
+
+
+@pytest.mark.skip("performance tests")
+@pytest.mark.usefixtures(set_tracking_context.__name__)
+class TestTaskRunsDeltaPerformance(object):
+    @pytest.mark.parametrize("delta", [True, False])
+    def test_add_task_run_cost(self, mock_channel_tracker, monkeypatch, delta):
+        # the limit is read when the function is decorated
+        monkeypatch.setattr(get_dbnd_project_config(), "max_calls_per_run", 10000)
+
+        @task
+        def perf_step(value):
+            return value + 1
+
+        @task
+        def many_calls(count):
+            timings = []
+            for i in range(count):
+                start = time.time()
+                perf_step(i)
+                timings.append(time.time() - start)
+            return timings
+
+        with config({"tracking": {"dynamic_task_runs_delta": delta}}):
+            timings = many_calls(2000)
+
+        for i in range(0, len(timings), 500):
+            chunk = timings[i : i + 500]
+            logger.info(
+                "delta=%s calls %s-%s: %.3f ms per call",
+                delta,
+                i,
+                i + len(chunk),
+                sum(chunk) / len(chunk) * 1000,
+            )
+        # flat per call cost, the last calls are not much slower than the first ones
+        if delta:
+            assert sum(timings[-500:]) < 2 * sum(timings[:500])
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mock import patch
+
+from dbnd import config, task
+from dbnd._core.current import get_databand_run
+from dbnd._core.tracking.value_meta_cache import ValueMetaCache
+from dbnd.testing.helpers_mocks import set_tracking_context
+from targets.value_meta import ValueMetaConf
+from targets.values import StrValueType
+from targets.values.numpy_values import NumpyArrayValueType, array_fingerprint
+from targets.values.pandas_values import DataFrameValueType
+
+
+def _df():
+    return pd.DataFrame(data={"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+
+class TestValueMetaCache(object):
+    def test_same_object_is_calculated_once(self):
+        cache = ValueMetaCache(max_size=10 ** 6)
+        df = _df()
+        meta_conf = ValueMetaConf.enabled()
+
+        with patch.object(
+            DataFrameValueType,
+            "get_value_meta",
+            wraps=DataFrameValueType().get_value_meta,
+        ) as get_value_meta:
+            first = cache.get_value_meta(df, DataFrameValueType(), meta_conf)
+            second = cache.get_value_meta(df, DataFrameValueType(), meta_conf)
+
+        assert get_value_meta.call_count == 1
+        assert first is second
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_changed_object_is_recalculated(self):
+        cache = ValueMetaCache(max_size=10 ** 6)
+        df = _df()
+        meta_conf = ValueMetaConf.enabled()
+
+        before = cache.get_value_meta(df, DataFrameValueType(), meta_conf)
+        df["a"] = 0
+        after = cache.get_value_meta(df, DataFrameValueType(), meta_conf)
+        df["c"] = 1
+        added_column = cache.get_value_meta(df, DataFrameValueType(), meta_conf)
+
+        assert before.descriptive_stats["a"]["max"] == 3
+        assert after.descriptive_stats["a"]["max"] == 0
+        assert added_column.data_dimensions == (3, 3)
+        assert (cache.hits, cache.misses) == (0, 3)
+
+    def test_meta_conf_is_part_of_the_key(self):
+        cache = ValueMetaCache(max_size=10 ** 6)
+        df = _df()
+
+        cache.get_value_meta(df, DataFrameValueType(), ValueMetaConf.enabled())
+        meta = cache.get_value_meta(
+            df, DataFrameValueType(), ValueMetaConf(log_preview=False)
+        )
+
+        assert meta.value_preview is None
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    @pytest.mark.parametrize(
+        "shape", [(2000000, 10), (10, 2000000), (2000000,), (1000, 100, 20)]
+    )
+    def test_array_fingerprint_sample(self, shape):
+        arr = np.zeros(shape)
+        with patch(
+            "targets.values.numpy_values.numpy.ascontiguousarray",
+            wraps=np.ascontiguousarray,
+        ) as ascontiguousarray:
+            before = array_fingerprint(arr)
+        (sample,), _ = ascontiguousarray.call_args
+        assert sample.size == 1024
+
+        arr.flat[-1] = 1
+        assert array_fingerprint(arr) != before
+
+    def test_numpy_array(self):
+        cache = ValueMetaCache(max_size=10 ** 6)
+        arr = np.arange(10)
+        meta_conf = ValueMetaConf.enabled()
+
+        cache.get_value_meta(arr, NumpyArrayValueType(), meta_conf)
+        cache.get_value_meta(arr, NumpyArrayValueType(), meta_conf)
+        cache.get_value_meta(arr.reshape(2, 5), NumpyArrayValueType(), meta_conf)
+
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_value_without_fingerprint_is_not_cached(self):
+        cache = ValueMetaCache(max_size=10 ** 6)
+        meta_conf = ValueMetaConf.enabled()
+
+        cache.get_value_meta("value", StrValueType(), meta_conf)
+        cache.get_value_meta("value", StrValueType(), meta_conf)
+
+        assert cache.get_stats()["entries"] == 0
+        assert (cache.hits, cache.misses) == (0, 0)
+
+    def test_lru_eviction(self):
+        meta_conf = ValueMetaConf.enabled()
+        dfs = [_df() for _ in range(3)]
+        cache = ValueMetaCache(max_size=10 ** 6)
+        cache.get_value_meta(dfs[0], DataFrameValueType(), meta_conf)
+        entry_size = cache.get_stats()["size"]
+
+        cache = ValueMetaCache(max_size=entry_size * 2)
+        cache.get_value_meta(dfs[0], DataFrameValueType(), meta_conf)
+        cache.get_value_meta(dfs[1], DataFrameValueType(), meta_conf)
+        # dfs[0] is the most recently used now
+        cache.get_value_meta(dfs[0], DataFrameValueType(), meta_conf)
+        cache.get_value_meta(dfs[2], DataFrameValueType(), meta_conf)
+
+        assert cache.evictions == 1
+        cache.get_value_meta(dfs[0], DataFrameValueType(), meta_conf)
+        assert cache.hits == 2
+        cache.get_value_meta(dfs[1], DataFrameValueType(), meta_conf)
+        assert cache.misses == 4
+
+
+@task
+def pass_df(df):
+    return df
+
+
+@pytest.fixture
+def value_meta_cache_config():
+    with config({"tracking": {"value_meta_cache": True}}):
+        yield
+
+
+@pytest.mark.usefixtures(set_tracking_context.__name__)
+@pytest.mark.usefixtures(value_meta_cache_config.__name__)
+def test_df_passed_through_tracked_functions(mock_channel_tracker):
+    df = _df()
+    for _ in range(3):
+        df = pass_df(df)
+
+    cache = get_databand_run().tracker.value_meta_cache
+    # df is logged by every call, value meta is calculated only once
+    assert cache.misses == 1
+    assert cache.hits >= 2
@@ -0,0 +1,45 @@
+import pytest
+
+from dbnd._core.utils.http.retry_policy import ExponentialBackoffRetryPolicy
+
+
+BASE_SECONDS_TO_SLEEP = 0.5
+MAX_SECONDS_TO_SLEEP = 3
+MAX_RETRIES = 5
+
+
+@pytest.fixture
+def retry_policy():
+    return ExponentialBackoffRetryPolicy(
+        BASE_SECONDS_TO_SLEEP, MAX_RETRIES, max_seconds_to_sleep=MAX_SECONDS_TO_SLEEP
+    )
+
+
+def test_retry_on_server_error(retry_policy):
+    assert retry_policy.should_retry(
+        status_code=500, error=None, retry_count=MAX_RETRIES - 1
+    )
+
+
+def test_not_retry_after_max_retries(retry_policy):
+    assert not retry_policy.should_retry(
+        status_code=500, error=None, retry_count=MAX_RETRIES
+    )
+
+
+def test_not_retry_on_client_error(retry_policy):
+    assert not retry_policy.should_retry(status_code=400, error=None, retry_count=1)
+
+
+@pytest.mark.parametrize("retry_count", [1, 2, 3, 4, 5, 100])
+def test_seconds_to_sleep_is_bounded(retry_policy, retry_count):
+    expected_bound = min(
+        BASE_SECONDS_TO_SLEEP * 2 ** (retry_count - 1), MAX_SECONDS_TO_SLEEP
+    )
+    for _ in range(50):
+        assert 0 <= retry_policy.seconds_to_sleep(retry_count) <= expected_bound
+
+
+def test_seconds_to_sleep_is_jittered(retry_policy):
+    sleeps = {retry_policy.seconds_to_sleep(3) for _ in range(10)}
+    assert len(sleeps) > 1
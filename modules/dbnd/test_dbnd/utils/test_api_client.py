@@ -0,0 +1,109 @@
+import gzip
+import io
+import json
+
+import pytest
+import requests
+
+from mock import Mock, patch
+
+from dbnd.utils.api_client import ApiClient
+
+
+def _response(content=b"{}", status_code=200):
+    resp = Mock(spec=requests.Response)
+    resp.ok = status_code < 400
+    resp.status_code = status_code
+    resp.content = content
+    resp.json.side_effect = lambda: json.loads(content.decode("utf-8"))
+    return resp
+
+
+def _gunzip(data):
+    return gzip.GzipFile(fileobj=io.BytesIO(data)).read()
+
+
+@pytest.fixture
+def send_request():
+    with patch.object(
+        ApiClient, "_send_request", return_value=_response(b'{"result": 1}')
+    ) as send_request:
+        yield send_request
+
+
+class TestApiClient(object):
+    def test_session_pool(self):
+        client = ApiClient("http://localhost:8080", pool_maxsize=32)
+        client._init_session(None)
+
+        adapter = client.session.get_adapter("http://localhost:8080/api/v1/")
+        assert adapter._pool_maxsize == 32
+
+    def test_token_session_is_kept_alive(self, send_request):
+        client = ApiClient(
+            "http://localhost:8080", credentials={"token": "x"}, session_timeout=0
+        )
+        client.api_request("some/endpoint", {})
+        session = client.session
+        client.api_request("some/endpoint", {})
+        assert client.session is session
+
+    def test_small_body_is_not_compressed(self, send_request):
+        client = ApiClient("http://localhost:8080", compression_threshold=1024)
+        assert client.api_request("some/endpoint", {"a": 1}) == {"result": 1}
+
+        kwargs = send_request.call_args[1]
+        assert "Content-Encoding" not in kwargs["headers"]
+        assert json.loads(kwargs["data"].decode("utf-8")) == {"a": 1}
+
+    def test_big_body_is_compressed(self, send_request):
+        client = ApiClient("http://localhost:8080", compression_threshold=1024)
+        data = {"values": list(range(1000))}
+        client.api_request("some/endpoint", data)
+
+        kwargs = send_request.call_args[1]
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        assert json.loads(_gunzip(kwargs["data"]).decode("utf-8")) == data
+
+    def test_json_body_without_compression(self, send_request):
+        client = ApiClient("http://localhost:8080")
+        client.api_request("some/endpoint", {"a": 1})
+
+        kwargs = send_request.call_args[1]
+        assert kwargs["json"] == {"a": 1}
+        assert "data" not in kwargs
+
+    def test_raw_request(self, send_request):
+        send_request.return_value = _response(b"\x00\x01")
+        client = ApiClient("http://localhost:8080")
+        result = client.api_request(
+            "some/endpoint", None, raw_data=b"\x08\x01", raw_response=True
+        )
+
+        assert result == b"\x00\x01"
+        kwargs = send_request.call_args[1]
+        assert kwargs["data"] == b"\x08\x01"
+        assert kwargs["headers"]["Content-Type"] == "application/octet-stream"
+
+    def test_endpoints_latency(self, send_request):
+        client = ApiClient("http://localhost:8080")
+        client.api_request("first", {})
+        client.api_request("first", {})
+        client.api_request("second", {})
+
+        latency = client.get_endpoints_latency()
+        assert latency["/api/v1/first"]["count"] == 2
+        assert latency["/api/v1/second"]["count"] == 1
+        assert latency["/api/v1/first"]["errors"] == 0
+
+    def test_retry_on_connection_error(self, send_request):
+        send_request.side_effect = [
+            requests.ConnectionError(),
+            _response(b'{"result": 2}'),
+        ]
+        client = ApiClient(
+            "http://localhost:8080", default_max_retry=2, default_retry_sleep=0
+        )
+        assert client.api_request("some/endpoint", {}) == {"result": 2}
+        assert client.get_endpoints_latency()["/api/v1/some/endpoint"]["errors"] == 1
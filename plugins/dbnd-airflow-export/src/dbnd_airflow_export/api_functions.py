@@ -146,7 +146,13 @@ def get_new_dag_runs(
 
 @safe_rich_result
 @provide_session
-def get_full_dag_runs(dag_run_ids, include_sources, airflow_dagbag=None, session=None):
+def get_full_dag_runs(
+    dag_run_ids,
+    include_sources,
+    airflow_dagbag=None,
+    known_dags_hashes=None,
+    session=None,
+):
     if airflow_dagbag:
         dagbag = airflow_dagbag
     else:
@@ -158,7 +164,9 @@ def get_full_dag_runs(dag_run_ids, include_sources, airflow_dagbag=None, session
         load_dags_models(session)
         task_instances, dag_runs = find_full_dag_runs(dag_run_ids, session)
         dag_ids = set(run.dag_id for run in dag_runs)
-        dags = get_dags(dagbag, True, dag_ids, False, include_sources)
+        dags = get_dags(
+            dagbag, True, dag_ids, False, include_sources, known_dags_hashes
+        )
         full_runs = FullRunsData(
             task_instances=task_instances, dag_runs=dag_runs, dags=dags
         )
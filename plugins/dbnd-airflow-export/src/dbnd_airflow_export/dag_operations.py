@@ -1,4 +1,5 @@
 import logging
+import os
 
 from airflow.models import DagModel
 from airflow.utils.db import provide_session
@@ -6,7 +7,7 @@ from sqlalchemy.orm import joinedload
 
 from dbnd._core.constants import AD_HOC_DAG_PREFIX
 from dbnd_airflow_export.helpers import _get_git_status
-from dbnd_airflow_export.metrics import measure_time, save_result_size
+from dbnd_airflow_export.metrics import METRIC_COLLECTOR, measure_time, save_result_size
 from dbnd_airflow_export.models import EDag
 
 
@@ -15,17 +16,75 @@ logger = logging.getLogger(__name__)
 
 current_dags = {}
 
+# dag_id -> (cache key, EDag, structure hash), exported dags are kept between the
+# requests and exported again only when the dag file or the dag parsing time has changed
+dags_export_cache = {}
+
+
+def _get_file_state(fileloc):
+    try:
+        file_stat = os.stat(fileloc)
+    except (OSError, TypeError):
+        return None
+    return file_stat.st_mtime, file_stat.st_size
+
+
+def _dag_export_cache_key(dag, dag_model, *export_args):
+    return (
+        dag.fileloc,
+        _get_file_state(dag.fileloc),
+        getattr(dag_model, "last_parsed_time", None),
+        # dag from the dagbag or only DagModel from the db
+        dag is dag_model,
+    ) + export_args
+
+
+def _export_dag(dag, dag_model, dag_folder, *export_args):
+    cache_key = _dag_export_cache_key(dag, dag_model, dag_folder, *export_args)
+    cached = dags_export_cache.get(dag_model.dag_id)
+    if cached and cached[0] == cache_key:
+        _, exported_dag, structure_hash = cached
+        # these can be changed without touching the dag file
+        exported_dag.tags = getattr(dag_model, "tags", [])
+        exported_dag.is_active = dag_model.is_active
+        exported_dag.is_paused = dag_model.is_paused
+        exported_dag.dag_hash = exported_dag.calculate_dag_hash(structure_hash)
+        return exported_dag, True
+
+    exported_dag = EDag.from_dag(dag, dag_model, dag_folder, *export_args)
+    structure_hash = exported_dag.calculate_structure_hash()
+    exported_dag.dag_hash = exported_dag.calculate_dag_hash(structure_hash)
+    dags_export_cache[dag_model.dag_id] = (cache_key, exported_dag, structure_hash)
+    return exported_dag, False
+
+
+def _prune_dags_export_cache():
+    # dags that were deleted (or have never been loaded into current_dags)
+    for dag_id in list(dags_export_cache):
+        if not current_dags.get(dag_id):
+            del dags_export_cache[dag_id]
+
 
 @save_result_size("dags")
 @measure_time
 def get_dags(
-    dagbag, include_task_args, dag_ids, raw_data_only=False, include_sources=True
+    dagbag,
+    include_task_args,
+    dag_ids,
+    raw_data_only=False,
+    include_sources=True,
+    known_dags_hashes=None,
 ):
+    """
+    Exports the dags, dags from known_dags_hashes (dag_id -> dag_hash) that are not
+    changed are not returned, so the caller can ask for the changed dags only
+    """
     dag_models = [d for d in current_dags.values() if d]
     if dag_ids is not None:
         dag_models = [dag for dag in dag_models if dag.dag_id in dag_ids]
 
     number_of_dags_not_in_dag_bag = 0
+    number_of_cached_dags = 0
     dags_list = []
     git_commit, is_committed = _get_git_status(dagbag.dag_folder)
 
@@ -36,31 +95,27 @@ def get_dags(
             logger.debug("DAG %s not in a dagbag", dag_model.dag_id)
             dag_from_dag_bag = None
 
-        if dag_from_dag_bag:
-            dag = EDag.from_dag(
-                dag_from_dag_bag,
-                dag_model,
-                dagbag.dag_folder,
-                include_task_args,
-                git_commit,
-                is_committed,
-                raw_data_only,
-                include_sources,
-            )
-        else:
-            dag = EDag.from_dag(
-                dag_model,
-                dag_model,
-                dagbag.dag_folder,
-                include_task_args,
-                git_commit,
-                is_committed,
-                raw_data_only,
-                include_sources,
-            )
+        if not dag_from_dag_bag:
             number_of_dags_not_in_dag_bag += 1
+
+        dag, from_cache = _export_dag(
+            dag_from_dag_bag or dag_model,
+            dag_model,
+            dagbag.dag_folder,
+            include_task_args,
+            git_commit,
+            is_committed,
+            raw_data_only,
+            include_sources,
+        )
+        number_of_cached_dags += from_cache
+
+        if known_dags_hashes and known_dags_hashes.get(dag.dag_id) == dag.dag_hash:
+            continue
         dags_list.append(dag)
 
+    _prune_dags_export_cache()
+    METRIC_COLLECTOR.add("size_metrics", "cached_dags", number_of_cached_dags)
     if number_of_dags_not_in_dag_bag > 0:
         logger.info("Found %d dags not in dagbag", number_of_dags_not_in_dag_bag)
     return dags_list
@@ -1,7 +1,8 @@
+import json
 import typing
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 import attr
 
@@ -56,15 +57,22 @@ class ETask(object):
         self.task_args = task_args
 
     @staticmethod
-    def from_task(t, include_task_args, dag, include_source=True):
-        # type: (BaseOperator, bool, DAG, bool) -> ETask
-        module_code = _get_module_code(t) or _read_dag_file(dag.fileloc)
+    def from_task(t, include_task_args, dag, include_source=True, dag_source_code=None):
+        # type: (BaseOperator, bool, DAG, bool, Optional[str]) -> ETask
+        module_code = _get_module_code(t)
+        if not module_code:
+            module_code = (
+                dag_source_code
+                if dag_source_code is not None
+                else _read_dag_file(dag.fileloc)
+            )
+        task_source_code = _get_source_code(t)
         return ETask(
             upstream_task_ids=t.upstream_task_ids,
             downstream_task_ids=t.downstream_task_ids,
             task_type=t.task_type,
-            task_source_code=_get_source_code(t) if include_source else None,
-            task_source_hash=source_md5(_get_source_code(t)),
+            task_source_code=task_source_code if include_source else None,
+            task_source_hash=source_md5(task_source_code),
             task_module_code=module_code if include_source else None,
             module_source_hash=source_md5(module_code),
             dag_id=t.dag_id,
@@ -193,6 +201,7 @@ class EDag(object):
         git_commit,
         is_committed,
         tags,
+        dag_hash=None,
     ):
         self.description = description
         self.root_task_ids = root_task_ids  # type: List[str]
@@ -215,6 +224,8 @@ class EDag(object):
         self.is_paused = is_paused
         self.git_commit = git_commit
         self.is_committed = is_committed
+        # identifies the exported dag metadata, changes when the dag is changed
+        self.dag_hash = dag_hash
 
     @staticmethod
     def from_dag(
@@ -234,7 +245,7 @@ class EDag(object):
             description=dag.description or "",
             root_task_ids=[t.task_id for t in getattr(dag, "roots", [])],
             tasks=[
-                ETask.from_task(t, include_task_args, dag, include_source)
+                ETask.from_task(t, include_task_args, dag, include_source, source_code)
                 for t in getattr(dag, "tasks", [])
             ]
             if not raw_data_only
@@ -259,6 +270,26 @@ class EDag(object):
             is_committed=is_committed,
         )
 
+    def calculate_structure_hash(self):
+        # tags, is_active and is_paused are not part of it,
+        # they are taken from DagModel on every export
+        dag_dict = self.as_dict()
+        dag_dict.pop("tags")
+        dag_dict.pop("dag_hash")
+        return source_md5(json.dumps(dag_dict, sort_keys=True, default=str))
+
+    def calculate_dag_hash(self, structure_hash):
+        return source_md5(
+            json.dumps(
+                [
+                    structure_hash,
+                    sorted(tag.name for tag in self.tags),
+                    self.is_active,
+                    self.is_paused,
+                ]
+            )
+        )
+
     def as_dict(self):
         return dict(
             description=self.description,
@@ -280,6 +311,7 @@ class EDag(object):
             is_subdag=self.is_subdag,
             task_type=self.task_type,
             task_args=self.task_args,
+            dag_hash=self.dag_hash,
         )
 
 
@@ -53,8 +53,17 @@ def process_new_runs_request():
 def process_full_runs_request():
     dag_run_ids = convert_url_param_value_to_list("dag_run_ids", int, [])
     include_sources = flask.request.values.get("include_sources", "").lower() == "true"
+    # dag_id:dag_hash pairs of the dags the caller already has
+    known_dags_hashes = dict(
+        dag_hash.split(":", 1)
+        for dag_hash in convert_url_param_value_to_list("known_dags_hashes", str, [])
+    )
 
-    return json_response(get_full_dag_runs(dag_run_ids, include_sources).as_dict())
+    return json_response(
+        get_full_dag_runs(
+            dag_run_ids, include_sources, known_dags_hashes=known_dags_hashes
+        ).as_dict()
+    )
 
 
 def process_dag_run_states_data_request():
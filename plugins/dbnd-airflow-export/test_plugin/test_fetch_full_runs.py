@@ -1,3 +1,6 @@
+import mock
+
+
 class TestFetchFullRuns(object):
     def validate_result(
         self, result, number_of_dags, number_of_dag_runs, number_of_task_instances
@@ -44,3 +47,93 @@ class TestFetchFullRuns(object):
             for task in dag.tasks:
                 assert not task.task_source_code
                 assert not task.task_module_code
+
+    def test_04_dags_export_cache(self, airflow_dagbag):
+        from dbnd_airflow_export.api_functions import get_full_dag_runs
+        from test_plugin.db_data_generator import insert_dag_runs
+
+        insert_dag_runs(dag_runs_count=1, task_instances_per_run=3)
+
+        first = get_full_dag_runs([1], True, airflow_dagbag)
+        second = get_full_dag_runs([1], True, airflow_dagbag)
+        self.validate_result(second, 1, 1, 3)
+
+        assert second.dags[0] is first.dags[0]
+        assert second.dags[0].dag_hash
+        assert second.airflow_export_meta.metrics["sizes"]["cached_dags"] == 1
+
+        # different export arguments are not served from the same cache entry
+        no_sources = get_full_dag_runs([1], False, airflow_dagbag)
+        assert not no_sources.dags[0].source_code
+        assert no_sources.dags[0].dag_hash != first.dags[0].dag_hash
+
+    def test_05_dags_export_cache_invalidated_on_file_change(self, airflow_dagbag):
+        from dbnd_airflow_export import dag_operations
+        from dbnd_airflow_export.api_functions import get_full_dag_runs
+        from test_plugin.db_data_generator import insert_dag_runs
+
+        insert_dag_runs(dag_runs_count=1, task_instances_per_run=3)
+
+        first = get_full_dag_runs([1], True, airflow_dagbag)
+        with mock.patch.object(dag_operations, "_get_file_state", return_value=(0, 0)):
+            second = get_full_dag_runs([1], True, airflow_dagbag)
+
+        assert second.dags[0] is not first.dags[0]
+        assert second.dags[0].dag_hash == first.dags[0].dag_hash
+        assert second.airflow_export_meta.metrics["sizes"]["cached_dags"] == 0
+
+    def test_06_known_dags_hashes(self, airflow_dagbag):
+        from dbnd_airflow_export.api_functions import get_full_dag_runs
+        from test_plugin.db_data_generator import insert_dag_runs
+
+        insert_dag_runs(dag_runs_count=1, task_instances_per_run=3)
+
+        first = get_full_dag_runs([1], True, airflow_dagbag)
+        dag = first.dags[0]
+
+        result = get_full_dag_runs(
+            [1], True, airflow_dagbag, known_dags_hashes={dag.dag_id: dag.dag_hash}
+        )
+        self.validate_result(result, 0, 1, 3)
+        assert not result.dags
+
+        result = get_full_dag_runs(
+            [1], True, airflow_dagbag, known_dags_hashes={dag.dag_id: "outdated"}
+        )
+        self.validate_result(result, 1, 1, 3)
+
+    def test_07_known_dags_hashes_dag_model_changed(self, airflow_dagbag):
+        from dbnd_airflow_export.api_functions import get_full_dag_runs
+        from test_plugin.db_data_generator import insert_dag_runs, set_dag_is_paused
+
+        insert_dag_runs(dag_runs_count=1, task_instances_per_run=3)
+
+        dag = get_full_dag_runs([1], True, airflow_dagbag).dags[0]
+        known_dags_hashes = {dag.dag_id: dag.dag_hash}
+
+        # paused without changing the dag file, the dag is exported from the cache
+        set_dag_is_paused(is_paused=True)
+        try:
+            result = get_full_dag_runs(
+                [1], True, airflow_dagbag, known_dags_hashes=known_dags_hashes
+            )
+        finally:
+            set_dag_is_paused(is_paused=False)
+
+        self.validate_result(result, 1, 1, 3)
+        assert result.airflow_export_meta.metrics["sizes"]["cached_dags"] == 1
+        assert result.dags[0].is_paused
+        assert result.dags[0].dag_hash != known_dags_hashes[dag.dag_id]
+
+    def test_08_dags_export_cache_pruned(self, airflow_dagbag):
+        from dbnd_airflow_export import dag_operations
+        from dbnd_airflow_export.api_functions import get_full_dag_runs
+        from test_plugin.db_data_generator import insert_dag_runs
+
+        insert_dag_runs(dag_runs_count=1, task_instances_per_run=3)
+
+        dag = get_full_dag_runs([1], True, airflow_dagbag).dags[0]
+        dag_operations.dags_export_cache["deleted_dag"] = (None, None, None)
+
+        get_full_dag_runs([1], True, airflow_dagbag)
+        assert set(dag_operations.dags_export_cache) == {dag.dag_id}
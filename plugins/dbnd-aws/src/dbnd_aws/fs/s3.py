@@ -23,12 +23,13 @@ system operations. The `boto3` library is required to use S3 targets.
 
 from __future__ import division
 
-import datetime
 import io
 import itertools
 import logging
 import os
 import os.path
+import threading
+import time
 
 import botocore
 
@@ -42,6 +43,7 @@ from targets import (
 from targets.config import get_config_section_values
 from targets.errors import FileNotFoundException, TargetError
 from targets.fs import FileSystems
+from targets.fs.range_file import open_range_file
 from targets.utils.path import path_to_bucket_and_key
 
 
@@ -50,6 +52,12 @@ try:
 except ImportError:
     from urllib.parse import urlsplit
 
+try:
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+except ImportError:
+    # we are python2
+    from dbnd._vendor.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 logger = logging.getLogger(__name__)
 
 # two different ways of marking a directory
@@ -57,6 +65,85 @@ logger = logging.getLogger(__name__)
 S3_DIRECTORY_MARKER_SUFFIX_0 = "_$folder$"
 S3_DIRECTORY_MARKER_SUFFIX_1 = "/"
 
+# maximum amount of keys in a single DeleteObjects request
+S3_DELETE_BATCH_SIZE = 1000
+# connections pool of the client, limits amount of concurrent requests
+S3_MAX_POOL_CONNECTIONS = 50
+S3_PROGRESS_LOG_INTERVAL = 10
+
+
+class _TransferProgress(object):
+    """
+    Counts keys and bytes processed by a bulk operation, logs progress and throughput
+    """
+
+    def __init__(self, operation, path, log_interval=S3_PROGRESS_LOG_INTERVAL):
+        self.operation = operation
+        self.path = path
+        self.log_interval = log_interval
+
+        self.keys = 0
+        self.size_bytes = 0
+        self._start = time.time()
+        self._last_log = self._start
+        self._lock = threading.Lock()
+
+    def update(self, keys, size_bytes=0):
+        with self._lock:
+            self.keys += keys
+            self.size_bytes += size_bytes
+            now = time.time()
+            if now - self._last_log < self.log_interval:
+                return
+            self._last_log = now
+        self.log("in progress")
+
+    def log(self, state):
+        duration = max(time.time() - self._start, 0.001)
+        size_mb = self.size_bytes / 1024.0 / 1024.0
+        logger.info(
+            "%s of %s %s: %s keys (%.1f MB) in %.1fs, %.1f keys/s, %.1f MB/s",
+            self.operation,
+            self.path,
+            state,
+            self.keys,
+            size_mb,
+            duration,
+            self.keys / duration,
+            size_mb / duration,
+        )
+
+
+def _run_bounded(executor, func, items, max_pending):
+    """
+    Runs func(item) for every item of (possibly huge) iterable in the executor,
+    keeping at most `max_pending` items in flight. Raises the first failure.
+    """
+    pending = set()
+    try:
+        for item in items:
+            pending.add(executor.submit(func, item))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+        done, pending = wait(pending)
+        for future in done:
+            future.result()
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 class InvalidDeleteException(FileSystemException):
     pass
@@ -90,6 +177,7 @@ class S3Client(FileSystem):
     """
 
     name = FileSystems.s3
+    support_range_read = True
     _exist_after_write_consistent = False
     _s3 = None
 
@@ -161,6 +249,12 @@ class S3Client(FileSystem):
                 "no credentials provided, delegating credentials resolution to boto3"
             )
 
+        if "config" not in options:
+            from botocore.config import Config
+
+            # bulk operations send concurrent requests through the same client
+            options["config"] = Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS)
+
         try:
             self._s3 = boto3.resource(
                 "s3",
@@ -203,9 +297,11 @@ class S3Client(FileSystem):
         logger.debug("Path %s does not exist", path)
         return False
 
-    def remove(self, path, recursive=True):
+    def remove(self, path, recursive=True, threads=10):
         """
         Remove a file or directory from S3.
+        Keys of a directory are deleted in batches of `S3_DELETE_BATCH_SIZE`,
+        `threads` batches at a time.
         """
         if not self.exists(path):
             logger.debug("Could not delete %s; path does not exist", path)
@@ -230,24 +326,54 @@ class S3Client(FileSystem):
                 "Path %s is a directory. Must use recursive delete" % path
             )
 
-        delete_key_list = [
-            {"Key": obj.key}
-            for obj in s3_bucket.objects.filter(Prefix=self._add_path_delimiter(key))
-        ]
+        # listing is paginated, we don't keep all the keys in memory
+        delete_keys = (
+            obj.key
+            for obj in s3_bucket.objects.filter(
+                Prefix=self._add_path_delimiter(key)
+            ).page_size(S3_DELETE_BATCH_SIZE)
+        )
 
         # delete the directory marker file if it exists
-        if self._exists(bucket, "{}{}".format(key, S3_DIRECTORY_MARKER_SUFFIX_0)):
-            delete_key_list.append(
-                {"Key": "{}{}".format(key, S3_DIRECTORY_MARKER_SUFFIX_0)}
-            )
+        marker_key = "{}{}".format(key, S3_DIRECTORY_MARKER_SUFFIX_0)
+        if self._exists(bucket, marker_key):
+            delete_keys = itertools.chain(delete_keys, [marker_key])
 
-        if len(delete_key_list) > 0:
-            self.s3.meta.client.delete_objects(
-                Bucket=bucket, Delete={"Objects": delete_key_list}
-            )
-            return True
+        return self._delete_keys(path, bucket, delete_keys, threads=threads) > 0
 
-        return False
+    def _delete_keys(self, path, bucket, keys, threads=10):
+        client = self.s3.meta.client
+        progress = _TransferProgress("Delete", path)
+
+        def _delete_batch(batch):
+            response = client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True},
+            )
+            errors = response.get("Errors")
+            if errors:
+                raise FileSystemException(
+                    "Failed to delete %s keys of %s, first error: %s %s"
+                    % (
+                        len(errors),
+                        path,
+                        errors[0].get("Key"),
+                        errors[0].get("Message"),
+                    )
+                )
+            progress.update(len(batch))
+
+        workers = max(1, min(threads, S3_MAX_POOL_CONNECTIONS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            _run_bounded(
+                executor,
+                _delete_batch,
+                _chunks(keys, S3_DELETE_BATCH_SIZE),
+                max_pending=workers * 2,
+            )
+        if progress.keys:
+            progress.log("complete")
+        return progress.keys
 
     def move(self, source_path, destination_path, **kwargs):
         """
@@ -348,7 +474,10 @@ class S3Client(FileSystem):
     ):
         """
         Copy object(s) from one S3 location to another. Works for individual keys or entire directories.
-        When files are larger than `part_size`, multipart uploading will be used.
+        Keys of a directory are copied concurrently by `threads` workers
+        (limited by `S3_MAX_POOL_CONNECTIONS`), while the listing is streamed,
+        the rest of the threads are shared by multipart copies of the keys.
+        When files are larger than `part_size`, multipart copy will be used.
         :param source_path: The `s3://` path of the directory or key to copy from
         :param destination_path: The `s3://` path of the directory or key to copy to
         :param threads: Optional argument to define the number of threads to use when copying (min: 3 threads)
@@ -361,8 +490,6 @@ class S3Client(FileSystem):
         # this is dbnd internal kwarg and its not supported by the S3
         kwargs.pop("raise_if_exists", None)
 
-        start = datetime.datetime.now()
-
         (src_bucket, src_key) = self._path_to_bucket_and_key(source_path)
         (dst_bucket, dst_key) = self._path_to_bucket_and_key(destination_path)
 
@@ -370,49 +497,65 @@ class S3Client(FileSystem):
         threads = 3 if threads < 3 else threads
         import boto3
 
-        transfer_config = boto3.s3.transfer.TransferConfig(
-            max_concurrency=threads, multipart_chunksize=part_size
-        )
-        total_keys = 0
+        client = self.s3.meta.client
 
         if self.isdir(source_path):
-            (bucket, key) = self._path_to_bucket_and_key(source_path)
-            key_path = self._add_path_delimiter(key)
-            key_path_len = len(key_path)
             src_prefix = self._add_path_delimiter(src_key)
             dst_prefix = self._add_path_delimiter(dst_key)
-            total_size_bytes = 0
-            for item in self.list(
-                source_path, start_time=start_time, end_time=end_time, return_key=True
-            ):
-                path = item.key[key_path_len:]
-                # prevents copy attempt of empty key in folder
-                if path != "" and path != "/":
-                    total_keys += 1
-                    total_size_bytes += item.size
-                    copy_source = {"Bucket": src_bucket, "Key": src_prefix + path}
+            progress = _TransferProgress("Copy", source_path)
 
-                    self.s3.meta.client.copy(
+            # keys are copied in parallel, `threads` is shared between them
+            workers = min(threads, S3_MAX_POOL_CONNECTIONS)
+            key_transfer_config = boto3.s3.transfer.TransferConfig(
+                max_concurrency=max(1, threads // workers),
+                multipart_chunksize=part_size,
+            )
+
+            def _copy_item(item):
+                path = item.key[len(src_prefix) :]
+                copy_source = {"Bucket": src_bucket, "Key": src_prefix + path}
+                if item.size < part_size:
+                    # single request, no need for the transfer manager and its threads
+                    client.copy_object(
+                        CopySource=copy_source,
+                        Bucket=dst_bucket,
+                        Key=dst_prefix + path,
+                        **kwargs
+                    )
+                else:
+                    client.copy(
                         copy_source,
                         dst_bucket,
                         dst_prefix + path,
-                        Config=transfer_config,
+                        Config=key_transfer_config,
                         ExtraArgs=kwargs,
                     )
-
-            end = datetime.datetime.now()
-            duration = end - start
-            logger.info(
-                "%s : Complete : %s total keys copied in %s"
-                % (datetime.datetime.now(), total_keys, duration)
+                progress.update(1, item.size)
+
+            items = (
+                item
+                for item in self.list(
+                    source_path,
+                    start_time=start_time,
+                    end_time=end_time,
+                    return_key=True,
+                )
+                # prevents copy attempt of empty key in folder
+                if item.key[len(src_prefix) :] not in ("", "/")
             )
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                _run_bounded(executor, _copy_item, items, max_pending=workers * 2)
 
-            return total_keys, total_size_bytes
+            progress.log("complete")
+            return progress.keys, progress.size_bytes
 
         # If the file isn't a directory just perform a regular copy
         else:
             copy_source = {"Bucket": src_bucket, "Key": src_key}
-            self.s3.meta.client.copy(
+            transfer_config = boto3.s3.transfer.TransferConfig(
+                max_concurrency=threads, multipart_chunksize=part_size
+            )
+            client.copy(
                 copy_source,
                 dst_bucket,
                 dst_key,
@@ -428,6 +571,19 @@ class S3Client(FileSystem):
         # download the file
         self.s3.meta.client.download_file(bucket, key, destination_local_path)
 
+    def content_fingerprint(self, path):
+        (bucket, key) = self._path_to_bucket_and_key(path)
+        if self._is_root(key) or key.endswith(S3_DIRECTORY_MARKER_SUFFIX_1):
+            return None
+        try:
+            e_tag = self.s3.Object(bucket, key).e_tag
+        except botocore.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in ["NoSuchKey", "404"]:
+                return None
+            raise
+        # etag of multipart upload is not md5 of the content, but still identifies it
+        return "s3-etag:%s" % e_tag.strip('"')
+
     def download_file(self, path, location, **kwargs):
         self.get(s3_path=path, destination_local_path=location)
 
@@ -575,11 +731,35 @@ class S3Client(FileSystem):
                 raise
 
     def open_read(self, path, mode="r"):
+        if "b" in mode:
+            return self._open_range_read(path)
         s3_key = self.get_key(path)
         if not s3_key:
             raise FileNotFoundException("Could not find file at %s" % path)
         return ReadableS3File(s3_key)
 
+    def _open_range_read(self, path):
+        """
+        Seekable binary file, reads only the requested parts of the object
+        """
+        (bucket, key) = self._path_to_bucket_and_key(path)
+        try:
+            head = self.s3.meta.client.head_object(Bucket=bucket, Key=key)
+        except botocore.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in ["NoSuchKey", "404", "Forbidden", "403"]:
+                raise FileNotFoundException("Could not find file at %s" % path)
+            raise
+        etag = head.get("ETag")
+
+        def fetch_range(start, end):
+            kwargs = {"IfMatch": etag} if etag else {}
+            response = self.s3.meta.client.get_object(
+                Bucket=bucket, Key=key, Range="bytes=%d-%d" % (start, end - 1), **kwargs
+            )
+            return response["Body"].read()
+
+        return open_range_file(path, head["ContentLength"], fetch_range)
+
     def open_write(self, path, mode="w", **kwargs):
         return AtomicLocalFile(path, self, mode=mode, **kwargs)
 
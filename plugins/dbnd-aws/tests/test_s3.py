@@ -111,6 +111,36 @@ class TestS3Client(_S3BaseTestCase):
         assert not self.client.exists(self.bucket_url("test_remove_recursive/1"))
         assert not self.client.exists(self.bucket_url("test_remove_recursive/2"))
 
+    def test_copy_dir(self):
+        for i in range(30):
+            self.client.put_string(
+                "hello %s" % i, self.bucket_url("test_copy_dir/part-%05d" % i)
+            )
+
+        keys, size = self.client.copy(
+            self.bucket_url("test_copy_dir"),
+            self.bucket_url("test_copy_dir_dest"),
+            threads=8,
+        )
+
+        assert keys == 30
+        assert size == sum(len("hello %s" % i) for i in range(30))
+        for i in range(30):
+            assert "hello %s" % i == self.client.get_as_string(
+                self.bucket_url("test_copy_dir_dest/part-%05d" % i)
+            )
+
+    def test_remove_recursive_batches(self, monkeypatch):
+        monkeypatch.setattr(s3, "S3_DELETE_BATCH_SIZE", 7)
+        for i in range(30):
+            self.client.put_string(
+                "hello", self.bucket_url("test_remove_batches/%s" % i)
+            )
+
+        assert self.client.remove(self.bucket_url("test_remove_batches"))
+        assert not self.client.exists(self.bucket_url("test_remove_batches"))
+        assert not list(self.client.listdir(self.bucket_url("test_remove_batches")))
+
     def test_listdir(self):
         self.client.put_string("hello", self.bucket_url("test_listdir/1"))
         self.client.put_string("hello", self.bucket_url("test_listdir/2"))
@@ -288,6 +288,18 @@ class AzureBlobStorageClient(FileSystem):
 
         return _DeleteOnCloseFile(local_tmp_file, mode)
 
+    def content_fingerprint(self, path):
+        account, container, blob = self._path_to_account_container_and_blob(path)
+        assert self.account == account
+        if self._is_container(blob) or not self.conn.exists(container, blob):
+            return None
+
+        properties = self.conn.get_blob_properties(container, blob).properties
+        if properties.content_settings.content_md5:
+            return "azure-md5:%s" % properties.content_settings.content_md5
+        # etag changes on every write of the blob
+        return "azure-etag:%s#%s" % (path, properties.etag)
+
     def download_file(self, azure_path, location, **kwargs):
         account, container, blob = self._path_to_account_container_and_blob(azure_path)
         assert self.account == account
@@ -35,6 +35,7 @@ from targets.config import get_local_tempfile
 from targets.errors import InvalidDeleteException
 from targets.fs import FileSystems
 from targets.fs.file_system import FileSystem
+from targets.fs.range_file import open_range_file
 from targets.utils.atomic import _DeleteOnCloseFile
 from targets.utils.path import path_to_bucket_and_key
 
@@ -142,6 +143,7 @@ class GCSClient(FileSystem):
     """
 
     name = FileSystems.gcs
+    support_range_read = True
     _exist_after_write_consistent = False
 
     def __init__(
@@ -507,6 +509,25 @@ class GCSClient(FileSystem):
 
         return return_fp
 
+    def content_fingerprint(self, path):
+        bucket, obj = self._path_to_bucket_and_key(path)
+        if self._is_root(obj) or obj.endswith("/"):
+            return None
+        try:
+            metadata = (
+                self.client.objects()
+                .get(bucket=bucket, object=obj, fields="md5Hash,generation")
+                .execute()
+            )
+        except errors.HttpError as ex:
+            if ex.resp["status"] == "404":
+                return None
+            raise
+        if metadata.get("md5Hash"):
+            return "gcs-md5:%s" % metadata["md5Hash"]
+        # composite objects have no md5, generation changes on every write of the path
+        return "gcs-generation:%s#%s" % (path, metadata["generation"])
+
     def download_file(self, path, location=None, **kwargs):
         """
         Download file to local filesystem
@@ -525,4 +546,35 @@ class GCSClient(FileSystem):
         self.put(local_path, dest)
 
     def open_read(self, path, mode="r"):
+        if "b" in mode:
+            return self._open_range_read(path)
         return self._open_read(path)
+
+    def _open_range_read(self, path):
+        """
+        Seekable binary file, reads only the requested parts of the object
+        """
+        bucket, obj = self._path_to_bucket_and_key(path)
+        try:
+            metadata = (
+                self.client.objects()
+                .get(bucket=bucket, object=obj, fields="size,generation")
+                .execute()
+            )
+        except errors.HttpError as ex:
+            if ex.resp["status"] == "404":
+                raise targets.errors.FileNotFoundException(
+                    "Could not find file at %s" % path
+                )
+            raise
+        generation = metadata.get("generation")
+
+        def fetch_range(start, end):
+            kwargs = {"ifGenerationMatch": generation} if generation else {}
+            request = self.client.objects().get_media(
+                bucket=bucket, object=obj, **kwargs
+            )
+            request.headers["range"] = "bytes=%d-%d" % (start, end - 1)
+            return request.execute(num_retries=NUM_RETRIES)
+
+        return open_range_file(path, int(metadata["size"]), fetch_range)
@@ -0,0 +1,96 @@
+import atexit
+import logging
+import os
+import threading
+
+from contextlib import contextmanager
+
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAX_SIZE = 4
+
+# (pid, connection string) -> (pool, semaphore of the connections that can be taken)
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(connection_string, max_size):
+    # connections can't be shared with forked processes, every process has its own pool
+    key = (os.getpid(), connection_string)
+    with _pools_lock:
+        pool, slots = _pools.get(key, (None, None))
+        if pool is None or pool.closed:
+            max_size = max(1, max_size)
+            pool = ThreadedConnectionPool(
+                0, max_size, connection_string, cursor_factory=RealDictCursor
+            )
+            # the pool keeps only `minconn` of the returned connections open,
+            # set after creation so they are not opened upfront
+            pool.minconn = max_size
+            slots = threading.BoundedSemaphore(max_size)
+            _pools[key] = (pool, slots)
+        return pool, slots
+
+
+def get_connection_pool(connection_string, max_size=DEFAULT_POOL_MAX_SIZE):
+    # type: (str, int) -> ThreadedConnectionPool
+    """
+    Pool of connections to the database, shared by all the tables we log from it
+    """
+    return _get_pool(connection_string, max_size)[0]
+
+
+@contextmanager
+def pooled_connection(connection_string, max_size=DEFAULT_POOL_MAX_SIZE):
+    """
+    Connection of the pool, waits for a free one if all `max_size` connections are used
+    (the pool raises PoolError instead)
+    """
+    pool, slots = _get_pool(connection_string, max_size)
+    with slots:
+        with _pool_connection(pool) as connection:
+            yield connection
+
+
+@contextmanager
+def _pool_connection(pool):
+    connection = pool.getconn()
+    if connection.closed:
+        # the server has closed it while it was idle in the pool
+        pool.putconn(connection, close=True)
+        connection = pool.getconn()
+
+    broken = False
+    try:
+        yield connection
+        # we only read, end the transaction so the connection can be reused
+        connection.rollback()
+    except Exception:
+        broken = bool(connection.closed)
+        if not broken:
+            try:
+                connection.rollback()
+            except Exception:
+                broken = True
+        raise
+    finally:
+        pool.putconn(connection, close=broken)
+
+
+@atexit.register
+def close_connection_pools():
+    pid = os.getpid()
+    with _pools_lock:
+        for (pool_pid, _), (pool, _) in _pools.items():
+            if pool_pid != pid:
+                # inherited from the parent process, closing would end its sessions
+                continue
+            try:
+                pool.closeall()
+            except Exception:
+                logger.debug("Failed to close postgres connection pool", exc_info=True)
+        _pools.clear()
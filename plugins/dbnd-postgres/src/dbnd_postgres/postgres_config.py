@@ -6,3 +6,32 @@ class PostgresConfig(Config):
     auto_log_pg_histograms = parameter(
         description="Automatically log all postgres table histograms", default=True
     )[bool]
+
+    connection_pool_max_size = parameter(
+        default=4,
+        description="Maximal amount of connections kept open to a single database, "
+        "the connections are shared by all the logged tables of the database, "
+        "more concurrent queries wait for a free connection",
+    )[int]
+
+    exact_stats = parameter(
+        default=False,
+        description="Calculate stats and histograms of the table with a single aggregate "
+        "query instead of the estimates of postgres statistics (pg_stats)",
+    )[bool]
+
+    exact_stats_sample_percent = parameter(
+        default=100.0,
+        description="Percent of the table read by the exact stats query "
+        "(TABLESAMPLE SYSTEM), 100 to read the whole table",
+    )[float]
+
+    histogram_bins = parameter(
+        default=20, description="Amount of buckets of exact numeric histograms"
+    )[int]
+
+    histogram_max_categories = parameter(
+        default=50,
+        description="Maximal amount of values in exact categorical histograms, "
+        "the rest of the values are counted as '_others'",
+    )[int]
@@ -1,11 +1,10 @@
+import bisect
 import typing
 
-import psycopg2
-import yaml
-
-from psycopg2.extras import RealDictCursor
+from psycopg2 import sql
 
 from dbnd._vendor.tabulate import tabulate
+from dbnd_postgres.connection_pool import DEFAULT_POOL_MAX_SIZE, pooled_connection
 
 
 if typing.TYPE_CHECKING:
@@ -13,22 +12,54 @@ if typing.TYPE_CHECKING:
     from targets.value_meta import ValueMetaConf
     from dbnd._core.tracking.log_data_request import LogDataRequest
 
+# types without equality operator, count(distinct) doesn't work for them
+NOT_COMPARABLE_TYPES = (
+    "json",
+    "xml",
+    "point",
+    "line",
+    "lseg",
+    "box",
+    "path",
+    "polygon",
+    "circle",
+)
+
 
 class PostgresController(object):
     """ Interacts with postgres, queries it, and calculates histograms and stats """
 
-    def __init__(self, connection_string, table_name):
+    def __init__(
+        self,
+        connection_string,
+        table_name,
+        pool_max_size=DEFAULT_POOL_MAX_SIZE,
+        exact_stats=False,
+        sample_percent=100.0,
+        histogram_bins=20,
+        histogram_max_categories=50,
+    ):
+        """
+        :param exact_stats: calculate stats and histograms with a single aggregate query
+            over the table instead of using pg_stats estimates
+        :param sample_percent: percent of the table blocks to read in exact mode,
+            counts are scaled by the sample size, distinct counts are of the sample
+        """
         self.table_name = table_name
         self.connection_string = connection_string
-        self._connection = None
+        self.pool_max_size = pool_max_size
+        self.exact_stats = exact_stats
+        self.sample_percent = sample_percent
+        self.histogram_bins = histogram_bins
+        self.histogram_max_categories = histogram_max_categories
         self._column_types = None
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self._connection is not None:
-            self._connection.close()
+        # connections are returned to the shared pool after every query
+        pass
 
     def to_preview(self):
         rows = self._query("select * from {} limit 20".format(self.table_name))
@@ -49,8 +80,15 @@ class PostgresController(object):
 
     def get_histograms_and_stats(self, meta_conf):
         # type: (ValueMetaConf) -> Tuple[Dict[str, Dict], Dict[str, Tuple]]
+        if self.exact_stats:
+            return self._get_exact_histograms_and_stats(meta_conf)
+
         pg_stats = self._query(
-            "select * from pg_stats where tablename = %s", self.table_name
+            "select attname, null_frac, n_distinct, "
+            "most_common_vals::text::text[] as most_common_vals, most_common_freqs, "
+            "histogram_bounds::text::text[] as histogram_bounds "
+            "from pg_stats where tablename = %s",
+            self.table_name,
         )
         count = self._get_row_count()
 
@@ -93,18 +131,23 @@ class PostgresController(object):
         ]
         return columns_to_calc
 
-    def _is_numeric_column(self, column_type):
+    def _is_integer_column(self, column_type):
         return column_type in (
             "smallint",
             "integer",
             "bigint",
+            "smallserial",
+            "serial",
+            "bigserial",
+        )
+
+    def _is_numeric_column(self, column_type):
+        return self._is_integer_column(column_type) or column_type in (
             "decimal",
             "numeric",
             "real",
             "double",
-            "smallserial",
-            "serial",
-            "bigserial",
+            "double precision",
         )
 
     def _is_string_column(self, column_type):
@@ -124,7 +167,9 @@ class PostgresController(object):
         # type: (Dict, int, str) -> Tuple[Dict, Optional[Tuple]]
         stats = self._calculate_stats(count, pg_stats_row)
         stats["type"] = column_type
-        common_counts, common_values = self._get_common_values(count, pg_stats_row)
+        common_counts, common_values = self._get_common_values(
+            count, pg_stats_row, column_type
+        )
 
         # types according to postgres documentation:
         # https://www.postgresql.org/docs/9.5/datatype-numeric.html
@@ -137,7 +182,7 @@ class PostgresController(object):
                 self._add_others_to_histogram(histogram, stats)
         elif self._is_numeric_column(column_type):
             histogram = self._calculate_numeric_histogram(
-                pg_stats_row, count, stats["null-count"]
+                pg_stats_row, count, stats["null-count"], column_type
             )
             histogram = self._add_common_values_to_histogram(
                 histogram, common_counts, common_values
@@ -164,7 +209,7 @@ class PostgresController(object):
         stats["distinct"] = int(stats["distinct"])
         return stats
 
-    def _get_common_values(self, count, pg_stats_row):
+    def _get_common_values(self, count, pg_stats_row, column_type):
         common_values = pg_stats_row["most_common_vals"]
         common_frequencies = pg_stats_row["most_common_freqs"]
 
@@ -172,12 +217,17 @@ class PostgresController(object):
             return None, None
 
         common_counts = [int(freq * count) for freq in common_frequencies]
-        common_values = self._pg_anyarray_to_list(common_values)
+        common_values = self._parse_pg_values(common_values, column_type)
         return common_counts, common_values
 
-    def _calculate_numeric_histogram(self, pg_stats_row, count, null_count):
-        values_str = pg_stats_row["histogram_bounds"]
-        values = self._pg_anyarray_to_list(values_str)
+    def _calculate_numeric_histogram(
+        self, pg_stats_row, count, null_count, column_type
+    ):
+        values = pg_stats_row["histogram_bounds"]
+        if not values or len(values) < 2:
+            # all the values are in the most common values
+            return None
+        values = self._parse_pg_values(values, column_type)
 
         buckets = len(values) - 1
         bucket_count = (count - null_count) / buckets
@@ -187,15 +237,17 @@ class PostgresController(object):
         return counts, values
 
     def _add_common_values_to_histogram(self, histogram, common_counts, common_values):
-        if (common_counts is None) or (common_values is None):
+        if (histogram is None) or (common_counts is None) or (common_values is None):
             return histogram
 
         histogram_counts, histogram_values = histogram
+        last_bucket = len(histogram_counts) - 1
 
         for value, count in zip(common_values, common_counts):
-            for i, histogram_value in enumerate(histogram_values):
-                if value < histogram_value:
-                    histogram_counts[i - 1] += count
+            # bucket i holds [histogram_values[i], histogram_values[i + 1])
+            # values outside of the bounds go to the first/last bucket
+            bucket = bisect.bisect_right(histogram_values, value) - 1
+            histogram_counts[min(max(bucket, 0), last_bucket)] += count
 
         return histogram
 
@@ -210,20 +262,186 @@ class PostgresController(object):
         values.append("_others")
         return histogram
 
-    def _pg_anyarray_to_list(self, value):
-        # type: (str) -> List
-        """ postgres returns anyarray type as a string, this function converts it to a list """
-        value = value.strip("{}")
-        value = "[" + value + "]"
-        return yaml.safe_load(value)
+    def _parse_pg_values(self, values, column_type):
+        # type: (List[str], str) -> List
+        """ pg_stats arrays are queried as text[], converts the values to the column type """
+        if self._is_integer_column(column_type):
+            return [int(v) for v in values]
+        if self._is_numeric_column(column_type):
+            return [float(v) for v in values]
+        return list(values)
+
+    def _to_number(self, value, column_type):
+        if value is None:
+            return None
+        if self._is_integer_column(column_type):
+            return int(value)
+        return float(value)
+
+    def _get_exact_histograms_and_stats(self, meta_conf):
+        # type: (ValueMetaConf) -> Tuple[Dict[str, Dict], Dict[str, Tuple]]
+        column_types = self.get_column_types()
+        columns = sorted(
+            c for c, t in column_types.items() if t not in NOT_COMPARABLE_TYPES
+        )
+        if not columns:
+            return {}, {}
+        histogram_columns = set(
+            self._get_columns_from_request(meta_conf.log_histograms)
+        )
 
-    def _query(self, query, *args):
-        if self._connection is None:
-            self._connection = psycopg2.connect(
-                self.connection_string, cursor_factory=RealDictCursor
+        row = self._query(self._build_exact_stats_query(columns, histogram_columns))[0]
+        scale = 100.0 / self.sample_percent if self.sample_percent < 100 else 1.0
+
+        def scaled(value):
+            return int(round(value * scale))
+
+        count = scaled(row["row_count"])
+        stats, histograms = dict(), dict()
+        for i, column_name in enumerate(columns):
+            column_type = column_types[column_name]
+            non_null = row["c%d_count" % i]
+            column_stats = {
+                "count": count,
+                "null-count": count - scaled(non_null),
+                "distinct": int(row["c%d_distinct" % i]),
+                "type": column_type,
+            }
+            if self._is_numeric_column(column_type):
+                column_stats["min"] = self._to_number(row["c%d_min" % i], column_type)
+                column_stats["max"] = self._to_number(row["c%d_max" % i], column_type)
+            stats[column_name] = column_stats
+
+            buckets = row.get("c%d_histogram" % i)
+            if column_name not in histogram_columns or not buckets:
+                continue
+            if self._is_numeric_column(column_type):
+                histogram = self._exact_numeric_histogram(
+                    buckets, column_stats["min"], column_stats["max"]
+                )
+            else:
+                histogram = self._exact_categorical_histogram(
+                    buckets, non_null, column_stats["distinct"]
+                )
+            histograms[column_name] = ([scaled(c) for c in histogram[0]], histogram[1])
+
+        return stats, histograms
+
+    def _exact_numeric_histogram(self, buckets, min_value, max_value):
+        # buckets are [bucket number (1 based), count]
+        counts = [0] * self.histogram_bins
+        for bucket, count in buckets:
+            counts[bucket - 1] += count
+
+        min_value, max_value = float(min_value), float(max_value)
+        if min_value == max_value:
+            return [sum(counts)], [min_value, max_value]
+
+        width = (max_value - min_value) / self.histogram_bins
+        values = [min_value + width * i for i in range(self.histogram_bins)]
+        values.append(max_value)
+        return counts, values
+
+    def _exact_categorical_histogram(self, buckets, non_null, distinct):
+        # buckets are [value, count] of the most common values, the most common first
+        counts = [count for _, count in buckets]
+        values = [value for value, _ in buckets]
+        if distinct > self.histogram_max_categories:
+            counts = counts[: self.histogram_max_categories - 1]
+            values = values[: self.histogram_max_categories - 1]
+        others_count = non_null - sum(counts)
+        if others_count > 0:
+            counts.append(others_count)
+            values.append("_others")
+        return counts, values
+
+    def _build_exact_stats_query(self, columns, histogram_columns):
+        """
+        Stats of all the columns are calculated by a single aggregate over the table
+        (or its sample), histograms are grouped from the same materialized sample
+        """
+        column_types = self.get_column_types()
+
+        tablesample = sql.SQL("")
+        if self.sample_percent < 100:
+            tablesample = sql.SQL(" TABLESAMPLE SYSTEM ({})").format(
+                sql.Literal(float(self.sample_percent))
+            )
+
+        aggregates = [sql.SQL("count(*) AS row_count")]
+        histograms = []
+        for i, column_name in enumerate(columns):
+            column = sql.Identifier(column_name)
+            is_numeric = self._is_numeric_column(column_types[column_name])
+
+            def alias(name):
+                return sql.Identifier("c%d_%s" % (i, name))
+
+            aggregates.append(
+                sql.SQL("count({c}) AS {a}").format(c=column, a=alias("count"))
+            )
+            aggregates.append(
+                sql.SQL("count(DISTINCT {c}) AS {a}").format(
+                    c=column, a=alias("distinct")
+                )
             )
+            if is_numeric:
+                aggregates.append(
+                    sql.SQL("min({c}) AS {a}").format(c=column, a=alias("min"))
+                )
+                aggregates.append(
+                    sql.SQL("max({c}) AS {a}").format(c=column, a=alias("max"))
+                )
+
+            if column_name not in histogram_columns:
+                continue
+            if is_numeric:
+                histograms.append(
+                    sql.SQL(
+                        "(SELECT json_agg(json_build_array(_bucket, _n)) FROM ("
+                        "SELECT CASE WHEN bounds.{min} < bounds.{max} THEN least("
+                        "width_bucket({c}::float8, bounds.{min}::float8, bounds.{max}::float8, "
+                        "{bins}), "
+                        "{bins}) ELSE 1 END AS _bucket, count(*) AS _n "
+                        "FROM sample WHERE {c} IS NOT NULL GROUP BY 1) h) AS {a}"
+                    ).format(
+                        c=column,
+                        min=alias("min"),
+                        max=alias("max"),
+                        bins=sql.Literal(self.histogram_bins),
+                        a=alias("histogram"),
+                    )
+                )
+            elif self._is_categorical_column(column_types[column_name]):
+                histograms.append(
+                    sql.SQL(
+                        "(SELECT json_agg(json_build_array(_value, _n) ORDER BY _n DESC) "
+                        "FROM (SELECT {c} AS _value, count(*) AS _n FROM sample "
+                        "WHERE {c} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC LIMIT {limit}) h"
+                        ") AS {a}"
+                    ).format(
+                        c=column,
+                        limit=sql.Literal(self.histogram_max_categories),
+                        a=alias("histogram"),
+                    )
+                )
+
+        return sql.SQL(
+            "WITH sample AS (SELECT {columns} FROM {table}{tablesample}), "
+            "bounds AS (SELECT {aggregates} FROM sample) "
+            "SELECT {select} FROM bounds"
+        ).format(
+            columns=sql.SQL(", ").join(sql.Identifier(c) for c in columns),
+            table=sql.SQL(self.table_name),
+            tablesample=tablesample,
+            aggregates=sql.SQL(", ").join(aggregates),
+            select=sql.SQL(", ").join([sql.SQL("bounds.*")] + histograms),
+        )
 
-        cursor = self._connection.cursor()
-        cursor.execute(query, args)
-        result = cursor.fetchall()
-        return result
+    def _query(self, query, *args):
+        with pooled_connection(
+            self.connection_string, max_size=self.pool_max_size
+        ) as connection:
+            cursor = connection.cursor()
+            cursor.execute(query, args)
+            return cursor.fetchall()
@@ -3,6 +3,7 @@ import typing
 
 import attr
 
+from dbnd_postgres.postgres_config import PostgresConfig
 from dbnd_postgres.postgres_contreoller import PostgresController
 from targets.value_meta import ValueMeta
 from targets.values import register_value_type
@@ -35,7 +36,16 @@ class PostgresTableValueType(DataValueType):
         # type: (PostgresTable, ValueMetaConf) -> ValueMeta
         data_schema = data_preview = None
 
-        with PostgresController(value.connection_string, value.table_name) as postgres:
+        config = PostgresConfig()
+        with PostgresController(
+            value.connection_string,
+            value.table_name,
+            pool_max_size=config.connection_pool_max_size,
+            exact_stats=config.exact_stats,
+            sample_percent=config.exact_stats_sample_percent,
+            histogram_bins=config.histogram_bins,
+            histogram_max_categories=config.histogram_max_categories,
+        ) as postgres:
             if meta_conf.log_histograms or meta_conf.log_stats:
                 start_time = time.time()
                 stats, histograms = postgres.get_histograms_and_stats(meta_conf)
@@ -1,5 +1,14 @@
+import threading
+
 import mock
 
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from dbnd_postgres.connection_pool import (
+    close_connection_pools,
+    get_connection_pool,
+    pooled_connection,
+)
 from dbnd_postgres.postgres_contreoller import PostgresController
 from dbnd_postgres.postgres_values import PostgresTable, PostgresTableValueType
 from targets.value_meta import ValueMetaConf
@@ -47,7 +56,7 @@ class TestPostgresController:
                     "attname": "customer",
                     "null_frac": 0.5,
                     "n_distinct": 8,
-                    "most_common_vals": "{customerA, customerB}",
+                    "most_common_vals": ["customerA", "customerB"],
                     "most_common_freqs": [0.2, 0.2],
                 }
             ]
@@ -81,3 +90,174 @@ class TestPostgresController:
             # Assert
             assert stats == expected_stats
             assert histograms == expected_histograms
+
+    def test_add_common_values_to_histogram(self):
+        postgres = PostgresController("user@database", "data_table")
+        histogram = ([10, 10, 10], [0, 10, 20, 30])
+
+        postgres._add_common_values_to_histogram(
+            histogram, [5, 7, 1, 2], [10, 25, -5, 35]
+        )
+
+        assert histogram == ([11, 15, 19], [0, 10, 20, 30])
+
+    def test_get_exact_histograms_and_stats(self):
+        with mock.patch(
+            "dbnd_postgres.postgres_values.PostgresController._query"
+        ) as query_patch:
+            query_patch.side_effect = [
+                [
+                    {"column_name": "customer", "data_type": "varchar"},
+                    {"column_name": "amount", "data_type": "integer"},
+                ],
+                [
+                    {
+                        "row_count": 10,
+                        # amount
+                        "c0_count": 8,
+                        "c0_distinct": 6,
+                        "c0_min": 0,
+                        "c0_max": 40,
+                        "c0_histogram": [[1, 5], [4, 3]],
+                        # customer
+                        "c1_count": 9,
+                        "c1_distinct": 4,
+                        "c1_histogram": [["customerA", 5], ["customerB", 2]],
+                    }
+                ],
+            ]
+
+            postgres = PostgresController(
+                "user@database",
+                "data_table",
+                exact_stats=True,
+                histogram_bins=4,
+                histogram_max_categories=3,
+            )
+            stats, histograms = postgres.get_histograms_and_stats(
+                ValueMetaConf.enabled()
+            )
+
+            assert query_patch.call_count == 2
+            assert stats == {
+                "customer": {
+                    "count": 10,
+                    "null-count": 1,
+                    "distinct": 4,
+                    "type": "varchar",
+                },
+                "amount": {
+                    "count": 10,
+                    "null-count": 2,
+                    "distinct": 6,
+                    "type": "integer",
+                    "min": 0,
+                    "max": 40,
+                },
+            }
+            assert histograms == {
+                "customer": ([5, 2, 2], ["customerA", "customerB", "_others"]),
+                "amount": ([5, 0, 0, 3], [0.0, 10.0, 20.0, 30.0, 40.0]),
+            }
+
+    def test_exact_stats_sample_is_scaled(self):
+        with mock.patch(
+            "dbnd_postgres.postgres_values.PostgresController._query"
+        ) as query_patch:
+            query_patch.side_effect = [
+                [{"column_name": "customer", "data_type": "text"}],
+                [
+                    {
+                        "row_count": 10,
+                        "c0_count": 8,
+                        "c0_distinct": 1,
+                        "c0_histogram": [["customerA", 8]],
+                    }
+                ],
+            ]
+
+            postgres = PostgresController(
+                "user@database", "data_table", exact_stats=True, sample_percent=10
+            )
+            stats, histograms = postgres.get_histograms_and_stats(
+                ValueMetaConf.enabled()
+            )
+
+            assert stats["customer"]["count"] == 100
+            assert stats["customer"]["null-count"] == 20
+            assert histograms["customer"] == ([80], ["customerA"])
+
+
+class TestConnectionPool:
+    def test_pool_is_shared(self):
+        with mock.patch(
+            "dbnd_postgres.connection_pool.ThreadedConnectionPool"
+        ) as pool_cls:
+            pool = pool_cls.return_value
+            pool.closed = False
+            connection = pool.getconn.return_value
+            connection.closed = 0
+            connection.cursor.return_value.fetchall.return_value = []
+
+            for table_name in ["table_a", "table_b"]:
+                with PostgresController(
+                    "postgresql://user@host/shared_db", table_name
+                ) as postgres:
+                    postgres.get_column_types()
+
+            assert pool_cls.call_count == 1
+            assert pool.getconn.call_count == 2
+            pool.putconn.assert_called_with(connection, close=False)
+        close_connection_pools()
+
+    def test_pool_per_process(self):
+        with mock.patch(
+            "dbnd_postgres.connection_pool.ThreadedConnectionPool",
+            side_effect=lambda *args, **kwargs: mock.MagicMock(closed=False),
+        ):
+            with mock.patch("os.getpid", return_value=1):
+                parent_pool = get_connection_pool("postgresql://user@host/db")
+                assert get_connection_pool("postgresql://user@host/db") is parent_pool
+            with mock.patch("os.getpid", return_value=2):
+                child_pool = get_connection_pool("postgresql://user@host/db")
+                close_connection_pools()
+
+        assert child_pool is not parent_pool
+        child_pool.closeall.assert_called_once_with()
+        # the sessions of the parent process are left open
+        assert not parent_pool.closeall.called
+
+    def test_wait_for_free_connection(self):
+        with mock.patch("psycopg2.pool.psycopg2.connect") as connect:
+            connect.return_value.closed = 0
+            connect.return_value.info.transaction_status = TRANSACTION_STATUS_IDLE
+            connection_string = "postgresql://user@host/busy_db"
+            taken = threading.Event()
+            release = threading.Event()
+
+            def hold_connection():
+                with pooled_connection(connection_string, max_size=1):
+                    taken.set()
+                    release.wait(10)
+
+            holder = threading.Thread(target=hold_connection)
+            holder.start()
+            taken.wait(10)
+
+            waiter_done = threading.Event()
+
+            def wait_for_connection():
+                with pooled_connection(connection_string, max_size=1):
+                    waiter_done.set()
+
+            waiter = threading.Thread(target=wait_for_connection)
+            waiter.start()
+            # all the connections are taken, waits instead of PoolError
+            assert not waiter_done.wait(0.2)
+
+            release.set()
+            holder.join(10)
+            waiter.join(10)
+            assert waiter_done.is_set()
+            assert connect.call_count == 1
+        close_connection_pools()
@@ -1,9 +1,14 @@
+import hashlib
+import re
+import threading
+
+from collections import OrderedDict
 from typing import List, Optional, Set, Tuple
 
 import attr
 import sqlparse
 
-from sqlparse import tokens as T
+from sqlparse import lexer, tokens as T
 from sqlparse.sql import Comparison, IdentifierList, Parenthesis, TokenList
 from sqlparse.tokens import CTE, Keyword, Token
 
@@ -36,6 +41,22 @@ SEQUENCE_OPERATIONS = {
 # tuple of: (table_name, target_operation)
 TableOperation = Tuple[str, DbndTargetOperationType]
 
+# sqlparse grouping is too slow for large statements,
+# these are extracted from the flat token stream
+LARGE_STATEMENT_SIZE = 10000
+EXTRACTION_CACHE_SIZE = 1000
+
+_SQL_NORMALIZE_RE = re.compile(
+    r"""(?P<identifier>"(?:[^"]|"")*")"""
+    # stage locations are unquoted paths, their numbers are part of the target
+    r"""|(?P<stage>@[^\s;,()]+)"""
+    r"""|(?P<literal>'(?:[^'\\]|\\.|'')*'|\$\$.*?\$\$"""
+    r"""|\b\d+(?:\.\d*)?(?:[eE][-+]?\d+)?\b)"""
+    # comments together with the whitespace around them
+    r"""|(?P<space>(?:\s+|--[^\n]*|/\*.*?\*/)+)""",
+    re.DOTALL,
+)
+
 
 @attr.s(frozen=True)
 class TableTargetOperation(object):
@@ -63,6 +84,64 @@ def detect_cte_tables(statement):
     return cte_names
 
 
+class _ExtractionCache(object):
+    """
+    LRU cache of the table operations extracted from queries,
+    the same (parameterized) query is usually executed again and again
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is None:
+                self.misses += 1
+                return None
+            # re-insert to mark as most recently used
+            self._entries[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+_extraction_cache = _ExtractionCache(EXTRACTION_CACHE_SIZE)
+
+
+def _normalize_token(match):
+    if match.lastgroup in ("identifier", "stage"):
+        return match.group()
+    if match.lastgroup == "literal":
+        return "?"
+    return " "
+
+
+def sql_fingerprint(sqlquery):
+    # type: (str) -> str
+    """
+    Fingerprint of the query text without literals, comments and formatting,
+    so executions of the same query with different values share it
+    """
+    normalized = _SQL_NORMALIZE_RE.sub(_normalize_token, sqlquery).strip()
+    return hashlib.md5(normalized.encode("utf-8")).hexdigest()
+
+
 def extract_from_sql(path, sqlquery):
     # type: (str, str) -> Set[TableTargetOperation]
     """
@@ -72,21 +151,45 @@ def extract_from_sql(path, sqlquery):
     @param sqlquery: string of the sql-query
     @return: Set of targets operation to log with (full_path, name, target_operation)
     """
-    # assuming there is only one statement in the sqlquery
-    statement = sqlparse.parse(sqlquery)[0]
-
-    table_operations = extract_tables_operations(statement)
-    cte_tables = detect_cte_tables(statement)
+    fingerprint_key = (path, sql_fingerprint(sqlquery))
+    # targets of COPY and stages are literals, these are cached by the exact query
+    exact_key = (path, sqlquery)
+
+    operations = _extraction_cache.get(fingerprint_key)
+    if operations is None:
+        operations = _extraction_cache.get(exact_key)
+    if operations is None:
+        operations, depends_on_literals = _extract_from_sql(path, sqlquery)
+        operations = frozenset(operations)
+        _extraction_cache.put(
+            exact_key if depends_on_literals else fingerprint_key, operations
+        )
+    return set(operations)
+
+
+def _extract_from_sql(path, sqlquery):
+    # type: (str, str) -> Tuple[Set[TableTargetOperation], bool]
+    if len(sqlquery) > LARGE_STATEMENT_SIZE:
+        table_operations, cte_tables = extract_tables_operations_from_tokens(sqlquery)
+    else:
+        # assuming there is only one statement in the sqlquery
+        statement = sqlparse.parse(sqlquery)[0]
+
+        table_operations = extract_tables_operations(statement)
+        cte_tables = detect_cte_tables(statement)
 
     result = set()
+    depends_on_literals = False
     for name, op in table_operations:
         # don't return cte_tables
         if name not in cte_tables:
+            # quoted paths, stages, identifier('...') and $variables
+            depends_on_literals |= "'" in name or "$" in name or name.startswith("@")
             parsed_path, name = build_target_path(path, name)
             operation = TableTargetOperation(path=parsed_path, name=name, operation=op)
             result.add(operation)
 
-    return result
+    return result, depends_on_literals
 
 
 def extract_tables_operations(statement):
@@ -109,7 +212,7 @@ def extract_tables_operations(statement):
             return tables_operators
 
         if token.ttype in Keyword:
-            operation_name = token.value.upper()
+            operation_name = _keyword_name(token.value)
             idx_potential, next_token = _next_non_empty_token(idx, statement)
 
             # if the following token is another keyword its usually has different meaning than we expect
@@ -133,6 +236,23 @@ def extract_tables_operations(statement):
                     tables_operators.extend(extracted)
                     idx = idx_potential
 
+                elif isinstance(next_token, IdentifierList):
+                    # `... from table0, table1 as alias1, (<sub_query>) ...`
+                    op = OPERATIONS[operation_name]
+                    for identifier in next_token.get_identifiers():
+                        if isinstance(identifier, Parenthesis):
+                            extracted = extract_tables_operations(identifier)
+                        elif isinstance(identifier, TokenList) and isinstance(
+                            identifier.token_first(), Parenthesis
+                        ):
+                            extracted = extract_tables_operations(
+                                identifier.token_first()
+                            )
+                        else:
+                            extracted = [(_extract_token_name(identifier), op)]
+                        tables_operators.extend(extracted)
+                    idx = idx_potential
+
                 elif next_token.ttype not in Keyword:
                     # no subquery - just parse the source/dest name of the operator
                     op = OPERATIONS[operation_name]
@@ -213,6 +333,188 @@ def _handle_cte_statement(idx, statement):
     return idx, tables_operators
 
 
+def extract_tables_operations_from_tokens(sqlquery):
+    # type: (str) -> Tuple[List[TableOperation], Set[str]]
+    """
+    Light version of `extract_tables_operations` and `detect_cte_tables` for large statements,
+    works on the flat token stream of sqlparse lexer without grouping the tokens.
+    Tables of sub-queries are found in the same pass, as we don't need to group them.
+    """
+    tokens = [
+        (ttype, value)
+        for ttype, value in lexer.tokenize(sqlquery)
+        if not (ttype in T.Whitespace or ttype in T.Comment)
+    ]
+
+    tables_operators = []
+    cte_names = set()
+    # CTE: WITH <name> [(<columns>)] AS (<query>), <name> ...
+    cte_state = cte_depth = None
+    depth = 0
+    idx = 0
+    while idx < len(tokens):
+        ttype, value = tokens[idx]
+
+        if ttype in T.Punctuation:
+            if value == "(":
+                depth += 1
+            elif value == ")":
+                depth -= 1
+                if cte_state == "body" and depth == cte_depth:
+                    cte_state = "next"
+            elif value == "," and cte_state == "next" and depth == cte_depth:
+                cte_state = "name"
+            elif value == ";" and depth <= 0:
+                # assuming there is only one statement in the sqlquery
+                break
+            idx += 1
+            continue
+
+        if cte_state == "name":
+            name, idx_potential = _read_table_name(tokens, idx)
+            if name:
+                cte_names.add(name)
+            idx = max(idx_potential, idx + 1)
+            cte_state = "columns"
+            continue
+        if cte_state == "columns" and depth == cte_depth and value.upper() == "AS":
+            cte_state = "body"
+            idx += 1
+            continue
+        if cte_state == "next":
+            cte_state = None
+
+        idx += 1
+        if ttype not in Keyword:
+            continue
+
+        operation_name = _keyword_name(value)
+        if ttype in CTE:
+            cte_state, cte_depth = "name", depth
+            if idx < len(tokens) and tokens[idx][1].upper() == "RECURSIVE":
+                idx += 1
+
+        elif operation_name in OPERATIONS:
+            op = OPERATIONS[operation_name]
+            while True:
+                name, idx_potential = _read_table_name(tokens, idx)
+                if not name:
+                    break
+                tables_operators.append((name, op))
+                idx = idx_potential
+                if op != DbndTargetOperationType.read:
+                    break
+
+                # `... from table0, table1 as alias1, ...`
+                idx_potential = _skip_alias(tokens, idx)
+                if not _is_punctuation(tokens, idx_potential, ","):
+                    break
+                idx = idx_potential + 1
+
+        elif (
+            idx < len(tokens)
+            and tokens[idx][0] in Keyword
+            and (operation_name, _keyword_name(tokens[idx][1])) in SEQUENCE_OPERATIONS
+        ):
+            op = SEQUENCE_OPERATIONS[(operation_name, _keyword_name(tokens[idx][1]))]
+            name, idx = _read_table_name(tokens, idx + 1)
+            if name:
+                tables_operators.append((name, op))
+
+        elif operation_name.startswith("CREATE"):
+            idx, extracted = _handle_create_tokens(idx, tokens)
+            tables_operators.extend(extracted)
+
+    return tables_operators, cte_names
+
+
+def _handle_create_tokens(idx, tokens):
+    # type: (int, List[Tuple]) -> (int, List[TableOperation])
+    """
+    Flat tokens version of `_handle_create_statement`
+    """
+    tables_operators = []
+    if idx < len(tokens) and tokens[idx][1].upper() == "TEMPORARY":
+        idx += 1
+    if idx >= len(tokens):
+        return idx, tables_operators
+
+    kind = tokens[idx][1].upper()
+    if kind == "STAGE":
+        name, idx = _read_table_name(tokens, idx + 1)
+        if name:
+            tables_operators.append(("@{}".format(name), DbndTargetOperationType.write))
+        for url_idx in range(idx, len(tokens) - 2):
+            if tokens[url_idx][1].upper() == "URL" and tokens[url_idx + 1][1] == "=":
+                tables_operators.append(
+                    (tokens[url_idx + 2][1], DbndTargetOperationType.read)
+                )
+                idx = url_idx + 3
+                break
+
+    elif kind == "TABLE":
+        name, idx = _read_table_name(tokens, idx + 1)
+        if name:
+            tables_operators.append((name, DbndTargetOperationType.write))
+
+    return idx, tables_operators
+
+
+def _read_table_name(tokens, idx):
+    # type: (List[Tuple], int) -> (Optional[str], int)
+    """
+    Reads `part[.part]*` table name (or a literal path) starting at `idx`,
+    returns the name and the index of the next token, None if there is no name at `idx`
+    """
+    if idx >= len(tokens):
+        return None, idx
+
+    ttype, value = tokens[idx]
+    if ttype in T.String.Single:
+        return value, idx + 1
+    if not (ttype in T.Name or ttype in T.String.Symbol):
+        return None, idx
+
+    parts = [value]
+    idx += 1
+    while (
+        _is_punctuation(tokens, idx, ".")
+        and idx + 1 < len(tokens)
+        and tokens[idx + 1][0] not in T.Punctuation
+    ):
+        parts.append(tokens[idx + 1][1])
+        idx += 2
+    return ".".join(parts), idx
+
+
+def _skip_alias(tokens, idx):
+    if (
+        idx < len(tokens)
+        and tokens[idx][0] in Keyword
+        and tokens[idx][1].upper() == "AS"
+    ):
+        idx += 1
+    if idx < len(tokens) and (
+        tokens[idx][0] in T.Name or tokens[idx][0] in T.String.Symbol
+    ):
+        idx += 1
+    return idx
+
+
+def _is_punctuation(tokens, idx, value):
+    return (
+        idx < len(tokens)
+        and tokens[idx][0] in T.Punctuation
+        and tokens[idx][1] == value
+    )
+
+
+def _keyword_name(value):
+    # type: (str) -> str
+    # multi words keywords (`LEFT OUTER JOIN`) can be split by any whitespace
+    return " ".join(value.upper().split())
+
+
 def _extract_token_name(token, pos=0):
     # type: (Token, int) -> str
     return token.value.split(" ")[pos]
@@ -0,0 +1,6 @@
+COPY INTO raw.events
+FROM 's3://company-data-lake/events/2021/04/01/'
+STORAGE_INTEGRATION = s3_integration
+FILE_FORMAT = (TYPE = 'JSON' STRIP_OUTER_ARRAY = TRUE)
+ON_ERROR = 'CONTINUE'
+PURGE = FALSE;
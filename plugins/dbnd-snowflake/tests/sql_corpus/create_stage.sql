@@ -0,0 +1,6 @@
+create or replace temporary stage analytics.staging.daily_orders_stage
+URL = 's3://company-data-lake/exports/orders/2021-04-01/'
+credentials = (
+    AWS_KEY_ID = 'id'
+    AWS_SECRET_KEY = 'secret')
+file_format = "ANALYTICS"."PUBLIC"."CSV_FORMAT"
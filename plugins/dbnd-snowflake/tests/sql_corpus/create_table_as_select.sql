@@ -0,0 +1,7 @@
+create table analytics.public.active_customers as
+select c.customer_id, c.name, max(o.order_date) as last_order_date
+  from analytics.public.customers c
+  right outer join analytics.public.orders o
+    on o.customer_id = c.customer_id
+ where o.order_date > dateadd(day, -90, current_date())
+ group by 1, 2;
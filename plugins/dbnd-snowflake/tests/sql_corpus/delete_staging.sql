@@ -0,0 +1,2 @@
+delete from "SALES_DATA"."PUBLIC"."STAGING_TABLE"
+ where loaded_at < dateadd(day, -7, current_timestamp());
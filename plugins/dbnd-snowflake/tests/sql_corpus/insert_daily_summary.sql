@@ -0,0 +1,13 @@
+INSERT INTO reporting.daily_summary (report_date, region, orders, revenue)
+SELECT o.order_date,
+       s.region,
+       COUNT(*),
+       SUM(o.amount)
+  FROM (
+        SELECT order_id, order_date, store_id, amount
+          FROM analytics.public.orders
+         WHERE order_date = '2021-04-01'
+       ) o
+ INNER JOIN analytics.public.stores s
+    ON s.store_id = o.store_id
+ GROUP BY 1, 2
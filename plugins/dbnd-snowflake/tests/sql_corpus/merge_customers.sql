@@ -0,0 +1,13 @@
+MERGE INTO "ANALYTICS"."PUBLIC"."DIM_CUSTOMER" target
+USING "ANALYTICS"."STAGING"."CUSTOMER_UPDATES" updates
+   ON target."CUSTOMER_ID" = updates."CUSTOMER_ID"
+ WHEN MATCHED AND updates."IS_DELETED" = TRUE
+      THEN DELETE
+ WHEN MATCHED
+      THEN UPDATE SET
+           target."NAME" = updates."NAME",
+           target."EMAIL" = updates."EMAIL",
+           target."UPDATED_AT" = CURRENT_TIMESTAMP()
+ WHEN NOT MATCHED
+      THEN INSERT ("CUSTOMER_ID", "NAME", "EMAIL", "UPDATED_AT")
+           VALUES (updates."CUSTOMER_ID", updates."NAME", updates."EMAIL", CURRENT_TIMESTAMP());
@@ -0,0 +1,35 @@
+WITH first_orders AS (
+    SELECT customer_id,
+           MIN(order_date) AS first_order_date
+      FROM analytics.public.orders
+     WHERE status <> 'CANCELLED'
+     GROUP BY customer_id
+),
+cohorts AS (
+    SELECT f.customer_id,
+           DATE_TRUNC('month', f.first_order_date) AS cohort_month,
+           c.segment
+      FROM first_orders f
+      JOIN analytics.public.customers c
+        ON c.customer_id = f.customer_id
+),
+activity AS (
+    SELECT o.customer_id,
+           DATE_TRUNC('month', o.order_date) AS activity_month,
+           SUM(o.amount) AS amount
+      FROM analytics.public.orders o
+      LEFT JOIN analytics.public.refunds r
+        ON r.order_id = o.order_id
+     WHERE r.order_id IS NULL
+     GROUP BY 1, 2
+)
+SELECT c.cohort_month,
+       c.segment,
+       DATEDIFF(month, c.cohort_month, a.activity_month) AS month_number,
+       COUNT(DISTINCT a.customer_id) AS active_customers,
+       SUM(a.amount) AS revenue
+  FROM cohorts c
+  JOIN activity a
+    ON a.customer_id = c.customer_id
+ GROUP BY 1, 2, 3
+ ORDER BY 1, 2, 3;
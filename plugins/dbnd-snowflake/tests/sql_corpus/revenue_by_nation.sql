@@ -0,0 +1,19 @@
+SELECT n.n_name,
+       SUM(l.l_extendedprice * (1 - l.l_discount)) AS revenue
+  FROM "SNOWFLAKE_SAMPLE_DATA"."TPCH_SF1"."CUSTOMER" c
+  JOIN "SNOWFLAKE_SAMPLE_DATA"."TPCH_SF1"."ORDERS" o
+    ON c.c_custkey = o.o_custkey
+  JOIN "SNOWFLAKE_SAMPLE_DATA"."TPCH_SF1"."LINEITEM" l
+    ON l.l_orderkey = o.o_orderkey
+  JOIN "SNOWFLAKE_SAMPLE_DATA"."TPCH_SF1"."SUPPLIER" s
+    ON l.l_suppkey = s.s_suppkey
+   AND c.c_nationkey = s.s_nationkey
+  JOIN snowflake_sample_data.tpch_sf1.nation n
+    ON s.s_nationkey = n.n_nationkey
+  LEFT OUTER JOIN snowflake_sample_data.tpch_sf1.region r
+    ON n.n_regionkey = r.r_regionkey
+ WHERE r.r_name = 'ASIA'
+   AND o.o_orderdate >= DATE '1994-01-01'
+   AND o.o_orderdate < DATEADD(year, 1, DATE '1994-01-01')
+ GROUP BY n.n_name
+ ORDER BY revenue DESC
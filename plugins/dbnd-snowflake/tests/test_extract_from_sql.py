@@ -1,13 +1,25 @@
+import glob
+import os
+
+import mock
 import pytest
 import sqlparse
 
 from dbnd._core.constants import DbndTargetOperationType
+from dbnd_snowflake import extract_sql_query
 from dbnd_snowflake.extract_sql_query import (
     TableTargetOperation,
     build_target_path,
     detect_cte_tables,
     extract_from_sql,
     extract_tables_operations,
+    extract_tables_operations_from_tokens,
+    sql_fingerprint,
+)
+
+
+SQL_CORPUS = sorted(
+    glob.glob(os.path.join(os.path.dirname(__file__), "sql_corpus", "*.sql"))
 )
 
 
@@ -588,3 +600,133 @@ def test_extract_from_sql(sqlquery, expected):
 )
 def test_build_target_path(path, name, expected):
     assert build_target_path(path, name) == expected
+
+
+def test_extract_tables_operations_identifier_list():
+    statement = sqlparse.parse("select * from table0, schema1.table1 as t1 where x")[0]
+    assert extract_tables_operations(statement) == [
+        ("table0", DbndTargetOperationType.read),
+        ("schema1.table1", DbndTargetOperationType.read),
+    ]
+
+
+@pytest.mark.parametrize("sql_file", SQL_CORPUS, ids=os.path.basename)
+def test_extract_tables_operations_from_tokens(sql_file):
+    with open(sql_file) as f:
+        sqlquery = f.read()
+
+    statement = sqlparse.parse(sqlquery)[0]
+    cte_tables = detect_cte_tables(statement)
+    expected = {
+        op for op in extract_tables_operations(statement) if op[0] not in cte_tables
+    }
+
+    table_operations, cte_tables = extract_tables_operations_from_tokens(sqlquery)
+    assert expected
+    assert {op for op in table_operations if op[0] not in cte_tables} == expected
+
+
+@pytest.mark.parametrize(
+    "first, second, same",
+    [
+        (
+            "select * from t where id = 1 and name = 'a'",
+            "select *\n  from t\n where id = 2.5 and name = 'it''s' -- comment",
+            True,
+        ),
+        ("select * from t where id = 1", "select *  from t where id = 22", True),
+        (
+            "select * from t where a = 'x'",
+            "select * from t /* c */ where a = 'y'",
+            True,
+        ),
+        ('select * from "t 1"', 'select * from "t 2"', False),
+        ("select * from t1", "select * from t2", False),
+        (
+            "copy into @stage/2020/01 from mytable",
+            "copy into @stage/2020/02 from mytable",
+            False,
+        ),
+        (
+            "copy into @stage/data from t where id = 1",
+            "copy into @stage/data from t where id = 2",
+            True,
+        ),
+    ],
+)
+def test_sql_fingerprint(first, second, same):
+    assert (sql_fingerprint(first) == sql_fingerprint(second)) == same
+
+
+class TestExtractionCache(object):
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        extract_sql_query._extraction_cache.clear()
+        yield
+        extract_sql_query._extraction_cache.clear()
+
+    def test_same_query_with_other_values_is_cached(self):
+        path = "snowflake://account.some.service"
+        with mock.patch.object(
+            extract_sql_query,
+            "_extract_from_sql",
+            wraps=extract_sql_query._extract_from_sql,
+        ) as extract:
+            for i in range(10):
+                result = extract_from_sql(
+                    path, "insert into table0 (a, b) values (%d, 'value %d')" % (i, i)
+                )
+                assert result == {
+                    TableTargetOperation(
+                        path=path + "/table0",
+                        name="table0",
+                        operation=DbndTargetOperationType.write,
+                    )
+                }
+            assert extract.call_count == 1
+
+            # cached per database path
+            extract_from_sql("snowflake://other", "insert into table0 values (1, 2)")
+            assert extract.call_count == 2
+
+    def test_literal_targets_are_not_shared(self):
+        path = "snowflake://account.some.service"
+        first = extract_from_sql(path, "copy into 's3://bucket/a' from mytable")
+        second = extract_from_sql(path, "copy into 's3://bucket/b' from mytable")
+
+        assert {op.path for op in first} == {"s3://bucket/a", path + "/mytable"}
+        assert {op.path for op in second} == {"s3://bucket/b", path + "/mytable"}
+
+    def test_stage_targets_are_not_shared(self):
+        path = "snowflake://account.some.service"
+        first = extract_from_sql(path, "copy into @stage/2020/01 from mytable")
+        second = extract_from_sql(path, "copy into @stage/2020/02 from mytable")
+
+        assert {op.name for op in first} == {"@stage/2020/01", "mytable"}
+        assert {op.name for op in second} == {"@stage/2020/02", "mytable"}
+
+    def test_identifier_targets_are_not_shared(self):
+        path = "snowflake://account.some.service"
+        first = extract_from_sql(path, "insert into IDENTIFIER('db.s.t1') values (1)")
+        second = extract_from_sql(path, "insert into IDENTIFIER('db.s.t2') values (1)")
+
+        assert {op.name for op in first} == {"IDENTIFIER('db.s.t1')"}
+        assert {op.name for op in second} == {"IDENTIFIER('db.s.t2')"}
+
+    def test_large_statement(self):
+        path = "snowflake://account.some.service"
+        sqlquery = "select * from table0 where id in ({})".format(
+            ", ".join(str(i) for i in range(5000))
+        )
+        assert len(sqlquery) > extract_sql_query.LARGE_STATEMENT_SIZE
+
+        with mock.patch.object(sqlparse, "parse") as parse:
+            result = extract_from_sql(path, sqlquery)
+        assert not parse.called
+        assert result == {
+            TableTargetOperation(
+                path=path + "/table0",
+                name="table0",
+                operation=DbndTargetOperationType.read,
+            )
+        }
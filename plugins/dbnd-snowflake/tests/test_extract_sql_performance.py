@@ -0,0 +1,52 @@
+import glob
+import logging
+import os
+import time
+
+import pytest
+import sqlparse
+
+from dbnd_snowflake import extract_sql_query
+from dbnd_snowflake.extract_sql_query import (
+    extract_from_sql,
+    extract_tables_operations,
+    extract_tables_operations_from_tokens,
+)
+
+
+logger = logging.getLogger(__name__)
+
+SQL_CORPUS = sorted(
+    glob.glob(os.path.join(os.path.dirname(__file__), "sql_corpus", "*.sql"))
+)
+ITERATIONS = 200
+
+
+def _measure(name, func, sqlquery):
+    start = time.time()
+    for i in range(ITERATIONS):
+        func(sqlquery)
+    per_call = (time.time() - start) / ITERATIONS
+    logger.info("%s: %.3f ms per statement", name, per_call * 1000)
+    return per_call
+
+
+@pytest.mark.skip("performance tests")
+class TestExtractSqlPerformance(object):
+    @pytest.mark.parametrize("sql_file", SQL_CORPUS, ids=os.path.basename)
+    def test_extractors(self, sql_file):
+        with open(sql_file) as f:
+            sqlquery = f.read()
+
+        logger.info("%s (%s chars)", os.path.basename(sql_file), len(sqlquery))
+        _measure(
+            "sqlparse",
+            lambda q: extract_tables_operations(sqlparse.parse(q)[0]),
+            sqlquery,
+        )
+        _measure("tokens", extract_tables_operations_from_tokens, sqlquery)
+
+        extract_sql_query._extraction_cache.clear()
+        _measure(
+            "cached", lambda q: extract_from_sql("snowflake://account", q), sqlquery
+        )